@@ -33,6 +33,16 @@ from .config_tts_api import (
 from .json_parser import ChatterboxResponseParser, AudioSection
 from .simple_audio_file_manager import SimpleAudioFileManager
 
+# Record/replay layer for offline profiling runs
+try:
+    from Utils.api_cassette import synthesize
+except ImportError:
+    def synthesize(engine, params, output_path, produce):
+        # A requested record/replay run must not fall through to live calls
+        if os.getenv('YOUTUBER_CASSETTE', 'off') != 'off':
+            raise RuntimeError("YOUTUBER_CASSETTE is set but Utils/api_cassette.py could not be imported")
+        return produce()
+
 logger = logging.getLogger(__name__)
 
 
@@ -236,6 +246,16 @@ class SimpleTTSEngine:
     
     def generate_speech(self, text: str, output_path: str) -> bool:
         """Generate single audio file via API call"""
+        return synthesize(
+            'chatterbox',
+            {'input': text, 'exaggeration': EXAGGERATION,
+             'cfg_weight': CFG_WEIGHT, 'temperature': TEMPERATURE},
+            output_path,
+            lambda: self._request_speech(text, output_path)
+        )
+
+    def _request_speech(self, text: str, output_path: str) -> bool:
+        """Make the live TTS API call and write the audio file"""
         section_start_time = time.time()
         text_length = len(text)
         
@@ -14,6 +14,15 @@ Self-correction: If any gate fails, the rebuttal is automatically rewritten
 targeting the specific failure, then re-verified through ALL gates.
 Maximum 3 iterations per rebuttal.
 
+Gate verdicts of passing rebuttals are remembered across episodes; a rebuttal
+identical (after normalization) to a remembered one, for the same clip
+claims, starts from the stored verdict instead of a new gate evaluation.
+Passing rebuttals are also recorded in the cross-episode claim library,
+whose stored rebuttal for a recurring claim short-circuits verification the
+same way when the new rebuttal is identical to it. Near-duplicates are never
+reused for gates: a changed figure or direction word barely moves text
+similarity but decides the accuracy gate.
+
 Author: Claude Code
 Created: 2024-12-28
 Pipeline: Multi-Pass Quality Control System
@@ -23,7 +32,10 @@ import os
 import sys
 import json
 import time
+import hashlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
@@ -39,6 +51,53 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 utils_dir = os.path.join(current_dir, '..', 'Utils')
 sys.path.append(utils_dir)
 
+try:
+    from .model_cascade import ModelCascade
+except ImportError:
+    try:
+        from Content_Analysis.model_cascade import ModelCascade
+    except ImportError:
+        from model_cascade import ModelCascade
+
+try:
+    from .context_cache import build_request
+except ImportError:
+    try:
+        from Content_Analysis.context_cache import build_request
+    except ImportError:
+        from context_cache import build_request
+
+try:
+    from Utils.api_cassette import create_gemini_client
+except ImportError:
+    try:
+        from api_cassette import create_gemini_client
+    except ImportError:
+        def create_gemini_client(api_key=None):
+            # A requested record/replay run must not fall through to live calls
+            if os.getenv('YOUTUBER_CASSETTE', 'off') != 'off':
+                raise RuntimeError("YOUTUBER_CASSETTE is set but Utils/api_cassette.py could not be imported")
+            return genai.Client(api_key=api_key)
+
+try:
+    from .usage_tracker import track_call
+except ImportError:
+    try:
+        from Content_Analysis.usage_tracker import track_call
+    except ImportError:
+        from usage_tracker import track_call
+
+try:
+    from .claim_cache import ClaimCache, normalize_claim
+    from .claim_library import ClaimLibrary
+except ImportError:
+    try:
+        from Content_Analysis.claim_cache import ClaimCache, normalize_claim
+        from Content_Analysis.claim_library import ClaimLibrary
+    except ImportError:
+        from claim_cache import ClaimCache, normalize_claim
+        from claim_library import ClaimLibrary
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -156,6 +215,23 @@ class BinaryRebuttalVerifier:
         # Temperature increases slightly each iteration for variety
         self.base_temperature = 0.4
 
+        # Speculative rewrites: N candidates generated and evaluated concurrently
+        # per failed iteration, each at a slightly higher temperature (1 = serial)
+        self.parallel_rewrites = max(1, int(qc_rebuttal.get('parallel_rewrites', 1)))
+        self.rewrite_temperature_spread = qc_rebuttal.get('rewrite_temperature_spread', 0.1)
+
+        # Fast-model-first cascade for gate evaluation (disabled = always gemini-2.5-pro)
+        self.cascade = ModelCascade(self.config, 'rebuttal_verifier', default_escalate_gates=['accuracy'])
+
+        # Gate verdicts of passing rebuttals, reused only for identical rebuttals
+        self.gate_memory = ClaimCache.from_config(
+            self.config, 'rebuttal_gates', qc_rebuttal.get('gate_memory_hours', 168)
+        )
+        self.gate_evaluations_reused = 0
+
+        # Cross-episode library of verified rebuttals per claim
+        self.claim_library = ClaimLibrary.from_config(self.config)
+
         # Debug storage
         self._debug_api_calls = []
         self._all_verification_results = []
@@ -180,7 +256,7 @@ class BinaryRebuttalVerifier:
             if not api_key:
                 raise ValueError("Gemini API key not found in config or environment")
 
-            _gemini_client = genai.Client(api_key=api_key)
+            _gemini_client = create_gemini_client(api_key=api_key)
             logger.info("Gemini API client configured successfully")
         except Exception as e:
             logger.error(f"Failed to configure Gemini API: {e}")
@@ -240,6 +316,11 @@ class BinaryRebuttalVerifier:
             self._all_verification_results.append(result)
             verified_sections[section_id] = result
 
+            if self.claim_library is not None and video_clip and result.passed and not result.warning:
+                self.claim_library.record(
+                    video_clip, rebuttal=result.final_content, gate_results=result.gate_results
+                )
+
             if result.warning:
                 logger.warning(f"  {section_id}: {result.warning}")
             else:
@@ -261,8 +342,12 @@ class BinaryRebuttalVerifier:
             'fully_passed': sum(1 for r in verified_sections.values() if r.passed and not r.warning),
             'passed_with_warnings': sum(1 for r in verified_sections.values() if r.warning),
             'gates_used': [g[0] for g in self.GATES],
-            'max_iterations': self.max_iterations
+            'max_iterations': self.max_iterations,
+            'gate_evaluations_reused': self.gate_evaluations_reused
         }
+        if self.cascade.reporting:
+            metadata['model_cascade'] = self.cascade.get_stats()
+            self.cascade.log_stats()
 
         logger.info("=== BINARY REBUTTAL VERIFICATION COMPLETE ===")
         logger.info(f"Results: {metadata['fully_passed']} passed, {metadata['passed_with_warnings']} with warnings")
@@ -353,17 +438,28 @@ class BinaryRebuttalVerifier:
         if clip_duration:
             logger.info(f"  Clip duration: {clip_duration:.0f}s — word limit: {word_limit}")
 
+        # Gate results already computed for current_content by a speculative
+        # round, or remembered from an identical rebuttal
+        pending_evaluation = self._recall_gate_evaluation(current_content, video_clip)
+        recalled = pending_evaluation is not None
+
         for iteration in range(self.max_iterations):
             logger.debug(f"  Iteration {iteration + 1}/{self.max_iterations}")
 
             # Evaluate all gates in single consolidated call — adjust
             # COMPLETENESS context for short clips
-            gate_results, first_failure, failure_justification = self._evaluate_all_gates(
-                current_content, video_clip, clip_duration=clip_duration
-            )
+            if pending_evaluation is None:
+                pending_evaluation = self._evaluate_all_gates(
+                    current_content, video_clip, clip_duration=clip_duration
+                )
+            gate_results, first_failure, failure_justification = pending_evaluation
+            pending_evaluation = None
 
             # Check if all gates passed
             if first_failure is None:
+                if not (recalled and iteration == 0):
+                    self._remember_gate_evaluation(current_content, video_clip, gate_results)
+
                 # Apply hard word limit on final passing content
                 if enforce_hard_limit:
                     current_content, was_truncated = self._truncate_to_word_limit(
@@ -405,7 +501,7 @@ class BinaryRebuttalVerifier:
             # Perform targeted rewrite with length constraint
             logger.debug(f"  Rewriting to fix: {first_failure}")
 
-            new_content = self._targeted_rewrite(
+            rewrite_kwargs = dict(
                 current_content=current_content,
                 failed_gate=first_failure,
                 failure_reason=failure_justification,
@@ -415,23 +511,32 @@ class BinaryRebuttalVerifier:
                 word_limit=word_limit,
                 clip_duration=clip_duration,
             )
+            speculative_info = None
 
-            # Post-rewrite enforcement
-            rewritten_word_count = len(new_content.split())
-            was_truncated = False
-
-            if enforce_hard_limit and rewritten_word_count > word_limit:
-                new_content, was_truncated = self._truncate_to_word_limit(
-                    new_content, word_limit
+            if self.parallel_rewrites > 1:
+                new_content, was_truncated, pending_evaluation, speculative_info = self._speculative_rewrite(
+                    rewrite_kwargs, video_clip, clip_duration, word_limit, enforce_hard_limit
                 )
                 rewritten_word_count = len(new_content.split())
+            else:
+                new_content = self._targeted_rewrite(**rewrite_kwargs)
+
+                # Post-rewrite enforcement
+                rewritten_word_count = len(new_content.split())
+                was_truncated = False
+
+                if enforce_hard_limit and rewritten_word_count > word_limit:
+                    new_content, was_truncated = self._truncate_to_word_limit(
+                        new_content, word_limit
+                    )
+                    rewritten_word_count = len(new_content.split())
 
             growth_percent = (
                 ((rewritten_word_count - original_word_count) / original_word_count * 100)
                 if original_word_count > 0 else 0
             )
 
-            rewrite_history.append({
+            history_entry = {
                 'iteration': iteration + 1,
                 'failed_gate': first_failure,
                 'failure_reason': failure_justification,
@@ -441,7 +546,10 @@ class BinaryRebuttalVerifier:
                 'growth_percent': round(growth_percent, 1),
                 'was_truncated': was_truncated,
                 'word_limit': word_limit,
-            })
+            }
+            if speculative_info:
+                history_entry['speculative'] = speculative_info
+            rewrite_history.append(history_entry)
 
             current_content = new_content
             time.sleep(self.api_delay)
@@ -457,6 +565,145 @@ class BinaryRebuttalVerifier:
             rewrite_history=rewrite_history
         )
 
+    def _gate_memory_text(self, rebuttal_content: str, video_clip: Optional[Dict]) -> str:
+        """Text a gate verdict is remembered under: the clip's claims and the rebuttal."""
+        claims = []
+        if video_clip:
+            claims = [video_clip.get('title', '')] + list(video_clip.get('key_claims', []))
+        return ' '.join(str(c) for c in claims if c) + ' || ' + rebuttal_content
+
+    def _recall_gate_evaluation(self, rebuttal_content: str, video_clip: Optional[Dict]):
+        """Passing gate evaluation of the same rebuttal (after normalization), if remembered."""
+        if not rebuttal_content:
+            return None
+
+        gate_results = None
+        if self.gate_memory:
+            text = self._gate_memory_text(rebuttal_content, video_clip)
+            gate_results = self.gate_memory.get(self._gate_memory_key(text))
+        if gate_results is None:
+            gate_results = self._recall_library_evaluation(rebuttal_content, video_clip)
+        if gate_results is None:
+            return None
+
+        self.gate_evaluations_reused += 1
+        logger.info("  Reusing remembered gate verdict for a matching rebuttal")
+        return gate_results, None, ""
+
+    def _recall_library_evaluation(self, rebuttal_content: str, video_clip: Optional[Dict]):
+        """Gate results of the library's rebuttal for this claim, if the rebuttal is identical to it.
+
+        Identical after normalization only: a similar rebuttal can differ in
+        the figures or direction words the accuracy gate judged.
+        """
+        if self.claim_library is None or not video_clip:
+            return None
+        entry = self.claim_library.lookup(video_clip)
+        if not entry or not entry.get('gate_results') or not entry.get('rebuttal'):
+            return None
+        if normalize_claim(rebuttal_content) != normalize_claim(entry['rebuttal']):
+            return None
+        return entry['gate_results']
+
+    def _remember_gate_evaluation(
+        self,
+        rebuttal_content: str,
+        video_clip: Optional[Dict],
+        gate_results: Dict[str, Dict]
+    ) -> None:
+        """Store the verdict of a rebuttal that passed all gates."""
+        if not self.gate_memory:
+            return
+        text = self._gate_memory_text(rebuttal_content, video_clip)
+        self.gate_memory.put(self._gate_memory_key(text), gate_results)
+
+    @staticmethod
+    def _gate_memory_key(text: str) -> str:
+        return hashlib.sha256(normalize_claim(text).encode('utf-8')).hexdigest()
+
+    def _speculative_rewrite(
+        self,
+        rewrite_kwargs: Dict,
+        video_clip: Optional[Dict],
+        clip_duration: Optional[float],
+        word_limit: int,
+        enforce_hard_limit: bool,
+    ) -> Tuple[str, bool, Tuple, Dict]:
+        """
+        Generate N rewrite candidates concurrently and evaluate them in parallel.
+
+        Candidate 0 uses the same temperature as a serial rewrite; the others
+        step up by rewrite_temperature_spread. Candidates are checked as they
+        finish: the first one that passes all gates within the word limit ends
+        the round, the shortest passing candidate among those already finished
+        wins, and the rest are abandoned (rewrites still in flight skip their
+        gate evaluation). If none pass, candidate 0 is kept so behaviour
+        matches the serial loop.
+
+        Returns:
+            Tuple of (content, was_truncated, gate_evaluation, speculative_info)
+        """
+        iteration = rewrite_kwargs['iteration']
+        serial_temperature = min(0.7, self.base_temperature + (iteration * 0.1))
+        temperatures = [
+            round(min(1.0, serial_temperature + i * self.rewrite_temperature_spread), 2)
+            for i in range(self.parallel_rewrites)
+        ]
+        winner_found = threading.Event()
+
+        def build_candidate(temperature: float) -> Optional[Dict]:
+            content = self._targeted_rewrite(temperature=temperature, **rewrite_kwargs)
+            was_truncated = False
+            if enforce_hard_limit and len(content.split()) > word_limit:
+                content, was_truncated = self._truncate_to_word_limit(content, word_limit)
+            # Another candidate already passed - no gate call for this one
+            if winner_found.is_set():
+                return None
+            evaluation = self._evaluate_all_gates(content, video_clip, clip_duration=clip_duration)
+            return {
+                'temperature': temperature,
+                'content': content,
+                'was_truncated': was_truncated,
+                'word_count': len(content.split()),
+                'evaluation': evaluation,
+            }
+
+        def passes(candidate: Optional[Dict]) -> bool:
+            return bool(candidate) and candidate['evaluation'][1] is None and candidate['word_count'] <= word_limit
+
+        logger.info(f"  Generating {len(temperatures)} speculative rewrites in parallel")
+        finished: Dict[int, Optional[Dict]] = {}
+        executor = ThreadPoolExecutor(max_workers=len(temperatures))
+        try:
+            futures = {executor.submit(build_candidate, t): i for i, t in enumerate(temperatures)}
+            for future in as_completed(futures):
+                finished[futures[future]] = future.result()
+                if passes(finished[futures[future]]):
+                    winner_found.set()
+                    # Ties: candidates that finished meanwhile compete as well
+                    for other, index in futures.items():
+                        if index not in finished and other.done() and other.exception() is None:
+                            finished[index] = other.result()
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        candidates = [finished[i] for i in sorted(finished) if finished[i]]
+        passing = [c for c in candidates if passes(c)]
+        chosen = min(passing, key=lambda c: c['word_count']) if passing else finished[0]
+
+        speculative_info = {
+            'candidates': len(temperatures),
+            'temperatures': temperatures,
+            'candidate_word_counts': [
+                finished[i]['word_count'] if finished.get(i) else None for i in range(len(temperatures))
+            ],
+            'passing_candidates': len(passing),
+            'abandoned_candidates': len(temperatures) - len(candidates),
+            'chosen_temperature': chosen['temperature'],
+        }
+        return chosen['content'], chosen['was_truncated'], chosen['evaluation'], speculative_info
+
     def _evaluate_all_gates(
         self,
         rebuttal_content: str,
@@ -464,7 +711,8 @@ class BinaryRebuttalVerifier:
         clip_duration: Optional[float] = None,
     ):
         """
-        Evaluate rebuttal against all 4 gates in a single API call.
+        Evaluate rebuttal against all 4 gates in a single API call
+        (routed through the model cascade when enabled).
 
         Returns:
             Tuple of (gate_results_dict, first_failed_gate_name_or_None, failure_justification)
@@ -501,15 +749,13 @@ Key Claims: {json.dumps(video_clip.get('key_claims', []))}
 **Guidance:** {guidance}
 """
 
-        prompt = f"""You are verifying rebuttal content for a media literacy project.
+        # Static gate guidance first so it can be served from a context cache;
+        # the clip context and rebuttal vary per call
+        prefix = f"""You are verifying rebuttal content for a media literacy project.
 
 Evaluate the rebuttal below against ALL 4 gates. Each gate MUST consider the results of prior gates.
 
 {gate_descriptions}
-{clip_context}
-
-## REBUTTAL CONTENT TO VERIFY
-{rebuttal_content}
 
 ## INSTRUCTIONS
 For EACH gate, provide your evaluation in this EXACT format:
@@ -532,45 +778,77 @@ GATE_4_SPECIFIC_ISSUES: [Problems or "None"]
 
 Be rigorous. Weak or unsupported claims should FAIL. We want high-quality rebuttals.
 """
+        suffix = f"""{clip_context}
+
+## REBUTTAL CONTENT TO VERIFY
+{rebuttal_content}
+"""
+
+        try:
+            return self.cascade.run(
+                suffix,
+                lambda prompt, model: self._request_gate_evaluation(prompt, model, prefix=prefix),
+                self._parse_consolidated_gate_response
+            )
+        except Exception as e:
+            # Return all-failed result
+            gate_results = {}
+            for gate_name, _, _ in self.GATES:
+                gate_results[gate_name] = {
+                    'passed': False,
+                    'justification': f"Evaluation failed: {str(e)}",
+                    'specific_issues': ["API error - conservative rejection"]
+                }
+            return gate_results, self.GATES[0][0], f"API error: {str(e)}"
+
+    def _request_gate_evaluation(self, prompt: str, model: str, prefix: str = "") -> str:
+        """
+        Send a consolidated gate prompt to the given model with retries.
+
+        Args:
+            prompt: Per-rebuttal part of the prompt
+            model: Model name
+            prefix: Static gate guidance, served from the shared context cache when active
+
+        Returns:
+            Response text; raises the last error once retries are exhausted
+        """
+        request_text, cached_content = build_request(prefix, prompt, model, scope='shared')
 
         for attempt in range(self.max_retries):
             try:
                 client = self._get_client()
-                response = client.models.generate_content(
-                    model='gemini-2.5-pro',
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
-                        temperature=0.3,
-                        top_p=0.9,
-                        candidate_count=1
+                with track_call('binary_rebuttal_verifier', model, attempt) as call:
+                    response = call.response = client.models.generate_content(
+                        model=model,
+                        contents=request_text,
+                        config=types.GenerateContentConfig(
+                            temperature=0.3,
+                            top_p=0.9,
+                            candidate_count=1,
+                            cached_content=cached_content
+                        )
                     )
-                )
 
                 if not response.text:
                     raise ValueError("Empty response from Gemini")
 
                 self._debug_api_calls.append({
                     'type': 'consolidated_gate_evaluation',
+                    'model': model,
+                    'cached_content': cached_content,
                     'timestamp': datetime.now().isoformat(),
                     'success': True
                 })
 
-                return self._parse_consolidated_gate_response(response.text)
+                return response.text
 
             except Exception as e:
-                logger.warning(f"Consolidated gate evaluation attempt {attempt + 1} failed: {e}")
+                logger.warning(f"Consolidated gate evaluation attempt {attempt + 1} ({model}) failed: {e}")
                 if attempt < self.max_retries - 1:
                     time.sleep(2 * (attempt + 1))
                 else:
-                    # Return all-failed result
-                    gate_results = {}
-                    for gate_name, _, _ in self.GATES:
-                        gate_results[gate_name] = {
-                            'passed': False,
-                            'justification': f"Evaluation failed: {str(e)}",
-                            'specific_issues': ["API error - conservative rejection"]
-                        }
-                    return gate_results, self.GATES[0][0], f"API error: {str(e)}"
+                    raise
 
     def _parse_consolidated_gate_response(self, response_text: str):
         """Parse consolidated gate response into individual results."""
@@ -629,11 +907,13 @@ Be rigorous. Weak or unsupported claims should FAIL. We want high-quality rebutt
         iteration: int,
         word_limit: int = 500,
         clip_duration: Optional[float] = None,
+        temperature: Optional[float] = None,
     ) -> str:
         """Rewrite rebuttal targeting the specific failed gate."""
 
         # Increase temperature slightly each iteration for more variety
-        temperature = min(0.7, self.base_temperature + (iteration * 0.1))
+        if temperature is None:
+            temperature = min(0.7, self.base_temperature + (iteration * 0.1))
 
         issues_str = "\n".join(f"- {issue}" for issue in specific_issues) if specific_issues else "See justification above"
 
@@ -715,11 +995,12 @@ Write ONLY the improved rebuttal content in your Alternative Media Literacy voic
                         candidate_count=1
                     )
 
-                response = client.models.generate_content(
-                    model='gemini-2.5-pro',
-                    contents=prompt,
-                    config=config
-                )
+                with track_call('binary_rebuttal_verifier', 'gemini-2.5-pro', attempt) as call:
+                    response = call.response = client.models.generate_content(
+                        model='gemini-2.5-pro',
+                        contents=prompt,
+                        config=config
+                    )
 
                 if not response.text:
                     raise ValueError("Empty response from Gemini")
@@ -25,7 +25,7 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, replace
 from google import genai
 from google.genai import types
 
@@ -46,6 +46,45 @@ except ImportError:
     except ImportError:
         JSONSchemaValidator = None
 
+try:
+    from .model_cascade import ModelCascade
+except ImportError:
+    try:
+        from Content_Analysis.model_cascade import ModelCascade
+    except ImportError:
+        from model_cascade import ModelCascade
+
+try:
+    from .context_cache import build_request
+except ImportError:
+    try:
+        from Content_Analysis.context_cache import build_request
+    except ImportError:
+        from context_cache import build_request
+
+try:
+    from Utils.api_cassette import create_gemini_client
+except ImportError:
+    try:
+        from api_cassette import create_gemini_client
+    except ImportError:
+        def create_gemini_client(api_key=None):
+            # A requested record/replay run must not fall through to live calls
+            if os.getenv('YOUTUBER_CASSETTE', 'off') != 'off':
+                raise RuntimeError("YOUTUBER_CASSETTE is set but Utils/api_cassette.py could not be imported")
+            return genai.Client(api_key=api_key)
+
+try:
+    from .usage_tracker import track_call
+    from .keyword_engine import KeywordEngine
+except ImportError:
+    try:
+        from Content_Analysis.usage_tracker import track_call
+        from Content_Analysis.keyword_engine import KeywordEngine
+    except ImportError:
+        from usage_tracker import track_call
+        from keyword_engine import KeywordEngine
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -100,6 +139,7 @@ class BinarySegmentFilter:
         'discount link', 'sponsored by', 'brought to you by', 'use code',
         'cash app', 'manscaped', 'liquid iv', 'liquid i.v.',
     ]
+    AD_ENGINE = KeywordEngine.from_keywords(AD_KEYWORDS, whole_words=False)
 
     # Define the 5 gates with their questions
     GATES = [
@@ -157,6 +197,9 @@ class BinarySegmentFilter:
         self.api_delay = self.config.get('api_delay', 2)
         self.max_retries = self.config.get('max_retries', 3)
 
+        # Fast-model-first cascade (disabled = always gemini-2.5-pro)
+        self.cascade = ModelCascade(self.config, 'segment_filter', default_escalate_gates=['accuracy_check'])
+
     def _configure_gemini(self) -> None:
         """Configure Gemini API using config or environment variable."""
         global _gemini_client
@@ -167,7 +210,7 @@ class BinarySegmentFilter:
             if not api_key:
                 raise ValueError("Gemini API key not found in config or environment")
 
-            _gemini_client = genai.Client(api_key=api_key)
+            _gemini_client = create_gemini_client(api_key=api_key)
             logger.info("Gemini API client configured successfully")
         except Exception as e:
             logger.error(f"Failed to configure Gemini API: {e}")
@@ -183,7 +226,8 @@ class BinarySegmentFilter:
     def filter_segments(
         self,
         segments: List[Dict],
-        output_path: Optional[str] = None
+        output_path: Optional[str] = None,
+        precomputed_results: Optional[List[Optional[FilterResult]]] = None
     ) -> Tuple[List[Dict], List[Dict], Dict]:
         """
         Filter all segments through the 5-gate system.
@@ -191,6 +235,9 @@ class BinarySegmentFilter:
         Args:
             segments: List of segment dictionaries from transcript analysis
             output_path: Optional path to save filtered results
+            precomputed_results: Optional list aligned with segments holding
+                verdicts already reached while Pass 1 was streaming (None
+                entries are evaluated now)
 
         Returns:
             Tuple of (passed_segments, rejected_segments, metadata)
@@ -200,6 +247,7 @@ class BinarySegmentFilter:
 
         passed_segments = []
         rejected_segments = []
+        reused_count = 0
 
         for i, segment in enumerate(segments):
             segment_id = segment.get('segment_id', f'segment_{i}')
@@ -207,7 +255,14 @@ class BinarySegmentFilter:
             print(f"  [{i+1}/{len(segments)}] {segment_id}: {segment_title}...", flush=True)
             logger.info(f"Filtering segment {i+1}/{len(segments)}: {segment_id}")
 
-            result = self.filter_segment(segment)
+            precomputed = precomputed_results[i] if precomputed_results and i < len(precomputed_results) else None
+            if precomputed is not None:
+                # Verdict reached while streaming; segment IDs may have been renumbered since
+                result = replace(precomputed, segment_id=segment.get('segment_id', 'unknown'))
+                reused_count += 1
+                print(f"      Using streamed verdict", flush=True)
+            else:
+                result = self.filter_segment(segment)
             self._all_filter_results.append(result)
 
             if result.passed:
@@ -225,7 +280,7 @@ class BinarySegmentFilter:
                 logger.info(f"  REJECTED at gate: {result.failed_at}")
 
             # Rate limiting between segments
-            if i < len(segments) - 1:
+            if precomputed is None and i < len(segments) - 1:
                 time.sleep(self.api_delay)
 
         metadata = {
@@ -236,6 +291,11 @@ class BinarySegmentFilter:
             'pass_rate': len(passed_segments) / len(segments) if segments else 0,
             'gates_used': [g[0] for g in self.GATES]
         }
+        if precomputed_results is not None:
+            metadata['streamed_verdicts_reused'] = reused_count
+        if self.cascade.reporting:
+            metadata['model_cascade'] = self.cascade.get_stats()
+            self.cascade.log_stats()
 
         logger.info(f"=== BINARY FILTERING COMPLETE ===")
         logger.info(f"Results: {len(passed_segments)} passed, {len(rejected_segments)} rejected")
@@ -248,7 +308,7 @@ class BinarySegmentFilter:
     def _is_advertisement(self, segment: Dict) -> bool:
         """Deterministic pre-screen: reject ads/sponsorships before API call."""
         text = self._extract_segment_content(segment).lower()
-        return any(kw in text for kw in self.AD_KEYWORDS)
+        return self.AD_ENGINE.search(text) is not None
 
     def _check_clip_duration(self, segment: Dict) -> Optional[Tuple[float, str]]:
         """Check if clip duration meets minimum threshold.
@@ -349,12 +409,33 @@ class BinarySegmentFilter:
 
     def _evaluate_consolidated(self, segment_content: str):
         """
-        Evaluate a segment against all 5 gates in a single API call.
+        Evaluate a segment against all 5 gates in a single API call
+        (routed through the model cascade when enabled).
 
         Returns:
             Tuple of (gate_results_dict, first_failed_gate_name_or_None),
             or None on total failure
         """
+        # Static gate guidance first so it can be served from a context cache;
+        # only the segment content varies per call
+        prefix = self._build_gate_prompt_prefix()
+        suffix = f"""
+## SEGMENT CONTENT
+{segment_content}
+"""
+
+        try:
+            return self.cascade.run(
+                suffix,
+                lambda prompt, model: self._request_consolidated(prompt, model, prefix=prefix),
+                self._parse_consolidated_response
+            )
+        except Exception as e:
+            logger.warning(f"Consolidated evaluation failed: {e}")
+            return None
+
+    def _build_gate_prompt_prefix(self) -> str:
+        """Build the static part of the consolidated gate prompt (identical for every segment)."""
         gate_descriptions = ""
         for i, (gate_name, gate_question, gate_guidance) in enumerate(self.GATES, 1):
             gate_descriptions += f"""
@@ -363,15 +444,12 @@ class BinarySegmentFilter:
 **Guidance:** {gate_guidance}
 """
 
-        prompt = f"""You are evaluating content for a media literacy project that identifies and rebuts misinformation.
+        return f"""You are evaluating content for a media literacy project that identifies and rebuts misinformation.
 
 Evaluate the segment below against ALL 5 gates sequentially. Each gate MUST consider the results of prior gates.
 
 {gate_descriptions}
 
-## SEGMENT CONTENT
-{segment_content}
-
 ## INSTRUCTIONS
 For EACH gate, provide your evaluation in this EXACT format:
 
@@ -398,39 +476,58 @@ GATE_5_EVIDENCE: [Quote or state "No specific evidence"]
 Be rigorous and conservative. When in doubt, the segment should FAIL the gate.
 """
 
+    def _request_consolidated(self, prompt: str, model: str, prefix: str = "") -> str:
+        """
+        Send a consolidated gate prompt to the given model with retries.
+
+        Args:
+            prompt: Per-segment part of the prompt
+            model: Model name
+            prefix: Static gate guidance, served from the shared context cache when active
+
+        Returns:
+            Response text; raises the last error once retries are exhausted
+        """
+        request_text, cached_content = build_request(prefix, prompt, model, scope='shared')
+        prompt = prefix + prompt
+
         for attempt in range(self.max_retries):
             try:
                 client = self._get_client()
-                response = client.models.generate_content(
-                    model='gemini-2.5-pro',
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
-                        temperature=0.3,
-                        top_p=0.9,
-                        candidate_count=1
+                with track_call('binary_segment_filter', model, attempt) as call:
+                    response = call.response = client.models.generate_content(
+                        model=model,
+                        contents=request_text,
+                        config=types.GenerateContentConfig(
+                            temperature=0.3,
+                            top_p=0.9,
+                            candidate_count=1,
+                            cached_content=cached_content
+                        )
                     )
-                )
 
                 if not response.text:
                     raise ValueError("Empty response from Gemini")
 
                 self._debug_api_calls.append({
                     'gate': 'consolidated',
+                    'model': model,
                     'timestamp': datetime.now().isoformat(),
                     'prompt_length': len(prompt),
+                    'cached_content': cached_content,
                     'response_length': len(response.text),
                     'attempt': attempt + 1,
                     'success': True
                 })
 
-                return self._parse_consolidated_response(response.text)
+                return response.text
 
             except Exception as e:
-                logger.warning(f"Consolidated evaluation attempt {attempt + 1} failed: {e}")
+                logger.warning(f"Consolidated evaluation attempt {attempt + 1} ({model}) failed: {e}")
                 if attempt < self.max_retries - 1:
                     time.sleep(2 * (attempt + 1))
                 else:
-                    return None
+                    raise
 
     def _parse_consolidated_response(self, response_text: str):
         """Parse consolidated gate response into individual gate results."""
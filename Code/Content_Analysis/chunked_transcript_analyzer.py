@@ -3,8 +3,10 @@ Chunked Transcript Analyzer - Splits long transcripts for better Gemini analysis
 
 Long transcripts (e.g., 3-hour podcasts) overwhelm Gemini's attention when analyzed
 in a single API call, producing thin, short clips. This module splits transcripts
-into ~25-minute time windows with overlap, analyzes each chunk independently, then
-merges and deduplicates results.
+into chunks of roughly equal estimated token size (cut on speaker-turn boundaries,
+with token-measured overlap), analyzes each chunk independently, then merges and
+deduplicates results. The older fixed ~25-minute windows remain available via
+chunking_mode: minutes.
 
 Wraps existing transcript_analyzer.py functions — no modifications to working
 analysis code.
@@ -21,7 +23,7 @@ import time
 import math
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
 # Add paths for imports
@@ -54,6 +56,18 @@ except ImportError:
             load_episode_metadata_from_path,
         )
 
+try:
+    from .segment_intervals import IntervalIndex, merge_overlapping, TIE_BREAK_POLICIES
+except ImportError:
+    try:
+        from Content_Analysis.segment_intervals import IntervalIndex, merge_overlapping, TIE_BREAK_POLICIES
+    except ImportError:
+        from segment_intervals import IntervalIndex, merge_overlapping, TIE_BREAK_POLICIES
+
+# Rough chars-per-token ratio for the uploaded JSON transcript
+CHARS_PER_TOKEN = 4
+COMPACT_SEGMENT_OVERHEAD_CHARS = 8
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -80,8 +94,21 @@ class ChunkedTranscriptAnalyzer:
         self.max_chunks = chunk_config.get('max_chunks', 12)
         self.segments_per_chunk = chunk_config.get('segments_per_chunk', 5)
         self.dedup_overlap_threshold = chunk_config.get('dedup_overlap_threshold', 0.5)
+        self.dedup_tie_break = chunk_config.get('dedup_tie_break', 'severity')
         self.delay_between_chunks = chunk_config.get('delay_between_chunks', 5)
 
+        # Compact uploads drop per-segment JSON overhead (see compact_transcript)
+        self.compact_upload = config.get('transcript_upload', {}).get('compact', True)
+
+        # Token-budget chunking (defaults approximate the old 25/3/30 minute settings
+        # for a typical diarized conversation in the active upload format)
+        token_defaults = (6000, 750, 7500) if self.compact_upload else (16000, 2000, 20000)
+        self.chunking_mode = chunk_config.get('chunking_mode', 'tokens')
+        self.target_chunk_tokens = chunk_config.get('target_chunk_tokens', token_defaults[0])
+        self.chunk_overlap_tokens = chunk_config.get('chunk_overlap_tokens', token_defaults[1])
+        self.single_call_max_tokens = chunk_config.get('single_call_max_tokens', token_defaults[2])
+        self.single_call_max_minutes = chunk_config.get('single_call_max_minutes', 30)
+
     def _create_fallback_logger(self):
         class FallbackLogger:
             def info(self, msg): logger.info(msg)
@@ -96,6 +123,7 @@ class ChunkedTranscriptAnalyzer:
         analysis_rules: str,
         processing_dir: str,
         total_target_segments: int = 20,
+        on_segment: Optional[Callable[[Dict], None]] = None,
     ) -> Optional[str]:
         """
         Main entry point: chunk, analyze, merge, return JSON string.
@@ -105,6 +133,8 @@ class ChunkedTranscriptAnalyzer:
             analysis_rules: Full analysis rules text (including guest profile)
             processing_dir: Directory for intermediate files
             total_target_segments: Target number of segments in final output
+            on_segment: Optional callback receiving each segment as soon as its
+                chunk streams it (before merge and renumbering)
 
         Returns:
             JSON string of merged analysis results, or None on failure
@@ -126,22 +156,50 @@ class ChunkedTranscriptAnalyzer:
             f"  Transcript duration: {total_duration_minutes:.1f} minutes"
         )
 
-        # If short enough, skip chunking
-        if total_duration_minutes <= 30:
-            self.enhanced_logger.info("  Transcript under 30 min — using single-call analysis")
-            return self._single_call_analysis(
-                transcript_path, analysis_rules, processing_dir
+        if self.chunking_mode == 'minutes':
+            # If short enough, skip chunking
+            if total_duration_minutes <= self.single_call_max_minutes:
+                self.enhanced_logger.info(
+                    f"  Transcript under {self.single_call_max_minutes} min — using single-call analysis"
+                )
+                return self._single_call_analysis(
+                    transcript_path, analysis_rules, processing_dir,
+                    on_segment=on_segment
+                )
+
+            # Chunk the transcript
+            chunks = self._chunk_transcript(transcript_data, segments)
+
+            self.enhanced_logger.info(
+                f"  Split into {len(chunks)} chunks "
+                f"(~{self.chunk_duration_minutes} min each, "
+                f"{self.chunk_overlap_minutes} min overlap)"
             )
+        else:
+            segment_tokens = [self._estimate_segment_tokens(seg) for seg in segments]
+            total_tokens = sum(segment_tokens)
+            self.enhanced_logger.info(f"  Estimated transcript size: ~{total_tokens} tokens")
 
-        # Chunk the transcript
-        chunks = self._chunk_transcript(transcript_data, segments)
-        num_chunks = len(chunks)
+            # If small enough, skip chunking
+            if total_tokens <= self.single_call_max_tokens:
+                self.enhanced_logger.info(
+                    f"  Transcript under {self.single_call_max_tokens} tokens — using single-call analysis"
+                )
+                return self._single_call_analysis(
+                    transcript_path, analysis_rules, processing_dir,
+                    on_segment=on_segment
+                )
 
-        self.enhanced_logger.info(
-            f"  Split into {num_chunks} chunks "
-            f"(~{self.chunk_duration_minutes} min each, "
-            f"{self.chunk_overlap_minutes} min overlap)"
-        )
+            # Chunk the transcript
+            chunks = self._chunk_transcript_by_tokens(segments, segment_tokens)
+
+            self.enhanced_logger.info(
+                f"  Split into {len(chunks)} chunks "
+                f"(~{chunks[0]['tokens'] if chunks else 0} tokens each, "
+                f"~{self.chunk_overlap_tokens} token overlap, speaker-turn boundaries)"
+            )
+
+        num_chunks = len(chunks)
 
         # Calculate per-chunk segment target
         per_chunk_target = math.ceil(total_target_segments / num_chunks) + 1
@@ -168,6 +226,9 @@ class ChunkedTranscriptAnalyzer:
                 self.enhanced_logger.info(f"    Using cached result for chunk {chunk_num}")
                 with open(chunk_result_path, 'r', encoding='utf-8') as f:
                     chunk_results = json.load(f)
+                if on_segment:
+                    for seg in chunk_results:
+                        on_segment(seg)
                 all_chunk_results.extend(chunk_results)
                 continue
 
@@ -188,15 +249,17 @@ class ChunkedTranscriptAnalyzer:
             with open(chunk_transcript_path, 'w', encoding='utf-8') as f:
                 json.dump(chunk_transcript_data, f, indent=2, ensure_ascii=False)
 
-            # Build chunk-specific rules with header
-            chunk_rules = self._build_chunk_rules(
-                analysis_rules, chunk_num, num_chunks, per_chunk_target,
+            # Build chunk-specific context; the shared rules stay a cacheable prefix
+            chunk_context = self._build_chunk_context(
+                chunk_num, num_chunks, per_chunk_target,
                 chunk['start_min'], chunk['end_min']
             )
 
             # Analyze this chunk using existing functions
             result = self._analyze_chunk(
-                chunk_transcript_path, chunk_rules, chunks_dir
+                chunk_transcript_path, analysis_rules, chunks_dir,
+                chunk_context=chunk_context,
+                on_segment=on_segment
             )
 
             if result:
@@ -275,19 +338,23 @@ class ChunkedTranscriptAnalyzer:
 
         chunks = []
         chunk_start = 0.0
+        if total_duration <= 0:
+            return chunks
+
+        # Bisect index over segment times instead of rescanning per window
+        index = IntervalIndex([
+            (
+                float(seg.get('start_time', seg.get('start', 0))),
+                float(seg.get('end_time', seg.get('end', 0))),
+            )
+            for seg in segments
+        ])
 
         while chunk_start < total_duration and len(chunks) < self.max_chunks:
             chunk_end = min(chunk_start + chunk_duration_sec, total_duration)
 
-            # Collect segments that fall within this time window
-            chunk_segments = []
-            for seg in segments:
-                seg_start = float(seg.get('start_time', seg.get('start', 0)))
-                seg_end = float(seg.get('end_time', seg.get('end', 0)))
-
-                # Include segment if it overlaps with the chunk window
-                if seg_start < chunk_end and seg_end > chunk_start:
-                    chunk_segments.append(seg)
+            # Collect segments that overlap with the chunk window
+            chunk_segments = [segments[i] for i in index.overlapping(chunk_start, chunk_end)]
 
             if chunk_segments:
                 chunks.append({
@@ -307,17 +374,118 @@ class ChunkedTranscriptAnalyzer:
 
         return chunks
 
-    def _build_chunk_rules(
+    def _estimate_segment_tokens(self, segment: Dict) -> int:
+        """Estimate the tokens a transcript segment costs in the uploaded file."""
+        if self.compact_upload:
+            # Text plus a share of the per-turn [start, code, ...] overhead
+            return math.ceil((len(segment.get('text') or '') + COMPACT_SEGMENT_OVERHEAD_CHARS) / CHARS_PER_TOKEN)
+        return math.ceil(len(json.dumps(segment, ensure_ascii=False)) / CHARS_PER_TOKEN)
+
+    def _build_turns(self, segments: List[Dict], segment_tokens: List[int]) -> List[List[int]]:
+        """
+        Group consecutive same-speaker segments into turns.
+
+        Turns are the cut units for token chunking. A monologue longer than half
+        a chunk is split at segment boundaries so it cannot swallow a chunk.
+
+        Returns:
+            List of [first_segment_index, end_segment_index, tokens]
+        """
+        max_turn_tokens = max(1, self.target_chunk_tokens // 2)
+        turns = []
+        for i, seg in enumerate(segments):
+            if (
+                turns
+                and seg.get('speaker') == segments[turns[-1][0]].get('speaker')
+                and turns[-1][2] + segment_tokens[i] <= max_turn_tokens
+            ):
+                turns[-1][1] = i + 1
+                turns[-1][2] += segment_tokens[i]
+            else:
+                turns.append([i, i + 1, segment_tokens[i]])
+        return turns
+
+    def _chunk_transcript_by_tokens(
+        self,
+        segments: List[Dict],
+        segment_tokens: List[int]
+    ) -> List[Dict]:
+        """Split transcript into near-equal token chunks cut on speaker turns.
+
+        The chunk count is derived from target_chunk_tokens (capped by
+        max_chunks) and the new content is spread evenly across chunks. Each
+        chunk after the first repeats the trailing turns of the previous one
+        until chunk_overlap_tokens is covered.
+        """
+        turns = self._build_turns(segments, segment_tokens)
+        if not turns:
+            return []
+
+        total_tokens = sum(t[2] for t in turns)
+        num_chunks = max(1, math.ceil(total_tokens / self.target_chunk_tokens))
+        if num_chunks > self.max_chunks:
+            logger.warning(
+                f"Transcript needs {num_chunks} chunks of ~{self.target_chunk_tokens} tokens; "
+                f"capping at max_chunks={self.max_chunks}"
+            )
+            num_chunks = self.max_chunks
+        budget = total_tokens / num_chunks
+
+        chunks = []
+        first_new = 0
+        overlap_start = 0
+        while first_new < len(turns) and len(chunks) < self.max_chunks:
+            last_chunk = len(chunks) >= num_chunks - 1
+            end = first_new
+            new_tokens = 0
+            while end < len(turns):
+                turn_tokens = turns[end][2]
+                # Stop at the turn boundary closest to the budget
+                if (
+                    not last_chunk
+                    and new_tokens > 0
+                    and new_tokens + turn_tokens > budget
+                    and (new_tokens + turn_tokens - budget) > (budget - new_tokens)
+                ):
+                    break
+                new_tokens += turn_tokens
+                end += 1
+
+            chunk_turns = turns[overlap_start:end]
+            first_seg, end_seg = chunk_turns[0][0], chunk_turns[-1][1]
+            chunk_segments = segments[first_seg:end_seg]
+            start_sec = float(chunk_segments[0].get('start_time', chunk_segments[0].get('start', 0)))
+            end_sec = float(chunk_segments[-1].get('end_time', chunk_segments[-1].get('end', 0)))
+            chunks.append({
+                'start_sec': start_sec,
+                'end_sec': end_sec,
+                'start_min': start_sec / 60,
+                'end_min': end_sec / 60,
+                'segments': chunk_segments,
+                'tokens': sum(t[2] for t in chunk_turns),
+            })
+
+            # Next chunk re-reads trailing turns of this one, always moving forward
+            overlap_start = end
+            overlap_tokens = 0
+            while overlap_start - 1 > first_new and overlap_tokens < self.chunk_overlap_tokens:
+                overlap_start -= 1
+                overlap_tokens += turns[overlap_start][2]
+            first_new = end
+
+        return chunks
+
+    def _build_chunk_context(
         self,
-        base_rules: str,
         chunk_num: int,
         total_chunks: int,
         per_chunk_target: int,
         start_min: float,
         end_min: float,
     ) -> str:
-        """Prepend chunking context header to analysis rules."""
-        header = f"""## CHUNKING CONTEXT
+        """Build the chunking context block sent after the shared analysis rules."""
+        return f"""
+## CHUNKING CONTEXT
 
 **IMPORTANT:** This is chunk {chunk_num} of {total_chunks} from a long podcast transcript.
 You are analyzing the portion from {start_min:.1f} to {end_min:.1f} minutes.
@@ -326,18 +494,18 @@ You are analyzing the portion from {start_min:.1f} to {end_min:.1f} minutes.
 Focus on the strongest, most impactful content within this time window.
 Each segment MUST have timestamps that fall within this chunk's time range.
 
-Maintain the same JSON output format and quality standards as described below.
+Maintain the same JSON output format and quality standards as described in the analysis rules above.
 
 ---
-
 """
-        return header + base_rules
 
     def _analyze_chunk(
         self,
         chunk_transcript_path: str,
-        chunk_rules: str,
+        analysis_rules: str,
         output_dir: str,
+        chunk_context: str = "",
+        on_segment: Optional[Callable[[Dict], None]] = None,
     ) -> Optional[str]:
         """Analyze a single chunk using existing transcript_analyzer functions."""
         try:
@@ -352,9 +520,11 @@ Maintain the same JSON output format and quality standards as described below.
 
             result = analyze_with_gemini_file_upload(
                 file_object=file_object,
-                analysis_rules=chunk_rules,
+                analysis_rules=analysis_rules,
                 output_dir=output_dir,
                 file_path=chunk_transcript_path,
+                chunk_context=chunk_context,
+                on_segment=on_segment,
             )
 
             return result
@@ -366,8 +536,9 @@ Maintain the same JSON output format and quality standards as described below.
     def _merge_results(self, all_results: List[Dict]) -> List[Dict]:
         """Deduplicate segments from overlapping chunks.
 
-        When two segments have >50% timestamp overlap, keep the one with
-        higher severity or longer duration.
+        When two segments have >50% timestamp overlap, keep the one preferred
+        by the dedup_tie_break policy ('severity': higher severity, then longer
+        duration; 'duration': longer duration).
         """
         if not all_results:
             return []
@@ -381,69 +552,30 @@ Maintain the same JSON output format and quality standards as described below.
                 return 0
         all_results.sort(key=get_start)
 
-        # Severity ordering for tie-breaking
-        severity_order = {'CRITICAL': 4, 'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+        prefer = TIE_BREAK_POLICIES.get(self.dedup_tie_break)
+        if prefer is None:
+            logger.warning(f"Unknown dedup_tie_break '{self.dedup_tie_break}', using severity")
+            prefer = TIE_BREAK_POLICIES['severity']
 
-        merged = []
-        for seg in all_results:
+        def get_interval(seg):
             ts = seg.get('fullerContextTimestamps', {})
             try:
-                seg_start = float(ts.get('start', 0))
-                seg_end = float(ts.get('end', 0))
+                return float(ts.get('start', 0)), float(ts.get('end', 0))
             except (ValueError, TypeError):
-                merged.append(seg)
-                continue
-
-            seg_duration = seg_end - seg_start
-            if seg_duration <= 0:
-                merged.append(seg)
-                continue
-
-            # Check for overlap with already-merged segments
-            is_duplicate = False
-            for i, existing in enumerate(merged):
-                ex_ts = existing.get('fullerContextTimestamps', {})
-                try:
-                    ex_start = float(ex_ts.get('start', 0))
-                    ex_end = float(ex_ts.get('end', 0))
-                except (ValueError, TypeError):
-                    continue
-
-                # Calculate overlap
-                overlap_start = max(seg_start, ex_start)
-                overlap_end = min(seg_end, ex_end)
-                overlap = max(0, overlap_end - overlap_start)
-
-                # Check if overlap exceeds threshold relative to shorter segment
-                shorter_duration = min(seg_duration, ex_end - ex_start)
-                if shorter_duration > 0 and overlap / shorter_duration > self.dedup_overlap_threshold:
-                    # Keep the better one
-                    seg_severity = severity_order.get(
-                        seg.get('severityRating', ''), 0
-                    )
-                    ex_severity = severity_order.get(
-                        existing.get('severityRating', ''), 0
-                    )
-
-                    if seg_severity > ex_severity or (
-                        seg_severity == ex_severity and seg_duration > (ex_end - ex_start)
-                    ):
-                        # Replace existing with new (better) segment
-                        merged[i] = seg
-
-                    is_duplicate = True
-                    break
-
-            if not is_duplicate:
-                merged.append(seg)
+                return None
 
-        return merged
+        return merge_overlapping(
+            all_results, get_interval,
+            overlap_threshold=self.dedup_overlap_threshold,
+            prefer=prefer,
+        )
 
     def _single_call_analysis(
         self,
         transcript_path: str,
         analysis_rules: str,
         processing_dir: str,
+        on_segment: Optional[Callable[[Dict], None]] = None,
     ) -> Optional[str]:
         """Fallback: analyze entire transcript in one call (short podcasts)."""
         try:
@@ -460,6 +592,7 @@ Maintain the same JSON output format and quality standards as described below.
                 analysis_rules=analysis_rules,
                 output_dir=processing_dir,
                 file_path=transcript_path,
+                on_segment=on_segment,
             )
 
             return result
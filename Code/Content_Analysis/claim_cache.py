@@ -0,0 +1,248 @@
+"""
+Claim Cache - Persistent Verification Results Shared Across Episodes
+
+Grounded web searches for date-sensitive claims are the slowest calls of the
+recent-events stage, and the same talking points recur across episodes. The
+cache stores each verification result in a SQLite database under the project
+Cache/ directory, namespaced per verifier and keyed by the normalized claim,
+with a time-to-live so results about ongoing events are searched again once
+they may be out of date.
+
+SQLite in WAL mode lets parallel episode runs read and write the same file;
+each operation opens its own short-lived connection, so one cache object can
+be used from worker threads. Reads run in plain transactions; only a hit
+takes the write lock, to record its access time. Writes take the database lock
+up front (BEGIN IMMEDIATE) and wait on a busy timeout, so concurrent writers
+queue instead of failing. Each namespace is capped at max_entries; the least recently read
+entries are evicted first, together with any that have expired.
+
+Config (claim_cache):
+    enabled: true
+    path: null            # default: <project root>/Cache/claim_cache.sqlite
+    max_entries: 20000    # per namespace
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+try:
+    from project_paths import get_cache_dir
+except ImportError:
+    try:
+        from Utils.project_paths import get_cache_dir
+    except ImportError:
+        get_cache_dir = None
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = 'claim_cache.sqlite'
+DEFAULT_MAX_ENTRIES = 20000
+BUSY_TIMEOUT_SECONDS = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS claim_cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_accessed REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+_LRU_INDEX = """
+CREATE INDEX IF NOT EXISTS claim_cache_lru ON claim_cache (namespace, last_accessed)
+"""
+
+
+def normalize_claim(text: str) -> str:
+    """
+    Normalize claim text for exact-match lookups.
+
+    Lowercases, drops punctuation and collapses whitespace, so the same
+    claim extracted from differently formatted segments maps to one key.
+    """
+    text = re.sub(r'[^\w\s%$.]', ' ', (text or '').lower())
+    text = re.sub(r'(?<!\d)\.|\.(?!\d)', ' ', text)
+    return ' '.join(text.split())
+
+
+def default_cache_path() -> str:
+    """Path of the shared cache database."""
+    if get_cache_dir is not None:
+        try:
+            return str(get_cache_dir() / CACHE_FILENAME)
+        except RuntimeError:
+            pass
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Cache', CACHE_FILENAME)
+
+
+class ClaimCache:
+    """
+    SQLite-backed TTL cache of claim verification results.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        namespace: str = 'default',
+        ttl_hours: float = 24,
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file (default: shared project cache)
+            namespace: Separates entries of different verifiers
+            ttl_hours: Age after which an entry is ignored
+            max_entries: Entries kept per namespace (None for unlimited)
+        """
+        self.path = path or default_cache_path()
+        self.namespace = namespace
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        self._stats_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+        finally:
+            conn.close()
+        with self.connect(write=True) as conn:
+            conn.execute(_SCHEMA)
+            conn.execute(_LRU_INDEX)
+
+    @classmethod
+    def from_config(cls, config: Dict, namespace: str, ttl_hours: float) -> Optional['ClaimCache']:
+        """Create the cache from pipeline config, or None when disabled or unavailable."""
+        cache_config = (config or {}).get('claim_cache', {})
+        if not cache_config.get('enabled', True):
+            return None
+        try:
+            return cls(
+                cache_config.get('path'),
+                namespace=namespace,
+                ttl_hours=ttl_hours,
+                max_entries=cache_config.get('max_entries', DEFAULT_MAX_ENTRIES)
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Claim cache unavailable ({e}) - continuing without it")
+            return None
+
+    @contextmanager
+    def connect(self, write: bool = False):
+        """
+        Short-lived connection committing on success.
+
+        Write transactions begin IMMEDIATE so a second writer waits for the
+        busy timeout at the start instead of failing on lock upgrade.
+        """
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        try:
+            if write:
+                conn.execute('BEGIN IMMEDIATE')
+            else:
+                conn.execute('BEGIN')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def _count(self, stat: str) -> None:
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the live value for key, or None."""
+        now = time.time()
+        try:
+            with self.connect() as conn:
+                row = conn.execute(
+                    'SELECT value FROM claim_cache WHERE namespace = ? AND key = ? AND expires_at > ?',
+                    (self.namespace, key, now)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Claim cache read failed: {e}")
+            row = None
+
+        if row is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        self._touch(key, now)
+        return json.loads(row[0])
+
+    def _touch(self, key: str, now: float) -> None:
+        """Mark an entry as read for least-recently-used eviction."""
+        try:
+            with self.connect(write=True) as conn:
+                conn.execute(
+                    'UPDATE claim_cache SET last_accessed = ? WHERE namespace = ? AND key = ?',
+                    (now, self.namespace, key)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Claim cache access update failed: {e}")
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value for key, evicting beyond max_entries."""
+        now = time.time()
+        try:
+            with self.connect(write=True) as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO claim_cache '
+                    '(namespace, key, value, created_at, expires_at, last_accessed) VALUES (?, ?, ?, ?, ?, ?)',
+                    (self.namespace, key, json.dumps(value, ensure_ascii=False), now, now + self.ttl_seconds, now)
+                )
+                evicted = self._evict(conn, now)
+            self._count('stores')
+            if evicted:
+                with self._stats_lock:
+                    self.stats['evictions'] += evicted
+        except sqlite3.Error as e:
+            logger.warning(f"Claim cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        """Drop expired entries and the least recently used beyond max_entries."""
+        removed = conn.execute(
+            'DELETE FROM claim_cache WHERE namespace = ? AND expires_at <= ?',
+            (self.namespace, now)
+        ).rowcount
+        if self.max_entries is not None:
+            removed += conn.execute(
+                'DELETE FROM claim_cache WHERE namespace = ? AND key IN ('
+                'SELECT key FROM claim_cache WHERE namespace = ? '
+                'ORDER BY last_accessed DESC LIMIT -1 OFFSET ?)',
+                (self.namespace, self.namespace, max(0, int(self.max_entries)))
+            ).rowcount
+        return removed
+
+    def count(self) -> int:
+        """Number of stored entries in this namespace, live or expired."""
+        with self.connect() as conn:
+            return conn.execute(
+                'SELECT COUNT(*) FROM claim_cache WHERE namespace = ?', (self.namespace,)
+            ).fetchone()[0]
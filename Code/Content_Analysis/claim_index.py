@@ -0,0 +1,294 @@
+"""
+Claim Index - Near-Duplicate Claim Matching with MinHash/LSH
+
+The claim cache is keyed by exact normalized text, so the same talking point
+phrased slightly differently ("studies show 50% of ..." vs "research shows
+half of ...") never shares an entry. The index maps a claim to a previously
+cached entry whose wording is nearly the same, so verifiers reuse the stored
+verdict instead of making an external call.
+
+Claims are canonicalized (attribution lead-ins dropped, fraction words and
+"percent" mapped to figures), split into word shingles and summarized as a
+MinHash signature. Signatures are split into LSH bands stored next to the
+cache entries; a lookup only compares signatures that share a band bucket,
+and a match is accepted when the estimated Jaccard similarity of the
+shingle sets reaches the threshold and both claims have the same anchors:
+their figures and their negation/direction words. "50%" vs "5%" or
+"increased" vs "decreased" changes a single shingle or two, so long claims
+differing only there would otherwise pass the threshold with the wrong verdict. Payloads, TTL and LRU eviction stay with
+the ClaimCache; index rows of evicted entries are pruned when encountered.
+
+Config (claim_cache.near_duplicates):
+    enabled: true
+    threshold: 0.8        # minimum estimated Jaccard similarity
+    shingle_size: 3       # words per shingle
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import re
+import struct
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    from .claim_cache import ClaimCache, normalize_claim
+except ImportError:
+    try:
+        from Content_Analysis.claim_cache import ClaimCache, normalize_claim
+    except ImportError:
+        from claim_cache import ClaimCache, normalize_claim
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 128
+BANDS = 32
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed permutation coefficients so signatures stay comparable across runs
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(f'a{i}'.encode(), digest_size=8).digest(), 'big') % (_MERSENNE_PRIME - 1) + 1,
+        int.from_bytes(hashlib.blake2b(f'b{i}'.encode(), digest_size=8).digest(), 'big') % _MERSENNE_PRIME,
+    )
+    for i in range(NUM_PERM)
+]
+
+_LEAD_INS = re.compile(
+    r'^(?:(?:new |recent |multiple |many )?(?:studies|study|research|data|evidence|experts?|scientists|surveys?|polls?)'
+    r' (?:shows?|showed|found|finds|says?|said|suggests?|suggested|indicates?|indicated|proves?|proved)'
+    r'|according to (?:the )?\w+|in fact|actually|the truth is)(?: that)? '
+)
+
+_CANONICAL_WORDS = [
+    (re.compile(r'\b(?:per cent|percent)\b'), '%'),
+    (re.compile(r'\bhalf\b'), '50%'),
+    (re.compile(r'\b(?:a|one) third\b'), '33%'),
+    (re.compile(r'\b(?:a|one) quarter\b'), '25%'),
+    (re.compile(r'\btwo thirds\b'), '67%'),
+    (re.compile(r'\bthree quarters\b'), '75%'),
+    (re.compile(r'(\d) %'), r'\1%'),
+]
+
+# Words that flip or scale a claim, by the anchor they count as
+_ANCHOR_WORDS = [
+    (re.compile(r'^(?:not|no|never|none|nobody|nothing|neither|nor|without|cannot|t)$'), 'not'),
+    (re.compile(r'^(?:more|most|higher|greater|above|over|up|increas\w*|ris(?:e|es|en|ing)|rose|grow\w*|grew'
+                r'|gain\w*|doubl\w*|tripl\w*)$'), 'more'),
+    (re.compile(r'^(?:less|least|fewer|lower|smaller|below|under|down|decreas\w*|declin\w*|fall\w*|fell'
+                r'|drop\w*|los(?:s|ses|e|es|ing)|lost|halv\w*)$'), 'less'),
+    (re.compile(r'^(?:before|after|hundred|thousand|million|billion|trillion|dozen'
+                r'|one|two|three|four|five|six|seven|eight|nine|ten)$'), None),
+]
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS claim_index (
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        signature BLOB NOT NULL,
+        anchors TEXT,
+        PRIMARY KEY (namespace, key)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS claim_index_bands (
+        namespace TEXT NOT NULL,
+        bucket TEXT NOT NULL,
+        key TEXT NOT NULL,
+        PRIMARY KEY (namespace, bucket, key)
+    )
+    """,
+]
+
+
+def canonical_claim(text: str) -> str:
+    """Normalize a claim and rewrite wording that does not change its meaning."""
+    text = normalize_claim(text)
+    text = _LEAD_INS.sub('', text)
+    for pattern, replacement in _CANONICAL_WORDS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def claim_anchors(text: str) -> str:
+    """
+    Figures and negation/direction words of the canonical claim.
+
+    Near-duplicates must agree on these exactly; reworded figures such as
+    "half" / "50%" are already canonical.
+    """
+    numbers, words = [], set()
+    for word in canonical_claim(text).split():
+        if any(c.isdigit() for c in word):
+            numbers.append(word)
+            continue
+        for pattern, anchor in _ANCHOR_WORDS:
+            if pattern.match(word):
+                words.add(anchor or word)
+                break
+    return ' '.join(sorted(numbers)) + '|' + ' '.join(sorted(words))
+
+
+def claim_shingles(text: str, size: int = 3) -> Set[str]:
+    """Word shingles of the canonical claim (the whole claim if shorter)."""
+    words = canonical_claim(text).split()
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(shingles: Set[str]) -> List[int]:
+    """MinHash signature of a shingle set under the fixed permutations."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big') & _MAX_HASH
+        for s in shingles
+    ]
+    if not hashes:
+        return [_MAX_HASH] * NUM_PERM
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def signature_similarity(first: List[int], second: List[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+
+def text_similarity(first: str, second: str, size: int = 3) -> float:
+    """Estimated Jaccard similarity of two texts' shingle sets."""
+    return signature_similarity(
+        minhash_signature(claim_shingles(first, size)), minhash_signature(claim_shingles(second, size))
+    )
+
+
+def _band_buckets(signature: List[int]) -> List[str]:
+    rows = len(signature) // BANDS
+    return [
+        f"{band}:" + hashlib.blake2b(
+            struct.pack(f'<{rows}I', *signature[band * rows:(band + 1) * rows]), digest_size=8
+        ).hexdigest()
+        for band in range(BANDS)
+    ]
+
+
+class ClaimIndex:
+    """
+    LSH index from claim text to near-duplicate entries of a ClaimCache.
+    """
+
+    def __init__(self, cache: ClaimCache, threshold: float = 0.8, shingle_size: int = 3):
+        """
+        Initialize the index over a cache namespace.
+
+        Args:
+            cache: Cache holding the verdicts the index points to
+            threshold: Minimum estimated Jaccard similarity for a match
+            shingle_size: Words per shingle
+        """
+        self.cache = cache
+        self.namespace = cache.namespace
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.stats = {'near_duplicate_hits': 0}
+        self._stats_lock = threading.Lock()
+
+        with self.cache.connect(write=True) as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            # Rows indexed before anchors were stored never match
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(claim_index)')]
+            if 'anchors' not in columns:
+                conn.execute('ALTER TABLE claim_index ADD COLUMN anchors TEXT')
+
+    @classmethod
+    def from_config(cls, config: Dict, cache: Optional[ClaimCache]) -> Optional['ClaimIndex']:
+        """Create the index for a cache, or None when the cache or the index is disabled."""
+        if not cache:
+            return None
+        index_config = (config or {}).get('claim_cache', {}).get('near_duplicates', {})
+        if not index_config.get('enabled', True):
+            return None
+        try:
+            return cls(
+                cache,
+                threshold=index_config.get('threshold', 0.8),
+                shingle_size=index_config.get('shingle_size', 3)
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Claim index unavailable ({e}) - exact matches only")
+            return None
+
+    def signature(self, text: str) -> List[int]:
+        """MinHash signature of a claim under this index's shingle size."""
+        return minhash_signature(claim_shingles(text, self.shingle_size))
+
+    def add(self, text: str, key: str) -> None:
+        """Index text as pointing at the cache entry stored under key."""
+        signature = self.signature(text)
+        try:
+            with self.cache.connect(write=True) as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO claim_index (namespace, key, signature, anchors) VALUES (?, ?, ?, ?)',
+                    (self.namespace, key, struct.pack(f'<{NUM_PERM}I', *signature), claim_anchors(text))
+                )
+                conn.executemany(
+                    'INSERT OR IGNORE INTO claim_index_bands (namespace, bucket, key) VALUES (?, ?, ?)',
+                    [(self.namespace, bucket, key) for bucket in _band_buckets(signature)]
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Claim index write failed: {e}")
+
+    def lookup(self, text: str) -> List[Tuple[str, float]]:
+        """Keys of indexed claims with the same anchors at or above the threshold, most similar first."""
+        signature = self.signature(text)
+        anchors = claim_anchors(text)
+        buckets = _band_buckets(signature)
+        try:
+            with self.cache.connect() as conn:
+                rows = conn.execute(
+                    'SELECT i.key, i.signature FROM claim_index i WHERE i.namespace = ? AND i.anchors = ? AND i.key IN ('
+                    'SELECT key FROM claim_index_bands WHERE namespace = ? AND bucket IN '
+                    f'({",".join("?" * len(buckets))}))',
+                    (self.namespace, anchors, self.namespace, *buckets)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Claim index read failed: {e}")
+            return []
+
+        matches = []
+        for key, packed in rows:
+            similarity = signature_similarity(signature, struct.unpack(f'<{NUM_PERM}I', packed))
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        return sorted(matches, key=lambda match: -match[1])
+
+    def get(self, text: str) -> Optional[Tuple[Any, float]]:
+        """
+        Cached value of the most similar live near-duplicate, with its similarity.
+
+        Index rows whose cache entry has expired or been evicted are removed.
+        """
+        for key, similarity in self.lookup(text):
+            value = self.cache.get(key)
+            if value is not None:
+                with self._stats_lock:
+                    self.stats['near_duplicate_hits'] += 1
+                return value, similarity
+            self._remove(key)
+        return None
+
+    def _remove(self, key: str) -> None:
+        try:
+            with self.cache.connect(write=True) as conn:
+                conn.execute('DELETE FROM claim_index WHERE namespace = ? AND key = ?', (self.namespace, key))
+                conn.execute('DELETE FROM claim_index_bands WHERE namespace = ? AND key = ?', (self.namespace, key))
+        except sqlite3.Error as e:
+            logger.warning(f"Claim index cleanup failed: {e}")
@@ -0,0 +1,206 @@
+"""
+Claim Library - Cross-Episode Memory of Verified Rebuttals
+
+Guests repeat the same talking points across episodes, and each time the
+rebuttal is regenerated, gate-checked and fact-checked from scratch. The
+library remembers, per claim, the rebuttal that passed the binary gates
+(BinaryRebuttalVerifier) and the verdict and sources found for the YouTube
+description (YouTubeDescriptionGenerator).
+
+Entries are keyed by the normalized claim text of a clip (title plus quoted
+lines) and listed by topic. Later episodes use them to:
+1. Offer the stored rebuttal to script generation as a candidate (reworded
+   claims are matched through the near-duplicate claim index)
+2. Skip gate evaluation when the rebuttal matches the stored passing one
+3. Skip the grounded source search for the description
+Steps 2 and 3 reuse stored results for the exact claim only.
+
+Entries live in the shared claim cache database (namespace 'claim_library').
+
+Config (claim_library):
+    enabled: true
+    ttl_days: 180
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    from .claim_cache import ClaimCache, normalize_claim
+    from .claim_index import ClaimIndex
+    from .diversity_selector import DiversitySelector
+except ImportError:
+    try:
+        from Content_Analysis.claim_cache import ClaimCache, normalize_claim
+        from Content_Analysis.claim_index import ClaimIndex
+        from Content_Analysis.diversity_selector import DiversitySelector
+    except ImportError:
+        from claim_cache import ClaimCache, normalize_claim
+        from claim_index import ClaimIndex
+        from diversity_selector import DiversitySelector
+
+logger = logging.getLogger(__name__)
+
+_TOPICS_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS claim_library_topics (
+        topic TEXT NOT NULL,
+        key TEXT NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (topic, key)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS claim_library_topics_recent ON claim_library_topics (topic, updated_at)",
+]
+
+_topic_selector = DiversitySelector()
+
+
+def clip_claim_text(clip: Dict) -> str:
+    """Claim text of an analysis segment or script clip section: its title and quotes."""
+    title = clip.get('narrativeSegmentTitle') or clip.get('title') or ''
+    quotes = [
+        entry.get('quote', '') for entry in clip.get('suggestedClip', []) or []
+        if isinstance(entry, dict)
+    ]
+    return ' '.join([title] + quotes).strip()
+
+
+def clip_topic(clip: Dict) -> str:
+    """Primary topic of a segment or clip section."""
+    return _topic_selector.primary_topic({
+        'narrativeSegmentTitle': clip.get('narrativeSegmentTitle') or clip.get('title') or '',
+        'clipContextDescription': clip.get('clipContextDescription', ''),
+        'suggestedClip': clip.get('suggestedClip', []) or [],
+    })
+
+
+class ClaimLibrary:
+    """
+    Persistent per-claim store of verified rebuttals, gate verdicts and sources.
+    """
+
+    def __init__(self, cache: ClaimCache, index: Optional[ClaimIndex] = None):
+        """
+        Initialize the library.
+
+        Args:
+            cache: Cache namespace holding the entries
+            index: Optional near-duplicate index over the entries
+        """
+        self.cache = cache
+        self.index = index
+        self.stats = {'lookups': 0, 'hits': 0, 'records': 0}
+        self._lock = threading.Lock()
+
+        with self.cache.connect(write=True) as conn:
+            for statement in _TOPICS_SCHEMA:
+                conn.execute(statement)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['ClaimLibrary']:
+        """Create the library from pipeline config, or None when disabled or unavailable."""
+        library_config = (config or {}).get('claim_library', {})
+        if not library_config.get('enabled', True):
+            return None
+        cache = ClaimCache.from_config(config, 'claim_library', library_config.get('ttl_days', 180) * 24)
+        if not cache:
+            return None
+        try:
+            return cls(cache, ClaimIndex.from_config(config, cache))
+        except sqlite3.Error as e:
+            logger.warning(f"Claim library unavailable ({e}) - continuing without it")
+            return None
+
+    @staticmethod
+    def _key(claim_text: str) -> str:
+        return hashlib.sha256(normalize_claim(claim_text).encode('utf-8')).hexdigest()
+
+    def lookup(self, clip: Dict, near_duplicates: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Entry for the clip's claim.
+
+        Args:
+            clip: Analysis segment or script clip section
+            near_duplicates: Also accept a near-duplicate claim on the same
+                topic. Only for suggestions - stored verdicts, sources and
+                gate results are reused on the exact claim only.
+        """
+        claim_text = clip_claim_text(clip)
+        if not claim_text:
+            return None
+
+        entry = self.cache.get(self._key(claim_text))
+        if entry is None and near_duplicates and self.index is not None:
+            match = self.index.get(claim_text)
+            if match and match[0].get('topic') in (clip_topic(clip), 'general'):
+                entry = match[0]
+
+        with self._lock:
+            self.stats['lookups'] += 1
+            if entry is not None:
+                self.stats['hits'] += 1
+        return entry
+
+    def record(self, clip: Dict, **fields: Any) -> None:
+        """
+        Merge verified results for the clip's claim into its entry.
+
+        Args:
+            clip: Analysis segment or script clip section
+            **fields: rebuttal, gate_results, verdict, summary, sources_line;
+                None values leave the stored value unchanged
+        """
+        claim_text = clip_claim_text(clip)
+        if not claim_text:
+            return
+
+        key = self._key(claim_text)
+        topic = clip_topic(clip)
+        entry = self.cache.get(key) or {'claim': claim_text, 'topic': topic}
+        entry.update({name: value for name, value in fields.items() if value is not None})
+        entry['updated_at'] = datetime.now().isoformat()
+
+        self.cache.put(key, entry)
+        if self.index is not None:
+            self.index.add(claim_text, key)
+        try:
+            with self.cache.connect(write=True) as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO claim_library_topics (topic, key, updated_at) VALUES (?, ?, ?)',
+                    (topic, key, time.time())
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Claim library topic write failed: {e}")
+
+        with self._lock:
+            self.stats['records'] += 1
+
+    def candidate_for(self, clip: Dict) -> Optional[Dict[str, Any]]:
+        """Stored rebuttal offered to script generation for the clip, if any."""
+        entry = self.lookup(clip, near_duplicates=True)
+        if not entry or not entry.get('rebuttal'):
+            return None
+        return {
+            'rebuttal': entry['rebuttal'],
+            'verdict': entry.get('verdict'),
+            'sources': entry.get('sources_line'),
+        }
+
+    def topic_entries(self, topic: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Live entries on a topic, most recently updated first."""
+        with self.cache.connect() as conn:
+            keys = [row[0] for row in conn.execute(
+                'SELECT key FROM claim_library_topics WHERE topic = ? ORDER BY updated_at DESC LIMIT ?',
+                (topic, limit)
+            )]
+        entries = [self.cache.get(key) for key in keys]
+        return [entry for entry in entries if entry is not None]
@@ -0,0 +1,326 @@
+"""
+Claim Prescreen - Local Claim-Density Scoring of Transcript Windows
+
+Pass 1 used to send the whole transcript to Gemini even though most of a long
+conversation is banter with nothing to rebut. The prescreen scores fixed-length
+windows of the transcript on the CPU and keeps only the windows that look like
+they contain checkable claims, plus context padding on either side. Pass 1
+then analyzes the reduced transcript; segment times are untouched, so
+timestamps in the Pass 1 output still refer to the original recording.
+
+Cues (keywords and simple inflections matched on word boundaries in one
+KeywordEngine pass, counted per window):
+- severity: FalseNegativeScanner.HIGH_SEVERITY_KEYWORDS
+- date_sensitive: RecentEventsVerifier.DATE_SENSITIVE_KEYWORDS
+- topic: DiversitySelector.TOPIC_KEYWORDS
+- number / statistic: figures, percentages, rates, "studies show"
+- hedging: hearsay and certainty markers ("apparently", "the truth is")
+
+A window's score is its weighted cue count per 100 words.
+
+Recall-safety mode (default) trades some of the savings for not missing
+segments: windows with any severity or date-sensitive cue are always kept, at
+least min_keep_fraction of windows (highest scores first) are kept, and if the
+kept share of the episode exceeds max_keep_fraction the full transcript is
+used unchanged.
+
+Config (claim_prescreen):
+    enabled: false
+    window_seconds: 120
+    padding_seconds: 90
+    threshold: 2.0
+    recall_safety: true
+    min_keep_fraction: 0.35
+    max_keep_fraction: 0.8
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import re
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .segment_intervals import IntervalIndex
+except ImportError:
+    try:
+        from Content_Analysis.segment_intervals import IntervalIndex
+    except ImportError:
+        from segment_intervals import IntervalIndex
+
+try:
+    from .keyword_engine import KeywordEngine
+except ImportError:
+    try:
+        from Content_Analysis.keyword_engine import KeywordEngine
+    except ImportError:
+        from keyword_engine import KeywordEngine
+
+try:
+    from .false_negative_scanner import FalseNegativeScanner
+    from .diversity_selector import DiversitySelector
+    from .recent_events_verifier import RecentEventsVerifier
+except ImportError:
+    try:
+        from Content_Analysis.false_negative_scanner import FalseNegativeScanner
+        from Content_Analysis.diversity_selector import DiversitySelector
+        from Content_Analysis.recent_events_verifier import RecentEventsVerifier
+    except ImportError:
+        from false_negative_scanner import FalseNegativeScanner
+        from diversity_selector import DiversitySelector
+        from recent_events_verifier import RecentEventsVerifier
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Agency acronyms collide with common words once lowercased ("who"), so they
+# only count when spoken/transcribed in capitals
+ACRONYM_KEYWORDS = {'fda', 'cdc', 'who'}
+
+STATISTIC_CUES = [
+    'percent', 'per cent', 'percentage', 'rate', 'rates', 'average', 'median',
+    'statistic', 'statistics', 'per capita', 'times more', 'times higher',
+    'times likely', 'doubled', 'tripled', 'increase', 'decrease', 'survey',
+    'poll', 'odds', 'study', 'studies', 'trial', 'data shows', 'the numbers',
+]
+
+HEDGING_CUES = [
+    'apparently', 'supposedly', 'allegedly', 'reportedly', 'i heard', 'i read',
+    'they say', 'people say', 'studies show', 'research shows', 'it turns out',
+    'the truth is', 'the fact is', 'the reality is', 'everybody knows',
+    'nobody talks about', "they don't want you to know", 'proven', 'proof',
+    'cover up', 'covered up', 'wake up', 'no evidence', 'debunked',
+]
+
+# Figures and magnitude words
+NUMBER_PATTERN = re.compile(
+    r'\b\d[\d,]*(?:\.\d+)?\b|%|\b(?:hundred|thousand|million|billion|trillion)s?\b'
+)
+
+CUE_WEIGHTS = {
+    'severity': 3.0,
+    'date_sensitive': 2.0,
+    'statistic': 2.0,
+    'hedging': 1.5,
+    'number': 1.0,
+    'topic': 1.0,
+}
+
+# Windows with these cues are always kept in recall-safety mode
+RECALL_CATEGORIES = ('severity', 'date_sensitive')
+
+CHARS_PER_TOKEN = 4
+
+
+# Simple inflections, covering stems such as 'inaugurat' -> inaugurated/inauguration
+INFLECTIONS = ('', 's', 'es', 'd', 'ed', 'ing', 'ion', 'e')
+
+
+def _inflected(keywords: List[str]) -> List[str]:
+    """Lowercased keywords with their simple inflections, for whole-word matching."""
+    return list(dict.fromkeys(k.lower() + suffix for k in keywords if k for suffix in INFLECTIONS))
+
+
+def _segment_time(segment: Dict, key: str) -> float:
+    return float(segment.get(f'{key}_time', segment.get(key, 0)) or 0)
+
+
+@dataclass
+class PrescreenReport:
+    """Outcome of prescreening one transcript."""
+    applied: bool
+    reason: str
+    windows_total: int = 0
+    windows_kept: int = 0
+    segments_total: int = 0
+    segments_kept: int = 0
+    total_seconds: float = 0.0
+    kept_seconds: float = 0.0
+    estimated_tokens_total: int = 0
+    estimated_tokens_kept: int = 0
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for pipeline metadata."""
+        return asdict(self)
+
+
+class ClaimDensityScorer:
+    """
+    Scores transcript windows by claim density and reduces a transcript to
+    its candidate windows for Pass 1.
+    """
+
+    # Cue keywords per category, matched in one pass over the lowercased text
+    CUE_ENGINE = KeywordEngine({
+        'severity': _inflected([k for k in FalseNegativeScanner.HIGH_SEVERITY_KEYWORDS
+                                if k not in ACRONYM_KEYWORDS]),
+        'date_sensitive': _inflected([k for words in RecentEventsVerifier.DATE_SENSITIVE_KEYWORDS.values()
+                                      for k in words]),
+        'statistic': _inflected(STATISTIC_CUES),
+        'hedging': _inflected(HEDGING_CUES),
+        'topic': _inflected([k for words in DiversitySelector.TOPIC_KEYWORDS.values() for k in words]),
+    })
+    # Severity acronyms, matched in the original text
+    ACRONYM_ENGINE = KeywordEngine.from_keywords(
+        [k.upper() for k in FalseNegativeScanner.HIGH_SEVERITY_KEYWORDS if k in ACRONYM_KEYWORDS]
+    )
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialize the ClaimDensityScorer.
+
+        Args:
+            config: Full pipeline configuration dictionary
+        """
+        prescreen_config = (config or {}).get('claim_prescreen', {})
+        self.window_seconds = prescreen_config.get('window_seconds', 120)
+        self.padding_seconds = prescreen_config.get('padding_seconds', 90)
+        self.threshold = prescreen_config.get('threshold', 2.0)
+        self.recall_safety = prescreen_config.get('recall_safety', True)
+        self.min_keep_fraction = prescreen_config.get('min_keep_fraction', 0.35)
+        self.max_keep_fraction = prescreen_config.get('max_keep_fraction', 0.8)
+
+    def score_text(self, text: str) -> Tuple[float, Dict[str, int]]:
+        """
+        Score a piece of transcript text.
+
+        Returns:
+            Tuple of (weighted cues per 100 words, cue counts by category)
+        """
+        lowered = text.lower()
+        counts = {category: 0 for category in self.CUE_ENGINE.categories}
+        counts.update(self.CUE_ENGINE.counts(lowered))
+        counts['severity'] += sum(self.ACRONYM_ENGINE.keyword_counts(text).values())
+        counts['number'] = len(NUMBER_PATTERN.findall(lowered))
+
+        words = max(len(text.split()), 1)
+        weighted = sum(CUE_WEIGHTS[category] * count for category, count in counts.items())
+        return weighted * 100.0 / words, counts
+
+    def build_windows(self, segments: List[Dict]) -> List[Dict]:
+        """
+        Group consecutive segments into windows of about window_seconds.
+
+        Returns:
+            List of window dicts with start, end, segment indices, score and cue counts
+        """
+        windows = []
+        current: List[int] = []
+        window_start = None
+
+        def close():
+            text = ' '.join(segments[i].get('text', '') for i in current)
+            score, counts = self.score_text(text)
+            windows.append({
+                'start': window_start,
+                'end': max(_segment_time(segments[i], 'end') for i in current),
+                'indices': list(current),
+                'score': round(score, 3),
+                'cues': counts,
+            })
+
+        for i, segment in enumerate(segments):
+            start = _segment_time(segment, 'start')
+            if current and start - window_start >= self.window_seconds:
+                close()
+                current = []
+            if not current:
+                window_start = start
+            current.append(i)
+        if current:
+            close()
+
+        return windows
+
+    def select_windows(self, windows: List[Dict]) -> List[Dict]:
+        """Return the windows to keep, in transcript order."""
+        keep = {i for i, w in enumerate(windows) if w['score'] >= self.threshold}
+
+        if self.recall_safety:
+            keep.update(
+                i for i, w in enumerate(windows)
+                if any(w['cues'].get(category) for category in RECALL_CATEGORIES)
+            )
+            minimum = int(len(windows) * self.min_keep_fraction + 0.999)
+            ranked = sorted(range(len(windows)), key=lambda i: windows[i]['score'], reverse=True)
+            for i in ranked:
+                if len(keep) >= minimum:
+                    break
+                keep.add(i)
+
+        return [windows[i] for i in sorted(keep)]
+
+    def prescreen(self, transcript_data: Dict) -> Tuple[Dict, PrescreenReport]:
+        """
+        Reduce a transcript to its candidate windows.
+
+        Args:
+            transcript_data: Transcript dictionary with a 'segments' list
+
+        Returns:
+            Tuple of (transcript to analyze, PrescreenReport). The returned
+            transcript is the input unchanged when prescreening is not applied.
+        """
+        segments = transcript_data.get('segments', [])
+        tokens = [len(s.get('text', '')) // CHARS_PER_TOKEN + 1 for s in segments]
+        report = PrescreenReport(
+            applied=False,
+            reason='',
+            segments_total=len(segments),
+            estimated_tokens_total=sum(tokens),
+        )
+        if not segments:
+            report.reason = 'empty transcript'
+            return transcript_data, report
+
+        windows = self.build_windows(segments)
+        selected = self.select_windows(windows)
+        report.windows_total = len(windows)
+        report.windows_kept = len(selected)
+        report.total_seconds = round(windows[-1]['end'] - windows[0]['start'], 1)
+
+        # Pad kept windows with context and merge touching ranges
+        ranges: List[List[float]] = []
+        for window in selected:
+            lo = window['start'] - self.padding_seconds
+            hi = window['end'] + self.padding_seconds
+            if ranges and lo <= ranges[-1][1]:
+                ranges[-1][1] = max(ranges[-1][1], hi)
+            else:
+                ranges.append([lo, hi])
+
+        index = IntervalIndex([
+            (_segment_time(s, 'start'), max(_segment_time(s, 'end'), _segment_time(s, 'start') + 1e-6))
+            for s in segments
+        ])
+        kept = sorted({i for lo, hi in ranges for i in index.overlapping(lo, hi)})
+
+        report.segments_kept = len(kept)
+        report.estimated_tokens_kept = sum(tokens[i] for i in kept)
+        report.kept_seconds = round(sum(
+            _segment_time(segments[i], 'end') - _segment_time(segments[i], 'start') for i in kept
+        ), 1)
+
+        if not kept:
+            report.reason = 'no candidate windows; using full transcript'
+            report.segments_kept = len(segments)
+            report.estimated_tokens_kept = report.estimated_tokens_total
+            return transcript_data, report
+
+        kept_fraction = report.estimated_tokens_kept / max(report.estimated_tokens_total, 1)
+        if self.recall_safety and kept_fraction > self.max_keep_fraction:
+            report.reason = f'kept {kept_fraction:.0%} of transcript; using full transcript'
+            report.segments_kept = len(segments)
+            report.estimated_tokens_kept = report.estimated_tokens_total
+            return transcript_data, report
+
+        report.applied = True
+        report.reason = f'kept {len(selected)}/{len(windows)} windows ({kept_fraction:.0%} of tokens)'
+        return {**transcript_data, 'segments': [segments[i] for i in kept]}, report
@@ -0,0 +1,189 @@
+"""
+Compact Transcript - Token-Efficient Transcript Serialization for LLM Uploads
+
+The diarized transcript JSON carries id, start/end times, two formatted
+timestamps and a duration on every segment, pretty-printed with indent=2.
+Most of those tokens tell the model nothing. The compact format merges
+consecutive same-speaker segments into turns and writes one line per turn:
+
+    {"format":"compact-v1",
+     "legend":"...",
+     "speakers":{"A":"SPEAKER_07 (Dr. Example)","B":"SPEAKER_02 (Host)"},
+     "end":5423.2,
+     "turns":[
+    [0.0,"A","first turn text ..."],
+    [14.6,"B","..."]
+    ]}
+
+Turn start times are rounded to 0.1s. A TurnTimeMap keeps the exact original
+segment boundaries of every turn so the times the model reports
+(suggestedClip timestamps, fullerContextTimestamps) can be snapped back to
+the original transcript times.
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import json
+import string
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+COMPACT_FORMAT = 'compact-v1'
+
+# Long monologues are split so clip boundaries inside them stay precise
+DEFAULT_MAX_TURN_SECONDS = 30.0
+
+# Reported times further than this from any turn boundary are left untouched
+SNAP_TOLERANCE_SECONDS = 2.0
+
+COMPACT_PROMPT_NOTE = """
+The transcript file is a compact JSON document: "speakers" maps short speaker codes to full speaker names, and each entry of "turns" is [start_seconds, speaker_code, text] for one continuous turn (a turn ends where the next one starts; "end" is the end of the transcript). In your output, use the full speaker names from "speakers" and report timestamps in seconds exactly as the turn start times appear.
+"""
+
+
+def _segment_time(segment: Dict, key: str) -> float:
+    return float(segment.get(f'{key}_time', segment.get(key, 0)) or 0)
+
+
+def _speaker_code(index: int) -> str:
+    if index < len(string.ascii_uppercase):
+        return string.ascii_uppercase[index]
+    return f"S{index + 1}"
+
+
+class TurnTimeMap:
+    """
+    Exact turn boundaries of a compacted transcript, for mapping reported
+    times back to original segment times.
+    """
+
+    def __init__(self, starts: List[float], ends: List[float]):
+        self.starts = sorted(starts)
+        self.ends = sorted(ends)
+
+    @staticmethod
+    def _snap(value, boundaries: List[float]):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return value
+        if not boundaries:
+            return value
+        i = bisect_left(boundaries, value)
+        nearest = min(
+            (boundaries[j] for j in (i - 1, i) if 0 <= j < len(boundaries)),
+            key=lambda b: abs(b - value)
+        )
+        return nearest if abs(nearest - value) <= SNAP_TOLERANCE_SECONDS else value
+
+    def snap_start(self, value):
+        """Snap a reported start time to the nearest original turn start."""
+        return self._snap(value, self.starts)
+
+    def snap_end(self, value):
+        """Snap a reported end time to the nearest original turn end."""
+        return self._snap(value, self.ends)
+
+    def remap_segment(self, segment: Dict) -> Dict:
+        """Return a copy of a Pass 1 segment with times mapped to the original transcript."""
+        remapped = dict(segment)
+
+        clips = segment.get('suggestedClip')
+        if isinstance(clips, list):
+            remapped['suggestedClip'] = [
+                dict(clip, timestamp=self.snap_start(clip['timestamp']))
+                if isinstance(clip, dict) and 'timestamp' in clip else clip
+                for clip in clips
+            ]
+
+        timestamps = segment.get('fullerContextTimestamps')
+        if isinstance(timestamps, dict):
+            timestamps = dict(timestamps)
+            if 'start' in timestamps:
+                timestamps['start'] = self.snap_start(timestamps['start'])
+            if 'end' in timestamps:
+                timestamps['end'] = self.snap_end(timestamps['end'])
+            remapped['fullerContextTimestamps'] = timestamps
+
+            start, end = timestamps.get('start'), timestamps.get('end')
+            if 'segmentDurationInSeconds' in segment and all(
+                isinstance(v, (int, float)) for v in (start, end)
+            ):
+                remapped['segmentDurationInSeconds'] = round(end - start, 3)
+
+        return remapped
+
+    def remap_json(self, json_text: str) -> str:
+        """Remap every segment of a Pass 1 JSON array; unparseable text is returned as-is."""
+        try:
+            segments = json.loads(json_text)
+        except (json.JSONDecodeError, TypeError):
+            return json_text
+        if not isinstance(segments, list):
+            return json_text
+        remapped = [self.remap_segment(s) if isinstance(s, dict) else s for s in segments]
+        return json.dumps(remapped, indent=2, ensure_ascii=False)
+
+
+def build_compact_transcript(
+    transcript_data: Dict,
+    max_turn_seconds: float = DEFAULT_MAX_TURN_SECONDS,
+) -> Tuple[str, TurnTimeMap]:
+    """
+    Serialize a diarized transcript into the compact turn format.
+
+    Args:
+        transcript_data: Transcript dictionary with a 'segments' list
+        max_turn_seconds: Start a new turn once a speaker has talked this long
+
+    Returns:
+        Tuple of (compact JSON text, TurnTimeMap for the turns)
+    """
+    speakers: Dict[str, str] = {}
+    turns: List[List] = []
+    starts: List[float] = []
+    ends: List[float] = []
+
+    for segment in transcript_data.get('segments', []):
+        text = (segment.get('text') or '').strip()
+        if not text:
+            continue
+        speaker = segment.get('speaker', 'UNKNOWN_SPEAKER')
+        start = _segment_time(segment, 'start')
+        end = _segment_time(segment, 'end')
+
+        if speaker not in speakers:
+            speakers[speaker] = _speaker_code(len(speakers))
+        code = speakers[speaker]
+
+        if turns and turns[-1][1] == code and end - starts[-1] <= max_turn_seconds:
+            turns[-1][2] += ' ' + text
+            ends[-1] = end
+        else:
+            turns.append([round(start, 1), code, text])
+            starts.append(start)
+            ends.append(end)
+
+    header = {
+        'format': COMPACT_FORMAT,
+        'legend': 'turns: [start_seconds, speaker_code, text]; speaker codes are defined in speakers',
+        'speakers': {code: name for name, code in speakers.items()},
+        'end': round(max(ends), 1) if ends else 0.0,
+    }
+    # One turn per line keeps the file readable without indent overhead
+    lines = [json.dumps(header, ensure_ascii=False, separators=(',', ':'))[:-1] + ',"turns":[']
+    lines.append(',\n'.join(json.dumps(t, ensure_ascii=False, separators=(',', ':')) for t in turns))
+    lines.append(']}')
+
+    return '\n'.join(lines), TurnTimeMap(starts, ends)
+
+
+def load_turn_time_map(transcript_path: str, max_turn_seconds: float = DEFAULT_MAX_TURN_SECONDS) -> Optional[TurnTimeMap]:
+    """Rebuild the TurnTimeMap for an original transcript file (None on failure)."""
+    try:
+        with open(transcript_path, 'r', encoding='utf-8') as f:
+            transcript_data = json.load(f)
+        return build_compact_transcript(transcript_data, max_turn_seconds)[1]
+    except Exception:
+        return None
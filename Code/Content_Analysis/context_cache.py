@@ -0,0 +1,255 @@
+"""
+Context Cache - Explicit Caching of Static Prompt Prefixes
+
+The analysis rules (selective_analysis_rules.txt + guest profile) are resent
+in full with Pass 1 and with every chunk, and the gate guidance is resent with
+every segment and rebuttal evaluation. This module registers those static
+prefixes once with the Gemini caching API and lets callers reference them by
+cache name, so each request only carries its variable suffix.
+
+Scopes:
+- 'episode': rules + guest profile; deleted when the episode completes
+- 'shared':  gate guidance identical across episodes; kept for shared_ttl_hours
+
+Callers always build (prefix, suffix) and use build_request(); when no cache is
+active, the prefix is too small, or cache creation fails, the full prompt
+prefix + suffix is sent inline exactly as before.
+
+LocalContextCache is an in-memory stand-in with the same interface for tests.
+
+Config (context_cache):
+    enabled: false
+    episode_ttl_hours: 6
+    shared_ttl_hours: 24
+    min_prefix_tokens: 1024
+    registry_path: null   # optional JSON file so shared caches survive restarts
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional, Tuple
+
+from google.genai import types
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Rough chars-per-token ratio for English prose, used for the minimum-size check
+CHARS_PER_TOKEN = 4
+
+# Process-wide cache consulted by prompt builders (None = always inline)
+_active_cache = None
+
+
+def set_active_context_cache(cache) -> None:
+    """Install (or clear with None) the context cache used by prompt builders."""
+    global _active_cache
+    _active_cache = cache
+
+
+def get_active_context_cache():
+    """Return the active context cache, if any."""
+    return _active_cache
+
+
+def build_request(prefix: str, suffix: str, model: str, scope: str = 'episode') -> Tuple[str, Optional[str]]:
+    """
+    Resolve a (static prefix, variable suffix) prompt against the active cache.
+
+    Returns:
+        Tuple of (prompt_text_to_send, cached_content_name_or_None)
+    """
+    cache = get_active_context_cache()
+    if cache and prefix:
+        cache_name = cache.get_or_create(prefix, model, scope=scope)
+        if cache_name:
+            return suffix, cache_name
+    return prefix + suffix, None
+
+
+def _prefix_key(prefix: str, model: str) -> str:
+    return hashlib.sha256(f"{model}\n{prefix}".encode('utf-8')).hexdigest()
+
+
+class LocalContextCache:
+    """In-memory stand-in for GeminiContextCache (tests and dry runs)."""
+
+    def __init__(self, min_prefix_tokens: int = 0):
+        self.min_prefix_tokens = min_prefix_tokens
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'hits': 0, 'skipped_small': 0, 'failed': 0, 'deleted': 0}
+
+    def get_or_create(self, prefix: str, model: str, scope: str = 'episode') -> Optional[str]:
+        """Return a cache id for prefix/model, registering it on first use."""
+        if len(prefix) / CHARS_PER_TOKEN < self.min_prefix_tokens:
+            with self._lock:
+                self.stats['skipped_small'] += 1
+            return None
+
+        key = _prefix_key(prefix, model)
+        with self._lock:
+            if key in self._entries:
+                self.stats['hits'] += 1
+            else:
+                self._entries[key] = {'name': f"localCache/{key[:16]}", 'prefix': prefix, 'scope': scope}
+                self.stats['created'] += 1
+            return self._entries[key]['name']
+
+    def resolve(self, cache_name: str) -> Optional[str]:
+        """Return the prefix text behind a cache id (lets fake clients rebuild prompts)."""
+        with self._lock:
+            for entry in self._entries.values():
+                if entry['name'] == cache_name:
+                    return entry['prefix']
+        return None
+
+    def cleanup_episode(self) -> int:
+        """Drop episode-scoped entries; shared entries survive."""
+        with self._lock:
+            episode_keys = [k for k, e in self._entries.items() if e['scope'] == 'episode']
+            for key in episode_keys:
+                del self._entries[key]
+            self.stats['deleted'] += len(episode_keys)
+        return len(episode_keys)
+
+
+class GeminiContextCache:
+    """
+    Registers static prompt prefixes with client.caches and tracks their names.
+    """
+
+    def __init__(self, client_getter: Callable, config: Optional[Dict] = None):
+        """
+        Initialize the GeminiContextCache.
+
+        Args:
+            client_getter: Zero-argument callable returning a genai.Client
+            config: Full pipeline configuration dictionary
+        """
+        cache_config = (config or {}).get('context_cache', {})
+        self._get_client = client_getter
+        self.episode_ttl = timedelta(hours=cache_config.get('episode_ttl_hours', 6))
+        self.shared_ttl = timedelta(hours=cache_config.get('shared_ttl_hours', 24))
+        self.min_prefix_tokens = cache_config.get('min_prefix_tokens', 1024)
+        self.registry_path = cache_config.get('registry_path')
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        # Prefix keys the API refused to cache (e.g. below model minimum)
+        self._uncacheable = set()
+        self.stats = {'created': 0, 'hits': 0, 'skipped_small': 0, 'failed': 0, 'deleted': 0}
+        self._load()
+
+    def get_or_create(self, prefix: str, model: str, scope: str = 'episode') -> Optional[str]:
+        """
+        Return the cached-content name for prefix/model, creating it if needed.
+
+        Returns:
+            Cache name to pass as GenerateContentConfig.cached_content, or None
+            when the prompt should be sent inline
+        """
+        if len(prefix) / CHARS_PER_TOKEN < self.min_prefix_tokens:
+            with self._lock:
+                self.stats['skipped_small'] += 1
+            return None
+
+        key = _prefix_key(prefix, model)
+        # Hold the lock across creation so concurrent callers share one cache
+        with self._lock:
+            if key in self._uncacheable:
+                return None
+
+            entry = self._entries.get(key)
+            if entry and datetime.fromisoformat(entry['expires_at']) > datetime.now(timezone.utc):
+                self.stats['hits'] += 1
+                return entry['name']
+
+            ttl = self.shared_ttl if scope == 'shared' else self.episode_ttl
+            try:
+                cache = self._get_client().caches.create(
+                    model=model,
+                    config=types.CreateCachedContentConfig(
+                        display_name=f"{scope}-prefix-{key[:12]}",
+                        contents=[prefix],
+                        ttl=f"{int(ttl.total_seconds())}s",
+                    )
+                )
+            except Exception as e:
+                logger.warning(f"Context cache creation failed ({model}), sending prefix inline: {e}")
+                self._uncacheable.add(key)
+                self.stats['failed'] += 1
+                return None
+
+            # Expire our handle a little before the server does
+            expires_at = datetime.now(timezone.utc) + ttl - timedelta(minutes=5)
+            self._entries[key] = {
+                'name': cache.name,
+                'model': model,
+                'scope': scope,
+                'expires_at': expires_at.isoformat(),
+            }
+            self.stats['created'] += 1
+            self._save_locked()
+            logger.info(f"Registered {scope} context cache {cache.name} (~{len(prefix) // CHARS_PER_TOKEN} tokens)")
+            return cache.name
+
+    def cleanup_episode(self) -> int:
+        """Delete episode-scoped caches. Shared caches expire on their own TTL."""
+        with self._lock:
+            episode_entries = [(k, e) for k, e in self._entries.items() if e['scope'] == 'episode']
+
+        deleted = 0
+        for key, entry in episode_entries:
+            try:
+                self._get_client().caches.delete(name=entry['name'])
+                deleted += 1
+            except Exception as e:
+                logger.debug(f"Could not delete context cache {entry['name']}: {e}")
+            with self._lock:
+                self._entries.pop(key, None)
+
+        with self._lock:
+            self.stats['deleted'] += deleted
+            self._save_locked()
+        return deleted
+
+    def _load(self) -> None:
+        """Load still-live shared caches from the registry file."""
+        if not self.registry_path or not os.path.exists(self.registry_path):
+            return
+        try:
+            with open(self.registry_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            now = datetime.now(timezone.utc)
+            self._entries = {
+                key: entry for key, entry in entries.items()
+                if entry.get('scope') == 'shared' and datetime.fromisoformat(entry['expires_at']) > now
+            }
+        except Exception as e:
+            logger.warning(f"Failed to load context cache registry: {e}")
+            self._entries = {}
+
+    def _save_locked(self) -> None:
+        if not self.registry_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.registry_path) or '.', exist_ok=True)
+            tmp_path = self.registry_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_path, self.registry_path)
+        except Exception as e:
+            logger.warning(f"Failed to save context cache registry: {e}")
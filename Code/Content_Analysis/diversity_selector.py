@@ -5,6 +5,12 @@ This module ensures topic diversity in selected segments, preventing all segment
 from clustering around the same topic. Uses keyword extraction and topic grouping
 to select a balanced mix of content.
 
+Selection modes (quality_control.diversity.selection_mode):
+- round_robin: best segment per keyword topic, then round-robin across topics
+- mmr: maximal marginal relevance over TF-IDF vectors of the segment text, so
+  near-duplicate segments are penalized even when their topics differ and a
+  unique 'general' segment is not crowded out by a popular topic
+
 Author: Claude Code
 Created: 2024-12-28
 Pipeline: Multi-Pass Quality Control System
@@ -14,9 +20,19 @@ import os
 import sys
 import json
 import logging
+import re
 from typing import Dict, List, Any, Optional, Set
 from collections import defaultdict
-import re
+
+import numpy as np
+
+try:
+    from .keyword_engine import KeywordEngine
+except ImportError:
+    try:
+        from Content_Analysis.keyword_engine import KeywordEngine
+    except ImportError:
+        from keyword_engine import KeywordEngine
 
 # Set up logging
 logging.basicConfig(
@@ -51,6 +67,12 @@ class DiversitySelector:
         'society': ['culture', 'society', 'education', 'children', 'family', 'community', 'values'],
     }
 
+    # All topic keywords compiled once and counted in a single pass per segment
+    TOPIC_ENGINE = KeywordEngine(TOPIC_KEYWORDS)
+
+    # Word tokens for TF-IDF vectors in MMR selection
+    TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9'-]+")
+
     def __init__(self, config: Optional[Dict] = None):
         """
         Initialize the DiversitySelector.
@@ -64,6 +86,9 @@ class DiversitySelector:
         self.min_segments = qc_config.get('min_segments', 6)
         self.max_segments = qc_config.get('max_segments', 12)
         self.max_per_topic = qc_config.get('max_per_topic', 3)
+        self.selection_mode = qc_config.get('selection_mode', 'round_robin')
+        # Weight of quality against redundancy in MMR (1.0 = quality only)
+        self.mmr_lambda = qc_config.get('mmr_lambda', 0.7)
 
     def select_diverse(
         self,
@@ -91,6 +116,9 @@ class DiversitySelector:
 
         logger.info(f"Selecting diverse segments from {len(segments)} candidates")
 
+        if self.selection_mode == 'mmr':
+            return self._select_mmr(segments, max_count)
+
         # Extract topics for each segment
         segment_topics = []
         for segment in segments:
@@ -159,6 +187,91 @@ class DiversitySelector:
 
         return selected
 
+    def _select_mmr(self, segments: List[Dict], max_count: int) -> List[Dict]:
+        """
+        Select segments by maximal marginal relevance.
+
+        Each step picks the segment maximizing
+        mmr_lambda * quality - (1 - mmr_lambda) * max similarity to the selection,
+        skipping segments whose primary topic already has max_per_topic picks.
+        Similarities to the newest pick are one matrix-vector product, so
+        selection is O(n * k) vector operations for n candidates and k picks.
+
+        Args:
+            segments: Candidate segments
+            max_count: Maximum segments to select
+
+        Returns:
+            Selected segments in selection order
+        """
+        vectors = self._tfidf_vectors(segments)
+        quality = np.array([self._quality_score(s) for s in segments], dtype=np.float32)
+        if quality.max() > 0:
+            quality /= quality.max()
+
+        topics = np.array([self.primary_topic(s) for s in segments])
+        topic_counts = defaultdict(int)
+
+        available = np.ones(len(segments), dtype=bool)
+        max_similarity = np.zeros(len(segments), dtype=np.float32)
+        selected = []
+
+        while len(selected) < max_count and available.any():
+            scores = self.mmr_lambda * quality - (1 - self.mmr_lambda) * max_similarity
+            scores[~available] = -np.inf
+            best = int(np.argmax(scores))
+
+            available[best] = False
+            topic = topics[best]
+            topic_counts[topic] += 1
+            if topic_counts[topic] >= self.max_per_topic:
+                available &= topics != topic
+
+            selected.append(segments[best])
+            np.maximum(max_similarity, vectors @ vectors[best], out=max_similarity)
+
+        logger.info(f"MMR selected {len(selected)} segments with topic distribution:")
+        for topic, count in sorted(topic_counts.items(), key=lambda x: -x[1]):
+            logger.info(f"  {topic}: {count} segments")
+
+        return selected
+
+    def _tfidf_vectors(self, segments: List[Dict]) -> np.ndarray:
+        """
+        L2-normalized TF-IDF rows for the segments' text.
+
+        Terms found in a single segment only change that row's norm, never a
+        similarity, so they are folded into the norm and left out of the
+        matrix; its width is the shared vocabulary, not the whole vocabulary.
+        """
+        token_counts = []
+        document_frequency = defaultdict(int)
+        for segment in segments:
+            counts = defaultdict(int)
+            for token in self.TOKEN_PATTERN.findall(self._segment_text(segment)):
+                counts[token] += 1
+            token_counts.append(counts)
+            for token in counts:
+                document_frequency[token] += 1
+
+        n = len(segments)
+        idf = {token: np.log((1 + n) / (1 + df)) + 1 for token, df in document_frequency.items()}
+        shared = {token: col for col, token in enumerate(t for t, df in document_frequency.items() if df > 1)}
+
+        vectors = np.zeros((n, len(shared)), dtype=np.float32)
+        norms = np.zeros(n, dtype=np.float32)
+        for row, counts in enumerate(token_counts):
+            for token, count in counts.items():
+                weight = count * idf[token]
+                norms[row] += weight * weight
+                col = shared.get(token)
+                if col is not None:
+                    vectors[row, col] = weight
+
+        norms = np.sqrt(norms)
+        norms[norms == 0] = 1
+        return vectors / norms[:, None]
+
     def _quality_score(self, segment: Dict) -> float:
         """
         Compute a quality score for sorting within topic groups.
@@ -197,7 +310,21 @@ class DiversitySelector:
         Returns:
             List of topic labels, most relevant first
         """
-        # Combine all text content for analysis
+        combined_text = self._segment_text(segment)
+
+        # Score each topic by its keyword occurrences
+        topic_scores = self.TOPIC_ENGINE.counts(combined_text)
+
+        # Sort by score
+        sorted_topics = sorted(topic_scores.items(), key=lambda x: -x[1])
+
+        if sorted_topics:
+            return [t[0] for t in sorted_topics]
+        else:
+            return ['general']
+
+    def _segment_text(self, segment: Dict) -> str:
+        """Lowercased title, context description and clip quotes of a segment."""
         text_parts = []
 
         if 'narrativeSegmentTitle' in segment:
@@ -211,25 +338,12 @@ class DiversitySelector:
                 if 'quote' in clip:
                     text_parts.append(clip['quote'])
 
-        combined_text = ' '.join(text_parts).lower()
+        return ' '.join(text_parts).lower()
 
-        # Score each topic
-        topic_scores = {}
-        for topic, keywords in self.TOPIC_KEYWORDS.items():
-            score = 0
-            for keyword in keywords:
-                # Count keyword occurrences
-                score += len(re.findall(r'\b' + re.escape(keyword) + r'\b', combined_text))
-            if score > 0:
-                topic_scores[topic] = score
-
-        # Sort by score
-        sorted_topics = sorted(topic_scores.items(), key=lambda x: -x[1])
-
-        if sorted_topics:
-            return [t[0] for t in sorted_topics]
-        else:
-            return ['general']
+    def primary_topic(self, segment: Dict) -> str:
+        """Most relevant topic label of a segment ('general' if none match)."""
+        topics = self._extract_topics(segment)
+        return topics[0] if topics else 'general'
 
     def get_topic_distribution(self, segments: List[Dict]) -> Dict[str, int]:
         """
@@ -244,9 +358,7 @@ class DiversitySelector:
         distribution = defaultdict(int)
 
         for segment in segments:
-            topics = self._extract_topics(segment)
-            primary_topic = topics[0] if topics else 'general'
-            distribution[primary_topic] += 1
+            distribution[self.primary_topic(segment)] += 1
 
         return dict(distribution)
 
@@ -10,6 +10,21 @@ Sources:
 2. ClaimBuster API (alternative)
 3. Local claim cache (for common claims)
 
+API results are persisted in the shared SQLite claim cache (namespace
+'fact_check'), so the cache_hours TTL spans runs and parallel episodes reuse
+each other's lookups instead of re-querying recurring claims. Claims worded
+slightly differently from a stored one resolve to its verdict through the
+near-duplicate claim index.
+
+Claims are extracted from all rebuttals first and deduplicated; those not
+answered locally are queried concurrently over one pooled keep-alive HTTP
+session, bounded by max_concurrent_queries, and corrections are applied
+once every claim is resolved.
+
+Config (quality_control.external_validation):
+    max_concurrent_queries: 8
+    request_timeout: 10       # seconds to wait for a response
+
 Author: Claude Code
 Created: 2024-12-28
 Pipeline: Multi-Pass Quality Control System
@@ -17,17 +32,38 @@ Pipeline: Multi-Pass Quality Control System
 
 import os
 import sys
-import json
 import logging
 import re
 import time
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, field
-import urllib.request
-import urllib.parse
-import urllib.error
+from dataclasses import dataclass, field, asdict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from .claim_cache import ClaimCache
+    from .claim_index import ClaimIndex
+except ImportError:
+    try:
+        from Content_Analysis.claim_cache import ClaimCache
+        from Content_Analysis.claim_index import ClaimIndex
+    except ImportError:
+        from claim_cache import ClaimCache
+        from claim_index import ClaimIndex
+
+try:
+    from .rate_limiter import get_shared_limiter
+except ImportError:
+    try:
+        from Content_Analysis.rate_limiter import get_shared_limiter
+    except ImportError:
+        from rate_limiter import get_shared_limiter
 
 # Set up logging
 logging.basicConfig(
@@ -37,6 +73,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+GOOGLE_FACT_CHECK_URL = 'https://factchecktools.googleapis.com/v1alpha1/claims:search'
+CONNECT_TIMEOUT = 5
+
 
 @dataclass
 class FactCheckResult:
@@ -81,13 +120,24 @@ class FactValidator:
         self.google_fact_check = qc_config.get('google_fact_check_api', True)
         self.cache_hours = qc_config.get('cache_hours', 168)  # 1 week default
 
+        # Concurrent API queries share one pooled session; the limiter bounds
+        # them process-wide when several episodes validate at once
+        self.max_concurrent = max(1, int(qc_config.get('max_concurrent_queries', 8)))
+        self.request_timeout = qc_config.get('request_timeout', 10)
+        self.limiter = get_shared_limiter('google_fact_check', self.max_concurrent)
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self.last_api_queries = 0
+
         # API configuration - use Gemini API key for Google Fact Check API
         self.google_api_key = self.config.get('api', {}).get('gemini_api_key')
         if not self.google_api_key or self.google_api_key == '${GEMINI_API_KEY}':
             self.google_api_key = os.getenv('GEMINI_API_KEY')
 
-        # Initialize cache
+        # Initialize cache: in-memory for this run, persistent across runs
         self._cache: Dict[str, Tuple[FactCheckResult, datetime]] = {}
+        self.persistent_cache = ClaimCache.from_config(self.config, 'fact_check', self.cache_hours)
+        self.claim_index = ClaimIndex.from_config(self.config, self.persistent_cache)
 
         # Common claim patterns that don't need external validation
         self._known_patterns = self._load_known_patterns()
@@ -119,14 +169,23 @@ class FactValidator:
         post_clip_sections = [s for s in sections if s.get('section_type') == 'post_clip']
         print(f"  Found {len(post_clip_sections)} rebuttals to validate", flush=True)
 
+        # Extract every claim first so each unique claim is checked once
+        section_claims = [
+            (section, self._extract_claims(section.get('script_content', '')))
+            for section in post_clip_sections
+        ]
+        unique_claims = list(dict.fromkeys(claim for _, claims in section_claims for claim in claims))
+        print(f"  Checking {len(unique_claims)} unique claims", flush=True)
+        resolved = self._resolve_claims(unique_claims)
+
         validation_results = []
         total_corrections = 0
 
-        for i, section in enumerate(post_clip_sections, 1):
+        for i, (section, claims) in enumerate(section_claims, 1):
             section_id = section.get('section_id', 'unknown')
             print(f"  [{i}/{len(post_clip_sections)}] Validating: {section_id}", flush=True)
 
-            result = self._validate_rebuttal(section)
+            result = self._build_validation_result(section_id, claims, resolved)
             validation_results.append(result)
 
             print(f"      Claims checked: {result.claims_checked}, Issues found: {result.issues_found}", flush=True)
@@ -149,6 +208,8 @@ class FactValidator:
         script_data['_fact_validation'] = {
             'timestamp': datetime.now().isoformat(),
             'rebuttals_validated': len(validation_results),
+            'unique_claims_checked': len(unique_claims),
+            'api_queries': self.last_api_queries,
             'total_corrections': total_corrections
         }
 
@@ -157,55 +218,81 @@ class FactValidator:
     def _validate_rebuttal(self, section: Dict) -> ValidationResult:
         """Validate a single rebuttal section."""
         section_id = section.get('section_id', 'unknown')
-        content = section.get('script_content', '')
-
         logger.debug(f"Validating rebuttal: {section_id}")
 
-        # Extract factual claims from content
-        claims = self._extract_claims(content)
+        claims = self._extract_claims(section.get('script_content', ''))
+        return self._build_validation_result(section_id, claims, self._resolve_claims(claims))
+
+    def _resolve_claims(self, claims: List[str]) -> Dict[str, Tuple[FactCheckResult, bool]]:
+        """
+        Fact-check unique claims, querying the external API concurrently.
 
-        results = []
-        corrections_made = 0
+        Cache and known-pattern lookups are answered locally; the remaining
+        claims are queried in parallel. Each claim maps to its result and
+        whether an unverified result counts as a correction (known-pattern
+        matches are reported as issues but do not trigger corrections).
+        """
+        resolved: Dict[str, Tuple[FactCheckResult, bool]] = {}
+        to_query = []
 
         for claim in claims:
             # Check cache first
             cached_result = self._check_cache(claim)
             if cached_result:
-                results.append(cached_result)
-                if not cached_result.verified:
-                    corrections_made += 1
+                resolved[claim] = (cached_result, True)
                 continue
 
             # Check known patterns
             known_result = self._check_known_patterns(claim)
             if known_result:
-                results.append(known_result)
+                resolved[claim] = (known_result, False)
                 self._add_to_cache(claim, known_result)
                 continue
 
-            # Query external API
-            if self.google_api_key and self.google_fact_check:
-                api_result = self._query_google_fact_check(claim)
-                if api_result:
-                    results.append(api_result)
-                    self._add_to_cache(claim, api_result)
-                    if not api_result.verified:
-                        corrections_made += 1
-                    continue
+            to_query.append(claim)
+
+        api_results: Dict[str, Optional[FactCheckResult]] = {}
+        if to_query and self.google_api_key and self.google_fact_check:
+            logger.info(f"Querying fact-check API for {len(to_query)} claims")
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrent, len(to_query))) as executor:
+                futures = {claim: executor.submit(self._query_with_limit, claim) for claim in to_query}
+                api_results = {claim: future.result() for claim, future in futures.items()}
+            self.last_api_queries = len(to_query)
+        else:
+            self.last_api_queries = 0
+
+        for claim in to_query:
+            api_result = api_results.get(claim)
+            if api_result:
+                resolved[claim] = (api_result, True)
+                self._add_to_cache(claim, api_result)
+                continue
 
             # If no external validation available, mark as unverified but acceptable
-            results.append(FactCheckResult(
+            resolved[claim] = (FactCheckResult(
                 claim=claim,
                 verified=True,
                 source='no_external_validation',
                 explanation='No external fact-check available'
-            ))
+            ), False)
+
+        return resolved
 
+    def _build_validation_result(
+        self,
+        section_id: str,
+        claims: List[str],
+        resolved: Dict[str, Tuple[FactCheckResult, bool]]
+    ) -> ValidationResult:
+        """Collect a section's results from the resolved claims."""
+        results = [resolved[claim][0] for claim in claims]
         return ValidationResult(
             section_id=section_id,
             claims_checked=len(claims),
             issues_found=sum(1 for r in results if not r.verified),
-            corrections_made=corrections_made,
+            corrections_made=sum(
+                1 for claim in claims if resolved[claim][1] and not resolved[claim][0].verified
+            ),
             results=results
         )
 
@@ -241,6 +328,25 @@ class FactValidator:
             if datetime.now() - timestamp < timedelta(hours=self.cache_hours):
                 return result
 
+        persistent_cache = getattr(self, 'persistent_cache', None)
+        if persistent_cache:
+            stored = persistent_cache.get(cache_key)
+            if stored:
+                result = FactCheckResult(**stored)
+                self._cache[cache_key] = (result, datetime.now())
+                return result
+
+        claim_index = getattr(self, 'claim_index', None)
+        if claim_index is not None:
+            match = claim_index.get(claim)
+            if match:
+                stored, similarity = match
+                # Keep this claim's wording so corrections attach to it in the script
+                result = FactCheckResult(**{**stored, 'claim': claim})
+                logger.debug(f"Near-duplicate fact-check match ({similarity:.2f}): {stored.get('claim')}")
+                self._cache[cache_key] = (result, datetime.now())
+                return result
+
         return None
 
     def _add_to_cache(self, claim: str, result: FactCheckResult) -> None:
@@ -248,6 +354,14 @@ class FactValidator:
         cache_key = self._get_cache_key(claim)
         self._cache[cache_key] = (result, datetime.now())
 
+        # Known patterns are re-derived locally on every run; only persist lookups
+        persistent_cache = getattr(self, 'persistent_cache', None)
+        if persistent_cache and result.source != 'known_pattern':
+            persistent_cache.put(cache_key, asdict(result))
+            claim_index = getattr(self, 'claim_index', None)
+            if claim_index is not None:
+                claim_index.add(claim, cache_key)
+
     def _get_cache_key(self, claim: str) -> str:
         """Generate cache key for a claim."""
         normalized = claim.lower().strip()
@@ -283,27 +397,51 @@ class FactValidator:
             'fda approved': (True, 'References regulatory approval'),
         }
 
+    def _get_session(self) -> requests.Session:
+        """Pooled keep-alive session shared by the query threads."""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.max_concurrent,
+                    max_retries=Retry(
+                        total=2, backoff_factor=0.5,
+                        status_forcelist=(429, 500, 502, 503, 504), allowed_methods=('GET',)
+                    )
+                )
+                session.mount('https://', adapter)
+                session.headers['Accept'] = 'application/json'
+                self._session = session
+            return self._session
+
+    def close(self) -> None:
+        """Close the pooled HTTP session."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _query_with_limit(self, claim: str) -> Optional[FactCheckResult]:
+        with self.limiter.slot():
+            return self._query_google_fact_check(claim)
+
     def _query_google_fact_check(self, claim: str) -> Optional[FactCheckResult]:
         """Query Google Fact Check API."""
         if not self.google_api_key:
             return None
 
         try:
-            # Build API URL
-            base_url = 'https://factchecktools.googleapis.com/v1alpha1/claims:search'
             params = {
                 'key': self.google_api_key,
                 'query': claim[:200],  # Limit query length
                 'languageCode': 'en'
             }
-            url = f"{base_url}?{urllib.parse.urlencode(params)}"
-
-            # Make request
-            request = urllib.request.Request(url)
-            request.add_header('Accept', 'application/json')
-
-            with urllib.request.urlopen(request, timeout=10) as response:
-                data = json.loads(response.read().decode())
+            response = self._get_session().get(
+                GOOGLE_FACT_CHECK_URL, params=params, timeout=(CONNECT_TIMEOUT, self.request_timeout)
+            )
+            response.raise_for_status()
+            data = response.json()
 
             # Parse response
             if 'claims' in data and data['claims']:
@@ -332,7 +470,7 @@ class FactValidator:
 
             return None
 
-        except urllib.error.URLError as e:
+        except requests.RequestException as e:
             logger.warning(f"Google Fact Check API error: {e}")
             print(f"      API error: {e}", flush=True)
             return None
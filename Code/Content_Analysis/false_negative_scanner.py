@@ -5,10 +5,19 @@ This module scans rejected segments for potential false negatives - important
 content that was incorrectly filtered out. Uses topic coverage analysis and
 re-evaluation to recover missed segments.
 
-Recovery Triggers:
-1. Rejected segment covers a topic NOT in selected set
-2. Segment failed only one gate and passed others strongly
-3. High-severity keywords present in rejected content
+Recovery Triggers (in priority order):
+1. Segment failed only one gate and passed others strongly
+2. High-severity keywords present in rejected content
+3. Rejected segment covers a topic NOT in selected set
+
+Ranked candidates get second opinions concurrently, in waves sized to the
+remaining recovery quota; requests still pending when the quota is met are
+cancelled.
+
+Config (quality_control.false_negative_recovery):
+    max_recovery: 3
+    max_concurrent: 4      # parallel second-opinion requests
+    wave_headroom: 1       # extra requests per wave beyond the remaining quota
 
 Author: Claude Code
 Created: 2024-12-28
@@ -19,7 +28,8 @@ import os
 import sys
 import json
 import logging
-import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Any, Optional, Set, Tuple
 from collections import defaultdict
 
@@ -32,6 +42,17 @@ try:
 except ImportError:
     BinarySegmentFilter = None
 
+try:
+    from .usage_tracker import track_call
+    from .keyword_engine import KeywordEngine
+except ImportError:
+    try:
+        from Content_Analysis.usage_tracker import track_call
+        from Content_Analysis.keyword_engine import KeywordEngine
+    except ImportError:
+        from usage_tracker import track_call
+        from keyword_engine import KeywordEngine
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -61,6 +82,20 @@ class FalseNegativeScanner:
         'children', 'kids', 'hospital',
         'fda', 'cdc', 'who',
     ]
+    SEVERITY_ENGINE = KeywordEngine.from_keywords(HIGH_SEVERITY_KEYWORDS)
+
+    # Coarse topics for coverage gaps (substring matches, first keyword per topic)
+    RECOVERY_TOPIC_KEYWORDS = {
+        'health': ['vaccine', 'health', 'medical', 'doctor', 'treatment', 'disease', 'covid'],
+        'politics': ['election', 'vote', 'government', 'policy', 'political', 'president'],
+        'media': ['media', 'news', 'journalist', 'mainstream', 'propaganda'],
+        'science': ['science', 'research', 'study', 'scientist', 'data', 'climate'],
+        'economics': ['economy', 'money', 'inflation', 'taxes', 'bank', 'financial'],
+    }
+    RECOVERY_TOPIC_ENGINE = KeywordEngine(RECOVERY_TOPIC_KEYWORDS, whole_words=False)
+
+    # Candidates most likely to be approved on a second opinion come first
+    RECOVERY_PRIORITY = {'near_miss': 0, 'high_severity_keywords': 1, 'uncovered_topic': 2}
 
     def __init__(self, config: Optional[Dict] = None, skip_api_init: bool = False):
         """
@@ -76,6 +111,9 @@ class FalseNegativeScanner:
         self.enabled = qc_config.get('enabled', True)
         self.re_evaluate_uncovered = qc_config.get('re_evaluate_uncovered_topics', True)
         self.max_recovery = qc_config.get('max_recovery', 3)
+        self.max_concurrent = qc_config.get('max_concurrent', 4)
+        self.wave_headroom = qc_config.get('wave_headroom', 1)
+        self.last_recovery_stats: Dict[str, int] = {}
 
         # Initialize segment filter for re-evaluation (skip API init for testing)
         if BinarySegmentFilter and not skip_api_init:
@@ -114,19 +152,19 @@ class FalseNegativeScanner:
 
         candidates = []
 
-        # Strategy 1: Find uncovered topics
-        uncovered_candidates = self._find_uncovered_topic_candidates(rejected, selected)
-        candidates.extend(uncovered_candidates)
-
-        # Strategy 2: Find near-misses
+        # Strategy 1: Find near-misses
         near_miss_candidates = self._find_near_miss_candidates(rejected)
         candidates.extend(near_miss_candidates)
 
-        # Strategy 3: Find high-severity keyword matches
+        # Strategy 2: Find high-severity keyword matches
         keyword_candidates = self._find_keyword_candidates(rejected)
         candidates.extend(keyword_candidates)
 
-        # Deduplicate candidates
+        # Strategy 3: Find uncovered topics
+        uncovered_candidates = self._find_uncovered_topic_candidates(rejected, selected)
+        candidates.extend(uncovered_candidates)
+
+        # Deduplicate candidates, keeping each segment's highest-priority reason
         seen_ids = set()
         unique_candidates = []
         for candidate in candidates:
@@ -134,6 +172,7 @@ class FalseNegativeScanner:
             if seg_id not in seen_ids:
                 seen_ids.add(seg_id)
                 unique_candidates.append(candidate)
+        unique_candidates = self._rank_candidates(unique_candidates)
 
         logger.info(f"Found {len(unique_candidates)} unique false negative candidates")
         print(f"  Found {len(unique_candidates)} candidates for re-evaluation", flush=True)
@@ -221,10 +260,7 @@ class FalseNegativeScanner:
             text = self._get_segment_text(segment).lower()
 
             # Check for high-severity keywords
-            matched_keywords = []
-            for keyword in self.HIGH_SEVERITY_KEYWORDS:
-                if re.search(r'\b' + re.escape(keyword) + r'\b', text):
-                    matched_keywords.append(keyword)
+            matched_keywords = self.SEVERITY_ENGINE.found(text).get('keywords', [])
 
             # If multiple high-severity keywords, consider for recovery
             if len(matched_keywords) >= 2:
@@ -238,43 +274,108 @@ class FalseNegativeScanner:
 
         return candidates
 
+    def _rank_candidates(self, candidates: List[Dict]) -> List[Dict]:
+        """
+        Order candidates by recovery priority: near-misses, then keyword
+        matches (most keywords first), then uncovered topics (most topics first).
+        """
+        def priority(candidate: Dict) -> Tuple[int, int]:
+            reason = candidate.get('_recovery_reason')
+            evidence = candidate.get('_matched_keywords') or candidate.get('_uncovered_topics') or []
+            return self.RECOVERY_PRIORITY.get(reason, len(self.RECOVERY_PRIORITY)), -len(evidence)
+
+        return sorted(candidates, key=priority)
+
     def _re_evaluate_candidates(self, candidates: List[Dict]) -> List[Dict]:
-        """Re-evaluate candidates with a relaxed 'second opinion' prompt."""
+        """
+        Re-evaluate ranked candidates with a relaxed 'second opinion' prompt.
+
+        Candidates are evaluated concurrently in waves of the remaining quota
+        plus wave_headroom. Once max_recovery are approved, queued requests are
+        cancelled and results still in flight are discarded.
+        """
         recovered = []
         max_to_evaluate = min(len(candidates), self.max_recovery * 2)
+        pending = list(enumerate(candidates[:max_to_evaluate]))
+        stats = {'evaluated': 0, 'cancelled': 0, 'waves': 0}
+        approved = [0]
+        lock = threading.Lock()
+
+        def evaluate(candidate: Dict, position: int) -> Optional[bool]:
+            # Requests starting after the quota is met are skipped, not sent
+            with lock:
+                if approved[0] >= self.max_recovery:
+                    stats['cancelled'] += 1
+                    return None
+                stats['evaluated'] += 1
+            should_recover = self._evaluate_candidate(candidate, position, max_to_evaluate)
+            if should_recover:
+                with lock:
+                    approved[0] += 1
+            return should_recover
 
-        for i, candidate in enumerate(candidates[:max_to_evaluate], 1):
-            if len(recovered) >= self.max_recovery:
-                break
+        executor = ThreadPoolExecutor(max_workers=max(1, self.max_concurrent))
+        try:
+            while pending and len(recovered) < self.max_recovery:
+                wave_size = self.max_recovery - len(recovered) + self.wave_headroom
+                wave, pending = pending[:wave_size], pending[wave_size:]
+                stats['waves'] += 1
+
+                futures = {
+                    executor.submit(evaluate, candidate, rank + 1): (rank, candidate)
+                    for rank, candidate in wave
+                }
+                for future in as_completed(futures):
+                    if future.result():
+                        recovered.append(futures[future])
+                    if len(recovered) >= self.max_recovery:
+                        # Results of requests still in flight are discarded
+                        with lock:
+                            stats['cancelled'] += sum(1 for other in futures if other.cancel())
+                        break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if stats['cancelled']:
+            print(f"  Quota met - cancelled {stats['cancelled']} pending second opinions", flush=True)
+        self.last_recovery_stats = stats
+
+        results = []
+        for _, candidate in sorted(recovered, key=lambda item: item[0]):
+            candidate['binary_filter_results'] = {
+                'passed': True,
+                'recovered_via': 'second_opinion',
+                'original_failed_gate': self._failed_gate(candidate),
+                'recovery_reason': candidate.get('_recovery_reason', 'unknown')
+            }
+            results.append(candidate)
+        return results
 
-            segment_id = candidate.get('segment_id', 'unknown')
-            segment_title = candidate.get('narrativeSegmentTitle', 'Unknown')
-            recovery_reason = candidate.get('_recovery_reason', 'unknown')
-            failed_gate = candidate.get('_failed_gate', candidate.get('binary_filter_results', {}).get('failed_at', 'unknown'))
+    def _failed_gate(self, candidate: Dict) -> str:
+        return candidate.get('_failed_gate', candidate.get('binary_filter_results', {}).get('failed_at', 'unknown'))
 
-            logger.info(f"Re-evaluating candidate: {segment_id}")
-            print(f"  [{i}/{max_to_evaluate}] Re-evaluating: {segment_id}", flush=True)
-            print(f"      Title: {segment_title}", flush=True)
-            print(f"      Recovery reason: {recovery_reason}, failed: {failed_gate}", flush=True)
+    def _evaluate_candidate(self, candidate: Dict, position: int, total: int) -> bool:
+        """Second opinion for one candidate (runs on a worker thread)."""
+        segment_id = candidate.get('segment_id', 'unknown')
+        segment_title = candidate.get('narrativeSegmentTitle', 'Unknown')
+        recovery_reason = candidate.get('_recovery_reason', 'unknown')
+        failed_gate = self._failed_gate(candidate)
 
-            # Use relaxed "second opinion" prompt instead of re-running identical gates
-            should_recover = self._second_opinion_evaluate(candidate, failed_gate)
+        logger.info(f"Re-evaluating candidate: {segment_id}")
+        print(f"  [{position}/{total}] Re-evaluating: {segment_id}", flush=True)
+        print(f"      Title: {segment_title}", flush=True)
+        print(f"      Recovery reason: {recovery_reason}, failed: {failed_gate}", flush=True)
 
-            if should_recover:
-                logger.info(f"  Recovered via second opinion")
-                print(f"    ✅ RECOVERED: second opinion approved", flush=True)
-                candidate['binary_filter_results'] = {
-                    'passed': True,
-                    'recovered_via': 'second_opinion',
-                    'original_failed_gate': failed_gate,
-                    'recovery_reason': recovery_reason
-                }
-                recovered.append(candidate)
-            else:
-                logger.info(f"  Still rejected by second opinion")
-                print(f"    ❌ Still rejected by second opinion", flush=True)
+        # Use relaxed "second opinion" prompt instead of re-running identical gates
+        should_recover = self._second_opinion_evaluate(candidate, failed_gate)
 
-        return recovered
+        if should_recover:
+            logger.info(f"  Recovered via second opinion: {segment_id}")
+            print(f"    ✅ RECOVERED: {segment_id} second opinion approved", flush=True)
+        else:
+            logger.info(f"  Still rejected by second opinion: {segment_id}")
+            print(f"    ❌ {segment_id} still rejected by second opinion", flush=True)
+        return should_recover
 
     def _second_opinion_evaluate(self, candidate: Dict, failed_gate: str) -> bool:
         """
@@ -327,15 +428,16 @@ REASONING: [2-3 sentences]
             from google.genai import types
 
             client = self.segment_filter._get_client()
-            response = client.models.generate_content(
-                model='gemini-2.5-pro',
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.4,
-                    top_p=0.9,
-                    candidate_count=1
+            with track_call('false_negative_scanner', 'gemini-2.5-pro') as call:
+                response = call.response = client.models.generate_content(
+                    model='gemini-2.5-pro',
+                    contents=prompt,
+                    config=types.GenerateContentConfig(
+                        temperature=0.4,
+                        top_p=0.9,
+                        candidate_count=1
+                    )
                 )
-            )
 
             if response.text:
                 return 'ANSWER: YES' in response.text.upper() or 'ANSWER:YES' in response.text.upper()
@@ -349,21 +451,7 @@ REASONING: [2-3 sentences]
         text = self._get_segment_text(segment).lower()
 
         # Simple keyword-based topic extraction
-        topics = []
-
-        topic_keywords = {
-            'health': ['vaccine', 'health', 'medical', 'doctor', 'treatment', 'disease', 'covid'],
-            'politics': ['election', 'vote', 'government', 'policy', 'political', 'president'],
-            'media': ['media', 'news', 'journalist', 'mainstream', 'propaganda'],
-            'science': ['science', 'research', 'study', 'scientist', 'data', 'climate'],
-            'economics': ['economy', 'money', 'inflation', 'taxes', 'bank', 'financial'],
-        }
-
-        for topic, keywords in topic_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    topics.append(topic)
-                    break
+        topics = list(self.RECOVERY_TOPIC_ENGINE.found(text))
 
         return topics if topics else ['general']
 
@@ -0,0 +1,120 @@
+"""
+Keyword Engine - Compiled Multi-Keyword Matching
+
+Topic extraction, false-negative recovery, ad pre-screening and date-sensitive
+claim detection each scanned text once per keyword with a fresh regex or
+substring search. The engine compiles a set of categorized keyword lists into
+one alternation regex and returns per-keyword and per-category counts from a
+single pass over the text.
+
+Counts are the same as scanning keyword by keyword: keywords that overlap
+("social media" / "media", "murder" / "murdered") are each counted, and a
+keyword never overlaps its own previous match.
+
+Two matching modes:
+- whole_words=True: r'\\bkeyword\\b' semantics (DiversitySelector, FalseNegativeScanner)
+- whole_words=False: plain substring semantics (BinarySegmentFilter, RecentEventsVerifier)
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+
+class KeywordEngine:
+    """
+    Categorized keyword lists compiled into a single-pass matcher.
+    """
+
+    def __init__(self, categories: Mapping[str, Iterable[str]], whole_words: bool = True):
+        """
+        Compile the keyword lists.
+
+        Args:
+            categories: Category name to keywords (matched as given, so
+                callers lowercase keywords and text alike)
+            whole_words: Require word boundaries around each keyword
+        """
+        self.whole_words = whole_words
+        self.categories: Dict[str, List[str]] = {name: list(words) for name, words in categories.items()}
+
+        self._keyword_categories: Dict[str, List[str]] = defaultdict(list)
+        for name, words in self.categories.items():
+            for word in words:
+                if name not in self._keyword_categories[word]:
+                    self._keyword_categories[word].append(name)
+
+        keywords = sorted(self._keyword_categories, key=lambda k: (-len(k), k))
+        boundary = r'\b' if whole_words else ''
+
+        # The lookahead finds the longest keyword at every start position, so
+        # keywords starting inside an earlier match are still seen
+        self._pattern = re.compile(
+            f"(?=({boundary}(?:{'|'.join(re.escape(k) for k in keywords)}){boundary}))"
+        ) if keywords else None
+
+        # Shorter keywords that can match at the same position as a longer one,
+        # longest first
+        self._prefixes: Dict[str, List[Tuple[str, re.Pattern]]] = {
+            keyword: [
+                (keyword[:end], re.compile(boundary + re.escape(keyword[:end]) + boundary))
+                for end in range(len(keyword) - 1, 0, -1) if keyword[:end] in self._keyword_categories
+            ]
+            for keyword in keywords
+        }
+
+    @classmethod
+    def from_keywords(cls, keywords: Iterable[str], whole_words: bool = True) -> 'KeywordEngine':
+        """Engine over a single uncategorized keyword list."""
+        return cls({'keywords': keywords}, whole_words=whole_words)
+
+    def matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """(position, keyword) for every keyword match in the text, in text order."""
+        if self._pattern is None:
+            return
+        ends: Dict[str, int] = {}
+        for match in self._pattern.finditer(text):
+            position = match.start()
+            longest = match.group(1)
+            found = [longest]
+            for shorter, pattern in self._prefixes[longest]:
+                if pattern.match(text, position):
+                    found.append(shorter)
+            for keyword in reversed(found):
+                if position >= ends.get(keyword, 0):
+                    ends[keyword] = position + len(keyword)
+                    yield position, keyword
+
+    def keyword_counts(self, text: str) -> Dict[str, int]:
+        """Occurrences of each keyword present in the text."""
+        counts: Dict[str, int] = defaultdict(int)
+        for _, keyword in self.matches(text):
+            counts[keyword] += 1
+        return dict(counts)
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Total keyword occurrences per category with any match, in category order."""
+        totals: Dict[str, int] = defaultdict(int)
+        for keyword, count in self.keyword_counts(text).items():
+            for name in self._keyword_categories[keyword]:
+                totals[name] += count
+        return {name: totals[name] for name in self.categories if name in totals}
+
+    def found(self, text: str) -> Dict[str, List[str]]:
+        """Keywords present per category, in each category's list order."""
+        present = self.keyword_counts(text)
+        return {
+            name: [word for word in words if word in present]
+            for name, words in self.categories.items()
+            if any(word in present for word in words)
+        }
+
+    def search(self, text: str) -> Optional[str]:
+        """Longest keyword at the earliest match position, or None."""
+        if self._pattern is None:
+            return None
+        match = self._pattern.search(text)
+        return match.group(1) if match else None
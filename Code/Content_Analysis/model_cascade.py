@@ -0,0 +1,243 @@
+"""
+Model Cascade - Fast-Model-First Gate Evaluation
+
+Gate evaluations are mostly clear-cut, so running every one on the strongest
+model wastes latency and cost. The cascade asks a flash-class model first,
+together with a self-reported confidence, and only escalates to the strong
+model when the verdict is low-confidence or borderline (e.g. a failure on a
+gate configured as escalation-worthy such as accuracy_check).
+
+Agreement statistics between the fast and strong models are tracked for every
+escalated call so the threshold and escalation gates can be tuned.
+
+Over the pipeline budget, degrade() sends every later evaluation to one
+cheaper model; statistics collected before that are still reported.
+
+Config (quality_control.model_cascade):
+    enabled: false
+    fast_model: gemini-2.5-flash
+    strong_model: gemini-2.5-pro
+    confidence_threshold: 80
+    escalate_on_failure:
+        segment_filter: [accuracy_check]
+        rebuttal_verifier: [accuracy]
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import re
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_STRONG_MODEL = 'gemini-2.5-pro'
+DEFAULT_FAST_MODEL = 'gemini-2.5-flash'
+
+CONFIDENCE_INSTRUCTIONS = """
+Finally, rate how confident you are in the overall verdict on its own line:
+
+CONFIDENCE: [0-100]
+"""
+
+_CONFIDENCE_PATTERN = re.compile(r'CONFIDENCE:\s*\[?\s*(\d{1,3})', re.IGNORECASE)
+
+
+class ModelCascade:
+    """
+    Two-tier model cascade for consolidated gate evaluations.
+
+    Callers supply the prompt, a function that sends a prompt to a named model
+    (returning the response text or raising on failure) and the module's own
+    response parser. Parsers must return a tuple whose second element is the
+    first failed gate name, or None when all gates passed.
+    """
+
+    def __init__(self, config: Optional[Dict], stage: str, default_escalate_gates: Optional[List[str]] = None):
+        """
+        Initialize the ModelCascade.
+
+        Args:
+            config: Full pipeline configuration dictionary
+            stage: Caller name, used for per-stage escalation gates and logging
+            default_escalate_gates: Gates whose failure always escalates
+        """
+        config = config or {}
+        cascade_config = config.get('quality_control', {}).get('model_cascade', {})
+
+        self.stage = stage
+        self.enabled = cascade_config.get('enabled', False)
+        self.fast_model = cascade_config.get('fast_model', DEFAULT_FAST_MODEL)
+        self.strong_model = cascade_config.get('strong_model', DEFAULT_STRONG_MODEL)
+        self.confidence_threshold = cascade_config.get('confidence_threshold', 80)
+        self.escalate_gates = set(
+            cascade_config.get('escalate_on_failure', {}).get(stage, default_escalate_gates or [])
+        )
+        # Set by degrade(): single cheaper model for every evaluation
+        self.degraded_model: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._stats = {
+            'calls': 0,
+            'fast_only': 0,
+            'escalated': 0,
+            'verdict_agreements': 0,
+            'first_failure_agreements': 0,
+            'strong_model_errors': 0,
+            'degraded_calls': 0,
+        }
+        self._escalation_reasons = defaultdict(int)
+
+    def run(
+        self,
+        prompt: str,
+        call_model: Callable[[str, str], str],
+        parse: Callable[[str], Tuple],
+    ) -> Tuple:
+        """
+        Evaluate a prompt through the cascade.
+
+        Args:
+            prompt: Consolidated gate prompt (without confidence instructions)
+            call_model: Function (prompt, model_name) -> response text
+            parse: Module parser turning response text into a result tuple
+
+        Returns:
+            Parsed result tuple from the model that made the final decision
+        """
+        if self.degraded_model:
+            with self._lock:
+                self._stats['degraded_calls'] += 1
+            return parse(call_model(prompt, self.degraded_model))
+
+        if not self.enabled:
+            return parse(call_model(prompt, self.strong_model))
+
+        fast_result = None
+        confidence = None
+        try:
+            fast_text = call_model(prompt + CONFIDENCE_INSTRUCTIONS, self.fast_model)
+            fast_result = parse(fast_text)
+            confidence = self.parse_confidence(fast_text)
+            reason = self.escalation_reason(confidence, fast_result[1])
+        except Exception as e:
+            logger.warning(f"[{self.stage}] Fast model {self.fast_model} failed: {e}")
+            reason = 'fast_model_error'
+
+        if reason is None:
+            self._record(fast_only=True)
+            return fast_result
+
+        logger.debug(f"[{self.stage}] Escalating to {self.strong_model}: {reason} (confidence={confidence})")
+        try:
+            strong_result = parse(call_model(prompt, self.strong_model))
+        except Exception:
+            if fast_result is None:
+                raise
+            logger.warning(f"[{self.stage}] Strong model failed, keeping fast-model verdict")
+            self._record(reason=reason, strong_error=True)
+            return fast_result
+
+        self._record(
+            reason=reason,
+            fast_failure=fast_result[1] if fast_result else None,
+            strong_failure=strong_result[1],
+            compared=fast_result is not None,
+        )
+        return strong_result
+
+    def degrade(self, model: str) -> None:
+        """Send every evaluation to one cheaper model, without escalation."""
+        logger.info(f"[{self.stage}] Degrading gate evaluations to {model}")
+        self.degraded_model = model
+
+    @property
+    def reporting(self) -> bool:
+        """Whether callers should include cascade statistics in their metadata."""
+        return self.enabled or self.degraded_model is not None
+
+    @staticmethod
+    def parse_confidence(response_text: str) -> Optional[int]:
+        """Extract the CONFIDENCE: N line from a response, if present."""
+        match = _CONFIDENCE_PATTERN.search(response_text or '')
+        if not match:
+            return None
+        return min(100, int(match.group(1)))
+
+    def escalation_reason(self, confidence: Optional[int], first_failure: Optional[str]) -> Optional[str]:
+        """Return why a fast-model verdict must be escalated, or None to accept it."""
+        if confidence is None:
+            return 'missing_confidence'
+        if confidence < self.confidence_threshold:
+            return 'low_confidence'
+        if first_failure in self.escalate_gates:
+            return f'borderline_{first_failure}'
+        return None
+
+    def _record(
+        self,
+        fast_only: bool = False,
+        reason: Optional[str] = None,
+        fast_failure: Optional[str] = None,
+        strong_failure: Optional[str] = None,
+        compared: bool = False,
+        strong_error: bool = False,
+    ) -> None:
+        """Update agreement statistics (thread-safe)."""
+        with self._lock:
+            self._stats['calls'] += 1
+            if fast_only:
+                self._stats['fast_only'] += 1
+                return
+            self._stats['escalated'] += 1
+            self._escalation_reasons[reason] += 1
+            if strong_error:
+                self._stats['strong_model_errors'] += 1
+                return
+            if compared:
+                if (fast_failure is None) == (strong_failure is None):
+                    self._stats['verdict_agreements'] += 1
+                if fast_failure == strong_failure:
+                    self._stats['first_failure_agreements'] += 1
+
+    def get_stats(self) -> Dict:
+        """Return cascade statistics for metadata and tuning."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['escalation_reasons'] = dict(self._escalation_reasons)
+
+        compared = stats['escalated'] - stats['strong_model_errors'] - stats['escalation_reasons'].get('fast_model_error', 0)
+        stats.update({
+            'enabled': self.enabled,
+            'fast_model': self.fast_model,
+            'strong_model': self.strong_model,
+            'degraded_model': self.degraded_model,
+            'confidence_threshold': self.confidence_threshold,
+            'escalation_rate': stats['escalated'] / stats['calls'] if stats['calls'] else 0,
+            'verdict_agreement_rate': stats['verdict_agreements'] / compared if compared > 0 else None,
+        })
+        return stats
+
+    def log_stats(self) -> None:
+        """Log a one-line agreement summary."""
+        if not self.reporting:
+            return
+        stats = self.get_stats()
+        agreement = stats['verdict_agreement_rate']
+        logger.info(
+            f"[{self.stage}] Model cascade: {stats['calls']} calls, "
+            f"{stats['fast_only']} fast-only, {stats['escalated']} escalated "
+            f"({stats['escalation_rate']:.0%}), verdict agreement on escalations: "
+            f"{'n/a' if agreement is None else f'{agreement:.0%}'}, "
+            f"reasons: {stats['escalation_reasons']}"
+            + (f", {stats['degraded_calls']} degraded to {self.degraded_model}" if self.degraded_model else "")
+        )
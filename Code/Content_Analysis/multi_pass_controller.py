@@ -24,6 +24,7 @@ import os
 import sys
 import json
 import time
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
@@ -44,18 +45,18 @@ try:
     from .binary_segment_filter import BinarySegmentFilter
     from .binary_rebuttal_verifier import BinaryRebuttalVerifier
     from .podcast_narrative_generator import NarrativeCreatorGenerator
-    from .transcript_analyzer import upload_transcript_to_gemini, analyze_with_gemini_file_upload
+    from .transcript_analyzer import upload_transcript_to_gemini, analyze_with_gemini_file_upload, configure_transcript_upload
 except ImportError:
     try:
         from Content_Analysis.binary_segment_filter import BinarySegmentFilter
         from Content_Analysis.binary_rebuttal_verifier import BinaryRebuttalVerifier
         from Content_Analysis.podcast_narrative_generator import NarrativeCreatorGenerator
-        from Content_Analysis.transcript_analyzer import upload_transcript_to_gemini, analyze_with_gemini_file_upload
+        from Content_Analysis.transcript_analyzer import upload_transcript_to_gemini, analyze_with_gemini_file_upload, configure_transcript_upload
     except ImportError:
         from binary_segment_filter import BinarySegmentFilter
         from binary_rebuttal_verifier import BinaryRebuttalVerifier
         from podcast_narrative_generator import NarrativeCreatorGenerator
-        from transcript_analyzer import upload_transcript_to_gemini, analyze_with_gemini_file_upload
+        from transcript_analyzer import upload_transcript_to_gemini, analyze_with_gemini_file_upload, configure_transcript_upload
 
 # Optional imports for additional stages
 try:
@@ -116,6 +117,141 @@ except ImportError:
     except ImportError:
         RECENT_EVENTS_VERIFIER_AVAILABLE = False
 
+try:
+    from .upload_registry import GeminiUploadRegistry, set_active_registry
+    UPLOAD_REGISTRY_AVAILABLE = True
+except ImportError:
+    try:
+        from Content_Analysis.upload_registry import GeminiUploadRegistry, set_active_registry
+        UPLOAD_REGISTRY_AVAILABLE = True
+    except ImportError:
+        try:
+            from upload_registry import GeminiUploadRegistry, set_active_registry
+            UPLOAD_REGISTRY_AVAILABLE = True
+        except ImportError:
+            UPLOAD_REGISTRY_AVAILABLE = False
+
+try:
+    from .streaming_pass1 import StreamingSegmentProcessor
+    STREAMING_AVAILABLE = True
+except ImportError:
+    try:
+        from Content_Analysis.streaming_pass1 import StreamingSegmentProcessor
+        STREAMING_AVAILABLE = True
+    except ImportError:
+        try:
+            from streaming_pass1 import StreamingSegmentProcessor
+            STREAMING_AVAILABLE = True
+        except ImportError:
+            STREAMING_AVAILABLE = False
+
+try:
+    from .claim_prescreen import ClaimDensityScorer
+    CLAIM_PRESCREEN_AVAILABLE = True
+except ImportError:
+    try:
+        from Content_Analysis.claim_prescreen import ClaimDensityScorer
+        CLAIM_PRESCREEN_AVAILABLE = True
+    except ImportError:
+        try:
+            from claim_prescreen import ClaimDensityScorer
+            CLAIM_PRESCREEN_AVAILABLE = True
+        except ImportError:
+            CLAIM_PRESCREEN_AVAILABLE = False
+
+try:
+    from .stage_checkpoints import StageCheckpointStore, stage_fingerprint
+    CHECKPOINTS_AVAILABLE = True
+except ImportError:
+    try:
+        from Content_Analysis.stage_checkpoints import StageCheckpointStore, stage_fingerprint
+        CHECKPOINTS_AVAILABLE = True
+    except ImportError:
+        try:
+            from stage_checkpoints import StageCheckpointStore, stage_fingerprint
+            CHECKPOINTS_AVAILABLE = True
+        except ImportError:
+            CHECKPOINTS_AVAILABLE = False
+
+try:
+    from .claim_library import ClaimLibrary
+    CLAIM_LIBRARY_AVAILABLE = True
+except ImportError:
+    try:
+        from Content_Analysis.claim_library import ClaimLibrary
+        CLAIM_LIBRARY_AVAILABLE = True
+    except ImportError:
+        try:
+            from claim_library import ClaimLibrary
+            CLAIM_LIBRARY_AVAILABLE = True
+        except ImportError:
+            CLAIM_LIBRARY_AVAILABLE = False
+
+try:
+    from Utils.api_cassette import configure_cassette
+except ImportError:
+    try:
+        from api_cassette import configure_cassette
+    except ImportError:
+        def configure_cassette(settings):
+            # A requested record/replay run must not fall through to live calls
+            if (settings or {}).get('mode', 'off') != 'off' or os.getenv('YOUTUBER_CASSETTE', 'off') != 'off':
+                raise RuntimeError("A cassette is configured but Utils/api_cassette.py could not be imported")
+            return None
+
+try:
+    from .usage_tracker import UsageTracker, set_active_usage_tracker
+    USAGE_TRACKING_AVAILABLE = True
+except ImportError:
+    try:
+        from Content_Analysis.usage_tracker import UsageTracker, set_active_usage_tracker
+        USAGE_TRACKING_AVAILABLE = True
+    except ImportError:
+        try:
+            from usage_tracker import UsageTracker, set_active_usage_tracker
+            USAGE_TRACKING_AVAILABLE = True
+        except ImportError:
+            USAGE_TRACKING_AVAILABLE = False
+
+try:
+    from .pipeline_budget import PipelineBudget
+    PIPELINE_BUDGET_AVAILABLE = True
+except ImportError:
+    try:
+        from Content_Analysis.pipeline_budget import PipelineBudget
+        PIPELINE_BUDGET_AVAILABLE = True
+    except ImportError:
+        try:
+            from pipeline_budget import PipelineBudget
+            PIPELINE_BUDGET_AVAILABLE = True
+        except ImportError:
+            PIPELINE_BUDGET_AVAILABLE = False
+
+try:
+    from .response_schemas import configure_response_schemas
+except ImportError:
+    try:
+        from Content_Analysis.response_schemas import configure_response_schemas
+    except ImportError:
+        try:
+            from response_schemas import configure_response_schemas
+        except ImportError:
+            configure_response_schemas = lambda enabled=True: None
+
+try:
+    from .context_cache import GeminiContextCache, set_active_context_cache
+    CONTEXT_CACHE_AVAILABLE = True
+except ImportError:
+    try:
+        from Content_Analysis.context_cache import GeminiContextCache, set_active_context_cache
+        CONTEXT_CACHE_AVAILABLE = True
+    except ImportError:
+        try:
+            from context_cache import GeminiContextCache, set_active_context_cache
+            CONTEXT_CACHE_AVAILABLE = True
+        except ImportError:
+            CONTEXT_CACHE_AVAILABLE = False
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -124,6 +260,40 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Config sections (dotted paths) that shape each stage's output; part of the
+# stage's checkpoint fingerprint
+STAGE_CONFIG_KEYS = {
+    'pass_1': ['claim_prescreen', 'chunked_analysis', 'transcript_upload', 'structured_output'],
+    'binary_filtering': ['quality_control.clip_duration', 'quality_control.model_cascade'],
+    'recent_events_verification': [],
+    'diversity_selection': ['quality_control.diversity'],
+    'false_negative_recovery': ['quality_control.false_negative_recovery'],
+    'script_generation': ['narrative_generation', 'structured_output', 'claim_library'],
+    'tts_formatting': [],
+    'output_quality_gate': ['quality_control.output_gate'],
+    'rebuttal_verification': [
+        'quality_control.rebuttal_verification', 'quality_control.rebuttal_length',
+        'quality_control.rebuttal_proportionality', 'quality_control.model_cascade',
+    ],
+    'fact_validation': ['quality_control.external_validation'],
+}
+
+# Prompt files read by a stage; hashed by content into its checkpoint
+# fingerprint so editing a prompt reruns the stage
+ANALYSIS_RULES_PATH = os.path.join(current_dir, 'Analysis_Guidelines', 'selective_analysis_rules.txt')
+GENERATION_TEMPLATES_DIR = os.path.join(current_dir, 'Generation_Templates')
+
+
+def generation_template_paths() -> List[str]:
+    """Script generation templates and persona definition, in name order."""
+    if not os.path.isdir(GENERATION_TEMPLATES_DIR):
+        return []
+    return [
+        os.path.join(GENERATION_TEMPLATES_DIR, name)
+        for name in sorted(os.listdir(GENERATION_TEMPLATES_DIR)) if name.endswith('.txt')
+    ]
+
+
 
 class MultiPassControllerError(Exception):
     """Custom exception for multi-pass controller failures."""
@@ -166,13 +336,16 @@ class MultiPassController:
         self.episode_dir = episode_dir
         self.enhanced_logger = enhanced_logger or self._create_fallback_logger()
 
+        # Record/replay Gemini calls (must be active before any client is created)
+        self.cassette = configure_cassette(config.get('cassette'))
+
         # Load verified names from episode metadata
         self.verified_names = self._load_verified_names()
 
         # Initialize pipeline modules
         self.segment_filter = BinarySegmentFilter(config)
         self.rebuttal_verifier = BinaryRebuttalVerifier(config)
-        self.narrative_generator = NarrativeCreatorGenerator()
+        self.narrative_generator = NarrativeCreatorGenerator(config=config)
 
         # Optional modules — pass verified names to quality gate and TTS formatter
         self.diversity_selector = DiversitySelector(config) if DIVERSITY_AVAILABLE else None
@@ -181,15 +354,293 @@ class MultiPassController:
         self.tts_formatter = TTSFormatter(verified_names=self.verified_names) if TTS_FORMATTER_AVAILABLE else None
         self.fact_validator = FactValidator(config) if FACT_VALIDATOR_AVAILABLE else None
         self.recent_events_verifier = RecentEventsVerifier(config) if RECENT_EVENTS_VERIFIER_AVAILABLE else None
+        self.claim_library = ClaimLibrary.from_config(config) if CLAIM_LIBRARY_AVAILABLE else None
 
         # Stage tracking
         self.completed_stages = []
         self.stage_outputs = {}
         self.stage_metadata = {}
+        self.reused_stages = []
 
         # Configuration
         self.qc_config = config.get('quality_control', {})
 
+        # Reuse Gemini uploads by content hash; deleted when the episode completes
+        self.upload_registry = self._create_upload_registry()
+
+        # Cache static prompt prefixes (analysis rules, gate guidance) by cache ID
+        self.context_cache = self._create_context_cache()
+
+        # Filters segments while Pass 1 is still streaming (created per run)
+        self.streaming_processor = None
+
+        # Token/latency accounting for every Gemini call, rolled up per stage
+        self.usage_tracker = self._create_usage_tracker()
+
+        # Latency/token budgets; stages past budget run in a cheaper mode
+        self.budget = PipelineBudget.from_config(config) if PIPELINE_BUDGET_AVAILABLE else None
+        self.degraded_stages = set()
+
+        # Per-stage checkpoints keyed by input fingerprint (resume after failures)
+        self.checkpoints = self._create_checkpoint_store()
+
+        # Upload transcripts as compact speaker turns (times mapped back after analysis)
+        upload_config = config.get('transcript_upload', {})
+        configure_transcript_upload(
+            compact=upload_config.get('compact', True),
+            max_turn_seconds=upload_config.get('max_turn_seconds', 30.0)
+        )
+
+        # Schema-constrained JSON for Pass 1 and narrative generation
+        configure_response_schemas(
+            enabled=config.get('structured_output', {}).get('enabled', True)
+        )
+
+    def _create_upload_registry(self):
+        """Create and activate the per-episode Gemini upload registry."""
+        registry_config = self.config.get('upload_registry', {})
+        if not UPLOAD_REGISTRY_AVAILABLE or not registry_config.get('enabled', True):
+            return None
+
+        registry = GeminiUploadRegistry(
+            persist_path=os.path.join(self.episode_dir, 'Processing', 'gemini_upload_registry.json'),
+            ttl_hours=registry_config.get('ttl_hours', 47)
+        )
+        set_active_registry(registry)
+        return registry
+
+    def _create_context_cache(self):
+        """Create and activate the Gemini context cache for static prompt prefixes."""
+        if not CONTEXT_CACHE_AVAILABLE or not self.config.get('context_cache', {}).get('enabled', False):
+            return None
+
+        cache = GeminiContextCache(self.segment_filter._get_client, self.config)
+        set_active_context_cache(cache)
+        return cache
+
+    def _cleanup_context_cache(self) -> None:
+        """Delete episode-scoped context caches; shared gate caches expire on their TTL."""
+        cache = getattr(self, 'context_cache', None)
+        if not cache:
+            return
+        try:
+            cache.cleanup_episode()
+            self.stage_metadata['context_cache'] = dict(cache.stats)
+        except Exception as e:
+            logger.warning(f"Failed to clean up context caches: {e}")
+        finally:
+            set_active_context_cache(None)
+
+    def _create_usage_tracker(self):
+        """Create and activate the per-episode Gemini usage tracker."""
+        if not USAGE_TRACKING_AVAILABLE or not self.config.get('usage_tracking', {}).get('enabled', True):
+            return None
+        tracker = UsageTracker(self.config)
+        set_active_usage_tracker(tracker)
+        return tracker
+
+    @contextmanager
+    def _stage(self, name: str):
+        """Run a pipeline stage, attributing its Gemini calls to the stage."""
+        self._apply_budget(name)
+        tracker = getattr(self, 'usage_tracker', None)
+        if not tracker:
+            yield
+            return
+        with tracker.stage(name):
+            yield
+
+    def _apply_budget(self, stage: str) -> None:
+        """Degrade a stage about to run when the episode is over budget."""
+        budget = getattr(self, 'budget', None)
+        if not budget:
+            return
+        tracker = getattr(self, 'usage_tracker', None)
+        decisions = budget.plan(stage, tracker)
+        if not decisions:
+            return
+
+        for decision in decisions:
+            action = decision['action']
+            verifier = None
+            if action in ('cheaper_gate_model', 'cap_rebuttal_iterations'):
+                verifier = getattr(self, 'segment_filter' if stage == 'binary_filtering' else 'rebuttal_verifier', None)
+                if not verifier:
+                    self.enhanced_logger.warning(f"  {stage} verifier not available - skipping {action}")
+                    decision['applied'] = False
+                    continue
+
+            if action == 'cheaper_gate_model':
+                verifier.cascade.degrade(decision['model'])
+            elif action == 'cap_rebuttal_iterations':
+                verifier.max_iterations = min(verifier.max_iterations, decision['max_iterations'])
+            decision['applied'] = True
+            self.enhanced_logger.warning(
+                f"  ⏱️  Over {'/'.join(decision['exceeded'])} budget - {stage}: {action.replace('_', ' ')}"
+            )
+
+        if any(decision['applied'] for decision in decisions):
+            self.degraded_stages.add(stage)
+        self.stage_metadata['pipeline_budget'] = budget.to_dict(tracker)
+
+    def _skipped_for_budget(self, stage: str) -> bool:
+        """Whether the budget decided to skip the stage."""
+        budget = getattr(self, 'budget', None)
+        return bool(budget) and any(
+            d['stage'] == stage and d['action'] == 'skip_stage' for d in budget.decisions
+        )
+
+    def _finish_usage_tracking(self) -> Optional[Dict[str, Any]]:
+        """Roll up Gemini usage for the episode and print the summary table."""
+        tracker = getattr(self, 'usage_tracker', None)
+        if not tracker:
+            return None
+        summary = tracker.summarize()
+        print("\nGemini usage by stage:\n" + tracker.format_table(summary), flush=True)
+        return summary
+
+    def _create_checkpoint_store(self):
+        """Create the per-episode stage checkpoint store."""
+        if not CHECKPOINTS_AVAILABLE or not self.config.get('checkpoints', {}).get('enabled', True):
+            return None
+        return StageCheckpointStore(
+            os.path.join(self.episode_dir, 'Processing', 'checkpoints'), self.episode_dir
+        )
+
+    def _stage_config(self, stage: str) -> Dict[str, Any]:
+        """Config values that shape a stage's output (see STAGE_CONFIG_KEYS)."""
+        values = {}
+        for dotted in STAGE_CONFIG_KEYS.get(stage, []):
+            node = self.config
+            for key in dotted.split('.'):
+                node = node.get(key, {}) if isinstance(node, dict) else {}
+            values[dotted] = node
+        return values
+
+    def _checkpointed(self, stage: str, inputs: List[Any], run, files: Tuple[str, ...] = ()):
+        """
+        Run a stage, or reuse its checkpoint when its inputs are unchanged.
+
+        Args:
+            stage: Stage name
+            inputs: Stage inputs (data, or paths hashed by content)
+            run: Zero-argument callable executing the stage
+            files: Extra files the stage rewrites (its result path and
+                stage_outputs entry are snapshotted automatically)
+
+        Returns:
+            The stage result, fresh or restored from the checkpoint
+        """
+        store = getattr(self, 'checkpoints', None)
+        if not store:
+            return run()
+
+        fingerprint = stage_fingerprint(stage, inputs, self._stage_config(stage))
+        checkpoint = store.load(stage, fingerprint)
+        if checkpoint:
+            result = store.restore(checkpoint)
+            self.stage_metadata.update(checkpoint.get('stage_metadata', {}))
+            stage_output = store.stage_output(checkpoint)
+            if stage_output:
+                self.stage_outputs[stage] = stage_output
+            self.reused_stages.append(stage)
+            self.enhanced_logger.info(f"  ♻️  Reusing {stage} checkpoint from {checkpoint['saved_at']}")
+            return result
+
+        metadata_before = dict(self.stage_metadata)
+        result = run()
+
+        recorded = {
+            key: value for key, value in self.stage_metadata.items()
+            if metadata_before.get(key) is not value
+        }
+        if any(isinstance(value, dict) and value.get('error') for value in recorded.values()):
+            # Degraded result (stage caught its own failure) - retry it next run
+            logger.warning(f"Not checkpointing {stage}: stage reported an error")
+            return result
+        if stage in getattr(self, 'degraded_stages', ()):
+            # Ran in budget mode - redo at full quality next run
+            logger.info(f"Not checkpointing {stage}: degraded to stay within the pipeline budget")
+            return result
+
+        stage_output = self.stage_outputs.get(stage)
+        result_path = result if isinstance(result, str) else None
+        store.save(
+            stage, fingerprint, result,
+            files=[path for path in (result_path, stage_output, *files) if path],
+            stage_metadata=recorded,
+            stage_output=stage_output
+        )
+        return result
+
+    def _create_streaming_processor(self):
+        """Create the processor that filters segments while Pass 1 streams."""
+        if not STREAMING_AVAILABLE or not self.config.get('pass1_streaming', {}).get('enabled', False):
+            return None
+        return StreamingSegmentProcessor(
+            self.segment_filter,
+            recent_events_verifier=self.recent_events_verifier,
+            config=self.config
+        )
+
+    def _finish_streaming(self, cancel: bool = False) -> None:
+        """Shut down the Pass 1 streaming workers and record their statistics.
+
+        Args:
+            cancel: Drop queued segments instead of waiting for them (failed runs)
+        """
+        processor = getattr(self, 'streaming_processor', None)
+        if not processor:
+            return
+        processor.shutdown(cancel=cancel)
+        self.stage_metadata['pass1_streaming'] = processor.get_stats()
+        self.streaming_processor = None
+
+    def _prescreen_transcript(self, transcript_path: str, processing_dir: str) -> str:
+        """Reduce the transcript to claim-dense windows for Pass 1.
+
+        Returns the path Pass 1 should analyze: the prescreened transcript
+        when it was applied, otherwise the original transcript.
+        """
+        if not CLAIM_PRESCREEN_AVAILABLE or not self.config.get('claim_prescreen', {}).get('enabled', False):
+            return transcript_path
+
+        try:
+            with open(transcript_path, 'r', encoding='utf-8') as f:
+                transcript_data = json.load(f)
+            prescreened, report = ClaimDensityScorer(self.config).prescreen(transcript_data)
+        except Exception as e:
+            self.enhanced_logger.warning(f"  Claim prescreen failed, analyzing full transcript: {e}")
+            return transcript_path
+
+        self.stage_metadata['claim_prescreen'] = report.to_dict()
+        if not report.applied:
+            self.enhanced_logger.info(f"  Claim prescreen not applied: {report.reason}")
+            return transcript_path
+
+        prescreened_path = os.path.join(processing_dir, 'prescreened_transcript.json')
+        with open(prescreened_path, 'w', encoding='utf-8') as f:
+            json.dump(prescreened, f, indent=2, ensure_ascii=False)
+
+        self.enhanced_logger.info(
+            f"  Claim prescreen: {report.reason}, "
+            f"~{report.estimated_tokens_total - report.estimated_tokens_kept} tokens skipped"
+        )
+        return prescreened_path
+
+    def _cleanup_uploads(self) -> None:
+        """Delete all registered Gemini uploads at the end of the episode."""
+        registry = getattr(self, 'upload_registry', None)
+        if not registry:
+            return
+        try:
+            registry.cleanup_all(self.segment_filter._get_client())
+            self.stage_metadata['upload_registry'] = dict(registry.stats)
+        except Exception as e:
+            logger.warning(f"Failed to clean up registered uploads: {e}")
+        finally:
+            set_active_registry(None)
+
     def _load_guest_profile(self) -> str:
         """Load guest-specific analysis profile if one exists.
 
@@ -300,60 +751,108 @@ class MultiPassController:
         self.enhanced_logger.info("=" * 60)
 
         pipeline_start = datetime.now()
+        if self.budget:
+            self.budget.start()
 
         try:
             # Stage 1: Transcript Analysis (Pass 1)
-            pass1_output = self._execute_pass_1_analysis(transcript_path)
+            with self._stage('pass_1'):
+                pass1_output = self._checkpointed(
+                    'pass_1', [transcript_path, self._load_guest_profile(), ANALYSIS_RULES_PATH],
+                    lambda: self._execute_pass_1_analysis(transcript_path)
+                )
             self.completed_stages.append('pass_1')
 
             # Stage 2: Binary Segment Filtering (5 gates)
-            filtered_segments, rejected_segments = self._execute_binary_filtering(pass1_output)
+            with self._stage('binary_filtering'):
+                filtered_segments, rejected_segments = self._checkpointed(
+                    'binary_filtering', [pass1_output],
+                    lambda: self._execute_binary_filtering(pass1_output)
+                )
             self.completed_stages.append('binary_filtering')
 
             # Stage 2.5: Recent Events Verification (web search for date-sensitive claims)
-            verified_segments = self._execute_recent_events_verification(filtered_segments)
+            with self._stage('recent_events_verification'):
+                verified_segments = self._checkpointed(
+                    'recent_events_verification', [filtered_segments],
+                    lambda: self._execute_recent_events_verification(filtered_segments)
+                )
             self.completed_stages.append('recent_events_verification')
+            self._finish_streaming()
 
             # Stage 3: Diversity Selection (if available)
-            selected_segments = self._execute_diversity_selection(
-                verified_segments, rejected_segments
-            )
+            with self._stage('diversity_selection'):
+                selected_segments = self._checkpointed(
+                    'diversity_selection', [verified_segments, rejected_segments],
+                    lambda: self._execute_diversity_selection(verified_segments, rejected_segments)
+                )
             self.completed_stages.append('diversity_selection')
 
             # Stage 4: False Negative Recovery (if available)
-            final_segments = self._execute_false_negative_recovery(
-                selected_segments, rejected_segments
-            )
+            with self._stage('false_negative_recovery'):
+                final_segments = self._checkpointed(
+                    'false_negative_recovery', [selected_segments, rejected_segments],
+                    lambda: self._execute_false_negative_recovery(selected_segments, rejected_segments)
+                )
             self.completed_stages.append('false_negative_recovery')
 
             # Stage 5: Script Generation
-            script_path = self._execute_script_generation(final_segments, narrative_format)
+            with self._stage('script_generation'):
+                script_path = self._checkpointed(
+                    'script_generation', [final_segments, narrative_format, *generation_template_paths()],
+                    lambda: self._execute_script_generation(final_segments, narrative_format)
+                )
             self.completed_stages.append('script_generation')
 
             # Stage 5.5: TTS Formatting (deterministic post-processing)
-            self._execute_tts_formatting(script_path)
+            with self._stage('tts_formatting'):
+                self._checkpointed(
+                    'tts_formatting', [script_path, self.verified_names],
+                    lambda: self._execute_tts_formatting(script_path),
+                    files=(script_path,)
+                )
             self.completed_stages.append('tts_formatting')
 
             # Stage 6: Output Quality Gate (if available)
-            validated_script_path = self._execute_output_quality_gate(script_path)
+            with self._stage('output_quality_gate'):
+                validated_script_path = self._checkpointed(
+                    'output_quality_gate', [script_path, self.verified_names],
+                    lambda: self._execute_output_quality_gate(script_path)
+                )
             self.completed_stages.append('output_quality_gate')
 
             # Stage 7: Binary Rebuttal Verification (4 gates + self-correction)
-            verified_script_path = self._execute_rebuttal_verification(validated_script_path)
+            with self._stage('rebuttal_verification'):
+                verified_script_path = self._checkpointed(
+                    'rebuttal_verification', [validated_script_path],
+                    lambda: self._execute_rebuttal_verification(validated_script_path)
+                )
             self.completed_stages.append('rebuttal_verification')
 
             # Stage 8: External Fact Validation (if available)
-            final_script_path = self._execute_fact_validation(verified_script_path)
+            with self._stage('fact_validation'):
+                final_script_path = self._checkpointed(
+                    'fact_validation', [verified_script_path],
+                    lambda: self._execute_fact_validation(verified_script_path)
+                )
             self.completed_stages.append('fact_validation')
 
+            # All stages done - registered uploads are no longer needed
+            self._cleanup_uploads()
+
             pipeline_end = datetime.now()
 
+            if self.budget:
+                self.stage_metadata['pipeline_budget'] = self.budget.to_dict(self.usage_tracker)
+
             pipeline_metadata = {
                 'pipeline_start': pipeline_start.isoformat(),
                 'pipeline_end': pipeline_end.isoformat(),
                 'total_duration_seconds': (pipeline_end - pipeline_start).total_seconds(),
                 'completed_stages': self.completed_stages,
+                'reused_stages': self.reused_stages,
                 'stage_metadata': self.stage_metadata,
+                'usage': self._finish_usage_tracking(),
                 'final_output': final_script_path
             }
 
@@ -367,14 +866,27 @@ class MultiPassController:
         except Exception as e:
             logger.error(f"Pipeline failed: {e}")
             logger.error(traceback.format_exc())
+            # Stop streamed filter/verify calls that would only spend quota
+            self._finish_streaming(cancel=True)
+            self.stage_metadata['usage'] = self._finish_usage_tracking()
             raise
 
+        finally:
+            # A failed run keeps its uploads for the resumed run, but this
+            # episode's registry must not stay active for the next controller
+            if getattr(self, 'upload_registry', None):
+                set_active_registry(None)
+            # Episode-scoped context caches are deleted and deactivated either way
+            self._cleanup_context_cache()
+
     def _execute_pass_1_analysis(self, transcript_path: str) -> str:
         """Execute Pass 1: Transcript Analysis.
 
-        Routes to ChunkedTranscriptAnalyzer for long podcasts (>30 min) when
-        chunked_analysis.enabled is true. Falls back to single-call analysis
-        for short podcasts or when chunked analysis is unavailable.
+        Routes to ChunkedTranscriptAnalyzer for long podcasts (by estimated
+        token size, or >30 min in minutes mode) when chunked_analysis.enabled
+        is true. Falls back to single-call analysis for short podcasts or when
+        chunked analysis is unavailable. With claim_prescreen.enabled, only
+        claim-dense transcript windows (plus context padding) are analyzed.
         """
         self.enhanced_logger.info("📊 Stage 1: Transcript Analysis")
 
@@ -397,11 +909,7 @@ class MultiPassController:
 
         try:
             # Load analysis rules
-            rules_path = os.path.join(
-                current_dir,
-                'Analysis_Guidelines',
-                'selective_analysis_rules.txt'
-            )
+            rules_path = ANALYSIS_RULES_PATH
             analysis_rules = ""
             if os.path.exists(rules_path):
                 with open(rules_path, 'r', encoding='utf-8') as f:
@@ -412,6 +920,13 @@ class MultiPassController:
             if guest_profile:
                 analysis_rules += f"\n\n{guest_profile}"
 
+            # Send only claim-dense windows to Pass 1 (times are unchanged)
+            analysis_path = self._prescreen_transcript(transcript_path, processing_dir)
+
+            # Filter segments as they stream out of Pass 1
+            self.streaming_processor = self._create_streaming_processor()
+            on_segment = self.streaming_processor.submit if self.streaming_processor else None
+
             # Decide whether to use chunked analysis
             chunked_config = self.config.get('chunked_analysis', {})
             use_chunked = (
@@ -426,9 +941,10 @@ class MultiPassController:
                     enhanced_logger=self.enhanced_logger,
                 )
                 analysis_content = chunked_analyzer.analyze_transcript(
-                    transcript_path=transcript_path,
+                    transcript_path=analysis_path,
                     analysis_rules=analysis_rules,
                     processing_dir=processing_dir,
+                    on_segment=on_segment,
                 )
             else:
                 # Original single-call path
@@ -442,8 +958,8 @@ class MultiPassController:
                 if not api_key:
                     api_key = os.getenv('GEMINI_API_KEY')
 
-                display_name = f"transcript_{os.path.basename(transcript_path)}"
-                file_object = upload_transcript_to_gemini(transcript_path, display_name)
+                display_name = f"transcript_{os.path.basename(analysis_path)}"
+                file_object = upload_transcript_to_gemini(analysis_path, display_name)
 
                 if not file_object:
                     raise MultiPassControllerError(
@@ -455,7 +971,8 @@ class MultiPassController:
                     file_object=file_object,
                     analysis_rules=analysis_rules,
                     output_dir=processing_dir,
-                    file_path=transcript_path
+                    file_path=analysis_path,
+                    on_segment=on_segment
                 )
 
             if not analysis_content:
@@ -472,6 +989,9 @@ class MultiPassController:
             return output_path
 
         except Exception as e:
+            if self.streaming_processor:
+                self.streaming_processor.shutdown(cancel=True)
+                self.streaming_processor = None
             raise MultiPassControllerError(f"Pass 1 failed: {str(e)}", stage="pass_1")
 
     def _execute_binary_filtering(self, pass1_output: str) -> Tuple[List[Dict], List[Dict]]:
@@ -487,9 +1007,20 @@ class MultiPassController:
 
         self.enhanced_logger.info(f"  Filtering {len(segments)} segments through 5 gates...")
 
+        filter_kwargs = {}
+        processor = getattr(self, 'streaming_processor', None)
+        if processor:
+            # Reuse verdicts reached while Pass 1 was still generating
+            processor.wait()
+            filter_kwargs['precomputed_results'] = [
+                verdict.filter_result if verdict else None
+                for verdict in map(processor.lookup, segments)
+            ]
+
         passed, rejected, metadata = self.segment_filter.filter_segments(
             segments=segments,
-            output_path=output_path
+            output_path=output_path,
+            **filter_kwargs
         )
 
         self.stage_metadata['binary_filtering'] = metadata
@@ -512,10 +1043,19 @@ class MultiPassController:
         processing_dir = os.path.join(self.episode_dir, "Processing")
         output_path = os.path.join(processing_dir, "recent_events_verification.json")
 
+        verify_kwargs = {}
+        processor = getattr(self, 'streaming_processor', None)
+        if processor:
+            verify_kwargs['precomputed'] = [
+                verdict.verification if verdict else None
+                for verdict in map(processor.lookup, segments)
+            ]
+
         try:
             verified_segments, metadata = self.recent_events_verifier.verify_segments(
                 segments=segments,
-                output_path=output_path
+                output_path=output_path,
+                **verify_kwargs
             )
 
             self.stage_metadata['recent_events_verification'] = metadata
@@ -541,6 +1081,7 @@ class MultiPassController:
             return filtered
 
         except Exception as e:
+            self.stage_metadata['recent_events_verification'] = {'error': str(e)}
             self.enhanced_logger.error(f"  Recent events verification failed: {e}")
             self.enhanced_logger.warning("  Continuing with unverified segments - manual review recommended")
             return segments
@@ -581,10 +1122,16 @@ class MultiPassController:
             self.enhanced_logger.warning("  False negative scanner not available - skipping")
             return selected_segments
 
+        if self._skipped_for_budget('false_negative_recovery'):
+            self.enhanced_logger.warning("  Over pipeline budget - skipping false negative recovery")
+            return selected_segments
+
         recovered = self.false_negative_scanner.scan_rejected(
             rejected=rejected_segments,
             selected=selected_segments
         )
+        if self.false_negative_scanner.last_recovery_stats:
+            self.stage_metadata['false_negative_recovery'] = dict(self.false_negative_scanner.last_recovery_stats)
 
         if recovered:
             self.enhanced_logger.info(f"  Recovered {len(recovered)} false negatives")
@@ -605,6 +1152,9 @@ class MultiPassController:
         output_dir = os.path.join(self.episode_dir, "Output", "Scripts")
         os.makedirs(output_dir, exist_ok=True)
 
+        # Offer rebuttals verified in earlier episodes for recurring claims
+        final_segments = self._attach_library_candidates(final_segments)
+
         # Save filtered segments for script generation
         filtered_path = os.path.join(
             self.episode_dir, "Processing", "final_filtered_for_script.json"
@@ -622,6 +1172,15 @@ class MultiPassController:
             narrative_format=narrative_format
         )
 
+        section_report = getattr(self.narrative_generator, 'last_section_report', None)
+        if isinstance(section_report, dict):
+            self.stage_metadata['narrative_sections'] = section_report
+            self.enhanced_logger.info(
+                f"  Sectioned script: {section_report['section_calls']} calls, "
+                f"slowest {section_report['slowest_section_seconds']}s, "
+                f"{len(section_report['regenerated'])} regenerated"
+            )
+
         script_path = self.narrative_generator.save_unified_script(
             script_data=script_data,
             episode_output_path=os.path.join(self.episode_dir, "Output")
@@ -632,6 +1191,29 @@ class MultiPassController:
         self.stage_outputs['script_generation'] = script_path_str
         return script_path_str
 
+    def _attach_library_candidates(self, segments: List[Dict]) -> List[Dict]:
+        """Copy segments, adding prior_verified_rebuttal where the claim library has one."""
+        claim_library = getattr(self, 'claim_library', None)
+        if claim_library is None:
+            return segments
+
+        attached = []
+        offered = 0
+        for segment in segments:
+            candidate = claim_library.candidate_for(segment)
+            if candidate:
+                segment = {**segment, 'prior_verified_rebuttal': candidate}
+                offered += 1
+            attached.append(segment)
+
+        self.stage_metadata['claim_library'] = {
+            'segments': len(segments),
+            'candidates_offered': offered,
+        }
+        if offered:
+            self.enhanced_logger.info(f"  Claim library: {offered} prior verified rebuttals offered")
+        return attached
+
     def _execute_tts_formatting(self, script_path: str) -> None:
         """Apply deterministic TTS formatting to script content."""
         self.enhanced_logger.info("🔤 Stage 5.5: TTS Formatting")
@@ -697,6 +1279,20 @@ class MultiPassController:
             f"{metadata['total_rewrites']} rewrites"
         )
 
+        # Re-run the output gate on the rewritten script; it re-checks only changed sections
+        if self.output_gate:
+            recheck = self.output_gate.validate_script(verified_script)
+            self.stage_metadata['output_quality_recheck'] = {
+                'passed': recheck.passed,
+                'critical_count': recheck.critical_count,
+                'warning_count': recheck.warning_count,
+                **self.output_gate.last_validation_stats,
+            }
+            if not recheck.passed:
+                self.enhanced_logger.warning(
+                    f"  Rewritten script has {recheck.critical_count} critical output gate issues"
+                )
+
         # Log warnings for sections that failed verification
         if metadata.get('passed_with_warnings', 0) > 0:
             self.enhanced_logger.warning(
@@ -722,10 +1318,18 @@ class MultiPassController:
             self.enhanced_logger.warning("  Fact validator not available - skipping")
             return script_path
 
+        if self._skipped_for_budget('fact_validation'):
+            self.enhanced_logger.warning("  Over pipeline budget - skipping external fact validation")
+            return script_path
+
         with open(script_path, 'r', encoding='utf-8') as f:
             script_data = json.load(f)
 
-        validated_script = self.fact_validator.validate_script(script_data)
+        try:
+            validated_script = self.fact_validator.validate_script(script_data)
+        finally:
+            # Last stage that queries the API - release its pooled connections
+            self.fact_validator.close()
 
         # Save validated script
         with open(script_path, 'w', encoding='utf-8') as f:
@@ -738,6 +1342,7 @@ class MultiPassController:
         """Get current pipeline progress information."""
         return {
             "completed_stages": self.completed_stages,
+            "reused_stages": getattr(self, 'reused_stages', []),
             "stage_outputs": self.stage_outputs,
             "stage_metadata": self.stage_metadata,
             "total_stages": 9,
@@ -11,6 +11,10 @@ Binary Checks:
 3. Does the intro accurately preview the content?
 4. Does each rebuttal reference the correct clip?
 
+The gate is incremental: per-section check results and phrase shingles are
+cached by section fingerprint, so re-validating a script after a few sections
+were rewritten (e.g. by the rebuttal verifier) only re-checks those sections.
+
 Author: Claude Code
 Created: 2024-12-28
 Pipeline: Multi-Pass Quality Control System
@@ -20,7 +24,10 @@ import os
 import sys
 import json
 import re
+import bisect
+import hashlib
 import logging
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
@@ -32,6 +39,46 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+NARRATION_TYPES = ['intro', 'pre_clip', 'post_clip', 'outro', 'intro_plus_hook_analysis']
+
+# Phrase repetition: word n-gram lengths and 64-bit polynomial rolling hash
+PHRASE_LENGTHS = range(3, 7)
+_MASK64 = (1 << 64) - 1
+_HASH_BASE = 0x100000001B3
+_LENGTH_SALT = 0x9E3779B97F4A7C15
+_WORD_PATTERN = re.compile(r"[a-z']+")
+
+
+@lru_cache(maxsize=65536)
+def _word_hash(word: str) -> int:
+    return int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def shingle_hashes(words: List[str]) -> List[Tuple[int, int, int]]:
+    """
+    (hash, start, length) of every 3-6 word shingle, length-major like the
+    original n-gram loop. Each hash is O(1) from prefix hashes of the words.
+    """
+    prefix = [0]
+    for word in words:
+        prefix.append((prefix[-1] * _HASH_BASE + _word_hash(word)) & _MASK64)
+
+    shingles = []
+    for n in PHRASE_LENGTHS:
+        power = pow(_HASH_BASE, n, 1 << 64)
+        salt = (n * _LENGTH_SALT) & _MASK64
+        for i in range(len(words) - n + 1):
+            shingles.append((((prefix[i + n] - prefix[i] * power) & _MASK64) ^ salt, i, n))
+    return shingles
+
+
+def phrase_hash(words: List[str]) -> int:
+    """Shingle hash of a whole word sequence."""
+    value = 0
+    for word in words:
+        value = (value * _HASH_BASE + _word_hash(word)) & _MASK64
+    return value ^ ((len(words) * _LENGTH_SALT) & _MASK64)
+
 
 @dataclass
 class QualityIssue:
@@ -68,6 +115,17 @@ class GateResult:
         }
 
 
+@dataclass
+class SectionChecks:
+    """Cached per-section check results and phrase shingles."""
+    content_issues: List[QualityIssue]
+    tts_issues: List[QualityIssue]
+    key: str = ''
+    words: List[str] = field(default_factory=list)
+    # Unique shingle hash -> (order, start, length) of its first occurrence
+    shingles: Dict[int, Tuple[int, int, int]] = field(default_factory=dict)
+
+
 class OutputQualityGate:
     """
     Validates script structure and consistency before downstream processing.
@@ -90,6 +148,30 @@ class OutputQualityGate:
         'but that is the', 'the kind of thing',
     }
 
+    # Stage direction keywords to check for
+    STAGE_KEYWORDS = [
+        'sound', 'pause', 'beat', 'laughing', 'laughter', 'sighs',
+        'sigh', 'clears throat', 'music', 'sfx', 'record scratch',
+        'transition', 'silence', 'dramatic', 'whispers', 'yelling',
+    ]
+
+    # Patterns that should be avoided for TTS
+    TTS_PATTERNS = [
+        (re.compile(r'\b[A-Z]{2,}\b'), 'Uppercase abbreviation'),  # Matches "CIA", "FBI", etc.
+        (re.compile(r'\d+%'), 'Percentage symbol'),  # Should be "fifty percent"
+        (re.compile(r'\$\d+'), 'Dollar sign'),  # Should be "one hundred dollars"
+        (re.compile(r'#\d+'), 'Hashtag number'),  # Should be "number one"
+        (re.compile(r'&'), 'Ampersand'),  # Should be "and"
+    ]
+    STAGE_PATTERN = re.compile(
+        r'\([^)]*\b(?:' + '|'.join(STAGE_KEYWORDS) + r')[^)]*\)',
+        re.IGNORECASE
+    )
+    GENERIC_STAGE_PATTERN = re.compile(
+        r'\((SFX|NOTE|CUE|FX|MUSIC|SOUND)[^)]*\)',
+        re.IGNORECASE
+    )
+
     def __init__(self, config: Optional[Dict] = None, verified_names: Optional[Dict] = None):
         """
         Initialize the OutputQualityGate.
@@ -103,6 +185,18 @@ class OutputQualityGate:
         qc_config = self.config.get('quality_control', {}).get('output_gate', {})
         self.max_regeneration_attempts = qc_config.get('max_regeneration_attempts', 2)
 
+        # Per-section results of the last validation, keyed by section fingerprint
+        self._section_cache: Dict[str, SectionChecks] = {}
+        self.last_validation_stats: Dict[str, int] = {}
+        # Phrase -> number of counted sections containing it, kept up to date
+        # by adding and removing only the sections that changed
+        self._counted_sections: Dict[str, Tuple[SectionChecks, int]] = {}
+        self._shingle_counts: Dict[int, int] = {}
+        self._repeated_shingles: set = set()
+        self._stoplist_hashes = {phrase_hash(phrase.split()) for phrase in self.REPETITION_STOPLIST}
+        # Shared by every auto_correct pass instead of rebuilt per fix
+        self._tts_formatter = None
+
     def validate_script(self, script_data: Dict) -> GateResult:
         """
         Run all quality gate checks on a script.
@@ -115,6 +209,9 @@ class OutputQualityGate:
         """
         issues = []
 
+        # Per-section results, recomputed only for new or changed sections
+        section_checks = self._section_checks(script_data.get('podcast_sections', []))
+
         # Check 1: Clip reference consistency
         issues.extend(self._check_clip_references(script_data))
 
@@ -125,10 +222,10 @@ class OutputQualityGate:
         issues.extend(self._check_section_structure(script_data))
 
         # Check 4: Content consistency
-        issues.extend(self._check_content_consistency(script_data))
+        issues.extend(self._check_content_consistency(script_data, section_checks))
 
         # Check 5: TTS readiness
-        issues.extend(self._check_tts_readiness(script_data))
+        issues.extend(self._check_tts_readiness(script_data, section_checks))
 
         # Check 6: Rebuttal proportionality
         issues.extend(self._check_rebuttal_proportionality(script_data))
@@ -137,7 +234,7 @@ class OutputQualityGate:
         issues.extend(self._check_name_consistency(script_data))
 
         # Check 8: Repetitive phrases
-        issues.extend(self._check_phrase_repetition(script_data))
+        issues.extend(self._check_phrase_repetition(script_data, section_checks))
 
         # Count by severity
         critical_count = sum(1 for i in issues if i.severity == 'CRITICAL')
@@ -154,7 +251,9 @@ class OutputQualityGate:
         )
 
         logger.info(f"Quality gate: {'PASSED' if passed else 'FAILED'} "
-                    f"({critical_count} critical, {warning_count} warnings)")
+                    f"({critical_count} critical, {warning_count} warnings, "
+                    f"{self.last_validation_stats['sections_rechecked']}/"
+                    f"{self.last_validation_stats['sections']} sections re-checked)")
 
         return result
 
@@ -321,103 +420,130 @@ class OutputQualityGate:
 
         return issues
 
-    def _check_content_consistency(self, script_data: Dict) -> List[QualityIssue]:
-        """Check content consistency between sections."""
-        issues = []
-
-        sections = script_data.get('podcast_sections', [])
+    def _section_checks(self, sections: List[Dict]) -> List[SectionChecks]:
+        """
+        Per-section check results, reused for sections unchanged since the
+        last validation. The cache keeps only the current script's sections.
+        """
+        cache = {}
+        checks = []
+        rechecked = 0
 
         for section in sections:
-            section_type = section.get('section_type')
-            section_id = section.get('section_id', 'unknown')
+            key = hashlib.blake2b(
+                json.dumps(section, sort_keys=True, default=str).encode('utf-8'), digest_size=16
+            ).hexdigest()
+            result = cache.get(key) or self._section_cache.get(key)
+            if result is None:
+                result = self._check_section(section, key)
+                rechecked += 1
+            cache[key] = result
+            checks.append(result)
+
+        self._section_cache = cache
+        self.last_validation_stats = {'sections': len(sections), 'sections_rechecked': rechecked}
+        return checks
+
+    def _check_section(self, section: Dict, key: str = '') -> SectionChecks:
+        """Run the checks that depend on one section only."""
+        checks = SectionChecks(
+            content_issues=self._section_content_issues(section),
+            tts_issues=self._section_tts_issues(section),
+            key=key,
+        )
 
-            # Check that script sections have content
-            if section_type in ['intro', 'pre_clip', 'post_clip', 'outro', 'intro_plus_hook_analysis']:
-                content = section.get('script_content', '')
-                if not content or len(content.strip()) < 50:
-                    issues.append(QualityIssue(
-                        check_name='empty_content',
-                        severity='CRITICAL' if section_type in ['intro', 'post_clip'] else 'WARNING',
-                        description=f"Section has insufficient content ({len(content)} chars)",
-                        location=section_id
-                    ))
+        content = section.get('script_content', '')
+        if section.get('section_type') in NARRATION_TYPES and content:
+            # Tokenize: split on whitespace, strip punctuation
+            checks.words = _WORD_PATTERN.findall(content.lower())
+            for shingle, start, n in shingle_hashes(checks.words):
+                if shingle not in checks.shingles and shingle not in self._stoplist_hashes:
+                    checks.shingles[shingle] = (len(checks.shingles), start, n)
 
-            # Check that video clips have required fields
-            if section_type == 'video_clip':
-                required_fields = ['clip_id', 'start_time', 'end_time', 'title']
-                for field in required_fields:
-                    if not section.get(field):
-                        issues.append(QualityIssue(
-                            check_name='missing_field',
-                            severity='CRITICAL',
-                            description=f"Video clip missing required field: {field}",
-                            location=section_id
-                        ))
+        return checks
 
-        return issues
+    def _check_content_consistency(
+        self,
+        script_data: Dict,
+        section_checks: Optional[List[SectionChecks]] = None
+    ) -> List[QualityIssue]:
+        """Check content consistency between sections."""
+        if section_checks is None:
+            section_checks = self._section_checks(script_data.get('podcast_sections', []))
+        return [issue for checks in section_checks for issue in checks.content_issues]
 
-    def _check_tts_readiness(self, script_data: Dict) -> List[QualityIssue]:
-        """Check that script content is TTS-ready."""
+    def _section_content_issues(self, section: Dict) -> List[QualityIssue]:
         issues = []
+        section_type = section.get('section_type')
+        section_id = section.get('section_id', 'unknown')
 
-        sections = script_data.get('podcast_sections', [])
+        # Check that script sections have content
+        if section_type in NARRATION_TYPES:
+            content = section.get('script_content', '')
+            if not content or len(content.strip()) < 50:
+                issues.append(QualityIssue(
+                    check_name='empty_content',
+                    severity='CRITICAL' if section_type in ['intro', 'post_clip'] else 'WARNING',
+                    description=f"Section has insufficient content ({len(content)} chars)",
+                    location=section_id
+                ))
 
-        # Patterns that should be avoided for TTS
-        problematic_patterns = [
-            (r'\b[A-Z]{2,}\b', 'Uppercase abbreviation'),  # Matches "CIA", "FBI", etc.
-            (r'\d+%', 'Percentage symbol'),  # Should be "fifty percent"
-            (r'\$\d+', 'Dollar sign'),  # Should be "one hundred dollars"
-            (r'#\d+', 'Hashtag number'),  # Should be "number one"
-            (r'&', 'Ampersand'),  # Should be "and"
-        ]
+        # Check that video clips have required fields
+        if section_type == 'video_clip':
+            required_fields = ['clip_id', 'start_time', 'end_time', 'title']
+            for field in required_fields:
+                if not section.get(field):
+                    issues.append(QualityIssue(
+                        check_name='missing_field',
+                        severity='CRITICAL',
+                        description=f"Video clip missing required field: {field}",
+                        location=section_id
+                    ))
 
-        # Stage direction keywords to check for
-        stage_keywords = [
-            'sound', 'pause', 'beat', 'laughing', 'laughter', 'sighs',
-            'sigh', 'clears throat', 'music', 'sfx', 'record scratch',
-            'transition', 'silence', 'dramatic', 'whispers', 'yelling',
-        ]
-        stage_pattern = re.compile(
-            r'\([^)]*\b(?:' + '|'.join(stage_keywords) + r')[^)]*\)',
-            re.IGNORECASE
-        )
-        generic_stage_pattern = re.compile(
-            r'\((SFX|NOTE|CUE|FX|MUSIC|SOUND)[^)]*\)',
-            re.IGNORECASE
-        )
+        return issues
 
-        for section in sections:
-            section_type = section.get('section_type')
-            section_id = section.get('section_id', 'unknown')
+    def _check_tts_readiness(
+        self,
+        script_data: Dict,
+        section_checks: Optional[List[SectionChecks]] = None
+    ) -> List[QualityIssue]:
+        """Check that script content is TTS-ready."""
+        if section_checks is None:
+            section_checks = self._section_checks(script_data.get('podcast_sections', []))
+        return [issue for checks in section_checks for issue in checks.tts_issues]
 
-            if section_type in ['intro', 'pre_clip', 'post_clip', 'outro', 'intro_plus_hook_analysis']:
-                content = section.get('script_content', '')
+    def _section_tts_issues(self, section: Dict) -> List[QualityIssue]:
+        issues = []
+        section_id = section.get('section_id', 'unknown')
 
-                for pattern, description in problematic_patterns:
-                    matches = re.findall(pattern, content)
-                    if matches:
-                        # Only report first few matches
-                        sample = matches[:3]
-                        issues.append(QualityIssue(
-                            check_name='tts_formatting',
-                            severity='INFO',
-                            description=f"{description} found: {sample}",
-                            location=section_id,
-                            auto_fixable=True
-                        ))
+        if section.get('section_type') in NARRATION_TYPES:
+            content = section.get('script_content', '')
 
-                # Check for remaining stage directions
-                stage_matches = stage_pattern.findall(content)
-                stage_matches.extend(generic_stage_pattern.findall(content))
-                if stage_matches:
+            for pattern, description in self.TTS_PATTERNS:
+                matches = pattern.findall(content)
+                if matches:
+                    # Only report first few matches
+                    sample = matches[:3]
                     issues.append(QualityIssue(
-                        check_name='stage_directions',
-                        severity='WARNING',
-                        description=f"Stage directions found that TTS would read aloud: {stage_matches[:3]}",
+                        check_name='tts_formatting',
+                        severity='INFO',
+                        description=f"{description} found: {sample}",
                         location=section_id,
                         auto_fixable=True
                     ))
 
+            # Check for remaining stage directions
+            stage_matches = self.STAGE_PATTERN.findall(content)
+            stage_matches.extend(self.GENERIC_STAGE_PATTERN.findall(content))
+            if stage_matches:
+                issues.append(QualityIssue(
+                    check_name='stage_directions',
+                    severity='WARNING',
+                    description=f"Stage directions found that TTS would read aloud: {stage_matches[:3]}",
+                    location=section_id,
+                    auto_fixable=True
+                ))
+
         return issues
 
     def _check_rebuttal_proportionality(self, script_data: Dict) -> List[QualityIssue]:
@@ -495,7 +621,6 @@ class OutputQualityGate:
             return issues
 
         sections = script_data.get('podcast_sections', [])
-        narration_types = ['intro', 'pre_clip', 'post_clip', 'outro', 'intro_plus_hook_analysis']
 
         for role in ['host', 'guest']:
             canonical = self.verified_names.get(role, '')
@@ -514,7 +639,7 @@ class OutputQualityGate:
             # Check each narration section for correct name usage
             canonical_found_anywhere = False
             for section in sections:
-                if section.get('section_type') not in narration_types:
+                if section.get('section_type') not in NARRATION_TYPES:
                     continue
                 content = section.get('script_content', '')
                 section_id = section.get('section_id', 'unknown')
@@ -551,72 +676,82 @@ class OutputQualityGate:
 
         return issues
 
-    def _check_phrase_repetition(self, script_data: Dict) -> List[QualityIssue]:
+    def _check_phrase_repetition(
+        self,
+        script_data: Dict,
+        section_checks: Optional[List[SectionChecks]] = None
+    ) -> List[QualityIssue]:
         """Detect phrases repeated across multiple script sections."""
         issues = []
 
         sections = script_data.get('podcast_sections', [])
-        narration_types = ['intro', 'pre_clip', 'post_clip', 'outro', 'intro_plus_hook_analysis']
+        if section_checks is None:
+            section_checks = self._section_checks(sections)
 
-        # Collect text by section
-        section_texts = []
-        for section in sections:
-            if section.get('section_type') in narration_types:
-                content = section.get('script_content', '')
-                if content:
-                    section_texts.append(content.lower())
+        # Cached shingles of each narration section with content
+        narrated = [
+            checks for section, checks in zip(sections, section_checks)
+            if section.get('section_type') in NARRATION_TYPES and section.get('script_content', '')
+        ]
 
-        if len(section_texts) < 2:
+        if len(narrated) < 2:
             return issues
 
-        # Extract n-grams (3 to 6 words) from each section and track which sections they appear in
-        phrase_sections = {}  # phrase -> set of section indices
-
-        for section_idx, text in enumerate(section_texts):
-            # Tokenize: split on whitespace, strip punctuation
-            words = re.findall(r"[a-z']+", text)
-
-            seen_in_section = set()
-            for n in range(3, 7):
-                for i in range(len(words) - n + 1):
-                    phrase = ' '.join(words[i:i + n])
-                    if phrase in seen_in_section:
-                        continue
-                    if phrase in self.REPETITION_STOPLIST:
-                        continue
-                    seen_in_section.add(phrase)
-                    if phrase not in phrase_sections:
-                        phrase_sections[phrase] = set()
-                    phrase_sections[phrase].add(section_idx)
+        self._update_shingle_counts(narrated)
 
         # Flag phrases appearing in 3+ different sections
-        flagged = set()  # avoid flagging substrings of already-flagged phrases
-        # Sort by length descending so longer phrases take priority
-        sorted_phrases = sorted(
-            ((p, secs) for p, secs in phrase_sections.items() if len(secs) >= 3),
-            key=lambda x: len(x[0]),
-            reverse=True
-        )
-
-        for phrase, section_indices in sorted_phrases:
-            # Skip if this phrase is a substring of an already-flagged phrase
-            is_substring = False
-            for flagged_phrase in flagged:
-                if phrase in flagged_phrase:
-                    is_substring = True
-                    break
-            if is_substring:
+        repeated = []
+        for shingle in self._repeated_shingles:
+            origin, checks = next((i, c) for i, c in enumerate(narrated) if shingle in c.shingles)
+            order, start, n = checks.shingles[shingle]
+            phrase = ' '.join(checks.words[start:start + n])
+            repeated.append((phrase, self._shingle_counts[shingle], (origin, order)))
+
+        # Sort by length descending so longer phrases take priority, then by first appearance
+        repeated.sort(key=lambda x: (-len(x[0]), x[2]))
+
+        # Sorted suffixes of flagged phrases: a phrase is a substring of a
+        # flagged phrase iff it prefixes the suffix it sorts next to
+        flagged_suffixes = []
+        for phrase, count, _ in repeated:
+            position = bisect.bisect_left(flagged_suffixes, phrase)
+            if position < len(flagged_suffixes) and flagged_suffixes[position].startswith(phrase):
                 continue
 
-            flagged.add(phrase)
+            for offset in range(len(phrase)):
+                bisect.insort(flagged_suffixes, phrase[offset:])
             issues.append(QualityIssue(
                 check_name='phrase_repetition',
                 severity='WARNING',
-                description=f"Phrase \"{phrase}\" repeated across {len(section_indices)} sections",
+                description=f"Phrase \"{phrase}\" repeated across {count} sections",
             ))
 
         return issues
 
+    def _update_shingle_counts(self, narrated: List[SectionChecks]) -> None:
+        """Apply the sections added or removed since the last count."""
+        current: Dict[str, Tuple[SectionChecks, int]] = {}
+        for checks in narrated:
+            current[checks.key] = (checks, current.get(checks.key, (checks, 0))[1] + 1)
+
+        for key in set(current) | set(self._counted_sections):
+            checks, count = current.get(key) or self._counted_sections[key]
+            delta = current.get(key, (None, 0))[1] - self._counted_sections.get(key, (None, 0))[1]
+            if not delta:
+                continue
+            for shingle in checks.shingles:
+                total = self._shingle_counts.get(shingle, 0) + delta
+                if total:
+                    self._shingle_counts[shingle] = total
+                else:
+                    del self._shingle_counts[shingle]
+                if total >= 3:
+                    self._repeated_shingles.add(shingle)
+                else:
+                    self._repeated_shingles.discard(shingle)
+
+        self._counted_sections = current
+
     def auto_correct(
         self,
         script_data: Dict,
@@ -633,10 +768,16 @@ class OutputQualityGate:
             Corrected script data
         """
         corrected = json.loads(json.dumps(script_data))  # Deep copy
+        # Script-wide fixes cover every section, so each runs at most once
+        applied = set()
 
         for issue in issues:
             if not issue.auto_fixable:
                 continue
+            if issue.check_name in applied:
+                continue
+            if issue.check_name != 'timestamp_order':
+                applied.add(issue.check_name)
 
             if issue.check_name == 'tts_formatting':
                 corrected = self._fix_tts_formatting(corrected)
@@ -684,21 +825,29 @@ class OutputQualityGate:
 
         return script_data
 
+    def _formatter(self):
+        """TTSFormatter for the verified names, built on first use."""
+        if self._tts_formatter is None:
+            try:
+                from .tts_formatter import TTSFormatter
+            except ImportError:
+                try:
+                    from tts_formatter import TTSFormatter
+                except ImportError:
+                    return None
+            self._tts_formatter = TTSFormatter(verified_names=self.verified_names)
+        return self._tts_formatter
+
     def _fix_name_consistency(self, script_data: Dict) -> Dict:
         """Fix garbled names using verified canonical forms."""
         if not self.verified_names:
             return script_data
 
         # Use TTSFormatter's name-fix logic
-        try:
-            from .tts_formatter import TTSFormatter
-        except ImportError:
-            try:
-                from tts_formatter import TTSFormatter
-            except ImportError:
-                return script_data
+        formatter = self._formatter()
+        if formatter is None:
+            return script_data
 
-        formatter = TTSFormatter(verified_names=self.verified_names)
         sections = script_data.get('podcast_sections', [])
 
         for section in sections:
@@ -709,15 +858,10 @@ class OutputQualityGate:
 
     def _fix_stage_directions(self, script_data: Dict) -> Dict:
         """Strip stage directions from script content."""
-        try:
-            from .tts_formatter import TTSFormatter
-        except ImportError:
-            try:
-                from tts_formatter import TTSFormatter
-            except ImportError:
-                return script_data
+        formatter = self._formatter()
+        if formatter is None:
+            return script_data
 
-        formatter = TTSFormatter()
         sections = script_data.get('podcast_sections', [])
 
         for section in sections:
@@ -0,0 +1,150 @@
+"""
+Pipeline Budget - Latency and Token Budgets with Graceful Degradation
+
+Under quota or deadline pressure a slightly less polished episode is better
+than a run that stalls for hours. The controller checks the episode's
+wall-clock time and Gemini token usage (from the active UsageTracker) before
+each stage. Once either budget is exceeded, the remaining stages run in a
+cheaper mode:
+
+- binary_filtering: gates on a single cheaper model (no cascade escalation)
+- false_negative_recovery: skipped
+- rebuttal_verification: gates on the cheaper model, rewrite iterations capped
+- fact_validation: skipped
+
+Every decision is recorded in pipeline_metadata['stage_metadata']['pipeline_budget']
+(applied: false when the stage's module is not available).
+Degraded stages are not checkpointed, so the next run within budget redoes
+them at full quality.
+
+Config:
+    pipeline_budget:
+      enabled: false
+      max_latency_seconds: 3600    # episode wall-clock budget (null = none)
+      max_tokens: 2000000          # prompt + output + thinking tokens (null = none)
+      degraded_gate_model: gemini-2.5-flash
+      degraded_rebuttal_iterations: 1
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEGRADED_GATE_MODEL = 'gemini-2.5-flash'
+
+# Cheaper mode of each stage, applied in this order
+STAGE_DEGRADATIONS = {
+    'binary_filtering': ['cheaper_gate_model'],
+    'false_negative_recovery': ['skip_stage'],
+    'rebuttal_verification': ['cheaper_gate_model', 'cap_rebuttal_iterations'],
+    'fact_validation': ['skip_stage'],
+}
+
+
+class PipelineBudget:
+    """
+    Per-episode latency and token budgets deciding which stages degrade.
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialize the PipelineBudget.
+
+        Args:
+            config: Full pipeline configuration dictionary
+        """
+        budget_config = (config or {}).get('pipeline_budget', {})
+        self.max_latency_seconds = budget_config.get('max_latency_seconds')
+        self.max_tokens = budget_config.get('max_tokens')
+        self.degraded_gate_model = budget_config.get('degraded_gate_model', DEFAULT_DEGRADED_GATE_MODEL)
+        self.degraded_rebuttal_iterations = max(1, int(budget_config.get('degraded_rebuttal_iterations', 1)))
+
+        self.started = time.monotonic()
+        self.decisions: List[Dict[str, Any]] = []
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> Optional['PipelineBudget']:
+        """Budget per config, or None when disabled or without any limit."""
+        budget_config = (config or {}).get('pipeline_budget', {})
+        if not budget_config.get('enabled', False):
+            return None
+        if budget_config.get('max_latency_seconds') is None and budget_config.get('max_tokens') is None:
+            logger.warning("pipeline_budget enabled without max_latency_seconds or max_tokens - ignoring")
+            return None
+        return cls(config)
+
+    def start(self) -> None:
+        """Start the episode clock."""
+        self.started = time.monotonic()
+
+    def usage(self, tracker=None) -> Dict[str, Any]:
+        """Elapsed seconds and tokens used so far (tokens None without a tracker)."""
+        return {
+            'elapsed_seconds': round(time.monotonic() - self.started, 1),
+            'tokens': tracker.total_tokens() if tracker else None,
+        }
+
+    def exceeded(self, usage: Dict[str, Any]) -> List[str]:
+        """Names of the budgets the usage is over ('latency', 'tokens')."""
+        over = []
+        if self.max_latency_seconds is not None and usage['elapsed_seconds'] > self.max_latency_seconds:
+            over.append('latency')
+        if self.max_tokens is not None and usage['tokens'] is not None and usage['tokens'] > self.max_tokens:
+            over.append('tokens')
+        return over
+
+    def plan(self, stage: str, tracker=None) -> List[Dict[str, Any]]:
+        """
+        Decide how a stage about to run should degrade.
+
+        Args:
+            stage: Pipeline stage name
+            tracker: Active UsageTracker, if any
+
+        Returns:
+            The stage's degradation decisions (empty when within budget or
+            the stage has no cheaper mode); also appended to self.decisions
+        """
+        actions = STAGE_DEGRADATIONS.get(stage)
+        if not actions:
+            return []
+
+        usage = self.usage(tracker)
+        over = self.exceeded(usage)
+        if not over:
+            return []
+
+        decisions = []
+        for action in actions:
+            decision = {'stage': stage, 'action': action, 'exceeded': over, **usage}
+            if action == 'cheaper_gate_model':
+                decision['model'] = self.degraded_gate_model
+            elif action == 'cap_rebuttal_iterations':
+                decision['max_iterations'] = self.degraded_rebuttal_iterations
+            decisions.append(decision)
+
+        self.decisions.extend(decisions)
+        return decisions
+
+    def to_dict(self, tracker=None) -> Dict[str, Any]:
+        """Limits, current usage and all decisions, for pipeline metadata."""
+        return {
+            'max_latency_seconds': self.max_latency_seconds,
+            'max_tokens': self.max_tokens,
+            **self.usage(tracker),
+            'degraded_stages': list(dict.fromkeys(
+                d['stage'] for d in self.decisions if d.get('applied', True)
+            )),
+            'decisions': list(self.decisions),
+        }
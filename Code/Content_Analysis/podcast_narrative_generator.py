@@ -11,6 +11,12 @@ Usage:
     generator = NarrativeCreatorGenerator()
     script_data = generator.generate_unified_narrative(analysis_json_path, episode_title)
     output_path = generator.save_unified_script(script_data, episode_output_path)
+
+Sectioned mode (narrative_generation.mode: sectioned) writes the script from the
+structure plan in parallel: the intro, each pre_clip/post_clip pair and the outro
+are separate calls that share the persona, guidelines and plan as a common prompt
+prefix. Video clip sections are built from the analysis data, sections are
+assembled in plan order, and only failed sections are regenerated.
 """
 
 import os
@@ -22,6 +28,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, Any
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 from google import genai
 from google.genai import types
@@ -35,6 +42,50 @@ utils_dir = os.path.join(current_dir, '..', 'Utils')
 config_dir = os.path.join(current_dir, '..', 'Config')
 sys.path.extend([utils_dir, config_dir])
 
+try:
+    from .upload_registry import get_active_registry
+except ImportError:
+    try:
+        from Content_Analysis.upload_registry import get_active_registry
+    except ImportError:
+        try:
+            from upload_registry import get_active_registry
+        except ImportError:
+            get_active_registry = lambda: None
+
+try:
+    from .response_schemas import json_output_options, is_schema_rejection, reject_schema
+except ImportError:
+    try:
+        from Content_Analysis.response_schemas import json_output_options, is_schema_rejection, reject_schema
+    except ImportError:
+        try:
+            from response_schemas import json_output_options, is_schema_rejection, reject_schema
+        except ImportError:
+            json_output_options = lambda name: {}
+            is_schema_rejection = lambda error: False
+            reject_schema = lambda name, error: None
+
+try:
+    from Utils.api_cassette import create_gemini_client
+except ImportError:
+    try:
+        from api_cassette import create_gemini_client
+    except ImportError:
+        def create_gemini_client(api_key=None):
+            # A requested record/replay run must not fall through to live calls
+            if os.getenv('YOUTUBER_CASSETTE', 'off') != 'off':
+                raise RuntimeError("YOUTUBER_CASSETTE is set but Utils/api_cassette.py could not be imported")
+            return genai.Client(api_key=api_key)
+
+try:
+    from .usage_tracker import track_call
+except ImportError:
+    try:
+        from Content_Analysis.usage_tracker import track_call
+    except ImportError:
+        from usage_tracker import track_call
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -47,10 +98,17 @@ logger = logging.getLogger(__name__)
 class NarrativeCreatorGenerator:
     """Single-call narrative generator that creates unified script-timeline structure."""
     
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, config: Optional[Dict] = None):
         """Initialize the narrative generator with API configuration."""
         self.api_key = os.getenv('GEMINI_API_KEY')  # From environment variable
         self.model_name = "gemini-2.5-pro"  # Fixed model name
+
+        # Sectioned generation settings
+        narrative_config = (config or {}).get('narrative_generation', {})
+        self.section_mode = narrative_config.get('mode', 'single') == 'sectioned'
+        self.section_workers = narrative_config.get('max_workers', 4)
+        self.max_section_retries = narrative_config.get('max_section_retries', 2)
+        self.last_section_report = None
         # Initialize Gemini API
         self._configure_gemini()
         
@@ -62,7 +120,7 @@ class NarrativeCreatorGenerator:
         logger.info("Configuring Gemini API")
         try:
             if self.api_key:
-                _gemini_client = genai.Client(api_key=self.api_key)
+                _gemini_client = create_gemini_client(api_key=self.api_key)
                 logger.info("Gemini API client configured successfully")
                 return True
             else:
@@ -139,19 +197,15 @@ class NarrativeCreatorGenerator:
         try:
             # Upload file using the new google.genai Client pattern
             client = self._get_client()
-            display_name = f"Analysis Results - {episode_title}"
-            logger.info(f"Uploading to Gemini with display name: {display_name}")
-
-            uploaded_file = client.files.upload(
-                file=analysis_json_path,
-                config=types.UploadFileConfig(
-                    mime_type="text/plain",
-                    display_name=display_name
-                )
-            )
 
-            logger.info(f"File uploaded successfully: {uploaded_file.name}")
-            logger.info(f"File URI: {uploaded_file.uri}")
+            # Reuse a live upload of identical analysis content
+            registry = get_active_registry()
+            uploaded_file = registry.find(analysis_json_path, client) if registry else None
+
+            if uploaded_file is None:
+                uploaded_file = self._upload_new_file(client, analysis_json_path, episode_title)
+                if registry:
+                    registry.register(analysis_json_path, uploaded_file)
 
             # Wait for processing to complete
             while uploaded_file.state.name == "PROCESSING":
@@ -167,6 +221,24 @@ class NarrativeCreatorGenerator:
             logger.error(f"CRITICAL: File upload to Gemini failed: {e}")
             logger.error(f"Traceback: {traceback.format_exc()}")
             return None
+
+    def _upload_new_file(self, client, analysis_json_path: str, episode_title: str):
+        """Upload the analysis file to Gemini (no reuse)."""
+        display_name = f"Analysis Results - {episode_title}"
+        logger.info(f"Uploading to Gemini with display name: {display_name}")
+
+        uploaded_file = client.files.upload(
+            file=analysis_json_path,
+            config=types.UploadFileConfig(
+                mime_type="text/plain",
+                display_name=display_name
+            )
+        )
+
+        logger.info(f"File uploaded successfully: {uploaded_file.name}")
+        logger.info(f"File URI: {uploaded_file.uri}")
+        return uploaded_file
+
     def _extract_guest_name_from_title(self, episode_title: str) -> str:
         """
         Extract guest name from folder structure.
@@ -417,6 +489,41 @@ class NarrativeCreatorGenerator:
                 elif 'STOP' not in finish_str and finish_reason not in [1, 'STOP']:
                     logger.warning(f"Unexpected finish reason: {finish_reason}")
 
+    def _generate_json(self, contents, schema_name: str, temperature: float):
+        """
+        Generate a JSON response constrained to the named response schema.
+
+        Falls back to plain JSON mode if the API rejects the schema; the
+        caller's parsing/validation still handles malformed output.
+        """
+        client = self._get_client()
+        schema_options = json_output_options(schema_name)
+
+        def generate(options, attempt=0):
+            with track_call('podcast_narrative_generator', self.model_name, attempt) as call:
+                call.response = client.models.generate_content(
+                    model=self.model_name,
+                    contents=contents,
+                    config=types.GenerateContentConfig(
+                        temperature=temperature,
+                        top_p=0.9,
+                        candidate_count=1,
+                        **(options or {"response_mime_type": "application/json"})
+                    )
+                )
+            return call.response
+
+        try:
+            response = generate(schema_options)
+        except Exception as e:
+            if not schema_options or not is_schema_rejection(e):
+                raise
+            reject_schema(schema_name, e)
+            response = generate({}, attempt=1)
+
+        self._check_response_safety(response)
+        return response
+
     def _generate_structure_plan(self, uploaded_file, episode_title: str, narrative_format: str) -> Dict:
         """
         Call 1: Generate structure plan (temp 0.3).
@@ -449,20 +556,10 @@ class NarrativeCreatorGenerator:
 """
         full_prompt = episode_context + structure_prompt
 
-        client = self._get_client()
-        response = client.models.generate_content(
-            model=self.model_name,
-            contents=[full_prompt, uploaded_file],
-            config=types.GenerateContentConfig(
-                temperature=0.3,
-                top_p=0.9,
-                candidate_count=1,
-                response_mime_type="application/json",
-            )
+        response = self._generate_json(
+            [full_prompt, uploaded_file], 'structure_plan', temperature=0.3
         )
 
-        self._check_response_safety(response)
-
         response_text = response.text.strip()
         if response_text.startswith("```json"):
             response_text = response_text[7:]
@@ -534,29 +631,372 @@ class NarrativeCreatorGenerator:
 """
         full_prompt = episode_context + creative_prompt
 
-        client = self._get_client()
-        response = client.models.generate_content(
-            model=self.model_name,
-            contents=[full_prompt, uploaded_file],
-            config=types.GenerateContentConfig(
-                temperature=0.6,
-                top_p=0.9,
-                candidate_count=1,
-                response_mime_type="application/json",
-            )
+        response = self._generate_json(
+            [full_prompt, uploaded_file], 'creative_script', temperature=0.6
         )
 
-        self._check_response_safety(response)
-
         response_text = response.text
         logger.info(f"Received creative script: {len(response_text)} characters")
         return response_text
 
+    def _load_analysis_segments(self, analysis_json_path: str) -> Dict[str, Dict]:
+        """Load the analysis segments keyed by segment_id."""
+        with open(analysis_json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('segments', [])
+        return {
+            segment['segment_id']: segment
+            for segment in data
+            if isinstance(segment, dict) and segment.get('segment_id')
+        }
+
+    def _build_section_context(self, structure_plan: Dict, episode_title: str,
+                               custom_instructions: str = "") -> str:
+        """
+        Build the prompt prefix shared by every section call.
+
+        Episode context, persona and writing guidelines come first and the
+        structure plan (plus any custom instructions) last, so the prefix is
+        identical across the parallel calls and only the assignment that
+        follows it differs.
+        """
+        creative_prompt_path = os.path.join(
+            current_dir, 'Generation_Templates', 'narrative_creative_prompt.txt'
+        )
+        with open(creative_prompt_path, 'r', encoding='utf-8') as f:
+            creative_prompt = f.read()
+        # Character profile, task and writing guidelines (sections 1-3)
+        guidelines = creative_prompt.split('## 4. STRUCTURE PLAN')[0]
+        guidelines = guidelines.replace('{persona_definition}', self._load_persona())
+
+        section_prompt_path = os.path.join(
+            current_dir, 'Generation_Templates', 'narrative_section_prompt.txt'
+        )
+        with open(section_prompt_path, 'r', encoding='utf-8') as f:
+            section_prompt = f.read()
+        section_prompt = section_prompt.replace(
+            '{structure_plan}', json.dumps(structure_plan, indent=2)
+        )
+        if custom_instructions.strip():
+            # Ahead of the assignment heading the section template ends with
+            section_prompt = section_prompt.replace(
+                '## 6. YOUR ASSIGNMENT',
+                f"## ADDITIONAL INSTRUCTIONS\n{custom_instructions}\n\n---\n\n## 6. YOUR ASSIGNMENT"
+            )
+
+        host_name = self._extract_host_name_from_title(episode_title)
+        guest_name = self._extract_guest_name_from_title(episode_title)
+
+        episode_context = f"""
+## EPISODE CONTEXT
+**Episode Title:** {episode_title}
+**Host Name:** {host_name}
+**Guest Name:** {guest_name}
+
+**CRITICAL INSTRUCTION:** Use "{host_name}" as the host's name and "{guest_name}" as the guest's name throughout your script.
+
+---
+
+"""
+        return episode_context + guidelines + section_prompt
+
+    def _plan_section_jobs(self, structure_plan: Dict, segments: Dict[str, Dict],
+                           narrative_format: str):
+        """
+        Fan the structure plan out into independent section jobs.
+
+        Returns:
+            Tuple of (hook segment ID or None, included plan entries in
+            position order, list of jobs). Each job is the intro, one
+            pre_clip/post_clip pair, or the outro.
+        """
+        hook_id = None
+        hook_selection = structure_plan.get('hook_selection') or {}
+        if narrative_format == "with_hook" and hook_selection.get('segment_id') in segments:
+            hook_id = hook_selection['segment_id']
+
+        entries = []
+        for entry in sorted(structure_plan.get('clip_order', []), key=lambda e: e.get('position', 0)):
+            segment_id = entry.get('segment_id')
+            if entry.get('skip') or segment_id == hook_id:
+                continue
+            if segment_id not in segments:
+                logger.warning(f"Structure plan references unknown segment: {segment_id}")
+                continue
+            entries.append(entry)
+
+        titles = [segments[e['segment_id']].get('narrativeSegmentTitle', e['segment_id']) for e in entries]
+        clip_list = '\n'.join(f"{n}. {title}" for n, title in enumerate(titles, 1)) or "(none)"
+
+        if hook_id:
+            intro = {
+                'key': 'intro',
+                'section_types': ['intro_plus_hook_analysis'],
+                'assignment': (
+                    'Write one section of type "intro_plus_hook_analysis": the opening of the episode '
+                    'combined with the full deconstruction of the hook clip, which plays right before it. '
+                    'Then briefly preview the clips that follow. Also return the key_claims of the hook clip.\n\n'
+                    f"Hook clip data:\n{json.dumps(segments[hook_id], indent=2, ensure_ascii=False)}\n\n"
+                    f"Clips that follow:\n{clip_list}\n"
+                ),
+            }
+        else:
+            intro = {
+                'key': 'intro',
+                'section_types': ['intro'],
+                'assignment': (
+                    'Write one section of type "intro": the opening of the episode, with brief guest '
+                    'research and a preview of the upcoming clips.\n\n'
+                    f"Upcoming clips:\n{clip_list}\n"
+                ),
+            }
+
+        jobs = [intro]
+        for n, entry in enumerate(entries, 1):
+            segment_id = entry['segment_id']
+            previous = titles[n - 2] if n > 1 else "none (it follows the intro)"
+            following = titles[n] if n < len(titles) else "none (the outro follows)"
+            jobs.append({
+                'key': f"clip:{segment_id}",
+                'segment_id': segment_id,
+                'section_types': ['pre_clip', 'post_clip'],
+                'assignment': (
+                    f'Write two sections, "pre_clip" then "post_clip", for clip {n} of {len(entries)} '
+                    f"({segment_id}). Also return the key_claims of the clip.\n\n"
+                    f"Previous clip: {previous}\nNext clip: {following}\n\n"
+                    f"Plan entry:\n{json.dumps(entry, indent=2, ensure_ascii=False)}\n\n"
+                    f"Clip data:\n{json.dumps(segments[segment_id], indent=2, ensure_ascii=False)}\n"
+                ),
+            })
+        jobs.append({
+            'key': 'outro',
+            'section_types': ['outro'],
+            'assignment': (
+                'Write one section of type "outro" that synthesizes the patterns across the episode.\n\n'
+                f"Clips covered:\n{clip_list}\n"
+            ),
+        })
+        return hook_id, entries, jobs
+
+    def _generate_section(self, job: Dict, shared_context: str) -> Dict:
+        """Generate one section job and check it returned every assigned section."""
+        started = time.monotonic()
+        response = self._generate_json(
+            [shared_context + job['assignment']], 'narrative_section', temperature=0.6
+        )
+
+        response_text = response.text.strip()
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        data = json.loads(response_text.strip())
+
+        by_type = {
+            section.get('section_type'): section
+            for section in data.get('sections', [])
+            if isinstance(section, dict)
+        }
+        missing = [
+            section_type for section_type in job['section_types']
+            if not str(by_type.get(section_type, {}).get('script_content', '')).strip()
+        ]
+        if missing:
+            raise ValueError(f"Response missing section(s): {', '.join(missing)}")
+
+        return {
+            'sections': [by_type[section_type] for section_type in job['section_types']],
+            'key_claims': data.get('key_claims') or [],
+            'seconds': round(time.monotonic() - started, 2),
+        }
+
+    def _run_section_jobs(self, jobs, shared_context: str) -> Dict[str, Dict]:
+        """
+        Run section jobs concurrently, regenerating only the ones that fail.
+
+        Returns:
+            Dict of job key -> generated result
+
+        Raises:
+            Exception: If a job still fails after max_section_retries retries
+        """
+        results = {}
+        attempts = {job['key']: 0 for job in jobs}
+        pending = list(jobs)
+        started = time.monotonic()
+
+        for round_number in range(self.max_section_retries + 1):
+            if not pending:
+                break
+            if round_number:
+                logger.warning(
+                    f"Regenerating {len(pending)} failed section(s): "
+                    f"{', '.join(job['key'] for job in pending)}"
+                )
+
+            failed = []
+            with ThreadPoolExecutor(max_workers=max(1, min(self.section_workers, len(pending)))) as executor:
+                futures = [
+                    (job, executor.submit(self._generate_section, job, shared_context))
+                    for job in pending
+                ]
+                for job, future in futures:
+                    attempts[job['key']] += 1
+                    try:
+                        results[job['key']] = future.result()
+                    except Exception as e:
+                        logger.warning(f"Section {job['key']} failed: {e}")
+                        failed.append(job)
+            pending = failed
+
+        if pending:
+            raise Exception(
+                f"Sections failed after {self.max_section_retries + 1} attempts: "
+                f"{', '.join(job['key'] for job in pending)}"
+            )
+
+        self.last_section_report = {
+            'mode': 'sectioned',
+            'section_calls': len(jobs),
+            'regenerated': {key: count - 1 for key, count in attempts.items() if count > 1},
+            'wall_seconds': round(time.monotonic() - started, 2),
+            'slowest_section_seconds': max(result['seconds'] for result in results.values()),
+        }
+        return results
+
+    def _clip_times(self, segment: Dict):
+        """
+        Clip start/end seconds from the segment's fullerContextTimestamps.
+
+        Raises:
+            ValueError: If either timestamp is missing or not a number
+        """
+        timestamps = segment.get('fullerContextTimestamps') or {}
+        try:
+            return float(timestamps['start']), float(timestamps['end'])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Segment {segment['segment_id']} has no usable fullerContextTimestamps")
+
+    def _build_clip_section(self, segment: Dict, section_type: str, section_id: str,
+                            selection_reason: str, key_claims) -> Dict:
+        """Build a video_clip/hook_clip section directly from the analysis segment."""
+        start, end = self._clip_times(segment)
+        duration = segment.get('segmentDurationInSeconds') or end - start
+        suggested_clip = segment.get('suggestedClip', [])
+
+        return {
+            'section_type': section_type,
+            'section_id': section_id,
+            'clip_id': segment['segment_id'],
+            'start_time': f"{start:.1f}",
+            'end_time': f"{end:.1f}",
+            'title': segment.get('narrativeSegmentTitle', segment['segment_id']),
+            'selection_reason': selection_reason,
+            'severity_level': segment.get('severityRating', 'MEDIUM'),
+            'key_claims': key_claims or [entry.get('quote', '') for entry in suggested_clip],
+            'suggestedClip': suggested_clip,
+            'estimated_duration': f"{round(duration)}s" if duration else "clip length",
+        }
+
+    def _narration_section(self, generated: Dict, section_id: str, **references) -> Dict:
+        """Normalize a generated section to the unified script key order."""
+        section = {'section_type': generated['section_type'], 'section_id': section_id}
+        section.update(references)
+        section['script_content'] = generated['script_content']
+        section['estimated_duration'] = generated.get('estimated_duration', '30s')
+        return section
+
+    def _generate_sectioned_script(self, analysis_json_path: str, structure_plan: Dict,
+                                   episode_title: str, narrative_format: str,
+                                   custom_instructions: str = "") -> Dict:
+        """
+        Sectioned alternative to Call 2: generate sections in parallel and assemble them.
+
+        Raises:
+            ValueError: If a planned clip has no usable timestamps
+
+        Returns:
+            Dict containing the unified script-timeline structure
+        """
+        segments = self._load_analysis_segments(analysis_json_path)
+        hook_id, entries, jobs = self._plan_section_jobs(structure_plan, segments, narrative_format)
+        # Clip sections are copied from the analysis, so check them before any call
+        for segment_id in ([hook_id] if hook_id else []) + [entry['segment_id'] for entry in entries]:
+            self._clip_times(segments[segment_id])
+        logger.info(f"🎨 Sectioned generation: {len(jobs)} parallel section calls")
+
+        shared_context = self._build_section_context(structure_plan, episode_title, custom_instructions)
+        results = self._run_section_jobs(jobs, shared_context)
+
+        sections = []
+        intro = results['intro']
+        if hook_id:
+            sections.append(self._build_clip_section(
+                segments[hook_id], 'hook_clip', 'hook_clip_001',
+                (structure_plan.get('hook_selection') or {}).get('reason', ''), intro['key_claims']
+            ))
+            sections.append(self._narration_section(
+                intro['sections'][0], 'intro_plus_hook_analysis_001', hook_clip_reference=hook_id
+            ))
+        else:
+            sections.append(self._narration_section(intro['sections'][0], 'intro_001'))
+
+        for n, entry in enumerate(entries, 1):
+            segment_id = entry['segment_id']
+            segment = segments[segment_id]
+            pair = results[f"clip:{segment_id}"]
+            pre_clip, post_clip = pair['sections']
+            sections.append(self._narration_section(
+                pre_clip, f"pre_clip_{n:03d}", clip_reference=segment_id
+            ))
+            sections.append(self._build_clip_section(
+                segment, 'video_clip', f"video_clip_{n:03d}",
+                segment.get('brief_reasoning_for_classification') or segment.get('clipContextDescription', ''),
+                pair['key_claims']
+            ))
+            sections.append(self._narration_section(
+                post_clip, f"post_clip_{n:03d}", clip_reference=segment_id
+            ))
+
+        sections.append(self._narration_section(results['outro']['sections'][0], 'outro_001'))
+
+        overview = structure_plan.get('episode_overview', {})
+        clip_sections = [s for s in sections if s['section_type'] in ('video_clip', 'hook_clip')]
+        narration = [s for s in sections if s['section_type'] not in ('video_clip', 'hook_clip')]
+        # ~150 spoken words per minute plus clip playback
+        clip_seconds = sum(
+            float(s['estimated_duration'][:-1]) for s in clip_sections if s['estimated_duration'].endswith('s')
+        )
+        words = sum(len(s['script_content'].split()) for s in narration)
+        total_minutes = max(1, round((words / 150 * 60 + clip_seconds) / 60))
+
+        script_metadata = {
+            'total_estimated_duration': f"{total_minutes} minutes",
+            'target_audience': 'General audience interested in political discourse',
+            'key_themes': [g['label'] for g in structure_plan.get('thematic_groups', []) if g.get('label')]
+                          or [overview.get('primary_theme', 'media analysis')],
+            'total_clips_analyzed': len(clip_sections),
+            'tts_segments_count': len(narration),
+            'timeline_ready': True,
+        }
+        if hook_id:
+            script_metadata['hook_clip_id'] = hook_id
+
+        return {
+            'narrative_theme': overview.get('primary_theme', ''),
+            'podcast_sections': sections,
+            'script_metadata': script_metadata,
+        }
+
     def generate_unified_narrative(self, analysis_json_path: str, episode_title: str,
                                  narrative_format: str, custom_instructions: str = "") -> Dict:
         """
         Generate unified narrative via 2-call approach: structure plan + creative script.
 
+        In sectioned mode the creative script is replaced by parallel per-section
+        calls, so time-to-script is set by the slowest section.
+
         Args:
             analysis_json_path: Path to the analysis JSON file
             episode_title: Title of the episode for context
@@ -591,6 +1031,21 @@ class NarrativeCreatorGenerator:
                     json.dump(structure_plan, f, indent=2, ensure_ascii=False)
                 logger.info(f"Structure plan saved to: {plan_path}")
 
+            # Step 3 (sectioned mode): generate sections in parallel and assemble
+            if self.section_mode:
+                script_data = self._generate_sectioned_script(
+                    analysis_json_path, structure_plan, episode_title, narrative_format,
+                    custom_instructions
+                )
+                self._save_debug_files(
+                    "[sectioned approach]", json.dumps(script_data, indent=2, ensure_ascii=False),
+                    analysis_json_path
+                )
+                if not self._validate_output_structure(script_data):
+                    raise ValueError("Response structure validation failed")
+                logger.info("Sectioned narrative generation completed successfully")
+                return script_data
+
             # Step 3: Generate creative script (Call 2, temp 0.6)
             response_text = self._generate_creative_script(
                 uploaded_file, structure_plan, episode_title, narrative_format
@@ -0,0 +1,70 @@
+"""
+Rate Limiter - Shared Concurrency and Pacing Limits for External Calls
+
+Modules used to pace external calls with a fixed time.sleep(api_delay) before
+each request, which also serialized them. A RateLimiter bounds how many calls
+are in flight and spaces out their start times instead, so callers can run
+requests concurrently without exceeding the API's rate.
+
+Limiters are shared by name: every caller of the same API (e.g. the streaming
+Pass 1 workers and the batch recent-events stage) draws from one limiter.
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict
+
+
+class RateLimiter:
+    """
+    Bounds concurrent calls and enforces a minimum interval between call starts.
+    """
+
+    def __init__(self, max_concurrent: int = 4, min_interval: float = 0.0):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_concurrent: Maximum number of calls in flight
+            min_interval: Minimum seconds between the starts of two calls
+        """
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.min_interval = max(0.0, float(min_interval))
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    @contextmanager
+    def slot(self):
+        """Hold one call slot for the duration of the block."""
+        self._semaphore.acquire()
+        try:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start)
+                self._next_start = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+        finally:
+            self._semaphore.release()
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_shared_limiter(name: str, max_concurrent: int = 4, min_interval: float = 0.0) -> RateLimiter:
+    """
+    Return the process-wide limiter for name, creating it on first use.
+
+    Later callers get the existing limiter; its limits are those of the first.
+    """
+    with _limiters_lock:
+        if name not in _limiters:
+            _limiters[name] = RateLimiter(max_concurrent, min_interval)
+        return _limiters[name]
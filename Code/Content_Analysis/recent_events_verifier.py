@@ -7,6 +7,15 @@ AI training data.
 
 Pipeline Position: Runs AFTER Binary Segment Filtering, BEFORE Script Generation
 
+Claims are deduplicated across segments by normalized text and the unique set is
+searched concurrently under a shared rate limiter; grounded results are kept in
+the cross-episode claim cache for cache_ttl_hours. A claim of the same type
+worded nearly like a cached one reuses its result through the claim index.
+
+Config (quality_control.recent_events_verification):
+    max_concurrent_searches: 4
+    cache_ttl_hours: 24
+
 Author: Claude Code
 Created: 2024-12-29
 """
@@ -15,10 +24,10 @@ import os
 import re
 import json
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Any, Tuple, Optional
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict, replace
 
 # Try to import google.genai for Gemini with grounding
 try:
@@ -28,6 +37,53 @@ try:
 except ImportError:
     GENAI_AVAILABLE = False
 
+try:
+    from Utils.api_cassette import create_gemini_client
+except ImportError:
+    try:
+        from api_cassette import create_gemini_client
+    except ImportError:
+        def create_gemini_client(api_key=None):
+            # A requested record/replay run must not fall through to live calls
+            if os.getenv('YOUTUBER_CASSETTE', 'off') != 'off':
+                raise RuntimeError("YOUTUBER_CASSETTE is set but Utils/api_cassette.py could not be imported")
+            return genai.Client(api_key=api_key)
+
+try:
+    from .usage_tracker import track_call
+except ImportError:
+    try:
+        from Content_Analysis.usage_tracker import track_call
+    except ImportError:
+        from usage_tracker import track_call
+
+try:
+    from .rate_limiter import get_shared_limiter
+except ImportError:
+    try:
+        from Content_Analysis.rate_limiter import get_shared_limiter
+    except ImportError:
+        from rate_limiter import get_shared_limiter
+
+try:
+    from .claim_cache import ClaimCache, normalize_claim
+    from .claim_index import ClaimIndex
+except ImportError:
+    try:
+        from Content_Analysis.claim_cache import ClaimCache, normalize_claim
+        from Content_Analysis.claim_index import ClaimIndex
+    except ImportError:
+        from claim_cache import ClaimCache, normalize_claim
+        from claim_index import ClaimIndex
+
+try:
+    from .keyword_engine import KeywordEngine
+except ImportError:
+    try:
+        from Content_Analysis.keyword_engine import KeywordEngine
+    except ImportError:
+        from keyword_engine import KeywordEngine
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -43,6 +99,7 @@ class VerificationResult:
     search_evidence: str  # Summary of web search findings
     sources: List[str] = field(default_factory=list)
     confidence: float = 0.0  # 0.0 to 1.0
+    failed: bool = False  # Search call failed (result is not cached)
 
 
 @dataclass
@@ -74,6 +131,7 @@ class RecentEventsVerifier:
         'legislation': ['signed into law', 'passed bill', 'enacted', 'repealed', 'executive order'],
         'event': ['happened', 'occurred', 'took place', 'announced', 'resigned', 'appointed', 'fired']
     }
+    DATE_SENSITIVE_ENGINE = KeywordEngine(DATE_SENSITIVE_KEYWORDS, whole_words=False)
 
     def __init__(self, config: Dict[str, Any] = None):
         """
@@ -90,12 +148,25 @@ class RecentEventsVerifier:
             raise ValueError("GEMINI_API_KEY not found in config or environment")
 
         if GENAI_AVAILABLE:
-            self.client = genai.Client(api_key=api_key)
+            self.client = create_gemini_client(api_key=api_key)
         else:
             raise ImportError("google.genai package not available")
 
-        # Rate limiting
+        # Rate limiting: grounded searches share one limiter process-wide, each
+        # slot keeping the old one-request-per-api_delay pace
         self.api_delay = self.config.get('quality_control', {}).get('api_delay', 2)
+        verification_config = self.config.get('quality_control', {}).get('recent_events_verification', {})
+        self.max_concurrent = verification_config.get('max_concurrent_searches', 4)
+        self.limiter = get_shared_limiter(
+            'gemini_search_grounding', self.max_concurrent, self.api_delay / max(1, self.max_concurrent)
+        )
+
+        # Grounded results persisted across episodes until they may be outdated
+        self.claim_cache = ClaimCache.from_config(
+            self.config, namespace='recent_events',
+            ttl_hours=verification_config.get('cache_ttl_hours', 24)
+        )
+        self.claim_index = ClaimIndex.from_config(self.config, self.claim_cache)
 
         logger.info("RecentEventsVerifier initialized with Gemini grounding")
 
@@ -127,18 +198,16 @@ class RecentEventsVerifier:
 
         combined_text = ' '.join(text_fields).lower()
 
-        # Check for date-sensitive keywords
-        for claim_type, keywords in self.DATE_SENSITIVE_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in combined_text:
-                    # Extract the relevant claim context
-                    claims_to_verify.append({
-                        'type': claim_type,
-                        'keyword': keyword,
-                        'context': self._extract_claim_context(combined_text, keyword),
-                        'segment_id': segment.get('segment_identifier', 'unknown')
-                    })
-                    break  # One match per type is enough
+        # Check for date-sensitive keywords; one match per type is enough
+        for claim_type, keywords in self.DATE_SENSITIVE_ENGINE.found(combined_text).items():
+            keyword = keywords[0]
+            # Extract the relevant claim context
+            claims_to_verify.append({
+                'type': claim_type,
+                'keyword': keyword,
+                'context': self._extract_claim_context(combined_text, keyword),
+                'segment_id': segment.get('segment_identifier', 'unknown')
+            })
 
         return claims_to_verify
 
@@ -195,14 +264,15 @@ Be extremely careful: If someone is reported as dead/murdered, verify this with
 
         try:
             # Use Gemini with Google Search grounding
-            response = self.client.models.generate_content(
-                model='gemini-2.5-pro',
-                contents=verification_prompt,
-                config=types.GenerateContentConfig(
-                    temperature=0.1,
-                    tools=[types.Tool(google_search=types.GoogleSearch())]
+            with track_call('recent_events_verifier', 'gemini-2.5-pro') as call:
+                response = call.response = self.client.models.generate_content(
+                    model='gemini-2.5-pro',
+                    contents=verification_prompt,
+                    config=types.GenerateContentConfig(
+                        temperature=0.1,
+                        tools=[types.Tool(google_search=types.GoogleSearch())]
+                    )
                 )
-            )
 
             # Parse response
             response_text = response.text if hasattr(response, 'text') else str(response)
@@ -229,9 +299,51 @@ Be extremely careful: If someone is reported as dead/murdered, verify this with
                 verified_status='UNVERIFIED',
                 search_evidence=f"Verification failed: {str(e)}",
                 sources=[],
-                confidence=0.0
+                confidence=0.0,
+                failed=True
             )
 
+    def _claim_key(self, claim: Dict) -> str:
+        """
+        Dedup/cache key of a claim: its type and normalized context.
+
+        Context windows are cut at fixed character offsets, so the partial
+        words at either edge are dropped.
+        """
+        words = normalize_claim(claim.get('context', '')).split()
+        if len(words) > 4:
+            words = words[1:-1]
+        return f"{claim.get('type', 'event')}|{' '.join(words)}"
+
+    def _verify_unique_claim(self, claim: Dict, segment: Dict) -> VerificationResult:
+        """
+        Verify one claim, reusing a persisted result when one is still live.
+
+        Searches run under the shared limiter; successful results are stored
+        in the claim cache.
+        """
+        key = self._claim_key(claim)
+        cache = getattr(self, 'claim_cache', None)
+        if cache:
+            cached = cache.get(key)
+            if cached:
+                return VerificationResult(**cached)
+
+        claim_index = getattr(self, 'claim_index', None)
+        if claim_index is not None:
+            match = claim_index.get(claim.get('context', ''))
+            if match and match[0].get('claim_type') == claim.get('type', 'event'):
+                return VerificationResult(**match[0])
+
+        with self.limiter.slot():
+            result = self.verify_claim_with_search(claim, segment)
+
+        if cache and not result.failed:
+            cache.put(key, asdict(result))
+            if claim_index is not None:
+                claim_index.add(claim.get('context', ''), key)
+        return result
+
     def _extract_names_from_segment(self, segment: Dict) -> List[str]:
         """Extract person names from segment for search queries."""
         names = []
@@ -286,10 +398,99 @@ Be extremely careful: If someone is reported as dead/murdered, verify this with
 
         return result
 
+    def verify_segment(self, segment: Dict) -> Tuple[Dict[str, Any], Optional[VerificationReport]]:
+        """
+        Verify the date-sensitive claims of a single segment.
+
+        Args:
+            segment: Segment dictionary
+
+        Returns:
+            Tuple of (annotations to merge into the segment, report or None when
+            the segment has no date-sensitive claims)
+        """
+        segment_id = segment.get('segment_identifier', 'unknown')
+
+        # Identify date-sensitive claims
+        claims = self.identify_date_sensitive_claims(segment)
+
+        if not claims:
+            # No date-sensitive claims, pass through unchanged
+            return {}, None
+
+        logger.info(f"Segment {segment_id}: Found {len(claims)} date-sensitive claims to verify")
+
+        results = [self._verify_unique_claim(claim, segment) for claim in claims]
+        return self._build_segment_verification(segment, results)
+
+    def _build_segment_verification(
+        self,
+        segment: Dict,
+        results: List[VerificationResult]
+    ) -> Tuple[Dict[str, Any], VerificationReport]:
+        """
+        Turn a segment's claim results into its annotations and report.
+
+        Results may be shared with other segments, so each is re-attributed
+        to this segment's original assessment.
+        """
+        segment_id = segment.get('segment_identifier', 'unknown')
+        original_assessment = segment.get('why_harmful', '')
+        verification_results = [replace(r, original_assessment=original_assessment) for r in results]
+        requires_correction = False
+
+        for result in verification_results:
+            # Check if this verification contradicts the original assessment
+            if result.verified_status == 'CONFIRMED_TRUE':
+                # The event DID happen - check if we incorrectly called it misinformation
+                original = original_assessment.lower()
+                if 'false' in original or 'fabricat' in original or 'misinformation' in original:
+                    requires_correction = True
+                    logger.warning(f"CORRECTION NEEDED: Segment {segment_id} - Event confirmed TRUE but marked as misinformation")
+
+        # Create verification report
+        report = VerificationReport(
+            segment_id=segment_id,
+            total_claims_checked=len(verification_results),
+            claims_confirmed_true=sum(1 for r in verification_results if r.verified_status == 'CONFIRMED_TRUE'),
+            claims_confirmed_false=sum(1 for r in verification_results if r.verified_status == 'CONFIRMED_FALSE'),
+            claims_unverified=sum(1 for r in verification_results if r.verified_status == 'UNVERIFIED'),
+            verification_results=verification_results,
+            requires_correction=requires_correction
+        )
+
+        # Verification data added to the segment
+        annotations = {
+            '_verification': {
+                'checked': True,
+                'requires_correction': requires_correction,
+                'claims_verified': len(verification_results),
+                'results': [
+                    {
+                        'claim': r.claim_text[:100],
+                        'status': r.verified_status,
+                        'evidence': r.search_evidence[:200]
+                    }
+                    for r in verification_results
+                ]
+            }
+        }
+
+        if requires_correction:
+            # Mark segment for special handling - don't flag confirmed true events as misinformation
+            annotations['_correction_needed'] = True
+            annotations['_verified_events'] = [
+                r.claim_text for r in verification_results
+                if r.verified_status == 'CONFIRMED_TRUE'
+            ]
+
+        return annotations, report
+
     def verify_segments(
         self,
         segments: List[Dict],
-        output_path: Optional[str] = None
+        output_path: Optional[str] = None,
+        precomputed: Optional[List[Optional[Tuple[Dict[str, Any], Optional[VerificationReport]]]]] = None
     ) -> Tuple[List[Dict], Dict[str, Any]]:
         """
         Verify all segments for date-sensitive claims.
@@ -297,88 +498,84 @@ Be extremely careful: If someone is reported as dead/murdered, verify this with
         Args:
             segments: List of segment dictionaries
             output_path: Optional path to save verification report
+            precomputed: Optional list aligned with segments holding verify_segment
+                results already computed while Pass 1 was streaming (None entries
+                are verified now)
 
         Returns:
             Tuple of (updated_segments, verification_metadata)
         """
         logger.info(f"Starting recent events verification for {len(segments)} segments")
 
+        # Identify claims of every segment not verified while Pass 1 streamed
+        outcomes = [
+            precomputed[i] if precomputed and i < len(precomputed) else None
+            for i in range(len(segments))
+        ]
+        segment_claims = {
+            i: self.identify_date_sensitive_claims(segment)
+            for i, segment in enumerate(segments)
+            if outcomes[i] is None
+        }
+
+        # Dedupe normalized claims across segments (first occurrence is searched)
+        unique_claims: Dict[str, Tuple[Dict, Dict]] = {}
+        for i, claims in segment_claims.items():
+            for claim in claims:
+                unique_claims.setdefault(self._claim_key(claim), (claim, segments[i]))
+
+        total_claim_mentions = sum(len(claims) for claims in segment_claims.values())
+        logger.info(
+            f"Verifying {len(unique_claims)} unique date-sensitive claims "
+            f"({total_claim_mentions} mentions across segments)"
+        )
+
+        # Verify the unique set concurrently; the shared limiter paces the searches
+        resolved: Dict[str, VerificationResult] = {}
+        cache = getattr(self, 'claim_cache', None)
+        hits_before = cache.stats['hits'] if cache else 0
+        claim_index = getattr(self, 'claim_index', None)
+        near_before = claim_index.stats['near_duplicate_hits'] if claim_index is not None else 0
+        if unique_claims:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrent, len(unique_claims)))) as executor:
+                futures = {
+                    key: executor.submit(self._verify_unique_claim, claim, segment)
+                    for key, (claim, segment) in unique_claims.items()
+                }
+                resolved = {key: future.result() for key, future in futures.items()}
+        cache_hits = cache.stats['hits'] - hits_before if cache else 0
+        near_duplicate_hits = (
+            claim_index.stats['near_duplicate_hits'] - near_before if claim_index is not None else 0
+        )
+
+        # Fan the results back out to every segment that made the claim
+        for i, claims in segment_claims.items():
+            if claims:
+                outcomes[i] = self._build_segment_verification(
+                    segments[i], [resolved[self._claim_key(claim)] for claim in claims]
+                )
+            else:
+                outcomes[i] = ({}, None)
+
         verification_reports = []
         updated_segments = []
 
         total_claims_checked = 0
         total_corrections = 0
 
-        for segment in segments:
-            segment_id = segment.get('segment_identifier', 'unknown')
-
-            # Identify date-sensitive claims
-            claims = self.identify_date_sensitive_claims(segment)
-
-            if not claims:
-                # No date-sensitive claims, pass through unchanged
+        for segment, (annotations, report) in zip(segments, outcomes):
+            if report is None:
                 updated_segments.append(segment)
                 continue
 
-            logger.info(f"Segment {segment_id}: Found {len(claims)} date-sensitive claims to verify")
-
-            # Verify each claim
-            verification_results = []
-            requires_correction = False
-
-            for claim in claims:
-                time.sleep(self.api_delay)  # Rate limiting
-
-                result = self.verify_claim_with_search(claim, segment)
-                verification_results.append(result)
-                total_claims_checked += 1
-
-                # Check if this verification contradicts the original assessment
-                if result.verified_status == 'CONFIRMED_TRUE':
-                    # The event DID happen - check if we incorrectly called it misinformation
-                    original = segment.get('why_harmful', '').lower()
-                    if 'false' in original or 'fabricat' in original or 'misinformation' in original:
-                        requires_correction = True
-                        logger.warning(f"CORRECTION NEEDED: Segment {segment_id} - Event confirmed TRUE but marked as misinformation")
-
-            # Create verification report
-            report = VerificationReport(
-                segment_id=segment_id,
-                total_claims_checked=len(verification_results),
-                claims_confirmed_true=sum(1 for r in verification_results if r.verified_status == 'CONFIRMED_TRUE'),
-                claims_confirmed_false=sum(1 for r in verification_results if r.verified_status == 'CONFIRMED_FALSE'),
-                claims_unverified=sum(1 for r in verification_results if r.verified_status == 'UNVERIFIED'),
-                verification_results=verification_results,
-                requires_correction=requires_correction
-            )
-
             verification_reports.append(report)
+            total_claims_checked += report.total_claims_checked
+            if report.requires_correction:
+                total_corrections += 1
 
             # Update segment with verification data
             updated_segment = segment.copy()
-            updated_segment['_verification'] = {
-                'checked': True,
-                'requires_correction': requires_correction,
-                'claims_verified': len(verification_results),
-                'results': [
-                    {
-                        'claim': r.claim_text[:100],
-                        'status': r.verified_status,
-                        'evidence': r.search_evidence[:200]
-                    }
-                    for r in verification_results
-                ]
-            }
-
-            if requires_correction:
-                total_corrections += 1
-                # Mark segment for special handling - don't flag confirmed true events as misinformation
-                updated_segment['_correction_needed'] = True
-                updated_segment['_verified_events'] = [
-                    r.claim_text for r in verification_results
-                    if r.verified_status == 'CONFIRMED_TRUE'
-                ]
-
+            updated_segment.update(annotations)
             updated_segments.append(updated_segment)
 
         # Compile metadata
@@ -386,6 +583,9 @@ Be extremely careful: If someone is reported as dead/murdered, verify this with
             'total_segments': len(segments),
             'segments_with_date_sensitive_claims': len(verification_reports),
             'total_claims_checked': total_claims_checked,
+            'unique_claims_verified': len(unique_claims),
+            'claim_cache_hits': cache_hits,
+            'near_duplicate_hits': near_duplicate_hits,
             'corrections_needed': total_corrections,
             'timestamp': datetime.now().isoformat()
         }
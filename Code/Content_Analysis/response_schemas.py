@@ -0,0 +1,203 @@
+"""
+Response Schemas - Schema-Constrained JSON Output for Gemini Calls
+
+Pass 1, the narrative structure plan and the creative script used to be
+generated as free text and pushed through the JSON cleanup/repair chain
+(validate_and_clean_json, extract_and_fix_json, ...) when the model emitted
+malformed JSON, which in turn caused retries. With a response schema Gemini
+decodes directly into the expected structure.
+
+Schemas are derived from the JSON Schema files in JSON_Schemas/ and converted
+to the OpenAPI subset accepted by response_schema: $ref is inlined, nullable
+unions become "nullable", and keywords Gemini does not support (pattern,
+additionalProperties, allOf/if/then, const, $id, title) are dropped. Property
+order is preserved with propertyOrdering. Fields the prompts ask for that the
+validation schemas predate are added per schema in SCHEMA_EXTENSIONS.
+
+The repair path stays in place as a fallback: responses are still validated
+and cleaned, and if the API rejects a schema it is disabled for the rest of
+the run and the call is repeated without it.
+
+Config (structured_output):
+    enabled: true
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import os
+import copy
+import json
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+SCHEMAS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'JSON_Schemas')
+
+# Response schema name -> JSON Schema file
+SCHEMA_FILES = {
+    'pass1_analysis': 'original_analysis_results_schema.json',
+    'structure_plan': 'narrative_structure_plan_schema.json',
+    'creative_script': 'unified_podcast_script_schema.json',
+    'narrative_section': 'narrative_section_schema.json',
+}
+
+# Keywords of the OpenAPI schema subset that carry over unchanged
+_PASSTHROUGH_KEYS = (
+    'description', 'enum', 'format', 'minimum', 'maximum',
+    'minItems', 'maxItems', 'required',
+)
+
+
+def _extend_pass1(schema: Dict) -> None:
+    """Pass 1 rules allow up to 180s clips flagged with extended_clip."""
+    schema['items']['properties']['extended_clip'] = {
+        'type': 'boolean',
+        'description': 'True for multi-part arguments that need up to 180 seconds',
+    }
+
+
+def _extend_creative_script(schema: Dict) -> None:
+    """The with_hook output format adds hook sections and hook references."""
+    section = schema['properties']['podcast_sections']['items']['properties']
+    section['section_type']['enum'] += ['hook_clip', 'intro_plus_hook_analysis']
+    section['hook_clip_reference'] = {
+        'type': 'string',
+        'description': 'Segment ID of the hook clip (for intro_plus_hook_analysis sections)',
+    }
+    schema['properties']['script_metadata']['properties']['hook_clip_id'] = {
+        'type': 'string',
+        'description': 'Segment ID of the hook clip',
+    }
+
+
+SCHEMA_EXTENSIONS = {
+    'pass1_analysis': _extend_pass1,
+    'creative_script': _extend_creative_script,
+}
+
+_enabled = True
+_rejected = set()
+_cache: Dict[str, Dict] = {}
+_lock = threading.Lock()
+
+
+def configure_response_schemas(enabled: bool = True) -> None:
+    """Turn schema-constrained output on or off for the process."""
+    global _enabled
+    _enabled = bool(enabled)
+    with _lock:
+        _rejected.clear()
+
+
+def _resolve_ref(ref: str, root: Dict) -> Dict:
+    node = root
+    for part in ref.lstrip('#/').split('/'):
+        node = node[part]
+    return node
+
+
+def to_gemini_schema(schema: Dict, root: Optional[Dict] = None) -> Dict:
+    """
+    Convert a JSON Schema node to the OpenAPI subset used by response_schema.
+
+    Args:
+        schema: JSON Schema node
+        root: Root document for resolving local $ref (defaults to schema)
+
+    Returns:
+        Converted schema dictionary
+    """
+    root = root if root is not None else schema
+    if '$ref' in schema:
+        return to_gemini_schema(_resolve_ref(schema['$ref'], root), root)
+
+    converted: Dict[str, Any] = {}
+
+    schema_type = schema.get('type')
+    if isinstance(schema_type, list):
+        types_ = [t for t in schema_type if t != 'null']
+        if len(types_) < len(schema_type):
+            converted['nullable'] = True
+        schema_type = types_[0] if types_ else 'string'
+    if schema_type:
+        converted['type'] = schema_type.upper()
+
+    for key in _PASSTHROUGH_KEYS:
+        if key in schema:
+            converted[key] = copy.deepcopy(schema[key])
+
+    if 'properties' in schema:
+        converted['properties'] = {
+            name: to_gemini_schema(prop, root) for name, prop in schema['properties'].items()
+        }
+        converted['propertyOrdering'] = list(schema['properties'])
+    if 'items' in schema:
+        converted['items'] = to_gemini_schema(schema['items'], root)
+
+    return converted
+
+
+def load_response_schema(name: str) -> Optional[Dict]:
+    """
+    Return the Gemini response schema for a pipeline call.
+
+    Returns None when structured output is disabled, the schema was rejected
+    by the API earlier in the run, or the schema file cannot be loaded.
+    """
+    if not _enabled or name not in SCHEMA_FILES:
+        return None
+
+    with _lock:
+        if name in _rejected:
+            return None
+        if name in _cache:
+            return copy.deepcopy(_cache[name])
+
+    try:
+        with open(os.path.join(SCHEMAS_DIR, SCHEMA_FILES[name]), 'r', encoding='utf-8') as f:
+            source = json.load(f)
+        extend = SCHEMA_EXTENSIONS.get(name)
+        if extend:
+            extend(source)
+        schema = to_gemini_schema(source)
+    except Exception as e:
+        logger.warning(f"Could not load response schema '{name}': {e}")
+        return None
+
+    with _lock:
+        _cache[name] = schema
+    return copy.deepcopy(schema)
+
+
+def json_output_options(name: str) -> Dict[str, Any]:
+    """
+    Keyword arguments for GenerateContentConfig enabling JSON mode with the
+    named schema (empty when structured output is unavailable).
+    """
+    schema = load_response_schema(name)
+    if schema is None:
+        return {}
+    return {'response_mime_type': 'application/json', 'response_schema': schema}
+
+
+def is_schema_rejection(error: Exception) -> bool:
+    """True if an API error looks like the request's schema was refused."""
+    code = getattr(error, 'code', None) or getattr(error, 'status_code', None)
+    message = str(error).lower()
+    return code == 400 and ('schema' in message or 'mime' in message)
+
+
+def reject_schema(name: str, error: Exception) -> None:
+    """Stop sending the named schema for the rest of the run."""
+    logger.warning(f"Response schema '{name}' rejected by the API, using free-form JSON: {error}")
+    with _lock:
+        _rejected.add(name)
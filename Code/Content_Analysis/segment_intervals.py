@@ -0,0 +1,158 @@
+"""
+Segment Intervals - Sweep-Line Merge and Bisect Window Slicing
+
+Shared interval helpers for chunked analysis:
+
+- merge_overlapping(): deduplicates segments from overlapping chunks. Input is
+  swept in start order while a min-heap of merged segments keyed by end time
+  holds only the segments still "open" at the current start, so each segment
+  is compared against the few it can actually overlap instead of against
+  every merged segment (O(n log n + n*d), d = overlap depth).
+- IntervalIndex: answers "which intervals overlap [lo, hi)" with two bisects
+  over start-sorted intervals instead of rescanning every segment per window.
+
+Both reproduce the results of the original quadratic implementations exactly
+(same segments, same order, same replacement choices); see
+tests/test_segment_intervals.py.
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Severity ordering for tie-breaking
+SEVERITY_ORDER = {'CRITICAL': 4, 'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+
+Interval = Tuple[float, float]
+# (candidate, candidate_duration, existing, existing_duration) -> replace existing?
+TieBreak = Callable[[Dict, float, Dict, float], bool]
+
+
+def prefer_severity(candidate: Dict, candidate_duration: float, existing: Dict, existing_duration: float) -> bool:
+    """Prefer the higher severityRating, then the longer segment."""
+    candidate_severity = SEVERITY_ORDER.get(candidate.get('severityRating', ''), 0)
+    existing_severity = SEVERITY_ORDER.get(existing.get('severityRating', ''), 0)
+    return candidate_severity > existing_severity or (
+        candidate_severity == existing_severity and candidate_duration > existing_duration
+    )
+
+
+def prefer_duration(candidate: Dict, candidate_duration: float, existing: Dict, existing_duration: float) -> bool:
+    """Prefer the longer segment regardless of severity."""
+    return candidate_duration > existing_duration
+
+
+TIE_BREAK_POLICIES: Dict[str, TieBreak] = {
+    'severity': prefer_severity,
+    'duration': prefer_duration,
+}
+
+
+def merge_overlapping(
+    items: Sequence[Any],
+    interval_of: Callable[[Any], Optional[Interval]],
+    overlap_threshold: float = 0.5,
+    prefer: TieBreak = prefer_severity,
+) -> List[Any]:
+    """
+    Deduplicate items whose intervals overlap by more than overlap_threshold.
+
+    Overlap is measured relative to the shorter of the two intervals. A
+    duplicate is compared with the earliest-merged overlapping item only and
+    replaces it in place when prefer() says so. Items without a parseable
+    interval, or with a non-positive duration, are kept and never matched.
+
+    Args:
+        items: Items sorted by interval start
+        interval_of: Returns (start, end) for an item, or None if unparseable
+        overlap_threshold: Minimum overlap fraction to treat as duplicate
+        prefer: Tie-break policy deciding whether a duplicate replaces the kept item
+
+    Returns:
+        Merged items in first-seen order
+    """
+    merged: List[Any] = []
+    intervals: List[Optional[Interval]] = []
+    versions: List[int] = []
+    # (end, merged_index, version) of merged items that may still overlap
+    open_heap: List[Tuple[float, int, int]] = []
+    # With a negative threshold even disjoint intervals match, so nothing closes
+    can_close = overlap_threshold >= 0
+
+    for item in items:
+        interval = interval_of(item)
+        if interval is None or interval[1] - interval[0] <= 0:
+            merged.append(item)
+            intervals.append(None)
+            versions.append(0)
+            continue
+
+        start, end = interval
+        duration = end - start
+
+        # Close merged items that ended before this start (starts only increase)
+        while open_heap and (
+            open_heap[0][2] != versions[open_heap[0][1]]
+            or (can_close and open_heap[0][0] <= start)
+        ):
+            heapq.heappop(open_heap)
+
+        candidates = sorted({
+            index for _, index, version in open_heap if version == versions[index]
+        })
+
+        is_duplicate = False
+        for index in candidates:
+            ex_start, ex_end = intervals[index]
+            ex_duration = ex_end - ex_start
+            overlap = max(0, min(end, ex_end) - max(start, ex_start))
+            shorter_duration = min(duration, ex_duration)
+            if shorter_duration > 0 and overlap / shorter_duration > overlap_threshold:
+                if prefer(item, duration, merged[index], ex_duration):
+                    merged[index] = item
+                    intervals[index] = interval
+                    versions[index] += 1
+                    heapq.heappush(open_heap, (end, index, versions[index]))
+                is_duplicate = True
+                break
+
+        if not is_duplicate:
+            merged.append(item)
+            intervals.append(interval)
+            versions.append(0)
+            heapq.heappush(open_heap, (end, len(merged) - 1, 0))
+
+    return merged
+
+
+class IntervalIndex:
+    """
+    Static index answering overlap queries against a list of intervals.
+    """
+
+    def __init__(self, intervals: Sequence[Interval]):
+        """
+        Build the index.
+
+        Args:
+            intervals: (start, end) pairs; query results are indices into this list
+        """
+        self._order = sorted(range(len(intervals)), key=lambda i: intervals[i][0])
+        self._starts = [intervals[i][0] for i in self._order]
+        self._ends = [intervals[i][1] for i in self._order]
+        # Running max of ends: everything before the first value > lo ends at or before lo
+        self._max_ends = list(accumulate(self._ends, max))
+
+    def overlapping(self, lo: float, hi: float) -> List[int]:
+        """
+        Return indices of intervals with start < hi and end > lo, in original order.
+        """
+        first = bisect_right(self._max_ends, lo)
+        last = bisect_left(self._starts, hi)
+        return sorted(
+            self._order[p] for p in range(first, last) if self._ends[p] > lo
+        )
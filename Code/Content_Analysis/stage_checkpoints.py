@@ -0,0 +1,185 @@
+"""
+Stage Checkpoints - Resume the Multi-Pass Pipeline from the Last Valid Stage
+
+Only Pass 1 used to have a cache check, so a crash in rebuttal verification
+meant a rerun redid binary filtering, recent-events verification, diversity
+selection, false-negative recovery and script generation.
+
+After each sub-stage of MultiPassController.run_full_pipeline completes, its
+return value, the files it wrote and the stage_metadata it recorded are saved
+to Processing/checkpoints/<stage>.json together with a fingerprint of its
+inputs (input data and files by content, plus the config sections the stage
+reads). On a rerun a stage whose fingerprint matches is not executed: its files
+are restored (later stages rewrite some files in place) and its result is
+returned. The first stage whose inputs changed runs again, and since
+fingerprints are content-based everything downstream of a changed output runs
+again too.
+
+Config (checkpoints):
+    enabled: true
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Bump when the checkpoint layout changes so old checkpoints are ignored
+CHECKPOINT_VERSION = 1
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def input_digest(value: Any) -> str:
+    """
+    Content digest of a stage input.
+
+    Paths to existing files are hashed by file contents; anything else by its
+    canonical JSON form.
+    """
+    if isinstance(value, (str, os.PathLike)) and os.path.isfile(value):
+        return _file_sha256(value)
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def stage_fingerprint(stage: str, inputs: Iterable[Any], config: Any = None) -> str:
+    """Fingerprint of a stage's inputs and the config that shapes its output."""
+    parts = {
+        'stage': stage,
+        'version': CHECKPOINT_VERSION,
+        'inputs': [input_digest(value) for value in inputs],
+        'config': input_digest(config),
+    }
+    return input_digest(parts)
+
+
+class StageCheckpointStore:
+    """
+    Per-episode store of completed stage results keyed by input fingerprint.
+    """
+
+    def __init__(self, checkpoint_dir: str, base_dir: str):
+        """
+        Initialize the store.
+
+        Args:
+            checkpoint_dir: Directory holding one <stage>.json per stage
+            base_dir: Episode directory; file snapshots are stored relative to it
+        """
+        self.checkpoint_dir = checkpoint_dir
+        self.base_dir = base_dir
+
+    def _path(self, stage: str) -> str:
+        return os.path.join(self.checkpoint_dir, f"{stage}.json")
+
+    def load(self, stage: str, fingerprint: str) -> Optional[Dict]:
+        """
+        Return the checkpoint for stage if it was saved for these inputs.
+
+        Returns:
+            Checkpoint dict, or None if missing, stale or unreadable
+        """
+        path = self._path(stage)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint for {stage}: {e}")
+            return None
+
+        if checkpoint.get('version') != CHECKPOINT_VERSION or checkpoint.get('fingerprint') != fingerprint:
+            logger.info(f"Checkpoint for {stage} is stale (inputs changed)")
+            return None
+        return checkpoint
+
+    def save(self, stage: str, fingerprint: str, result: Any,
+             files: Iterable[str] = (), stage_metadata: Optional[Dict] = None,
+             stage_output: Optional[str] = None) -> None:
+        """
+        Persist a completed stage.
+
+        Args:
+            stage: Stage name
+            fingerprint: Fingerprint of the stage inputs
+            result: JSON-serializable stage return value (tuples are restored)
+            files: Files the stage wrote, snapshotted as they are now
+            stage_metadata: stage_metadata entries the stage recorded
+            stage_output: The stage's entry in stage_outputs, if any
+        """
+        snapshots = {}
+        for path in dict.fromkeys(files):
+            if path and os.path.isfile(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    snapshots[os.path.relpath(path, self.base_dir)] = f.read()
+
+        # Output paths are stored relative to the episode so it can be moved
+        result_is_path = isinstance(result, str) and os.path.isfile(result)
+        if result_is_path:
+            result = os.path.relpath(result, self.base_dir)
+
+        checkpoint = {
+            'stage': stage,
+            'version': CHECKPOINT_VERSION,
+            'fingerprint': fingerprint,
+            'saved_at': datetime.now().isoformat(),
+            'result': list(result) if isinstance(result, tuple) else result,
+            'result_is_tuple': isinstance(result, tuple),
+            'result_is_path': result_is_path,
+            'stage_output': os.path.relpath(stage_output, self.base_dir) if stage_output else None,
+            'stage_metadata': stage_metadata or {},
+            'files': snapshots,
+        }
+
+        try:
+            os.makedirs(self.checkpoint_dir, exist_ok=True)
+            path = self._path(stage)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(checkpoint, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to save checkpoint for {stage}: {e}")
+
+    def restore(self, checkpoint: Dict) -> Any:
+        """
+        Write a checkpoint's file snapshots back and return its stage result.
+        """
+        for relative_path, content in checkpoint.get('files', {}).items():
+            path = os.path.join(self.base_dir, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+
+        result = checkpoint.get('result')
+        if checkpoint.get('result_is_tuple'):
+            result = tuple(result)
+        elif checkpoint.get('result_is_path'):
+            result = os.path.join(self.base_dir, result)
+        return result
+
+    def stage_output(self, checkpoint: Dict) -> Optional[str]:
+        """Absolute stage_outputs path recorded in a checkpoint."""
+        relative_path = checkpoint.get('stage_output')
+        return os.path.join(self.base_dir, relative_path) if relative_path else None
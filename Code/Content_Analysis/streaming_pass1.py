@@ -0,0 +1,267 @@
+"""
+Streaming Pass 1 - Overlap Gate Filtering with Transcript Analysis Generation
+
+Pass 1 returns one large JSON array of harmful segments, and binary filtering
+used to start only after the whole array (and every chunk) had been generated.
+With streaming enabled, Pass 1 uses generate_content_stream and an incremental
+JSON array parser; every segment object is handed to a small worker pool as
+soon as its closing brace arrives. Workers run the 5-gate filter and, for
+passing segments, the recent-events verifier.
+
+The streamed verdicts are only a head start. Once Pass 1 completes, the
+controller still filters the final (cleaned, merged, renumbered) segment list;
+segments whose content matches a streamed segment reuse its verdict, anything
+else (e.g. repaired JSON, chunk-merge winners that never streamed) is
+evaluated as before. Output is therefore identical to the barrier pipeline.
+
+Config (pass1_streaming):
+    enabled: false
+    max_workers: 2
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+try:
+    from .usage_tracker import attributed_stage
+except ImportError:
+    try:
+        from Content_Analysis.usage_tracker import attributed_stage
+    except ImportError:
+        from usage_tracker import attributed_stage
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Keys assigned after generation (renumbered IDs, filter annotations)
+_VOLATILE_KEYS = {'segment_id', 'binary_filter_results'}
+
+
+def segment_fingerprint(segment: Dict) -> str:
+    """
+    Content hash of a Pass 1 segment, stable across chunk merge renumbering.
+
+    Ignores segment_id, binary_filter_results and underscore-prefixed pipeline
+    annotations such as _source_chunk.
+    """
+    content = {
+        k: v for k, v in segment.items()
+        if k not in _VOLATILE_KEYS and not k.startswith('_')
+    }
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class IncrementalJSONArrayParser:
+    """
+    Yields the objects of a top-level JSON array as text arrives.
+
+    Tolerates a leading markdown fence or preamble (anything before the first
+    '['). Objects that fail to parse are skipped; the final response still goes
+    through the normal validate/repair path.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._array_started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._object_start = None
+        self.parsed_count = 0
+        self.skipped_count = 0
+
+    @property
+    def finished(self) -> bool:
+        """True once the closing bracket of the top-level array was seen."""
+        return self._finished
+
+    def feed(self, text: str) -> List[Dict]:
+        """
+        Consume the next piece of streamed text.
+
+        Returns:
+            Objects completed by this piece, in array order
+        """
+        if self._finished or not text:
+            return []
+
+        self._buffer += text
+        completed = []
+        buffer = self._buffer
+        i = self._pos
+
+        while i < len(buffer):
+            char = buffer[i]
+
+            if not self._array_started:
+                if char == '[':
+                    self._array_started = True
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                if self._depth == 0 and char == '{':
+                    self._object_start = i
+                self._depth += 1
+            elif char in '}]':
+                if self._depth == 0:
+                    if char == ']':
+                        self._finished = True
+                        i += 1
+                        break
+                else:
+                    self._depth -= 1
+                    if self._depth == 0 and self._object_start is not None:
+                        obj = self._parse_object(buffer[self._object_start:i + 1])
+                        if obj is not None:
+                            completed.append(obj)
+                        self._object_start = None
+            i += 1
+
+        # Drop consumed text, keeping any partially received object
+        keep_from = self._object_start if self._object_start is not None else i
+        self._buffer = buffer[keep_from:]
+        if self._object_start is not None:
+            self._object_start = 0
+        self._pos = i - keep_from
+        return completed
+
+    def _parse_object(self, text: str) -> Optional[Dict]:
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError as e:
+            self.skipped_count += 1
+            logger.debug(f"Skipping unparseable streamed segment: {e}")
+            return None
+        if not isinstance(obj, dict):
+            self.skipped_count += 1
+            return None
+        self.parsed_count += 1
+        return obj
+
+
+@dataclass
+class StreamedVerdict:
+    """Filter (and optional recent-events) outcome for one streamed segment."""
+    filter_result: Any
+    verification: Optional[tuple] = None  # (annotations, VerificationReport or None)
+
+
+class StreamingSegmentProcessor:
+    """
+    Runs the gate filter and recent-events verifier on segments as Pass 1
+    streams them.
+    """
+
+    def __init__(self, segment_filter, recent_events_verifier=None, config: Optional[Dict] = None):
+        """
+        Initialize the StreamingSegmentProcessor.
+
+        Args:
+            segment_filter: BinarySegmentFilter (needs filter_segment)
+            recent_events_verifier: Optional RecentEventsVerifier (needs verify_segment)
+            config: Full pipeline configuration dictionary
+        """
+        streaming_config = (config or {}).get('pass1_streaming', {})
+        self.segment_filter = segment_filter
+        self.recent_events_verifier = recent_events_verifier
+        self.api_delay = getattr(segment_filter, 'api_delay', 0)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, streaming_config.get('max_workers', 2)),
+            thread_name_prefix='pass1-stream'
+        )
+        self._lock = threading.Lock()
+        self._futures = {}
+        self._verdicts: Dict[str, StreamedVerdict] = {}
+        self._started_at = time.monotonic()
+        self._first_verdict_at = None
+        self.stats = {'streamed': 0, 'duplicates': 0, 'evaluated': 0, 'errors': 0}
+
+    def submit(self, segment: Dict) -> None:
+        """Queue a streamed segment for filtering (duplicates are ignored)."""
+        fingerprint = segment_fingerprint(segment)
+        with self._lock:
+            if fingerprint in self._futures:
+                self.stats['duplicates'] += 1
+                return
+            self.stats['streamed'] += 1
+            self._futures[fingerprint] = self._executor.submit(
+                self._evaluate, fingerprint, dict(segment)
+            )
+
+    def _evaluate(self, fingerprint: str, segment: Dict) -> None:
+        # Book usage to the stages doing this work, not to whichever stage
+        # the controller is in while the worker runs
+        try:
+            with attributed_stage('binary_filtering'):
+                filter_result = self.segment_filter.filter_segment(segment)
+            verification = None
+            if filter_result.passed and self.recent_events_verifier:
+                segment_copy = segment.copy()
+                segment_copy['binary_filter_results'] = filter_result.to_dict()
+                with attributed_stage('recent_events_verification'):
+                    verification = self.recent_events_verifier.verify_segment(segment_copy)
+        except Exception as e:
+            logger.warning(f"Streamed segment evaluation failed, will re-run after Pass 1: {e}")
+            with self._lock:
+                self.stats['errors'] += 1
+            return
+
+        with self._lock:
+            self._verdicts[fingerprint] = StreamedVerdict(filter_result, verification)
+            self.stats['evaluated'] += 1
+            if self._first_verdict_at is None:
+                self._first_verdict_at = time.monotonic()
+
+        # Same pacing as filter_segments between API calls
+        if self.api_delay:
+            time.sleep(self.api_delay)
+
+    def wait(self) -> None:
+        """Block until every queued segment has been evaluated."""
+        with self._lock:
+            futures = list(self._futures.values())
+        wait(futures)
+
+    def lookup(self, segment: Dict) -> Optional[StreamedVerdict]:
+        """Return the streamed verdict for a segment with identical content."""
+        with self._lock:
+            return self._verdicts.get(segment_fingerprint(segment))
+
+    def shutdown(self, cancel: bool = False) -> None:
+        """Stop the worker pool (cancel=True drops queued segments)."""
+        self._executor.shutdown(wait=not cancel, cancel_futures=cancel)
+
+    def get_stats(self) -> Dict:
+        """Return streaming statistics for pipeline metadata."""
+        with self._lock:
+            stats = dict(self.stats)
+            first = self._first_verdict_at
+        stats['time_to_first_verdict_seconds'] = (
+            round(first - self._started_at, 2) if first is not None else None
+        )
+        return stats
@@ -0,0 +1,187 @@
+"""
+Tests for the API Record/Replay Cassette
+
+Created: 2026-10-18
+"""
+
+import os
+import sys
+import json
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+from google.genai import types
+
+from Utils.api_cassette import (
+    Cassette, CassetteGeminiClient, CassetteMissError, CassetteReplayError
+)
+
+
+def response(text, prompt_tokens=100):
+    """A real SDK response object."""
+    return types.GenerateContentResponse.model_validate({
+        'candidates': [{'content': {'role': 'model', 'parts': [{'text': text}]}, 'finish_reason': 'STOP'}],
+        'usage_metadata': {'prompt_token_count': prompt_tokens, 'candidates_token_count': 5},
+    })
+
+
+class ClientError(Exception):
+    """Stand-in for a google-genai API error."""
+
+    def __init__(self, message, code):
+        self.code = code
+        super().__init__(message)
+
+
+class TestGeminiCassette(unittest.TestCase):
+    """Recording Gemini calls and replaying them offline."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cassette_dir = os.path.join(self.test_dir, 'cassette')
+        self.transcript = os.path.join(self.test_dir, 'transcript.json')
+        with open(self.transcript, 'w', encoding='utf-8') as f:
+            json.dump({'segments': []}, f)
+
+        self.live = MagicMock()
+        self.live.files.upload.return_value = types.File(name='files/live-abc123', uri='https://x', state='ACTIVE')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def record_session(self):
+        """Upload a file, analyze it, and hit one failing and one streamed call."""
+        client = CassetteGeminiClient(Cassette(self.cassette_dir, mode='record'), self.live)
+        config = types.GenerateContentConfig(temperature=0.1)
+
+        self.live.models.generate_content.side_effect = [
+            response('[{"segment_id": "Harmful_Segment_01"}]'),
+            ClientError("429 RESOURCE_EXHAUSTED", 429),
+        ]
+        self.live.models.generate_content_stream.return_value = iter([response('[{"a"'), response(': 1}]')])
+
+        uploaded = client.files.upload(file=self.transcript)
+        first = client.models.generate_content(model='gemini-2.5-pro', contents=['rules', uploaded], config=config)
+        with self.assertRaises(ClientError):
+            client.models.generate_content(model='gemini-2.5-flash', contents='gate prompt')
+        streamed = ''.join(c.text for c in client.models.generate_content_stream(
+            model='gemini-2.5-pro', contents='stream me'))
+        return first, streamed
+
+    def test_replay_matches_recording_without_live_client(self):
+        """Test replay serves identical responses, remapping the uploaded file name."""
+        first, streamed = self.record_session()
+
+        cassette = Cassette(self.cassette_dir, mode='replay', latency='none')
+        client = CassetteGeminiClient(cassette)
+        uploaded = client.files.upload(file=self.transcript)
+        self.assertNotEqual(uploaded.name, 'files/live-abc123')
+
+        replayed = client.models.generate_content(
+            model='gemini-2.5-pro', contents=['rules', uploaded],
+            config=types.GenerateContentConfig(temperature=0.1)
+        )
+        self.assertEqual(replayed.text, first.text)
+        self.assertEqual(replayed.usage_metadata.prompt_token_count, 100)
+
+        with self.assertRaises(CassetteReplayError) as error:
+            client.models.generate_content(model='gemini-2.5-flash', contents='gate prompt')
+        self.assertEqual(error.exception.code, 429)
+
+        self.assertEqual(''.join(c.text for c in client.models.generate_content_stream(
+            model='gemini-2.5-pro', contents='stream me')), streamed)
+
+        with self.assertRaises(CassetteMissError):
+            client.models.generate_content(model='gemini-2.5-pro', contents='never recorded')
+        self.assertEqual(cassette.stats['misses'], 1)
+
+    def test_replay_injects_recorded_latency(self):
+        """Test recorded latency is replayed with scaling or a fixed delay."""
+        self.record_session()
+        key = next(iter(Cassette(self.cassette_dir, mode='replay')._entries))
+
+        scaled = Cassette(self.cassette_dir, mode='replay', latency='recorded', latency_scale=2.0)
+        recorded = scaled._entries[key][0]['latency_seconds']
+        self.assertEqual(scaled.delay(recorded), recorded * 2.0)
+        self.assertEqual(Cassette(self.cassette_dir, mode='replay', latency=0.25).delay(recorded), 0.25)
+
+        with patch('Utils.api_cassette.time.sleep') as sleep:
+            client = CassetteGeminiClient(Cassette(self.cassette_dir, mode='replay', latency=0.25))
+            with self.assertRaises(CassetteReplayError):
+                client.models.generate_content(model='gemini-2.5-flash', contents='gate prompt')
+        sleep.assert_called_once_with(0.25)
+
+
+class TestTTSCassette(unittest.TestCase):
+    """Recording and replaying TTS audio."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_audio_replayed_to_output_path(self):
+        """Test recorded audio bytes are copied to the output path on replay."""
+        cassette_dir = os.path.join(self.test_dir, 'cassette')
+        params = {'text': 'Hello there', 'voice': 'en-US-GuyNeural'}
+        recorded_path = os.path.join(self.test_dir, 'intro_001.mp3')
+
+        def produce():
+            with open(recorded_path, 'wb') as f:
+                f.write(b'ID3-audio')
+            return True
+
+        Cassette(cassette_dir, mode='record').synthesize('edge_tts', params, recorded_path, produce)
+
+        replay_path = os.path.join(self.test_dir, 'replay', 'intro_001.mp3')
+        live = MagicMock()
+        result = Cassette(cassette_dir, mode='replay', latency='none').synthesize(
+            'edge_tts', params, replay_path, live
+        )
+
+        self.assertTrue(result)
+        live.assert_not_called()
+        with open(replay_path, 'rb') as f:
+            self.assertEqual(f.read(), b'ID3-audio')
+
+
+class TestCassetteModuleIdentity(unittest.TestCase):
+    """One active cassette whichever path the module is imported through."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_both_import_paths_share_the_active_cassette(self):
+        """Test a cassette configured via api_cassette is active for Utils.api_cassette and vice versa."""
+        script = (
+            "import sys, importlib\n"
+            "sys.path[:0] = [{utils!r}, {code!r}]\n"
+            "first, second = importlib.import_module(sys.argv[1]), importlib.import_module(sys.argv[2])\n"
+            "cassette = first.configure_cassette({{'mode': 'replay', 'path': {path!r}, 'latency': 'none'}})\n"
+            "assert first is second and cassette is not None\n"
+            "assert second.get_active_cassette() is cassette\n"
+        ).format(utils=os.path.join(code_dir, 'Utils'), code=code_dir, path=os.path.join(self.test_dir, 'cassette'))
+
+        for order in (['api_cassette', 'Utils.api_cassette'], ['Utils.api_cassette', 'api_cassette']):
+            env = {k: v for k, v in os.environ.items() if not k.startswith('YOUTUBER_CASSETTE')}
+            result = subprocess.run([sys.executable, '-c', script, *order], capture_output=True, text=True,
+                                    env=env, cwd=self.test_dir)
+            self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
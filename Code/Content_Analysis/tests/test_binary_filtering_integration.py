@@ -18,10 +18,13 @@ Created: 2024-12-28
 import os
 import sys
 import json
+import time
+import threading
 import unittest
 import tempfile
 import shutil
 from pathlib import Path
+from concurrent.futures import wait
 from unittest.mock import patch, MagicMock
 
 # Add parent directories to path
@@ -141,6 +144,71 @@ class TestBinarySegmentFilter(unittest.TestCase):
         self.assertIsInstance(passed, list)
         self.assertIsInstance(metadata, dict)
 
+    def test_model_cascade_escalation(self):
+        """Test cascade: confident fast verdicts stick, borderline accuracy failures escalate."""
+        config = {'quality_control': {'model_cascade': {'enabled': True, 'confidence_threshold': 80}}}
+        segment_filter = BinarySegmentFilter(config, skip_api_init=True)
+
+        def gate_text(failed_gate=None, confidence=None):
+            lines = []
+            for i, (name, _, _) in enumerate(BinarySegmentFilter.GATES, 1):
+                lines.append(f"GATE_{i}_ANSWER: {'NO' if name == failed_gate else 'YES'}")
+                lines.append(f"GATE_{i}_JUSTIFICATION: Test justification")
+            if confidence is not None:
+                lines.append(f"CONFIDENCE: {confidence}")
+            return "\n".join(lines)
+
+        fast_replies = iter([gate_text(None, 95), gate_text('accuracy_check', 95), gate_text(None, 40)])
+
+        def fake_request(prompt, model, **kwargs):
+            if model == segment_filter.cascade.fast_model:
+                return next(fast_replies)
+            return gate_text(None)
+
+        with patch.object(segment_filter, '_request_consolidated', side_effect=fake_request) as request:
+            results = [segment_filter._evaluate_consolidated("content") for _ in range(3)]
+
+        self.assertTrue(all(first_failure is None for _, first_failure in results))
+        self.assertEqual(request.call_count, 5)
+
+        stats = segment_filter.cascade.get_stats()
+        self.assertEqual(stats['fast_only'], 1)
+        self.assertEqual(stats['escalated'], 2)
+        self.assertEqual(stats['verdict_agreements'], 1)
+        self.assertEqual(stats['escalation_reasons'], {'borderline_accuracy_check': 1, 'low_confidence': 1})
+
+    def test_gate_guidance_served_from_context_cache(self):
+        """Test static gate guidance is registered once and referenced by cache ID."""
+        import binary_segment_filter
+        # Use the context_cache module instance the filter actually imported
+        context_cache = sys.modules[binary_segment_filter.build_request.__module__]
+
+        cache = context_cache.LocalContextCache()
+        set_active_context_cache = context_cache.set_active_context_cache
+        segment_filter = BinarySegmentFilter({'api_delay': 0}, skip_api_init=True)
+        client = MagicMock()
+        client.models.generate_content.return_value = MagicMock(
+            text="\n".join(f"GATE_{i}_ANSWER: YES" for i in range(1, 6))
+        )
+
+        set_active_context_cache(cache)
+        try:
+            with patch.object(segment_filter, '_get_client', return_value=client):
+                segment_filter._evaluate_consolidated("TITLE: first segment")
+                gate_results, first_failure = segment_filter._evaluate_consolidated("TITLE: second segment")
+        finally:
+            set_active_context_cache(None)
+
+        self.assertIsNone(first_failure)
+        self.assertEqual(cache.stats['created'], 1)
+        self.assertEqual(cache.stats['hits'], 1)
+
+        call_kwargs = client.models.generate_content.call_args.kwargs
+        cache_name = call_kwargs['config'].cached_content
+        self.assertIn('GATE 5: REBUTTABILITY', cache.resolve(cache_name))
+        self.assertIn('second segment', call_kwargs['contents'])
+        self.assertNotIn('GATE 5: REBUTTABILITY', call_kwargs['contents'])
+
 
 class TestBinaryRebuttalVerifier(unittest.TestCase):
     """Tests for BinaryRebuttalVerifier module."""
@@ -201,6 +269,94 @@ class TestBinaryRebuttalVerifier(unittest.TestCase):
 
         self.assertEqual(metadata['rebuttals_verified'], post_clip_count)
 
+    def speculative_verifier(self, candidates, gates=None):
+        """Verifier with three parallel rewrites answering from candidates by temperature."""
+        config = {
+            'api_delay': 0,
+            'quality_control': {'rebuttal_verification': {'parallel_rewrites': 3}},
+            'claim_cache': {'enabled': False},
+        }
+        with patch.object(BinaryRebuttalVerifier, '_configure_gemini'):
+            verifier = BinaryRebuttalVerifier(config)
+
+        def fake_rewrite(temperature=None, **kwargs):
+            if gates and temperature in gates:
+                gates[temperature].wait(timeout=5)
+            return candidates[temperature]
+
+        def fake_evaluate(content, video_clip, clip_duration=None):
+            passed = content != "Original rebuttal." and 'fails' not in content
+            gate_results = {name: {'passed': passed, 'specific_issues': []} for name, _, _ in verifier.GATES}
+            return gate_results, (None if passed else 'sources'), (None if passed else 'Vague sources')
+
+        return verifier, fake_rewrite, fake_evaluate
+
+    def test_speculative_rewrites_pick_shortest_passing(self):
+        """Test parallel rewrite candidates: shortest passing candidate among finished ones wins."""
+        candidates = {
+            0.4: "A long rewrite that still fails the sources gate somehow.",
+            0.5: "A long rewrite that passes every gate with room to spare today.",
+            0.6: "Short passing rewrite.",
+        }
+        verifier, fake_rewrite, fake_evaluate = self.speculative_verifier(candidates)
+
+        def in_submission_order(futures):
+            # Every candidate finishes before the first result is looked at
+            wait(futures)
+            return iter(list(futures))
+
+        with patch.object(verifier, '_targeted_rewrite', side_effect=fake_rewrite), \
+                patch.object(verifier, '_evaluate_all_gates', side_effect=fake_evaluate) as evaluate, \
+                patch('binary_rebuttal_verifier.as_completed', side_effect=in_submission_order):
+            result = verifier.verify_with_correction({'section_id': 'post_clip_1', 'script_content': "Original rebuttal."})
+
+        self.assertTrue(result.passed)
+        self.assertEqual(result.iterations, 2)
+        self.assertEqual(result.final_content, "Short passing rewrite.")
+        self.assertEqual(result.rewrite_history[0]['speculative']['passing_candidates'], 2)
+        # Original + 3 candidates; the winner is not re-evaluated
+        self.assertEqual(evaluate.call_count, 4)
+
+    def test_speculative_rewrites_stop_at_first_passing(self):
+        """Test the first passing candidate ends the round and slower ones skip gate evaluation."""
+        candidates = {
+            0.4: "A rewrite that fails the sources gate.",
+            0.5: "Passing rewrite that took far too long.",
+            0.6: "A longer passing rewrite that finished first.",
+        }
+        slow = threading.Event()
+        verifier, fake_rewrite, fake_evaluate = self.speculative_verifier(candidates, gates={0.5: slow})
+
+        with patch.object(verifier, '_targeted_rewrite', side_effect=fake_rewrite), \
+                patch.object(verifier, '_evaluate_all_gates', side_effect=fake_evaluate) as evaluate:
+            result = verifier.verify_with_correction({'section_id': 'post_clip_1', 'script_content': "Original rebuttal."})
+            slow.set()
+
+        speculative = result.rewrite_history[0]['speculative']
+        self.assertEqual(result.final_content, "A longer passing rewrite that finished first.")
+        self.assertEqual(speculative['chosen_temperature'], 0.6)
+        self.assertIsNone(speculative['candidate_word_counts'][1])
+        self.assertGreaterEqual(speculative['abandoned_candidates'], 1)
+        time.sleep(0.05)
+        self.assertNotIn("Passing rewrite that took far too long.",
+                         [call.args[0] for call in evaluate.call_args_list])
+
+    def test_speculative_rewrites_fall_back_to_serial_candidate(self):
+        """Test candidate 0 is kept when no candidate passes."""
+        candidates = {t: f"Rewrite at {t} still fails the sources gate{'.' * n}"
+                      for n, t in enumerate((0.4, 0.5, 0.6, 0.7, 0.8))}
+        verifier, fake_rewrite, fake_evaluate = self.speculative_verifier(candidates)
+        verifier.max_iterations = 2
+
+        with patch.object(verifier, '_targeted_rewrite', side_effect=fake_rewrite), \
+                patch.object(verifier, '_evaluate_all_gates', side_effect=fake_evaluate):
+            result = verifier.verify_with_correction({'section_id': 'post_clip_1', 'script_content': "Original rebuttal."})
+
+        speculative = result.rewrite_history[0]['speculative']
+        self.assertFalse(result.passed)
+        self.assertEqual((speculative['chosen_temperature'], speculative['abandoned_candidates']), (0.4, 0))
+        self.assertEqual(speculative['passing_candidates'], 0)
+
 
 class TestDiversitySelector(unittest.TestCase):
     """Tests for DiversitySelector module."""
@@ -263,6 +419,48 @@ class TestDiversitySelector(unittest.TestCase):
         # Should return all available
         self.assertEqual(len(selected), 2)
 
+    def test_mmr_skips_near_duplicates(self):
+        """Test MMR prefers a unique segment over a reworded duplicate of a better one."""
+        duplicate_quote = 'The vaccine rollout hid thousands of injuries from the public'
+        segments = [
+            {'segment_id': 'vax_1', 'severity_level': 'CRITICAL', 'confidence_level': 'high',
+             'narrativeSegmentTitle': 'Vaccine injuries hidden', 'suggestedClip': [{'quote': duplicate_quote}]},
+            {'segment_id': 'vax_2', 'severity_level': 'CRITICAL', 'confidence_level': 'high',
+             'narrativeSegmentTitle': 'Vaccine injuries were hidden', 'suggestedClip': [{'quote': duplicate_quote}]},
+            {'segment_id': 'moon', 'severity_level': 'HIGH', 'confidence_level': 'medium',
+             'narrativeSegmentTitle': 'Moon landing staged', 'suggestedClip': [{'quote': 'Nobody ever walked on the moon'}]},
+            {'segment_id': 'fluoride', 'severity_level': 'LOW',
+             'narrativeSegmentTitle': 'Fluoride lowers IQ', 'suggestedClip': [{'quote': 'Fluoride in water makes kids dumber'}]},
+        ]
+        self.selector.selection_mode = 'mmr'
+
+        selected = self.selector.select_diverse(segments, min_count=1, max_count=2)
+        self.assertEqual([s['segment_id'] for s in selected], ['vax_1', 'moon'])
+
+        self.selector.selection_mode = 'round_robin'
+        self.assertIn('vax_2', [s['segment_id'] for s in self.selector.select_diverse(segments, min_count=1, max_count=3)])
+
+    def test_mmr_max_per_topic_and_scale(self):
+        """Test MMR enforces max_per_topic and handles hundreds of candidates quickly."""
+        import time
+        topics = ['vaccine', 'election', 'inflation', 'climate', 'censorship']
+        segments = [
+            {'segment_id': f'seg_{i}', 'severity_level': ['HIGH', 'MEDIUM', 'LOW'][i % 3],
+             'narrativeSegmentTitle': f'{topics[i % 5]} claim {i}',
+             'clipContextDescription': f'Guest repeats talking point {i % 40} about the {topics[i % 5]}'}
+            for i in range(600)
+        ]
+        self.selector.selection_mode = 'mmr'
+        self.selector.max_per_topic = 2
+
+        start = time.perf_counter()
+        selected = self.selector.select_diverse(segments, min_count=1, max_count=12)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(selected), 10)
+        self.assertEqual(set(self.selector.get_topic_distribution(selected).values()), {2})
+        self.assertLess(elapsed, 2.0)
+
 
 class TestFalseNegativeScanner(unittest.TestCase):
     """Tests for FalseNegativeScanner module."""
@@ -303,6 +501,63 @@ class TestFalseNegativeScanner(unittest.TestCase):
         candidates = self.scanner._find_keyword_candidates(self.rejected)
         self.assertIsInstance(candidates, list)
 
+    def test_candidates_ranked_by_priority(self):
+        """Test near-misses come before keyword matches and uncovered topics."""
+        candidates = [
+            {'segment_id': 'topic', '_recovery_reason': 'uncovered_topic', '_uncovered_topics': ['health']},
+            {'segment_id': 'kw_2', '_recovery_reason': 'high_severity_keywords', '_matched_keywords': ['fraud', 'fda']},
+            {'segment_id': 'kw_3', '_recovery_reason': 'high_severity_keywords',
+             '_matched_keywords': ['fraud', 'fda', 'lethal']},
+            {'segment_id': 'near', '_recovery_reason': 'near_miss', '_failed_gate': 'harm'},
+        ]
+        ranked = self.scanner._rank_candidates(candidates)
+        self.assertEqual([c['segment_id'] for c in ranked], ['near', 'kw_3', 'kw_2', 'topic'])
+
+    def test_parallel_waves_stop_at_quota(self):
+        """Test second opinions run concurrently in quota-sized waves and stop once the quota is met."""
+        import threading
+        import time
+        self.scanner.max_recovery = 2
+        self.scanner.max_concurrent = 4
+        candidates = [{'segment_id': f'seg_{i}', '_recovery_reason': 'near_miss'} for i in range(4)]
+        approve = {'seg_0': False, 'seg_1': True, 'seg_2': True, 'seg_3': True}
+        state = {'active': 0, 'peak': 0, 'calls': []}
+        lock = threading.Lock()
+
+        def second_opinion(candidate, failed_gate):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+                state['calls'].append(candidate['segment_id'])
+            time.sleep(0.05)
+            with lock:
+                state['active'] -= 1
+            return approve[candidate['segment_id']]
+
+        with patch.object(self.scanner, '_second_opinion_evaluate', side_effect=second_opinion):
+            recovered = self.scanner._re_evaluate_candidates(candidates)
+
+        # One wave of quota (2) + headroom (1); seg_3 is never requested
+        self.assertEqual(sorted(state['calls']), ['seg_0', 'seg_1', 'seg_2'])
+        self.assertEqual(state['peak'], 3)
+        self.assertEqual([c['segment_id'] for c in recovered], ['seg_1', 'seg_2'])
+        self.assertTrue(all(c['binary_filter_results']['recovered_via'] == 'second_opinion' for c in recovered))
+        self.assertEqual(self.scanner.last_recovery_stats['waves'], 1)
+
+    def test_queued_requests_cancelled_at_quota(self):
+        """Test requests not yet sent are cancelled when the quota fills first."""
+        self.scanner.max_recovery = 1
+        self.scanner.max_concurrent = 1
+        self.scanner.wave_headroom = 2
+        candidates = [{'segment_id': f'seg_{i}', '_recovery_reason': 'near_miss'} for i in range(3)]
+
+        with patch.object(self.scanner, '_second_opinion_evaluate', return_value=True) as second_opinion:
+            recovered = self.scanner._re_evaluate_candidates(candidates)
+
+        self.assertEqual([c['segment_id'] for c in recovered], ['seg_0'])
+        self.assertEqual(second_opinion.call_count, 1)
+        self.assertEqual(self.scanner.last_recovery_stats['evaluated'], 1)
+
 
 class TestOutputQualityGate(unittest.TestCase):
     """Tests for OutputQualityGate module."""
@@ -386,6 +641,47 @@ class TestOutputQualityGate(unittest.TestCase):
         tts_issues = [i for i in result.issues if i.check_name == 'tts_formatting']
         self.assertGreater(len(tts_issues), 0)
 
+    def repetitive_script(self):
+        phrase = "and the data never showed anything like that"
+        return {'podcast_sections': [
+            {'section_type': 'post_clip', 'section_id': f'post_{i}', 'clip_reference': f'clip_{i}',
+             'script_content': f"Rebuttal number {i} looks at the claim closely {phrase} at all."}
+            for i in range(4)
+        ] + [
+            {'section_type': 'outro', 'section_id': 'outro_1',
+             'script_content': "Thanks for listening, and check the sources linked in the description."}
+        ]}
+
+    def test_phrase_repetition_flags_longest_phrase_only(self):
+        """Test a phrase repeated in 3+ sections is flagged once, without its sub-phrases."""
+        result = self.gate.validate_script(self.repetitive_script())
+        repeated = [i.description for i in result.issues if i.check_name == 'phrase_repetition']
+
+        self.assertEqual(repeated[0], 'Phrase "data never showed anything like that" repeated across 4 sections')
+        self.assertNotIn('Phrase "the data never" repeated across 4 sections', repeated)
+        # Only maximal 6-word windows survive containment
+        self.assertTrue(all(len(d.split('"')[1].split()) == 6 for d in repeated))
+
+    def test_revalidation_rechecks_only_changed_sections(self):
+        """Test re-validating after a rewrite re-checks only the rewritten sections."""
+        script = self.repetitive_script()
+        self.gate.validate_script(script)
+        self.assertEqual(self.gate.last_validation_stats, {'sections': 5, 'sections_rechecked': 5})
+
+        # Rewrite two rebuttals so the phrase is left in only two sections
+        for section in script['podcast_sections'][:2]:
+            section['script_content'] = "A rewritten rebuttal citing the CDC & FDA reviews of the claim."
+
+        with patch.object(self.gate, '_section_content_issues', wraps=self.gate._section_content_issues) as checked:
+            result = self.gate.validate_script(script)
+
+        self.assertEqual(checked.call_count, 2)
+        self.assertEqual(self.gate.last_validation_stats, {'sections': 5, 'sections_rechecked': 2})
+        self.assertFalse([i for i in result.issues if i.check_name == 'phrase_repetition'])
+        self.assertEqual({i.location for i in result.issues if i.check_name == 'tts_formatting'},
+                         {'post_0', 'post_1'})
+        self.assertEqual(result.to_dict(), OutputQualityGate().validate_script(script).to_dict())
+
 
 class TestIntegrationPipeline(unittest.TestCase):
     """Test the full integration of all modules together."""
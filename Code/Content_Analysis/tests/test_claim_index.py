@@ -0,0 +1,175 @@
+"""
+Tests for Near-Duplicate Claim Matching
+
+Created: 2026-10-18
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+from claim_cache import ClaimCache
+from claim_index import ClaimIndex, canonical_claim
+from fact_validator import FactValidator, FactCheckResult
+from recent_events_verifier import RecentEventsVerifier, VerificationResult
+from binary_rebuttal_verifier import BinaryRebuttalVerifier
+from rate_limiter import RateLimiter
+
+CLAIM = "Studies show 50% of ballots in swing states were never verified by election officials"
+PARAPHRASE = "research shows half of ballots in swing states were never verified by election officials."
+DIFFERENT = "50% of ballots in swing states were verified twice by election officials"
+
+
+class TestClaimIndex(unittest.TestCase):
+    """MinHash/LSH matching over cached claims."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache = ClaimCache(os.path.join(self.test_dir, 'claim_cache.sqlite'), namespace='fact_check')
+        self.index = ClaimIndex(self.cache, threshold=0.8)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_canonical_wording(self):
+        """Test attribution lead-ins and fraction words do not change the canonical claim."""
+        self.assertEqual(canonical_claim(CLAIM), canonical_claim(PARAPHRASE))
+
+    def test_near_duplicate_resolves_to_verdict(self):
+        """Test a reworded claim finds the stored verdict and a different claim does not."""
+        self.cache.put('k1', {'verified': False})
+        self.index.add(CLAIM, 'k1')
+
+        value, similarity = self.index.get(PARAPHRASE)
+        self.assertEqual(value, {'verified': False})
+        self.assertGreaterEqual(similarity, 0.8)
+        self.assertIsNone(self.index.get(DIFFERENT))
+
+    def test_changed_figure_or_direction_is_a_miss(self):
+        """Test long claims differing only in a figure or direction word never share a verdict."""
+        tail = (" among vaccinated adults over sixty in the national registry study published last spring according"
+                " to the health ministry figures released on monday and reported by every major network in the"
+                " country that same evening")
+        for stored, query in (("hospitalizations rose 50%", "hospitalizations rose 5%"),
+                              ("hospitalizations increased sharply", "hospitalizations decreased sharply"),
+                              ("the risk was 1 in 50,000", "the risk was 1 in 5,000"),
+                              ("the vaccine was tested", "the vaccine was not tested")):
+            key = stored.replace(' ', '_')
+            self.cache.put(key, {'claim': stored})
+            self.index.add(stored + tail, key)
+            self.assertIsNone(self.index.get(query + tail), query)
+        self.assertEqual(self.index.get("hospitalizations increased sharply" + tail + ".")[0],
+                         {'claim': "hospitalizations increased sharply"})
+
+    def test_index_rows_of_evicted_entries_pruned(self):
+        """Test entries gone from the cache stop matching and leave the index."""
+        small = ClaimCache(self.cache.path, namespace='small', max_entries=1)
+        index = ClaimIndex(small)
+        small.put('k1', 1)
+        index.add(CLAIM, 'k1')
+        small.put('k2', 2)
+
+        self.assertIsNone(index.get(PARAPHRASE))
+        self.assertEqual(index.lookup(PARAPHRASE), [])
+
+
+class TestVerifiersShareNearDuplicates(unittest.TestCase):
+    """FactValidator, RecentEventsVerifier and BinaryRebuttalVerifier skip calls for near-duplicates."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.config = {
+            'api': {'gemini_api_key': 'test-key'},
+            'api_delay': 0,
+            'claim_cache': {'path': os.path.join(self.test_dir, 'claim_cache.sqlite')},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_fact_validator_reuses_reworded_claim(self):
+        """Test a reworded claim gets the stored verdict under its own wording."""
+        FactValidator(self.config)._add_to_cache(CLAIM, FactCheckResult(
+            claim=CLAIM, verified=False, source='google_fact_check', explanation='Rated False'
+        ))
+
+        validator = FactValidator(self.config)
+        with patch.object(FactValidator, '_query_google_fact_check') as query:
+            result = validator._check_cache(PARAPHRASE)
+        query.assert_not_called()
+        self.assertFalse(result.verified)
+        self.assertEqual(result.claim, PARAPHRASE)
+
+    def test_fact_validator_changed_figure_queried(self):
+        """Test a claim differing from a stored one only in its figure is checked again."""
+        FactValidator(self.config)._add_to_cache(CLAIM, FactCheckResult(
+            claim=CLAIM, verified=False, source='google_fact_check', explanation='Rated False'
+        ))
+        self.assertIsNone(FactValidator(self.config)._check_cache(CLAIM.replace('50%', '5%')))
+
+    def recent_events_verifier(self):
+        verifier = RecentEventsVerifier.__new__(RecentEventsVerifier)
+        verifier.config = self.config
+        verifier.max_concurrent = 2
+        verifier.limiter = RateLimiter(max_concurrent=2)
+        verifier.claim_cache = ClaimCache.from_config(self.config, 'recent_events', 24)
+        verifier.claim_index = ClaimIndex.from_config(self.config, verifier.claim_cache)
+        verifier.verify_claim_with_search = MagicMock(side_effect=lambda claim, segment: VerificationResult(
+            claim_text=claim['context'], claim_type=claim['type'], original_assessment='',
+            verified_status='CONFIRMED_FALSE', search_evidence='', confidence=0.9
+        ))
+        return verifier
+
+    def test_recent_events_reuses_same_type_only(self):
+        """Test near-duplicate contexts reuse results only for the same claim type."""
+        context = "he was assassinated last week in a shooting at the rally and the media is hiding it"
+        self.recent_events_verifier()._verify_unique_claim({'type': 'assassination', 'context': context}, {})
+
+        # The same quote cut from a different context window
+        shifted = f"said {context} today"
+        verifier = self.recent_events_verifier()
+        verifier._verify_unique_claim({'type': 'assassination', 'context': shifted}, {})
+        verifier.verify_claim_with_search.assert_not_called()
+
+        verifier._verify_unique_claim({'type': 'event', 'context': shifted}, {})
+        self.assertEqual(verifier.verify_claim_with_search.call_count, 1)
+
+    def test_rebuttal_gate_verdict_reused_only_for_identical_text(self):
+        """Test only a rebuttal identical after normalization skips gate evaluation."""
+        passing = {gate: {'passed': True, 'justification': 'ok', 'specific_issues': []}
+                   for gate, _, _ in BinaryRebuttalVerifier.GATES}
+        video_clip = {'title': 'Ballots', 'key_claims': ['Half of ballots were never verified']}
+        rebuttal = ("Every state audits its ballots. The Brennan Center and state election officials found "
+                    "signature checks on all mail ballots, and fewer than 1 in 50,000 were unverified.")
+
+        with patch.object(BinaryRebuttalVerifier, '_configure_gemini'):
+            first = BinaryRebuttalVerifier(self.config)
+            second = BinaryRebuttalVerifier(self.config)
+        with patch.object(BinaryRebuttalVerifier, '_evaluate_all_gates', return_value=(passing, None, '')) as gates:
+            first.verify_with_correction({'section_id': 'post_1', 'script_content': rebuttal}, video_clip)
+            result = second.verify_with_correction(
+                {'section_id': 'post_1', 'script_content': rebuttal.upper().replace(', and', ' -- and')}, video_clip
+            )
+            self.assertEqual(gates.call_count, 1)
+            self.assertTrue(result.passed)
+            self.assertEqual(second.gate_evaluations_reused, 1)
+
+            # A changed figure is near-identical text but a different claim
+            second.verify_with_correction(
+                {'section_id': 'post_1', 'script_content': rebuttal.replace('50,000', '5,000')}, video_clip
+            )
+        self.assertEqual(gates.call_count, 2)
+        self.assertEqual(second.gate_evaluations_reused, 1)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,192 @@
+"""
+Tests for the Cross-Episode Claim Library
+
+Created: 2026-10-18
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+from claim_library import ClaimLibrary, clip_topic
+from binary_rebuttal_verifier import BinaryRebuttalVerifier
+from youtube_description_generator import YouTubeDescriptionGenerator
+from multi_pass_controller import MultiPassController
+
+QUOTE = "The vaccine was never tested on pregnant women, not once, and they knew it."
+REBUTTAL = ("Pfizer's trial excluded pregnant women at first, but the CDC's v-safe registry and a 2022 "
+            "NEJM study followed over 35,000 pregnancies and found no added risk.")
+PASSING = {gate: {'passed': True, 'justification': 'ok', 'specific_issues': []}
+           for gate, _, _ in BinaryRebuttalVerifier.GATES}
+
+
+def clip_section(title="Vaccine never tested in pregnancy", key_claims=None, quote=QUOTE):
+    return {
+        'section_type': 'video_clip', 'section_id': 'video_clip_001', 'clip_id': 'seg_1',
+        'title': title, 'key_claims': key_claims or ['Vaccines untested in pregnancy'],
+        'severity_level': 'HIGH', 'suggestedClip': [{'speaker': 'Guest', 'quote': quote}],
+    }
+
+
+def script(clip, rebuttal=REBUTTAL):
+    return {'podcast_sections': [
+        clip,
+        {'section_type': 'post_clip', 'section_id': 'post_clip_001', 'clip_reference': clip['clip_id'],
+         'script_content': rebuttal},
+    ]}
+
+
+class TestClaimLibrary(unittest.TestCase):
+    """Verified rebuttals, verdicts and sources shared across episodes."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.config = {
+            'api': {'gemini_api_key': 'test-key'},
+            'api_delay': 0,
+            'claim_cache': {'path': os.path.join(self.test_dir, 'claim_cache.sqlite')},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_lookup_by_claim_and_topic(self):
+        """Test entries match segments and reworded clip sections, and list by topic."""
+        library = ClaimLibrary.from_config(self.config)
+        library.record(clip_section(), rebuttal=REBUTTAL, gate_results=PASSING)
+        library.record(clip_section(), verdict='MISLEADING')
+
+        segment = {'narrativeSegmentTitle': 'Vaccine never tested in pregnancy',
+                   'suggestedClip': [{'quote': QUOTE}]}
+        entry = library.lookup(segment)
+        self.assertEqual((entry['rebuttal'], entry['verdict']), (REBUTTAL, 'MISLEADING'))
+
+        reworded = clip_section(quote=QUOTE.replace('and they knew it', 'and they knew it all along'))
+        self.assertIsNone(library.lookup(reworded))
+        self.assertEqual(library.lookup(reworded, near_duplicates=True)['rebuttal'], REBUTTAL)
+        self.assertEqual(library.candidate_for(reworded)['rebuttal'], REBUTTAL)
+        self.assertIsNone(library.lookup(clip_section(title="Moon landing faked", quote="It was a film set."),
+                                         near_duplicates=True))
+
+        self.assertEqual(clip_topic(segment), 'health')
+        self.assertEqual([e['verdict'] for e in library.topic_entries('health')], ['MISLEADING'])
+
+    def test_disabled(self):
+        """Test claim_library.enabled false turns the library off."""
+        self.config['claim_library'] = {'enabled': False}
+        self.assertIsNone(ClaimLibrary.from_config(self.config))
+
+    def verifier(self):
+        with patch.object(BinaryRebuttalVerifier, '_configure_gemini'):
+            return BinaryRebuttalVerifier(self.config)
+
+    def test_library_rebuttal_short_circuits_verification(self):
+        """Test a later episode reusing the library rebuttal skips gate evaluation."""
+        with patch.object(BinaryRebuttalVerifier, '_evaluate_all_gates', return_value=(PASSING, None, '')) as gates:
+            self.verifier().verify_script_rebuttals(script(clip_section()))
+            self.assertEqual(gates.call_count, 1)
+
+            # Different generated key_claims, so only the library can match
+            later = self.verifier()
+            later.gate_memory = None
+            _, metadata = later.verify_script_rebuttals(
+                script(clip_section(key_claims=['No pregnancy testing', 'Cover-up']))
+            )
+        self.assertEqual(gates.call_count, 1)
+        self.assertEqual(metadata['gate_evaluations_reused'], 1)
+
+    def test_changed_figure_not_short_circuited(self):
+        """Test a library rebuttal is reused only when the new rebuttal is identical."""
+        with patch.object(BinaryRebuttalVerifier, '_evaluate_all_gates', return_value=(PASSING, None, '')) as gates:
+            self.verifier().verify_script_rebuttals(script(clip_section()))
+
+            later = self.verifier()
+            later.gate_memory = None
+            later.verify_script_rebuttals(script(clip_section(), rebuttal=REBUTTAL.replace('35,000', '3,500')))
+        self.assertEqual(gates.call_count, 2)
+        self.assertEqual(later.gate_evaluations_reused, 0)
+
+    def test_failed_rebuttal_not_recorded(self):
+        """Test only rebuttals that pass every gate enter the library."""
+        failing = {**PASSING, 'sources': {'passed': False, 'justification': 'vague', 'specific_issues': []}}
+        verifier = self.verifier()
+        verifier.max_iterations = 1
+        with patch.object(BinaryRebuttalVerifier, '_evaluate_all_gates', return_value=(failing, 'sources', 'vague')):
+            verifier.verify_script_rebuttals(script(clip_section()))
+        self.assertIsNone(ClaimLibrary.from_config(self.config).lookup(clip_section()))
+
+    def test_description_reuses_verdicts_and_sources(self):
+        """Test known claims skip the grounded source search."""
+        summary = {'title': 'Untested in pregnancy', 'verdict': 'MISLEADING',
+                   'raw_text': '"Untested in pregnancy" - MISLEADING\nv-safe followed 35,000 pregnancies.',
+                   'sources_line': 'Sources: https://www.cdc.gov/v-safe'}
+        other = clip_section(title="Ivermectin cures covid", quote="Ivermectin cured everyone I know.")
+        other['clip_id'] = 'seg_2'
+
+        with patch.object(YouTubeDescriptionGenerator, '_configure_gemini'):
+            first = YouTubeDescriptionGenerator(self.config)
+            second = YouTubeDescriptionGenerator(self.config)
+        with patch.object(YouTubeDescriptionGenerator, '_generate_summaries_with_sources',
+                          return_value=[summary]) as search:
+            first._generate_summaries(first._extract_claim_rebuttal_pairs(script(clip_section())))
+            summaries, reused = second._generate_summaries(second._extract_claim_rebuttal_pairs({
+                'podcast_sections': script(clip_section())['podcast_sections'] + [other]
+            }))
+
+        self.assertEqual(search.call_count, 2)
+        self.assertEqual([pair['title'] for pair in search.call_args.args[0]], ['Ivermectin cures covid'])
+        self.assertEqual(reused, 1)
+        self.assertEqual(summaries[0]['sources_line'], 'Sources: https://www.cdc.gov/v-safe')
+
+    def test_description_searches_reworded_claims(self):
+        """Test a near-duplicate claim's verdict and sources are not published without a search."""
+        library = ClaimLibrary.from_config(self.config)
+        library.record(clip_section(), verdict='MISLEADING', summary='v-safe followed 35,000 pregnancies.',
+                       sources_line='Sources: https://www.cdc.gov/v-safe')
+        reworded = clip_section(quote=QUOTE.replace('and they knew it', 'and they knew it all along'))
+
+        with patch.object(YouTubeDescriptionGenerator, '_configure_gemini'):
+            generator = YouTubeDescriptionGenerator(self.config)
+        with patch.object(YouTubeDescriptionGenerator, '_generate_summaries_with_sources',
+                          return_value=[]) as search:
+            _, reused = generator._generate_summaries(generator._extract_claim_rebuttal_pairs(script(reworded)))
+
+        self.assertEqual(reused, 0)
+        self.assertEqual(search.call_count, 1)
+
+    def test_script_generation_offered_candidates(self):
+        """Test segments with a recorded claim carry the prior verified rebuttal."""
+        library = ClaimLibrary.from_config(self.config)
+        library.record(clip_section(), rebuttal=REBUTTAL, gate_results=PASSING, verdict='MISLEADING')
+
+        controller = MultiPassController.__new__(MultiPassController)
+        controller.claim_library = library
+        controller.stage_metadata = {}
+        controller.enhanced_logger = MagicMock()
+        segments = [
+            {'segment_id': 'S1', 'narrativeSegmentTitle': 'Vaccine never tested in pregnancy',
+             'suggestedClip': [{'quote': QUOTE}]},
+            {'segment_id': 'S2', 'narrativeSegmentTitle': 'Tax cuts pay for themselves',
+             'suggestedClip': [{'quote': 'Every tax cut pays for itself.'}]},
+        ]
+
+        attached = controller._attach_library_candidates(segments)
+
+        self.assertEqual(attached[0]['prior_verified_rebuttal']['rebuttal'], REBUTTAL)
+        self.assertNotIn('prior_verified_rebuttal', attached[1])
+        self.assertNotIn('prior_verified_rebuttal', segments[0])
+        self.assertEqual(controller.stage_metadata['claim_library']['candidates_offered'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
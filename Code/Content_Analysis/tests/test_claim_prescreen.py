@@ -0,0 +1,117 @@
+"""
+Tests for the Claim-Density Prescreen
+
+Created: 2026-10-18
+"""
+
+import os
+import sys
+import unittest
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+from claim_prescreen import ClaimDensityScorer
+
+FILLER = "yeah man that is so funny I was just out walking the dog and it was nice out"
+CLAIM = "the study found forty percent of kids who took it died and the FDA covered up the data"
+TOPIC = "I think the media narrative on the economy and inflation is pretty interesting honestly"
+
+
+def transcript(texts, seconds=30.0):
+    """One segment per text, back to back."""
+    return {"segments": [
+        {"speaker": "SPEAKER_00", "text": text, "start_time": i * seconds, "end_time": (i + 1) * seconds}
+        for i, text in enumerate(texts)
+    ]}
+
+
+class TestClaimDensityScoring(unittest.TestCase):
+    """Cue scoring of transcript text."""
+
+    def setUp(self):
+        self.scorer = ClaimDensityScorer({})
+
+    def test_claims_outscore_filler(self):
+        """Test claim-heavy text scores above topical chat, which scores above filler."""
+        claim, counts = self.scorer.score_text(CLAIM)
+        topic, _ = self.scorer.score_text(TOPIC)
+        filler, _ = self.scorer.score_text(FILLER)
+
+        self.assertGreater(claim, topic)
+        self.assertGreater(topic, filler)
+        self.assertEqual(filler, 0)
+        self.assertGreater(counts['severity'], 0)
+        self.assertGreater(counts['statistic'], 0)
+
+    def test_acronyms_only_count_in_capitals(self):
+        """Test 'who' the pronoun is not mistaken for the WHO."""
+        _, lower = self.scorer.score_text("the guy who called me")
+        _, upper = self.scorer.score_text("the WHO said so")
+        self.assertEqual(lower['severity'], 0)
+        self.assertEqual(upper['severity'], 1)
+
+    def test_inflections_match_whole_words(self):
+        """Test keyword stems match their inflections but not longer words."""
+        self.assertEqual(self.scorer.CUE_ENGINE.counts("he was inaugurated at the inauguration"),
+                         {'date_sensitive': 2})
+        self.assertEqual(self.scorer.CUE_ENGINE.counts("the polls and the pollster"), {'statistic': 1})
+
+
+class TestPrescreen(unittest.TestCase):
+    """Window selection and transcript reduction."""
+
+    def setUp(self):
+        # 60 minutes of filler with one claim at minute 30
+        texts = [FILLER] * 120
+        texts[60] = CLAIM
+        self.transcript = transcript(texts)
+
+    def test_keeps_padded_claim_window_only(self):
+        """Test only the claim window and its padding reach Pass 1."""
+        scorer = ClaimDensityScorer({'claim_prescreen': {
+            'recall_safety': False, 'window_seconds': 120, 'padding_seconds': 60
+        }})
+        reduced, report = scorer.prescreen(self.transcript)
+
+        self.assertTrue(report.applied)
+        starts = [s['start_time'] for s in reduced['segments']]
+        self.assertIn(1800.0, starts)
+        self.assertEqual(starts, sorted(starts))
+        # Window 1800-1920s padded by 60s on each side
+        self.assertEqual((min(starts), max(starts)), (1740.0, 1950.0))
+        self.assertLess(report.estimated_tokens_kept, report.estimated_tokens_total / 10)
+        # Original times are kept so Pass 1 timestamps need no remapping
+        self.assertIs(reduced['segments'][0], self.transcript['segments'][int(min(starts) // 30)])
+
+    def test_recall_safety_keeps_minimum_fraction(self):
+        """Test recall-safety mode keeps at least min_keep_fraction of windows."""
+        scorer = ClaimDensityScorer({'claim_prescreen': {
+            'recall_safety': True, 'min_keep_fraction': 0.25, 'padding_seconds': 0
+        }})
+        _, report = scorer.prescreen(self.transcript)
+        self.assertGreaterEqual(report.windows_kept, report.windows_total * 0.25)
+
+    def test_recall_safety_falls_back_to_full_transcript(self):
+        """Test a claim-dense episode is analyzed in full."""
+        dense = transcript([CLAIM, TOPIC] * 30)
+        reduced, report = ClaimDensityScorer({}).prescreen(dense)
+        self.assertFalse(report.applied)
+        self.assertIs(reduced, dense)
+
+    def test_no_candidate_windows_keeps_full_transcript(self):
+        """Test a transcript with no window above threshold is passed on unchanged."""
+        filler = transcript([FILLER] * 20)
+        scorer = ClaimDensityScorer({'claim_prescreen': {'recall_safety': False}})
+        reduced, report = scorer.prescreen(filler)
+        self.assertFalse(report.applied)
+        self.assertIs(reduced, filler)
+        self.assertEqual(report.segments_kept, 20)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,124 @@
+"""
+Tests for the Compact Transcript Upload Format
+
+Created: 2026-10-18
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+import transcript_analyzer
+from compact_transcript import build_compact_transcript
+
+
+def diarized_segment(i, speaker, text, start, end):
+    """Segment in the shape written by audio_diarizer."""
+    return {
+        "id": i,
+        "speaker": speaker,
+        "text": text,
+        "start_time": start,
+        "end_time": end,
+        "start_time_formatted": "00:00:00",
+        "end_time_formatted": "00:00:00",
+        "duration": round(end - start, 2),
+    }
+
+
+class TestCompactTranscript(unittest.TestCase):
+    """Compact serialization and mapping back to original times."""
+
+    def setUp(self):
+        self.transcript = {"segments": [
+            diarized_segment(1, "SPEAKER_02 (Host)", "So what happened next?", 12.345, 14.02),
+            diarized_segment(2, "SPEAKER_07 (Guest)", "Well, the study showed", 14.512, 17.9),
+            diarized_segment(3, "SPEAKER_07 (Guest)", "that ninety percent of people", 17.95, 21.333),
+            diarized_segment(4, "SPEAKER_07 (Guest)", "were affected.", 21.4, 23.07),
+            diarized_segment(5, "SPEAKER_02 (Host)", "Really?", 23.61, 24.2),
+        ]}
+
+    def test_turns_merge_same_speaker_with_short_codes(self):
+        """Test consecutive same-speaker segments become one short-coded turn."""
+        text, _ = build_compact_transcript(self.transcript)
+        compact = json.loads(text)
+
+        self.assertEqual(compact["speakers"], {"A": "SPEAKER_02 (Host)", "B": "SPEAKER_07 (Guest)"})
+        self.assertEqual(compact["turns"], [
+            [12.3, "A", "So what happened next?"],
+            [14.5, "B", "Well, the study showed that ninety percent of people were affected."],
+            [23.6, "A", "Really?"],
+        ])
+        full = json.dumps(self.transcript, indent=2, ensure_ascii=False)
+        self.assertLess(len(text), len(full) / 2)
+
+    def test_long_monologue_split_into_turns(self):
+        """Test a speaker talking past max_turn_seconds starts a new turn."""
+        segments = [diarized_segment(i, "SPEAKER_07", f"part {i}", i * 10.0, i * 10.0 + 9.5) for i in range(7)]
+        _, time_map = build_compact_transcript({"segments": segments}, max_turn_seconds=30)
+        self.assertEqual(time_map.starts, [0.0, 30.0, 60.0])
+
+    def test_reported_times_map_back_to_original(self):
+        """Test rounded turn times in a Pass 1 segment snap to exact segment times."""
+        _, time_map = build_compact_transcript(self.transcript)
+        segment = {
+            "suggestedClip": [
+                {"timestamp": 14.5, "speaker": "SPEAKER_07 (Guest)", "quote": "..."},
+                {"timestamp": 23.6, "speaker": "SPEAKER_02 (Host)", "quote": "Really?"},
+            ],
+            "fullerContextTimestamps": {"start": 14.5, "end": 23.6},
+            "segmentDurationInSeconds": 9.1,
+        }
+        remapped = time_map.remap_segment(segment)
+
+        self.assertEqual([c["timestamp"] for c in remapped["suggestedClip"]], [14.512, 23.61])
+        self.assertEqual(remapped["fullerContextTimestamps"], {"start": 14.512, "end": 23.07})
+        self.assertEqual(remapped["segmentDurationInSeconds"], 8.558)
+        # Times far from any turn boundary are left alone
+        self.assertEqual(time_map.snap_start(500.0), 500.0)
+
+
+class TestCompactUpload(unittest.TestCase):
+    """upload_transcript_to_gemini uploads the compact file when enabled."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.processing_dir = os.path.join(self.test_dir, "Processing")
+        os.makedirs(os.path.join(self.test_dir, "Input"))
+        os.makedirs(self.processing_dir)
+        self.transcript_path = os.path.join(self.test_dir, "Input", "original_audio_transcript.json")
+        with open(self.transcript_path, 'w', encoding='utf-8') as f:
+            json.dump({"segments": [diarized_segment(1, "SPEAKER_00", "Hello there.", 0.0, 1.5)]}, f, indent=2)
+
+    def tearDown(self):
+        transcript_analyzer.configure_transcript_upload(compact=False)
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_compact_file_uploaded(self):
+        """Test the compact sidecar is written to Processing and uploaded instead of the full JSON."""
+        client = MagicMock()
+        transcript_analyzer.configure_transcript_upload(compact=True)
+        with patch.object(transcript_analyzer, 'get_gemini_client', return_value=client), \
+                patch.object(transcript_analyzer, 'get_active_registry', return_value=None):
+            transcript_analyzer.upload_transcript_to_gemini(self.transcript_path, "test")
+
+        compact_path = os.path.join(self.processing_dir, "original_audio_transcript_compact.json")
+        self.assertEqual(os.listdir(os.path.join(self.test_dir, "Input")), ["original_audio_transcript.json"])
+        self.assertEqual(client.files.upload.call_args.kwargs['file'], compact_path)
+        with open(compact_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["turns"], [[0.0, "A", "Hello there."]])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,274 @@
+"""
+Tests for the Persistent Fact-Check Cache
+
+Created: 2026-10-18
+"""
+
+import os
+import sys
+import json
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+from claim_cache import ClaimCache
+from fact_validator import FactValidator, FactCheckResult
+from multi_pass_controller import MultiPassController
+
+CLAIM = "the 2020 election had millions of fraudulent ballots counted in swing states"
+
+
+def rebuttal_script(claim=CLAIM):
+    return {'podcast_sections': [{
+        'section_type': 'post_clip',
+        'section_id': 'post_1',
+        'script_content': f"In fact {claim}, which no audit found."
+    }]}
+
+
+class TestFactValidatorPersistentCache(unittest.TestCase):
+    """FactValidator lookups reused across runs through the SQLite store."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.test_dir, 'claim_cache.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def validator(self, cache_hours=168, **cache_config):
+        config = {
+            'api': {'gemini_api_key': 'test-key'},
+            'quality_control': {'external_validation': {'cache_hours': cache_hours}},
+            'claim_cache': {'path': self.cache_path, **cache_config},
+        }
+        return FactValidator(config)
+
+    def api_result(self, claim):
+        return FactCheckResult(
+            claim=claim, verified=False, source='google_fact_check',
+            rating='False', explanation="Rated 'False' by PolitiFact"
+        )
+
+    def test_lookup_reused_by_later_run(self):
+        """Test a new validator instance answers a checked claim without the API."""
+        first = self.validator()
+        with patch.object(FactValidator, '_query_google_fact_check', side_effect=self.api_result) as query:
+            first.validate_script(rebuttal_script())
+        self.assertEqual(query.call_count, 1)
+
+        second = self.validator()
+        with patch.object(FactValidator, '_query_google_fact_check', side_effect=self.api_result) as query:
+            result = second.validate_script(rebuttal_script())
+        query.assert_not_called()
+        self.assertEqual(result['_fact_validation']['total_corrections'], 1)
+        self.assertIn("[Note: Rated 'False' by PolitiFact]", result['podcast_sections'][0]['script_content'])
+
+    def test_ttl_uses_cache_hours(self):
+        """Test stored lookups expire after cache_hours."""
+        self.validator(cache_hours=1)._add_to_cache(CLAIM, self.api_result(CLAIM))
+
+        self.assertIsNotNone(self.validator(cache_hours=1)._check_cache(CLAIM))
+        with patch('claim_cache.time.time', return_value=time.time() + 2 * 3600):
+            self.assertIsNone(self.validator(cache_hours=1)._check_cache(CLAIM))
+
+    def test_known_patterns_not_persisted(self):
+        """Test locally derived results stay out of the shared store."""
+        validator = self.validator()
+        validator._add_to_cache('vaccines cause autism', validator._check_known_patterns('vaccines cause autism'))
+        self.assertEqual(validator.persistent_cache.count(), 0)
+
+    def test_disabled_cache(self):
+        """Test claim_cache.enabled false keeps lookups in memory only."""
+        validator = self.validator(enabled=False)
+        self.assertIsNone(validator.persistent_cache)
+        validator._add_to_cache(CLAIM, self.api_result(CLAIM))
+        self.assertIsNotNone(validator._check_cache(CLAIM))
+        self.assertFalse(os.path.exists(self.cache_path))
+
+
+class TestConcurrentFactChecking(unittest.TestCase):
+    """All claims extracted first, deduplicated and queried in parallel."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.config = {
+            'api': {'gemini_api_key': 'test-key'},
+            'quality_control': {'external_validation': {'max_concurrent_queries': 4}},
+            'claim_cache': {'enabled': False},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def fake_session(self, delay=0.05):
+        """Session whose GETs record the claims queried and the peak parallelism."""
+        session = MagicMock()
+        state = {'active': 0, 'peak': 0, 'queries': []}
+        lock = threading.Lock()
+
+        def get(url, params=None, timeout=None):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+                state['queries'].append(params['query'])
+            time.sleep(delay)
+            with lock:
+                state['active'] -= 1
+            response = MagicMock()
+            response.json.return_value = {'claims': [{'claimReview': [{
+                'textualRating': 'False', 'publisher': {'name': 'PolitiFact'}, 'url': 'https://example.org'
+            }]}]}
+            return response
+
+        session.get.side_effect = get
+        return session, state
+
+    def script(self):
+        claims = [f"{n} percent of the ballots in district {n} were filled in by machines" for n in range(6)]
+        return {'podcast_sections': [
+            {'section_type': 'post_clip', 'section_id': 'post_1',
+             'script_content': f"In fact {claims[0]}, and in fact {claims[1]}, and in fact {claims[2]}."},
+            {'section_type': 'post_clip', 'section_id': 'post_2',
+             'script_content': f"In fact {claims[0]}, and in fact {claims[3]}, and in fact {claims[4]}."},
+            {'section_type': 'post_clip', 'section_id': 'post_3',
+             'script_content': f"In fact {claims[5]}, and in fact {claims[1]}."},
+        ]}
+
+    def test_unique_claims_queried_concurrently(self):
+        """Test each unique claim is queried once, in parallel, before corrections."""
+        validator = FactValidator(self.config)
+        session, state = self.fake_session()
+        validator._session = session
+
+        result = validator.validate_script(self.script())
+
+        self.assertEqual(sorted(state['queries']), sorted(set(state['queries'])))
+        self.assertEqual(len(state['queries']), 6)
+        self.assertGreater(state['peak'], 1)
+        self.assertLessEqual(state['peak'], 4)
+        self.assertEqual(result['_fact_validation']['unique_claims_checked'], 6)
+        self.assertEqual(result['_fact_validation']['api_queries'], 6)
+        # Shared claims are corrected in every section that makes them
+        for section in result['podcast_sections'][:2]:
+            self.assertEqual(section['script_content'].count("[Note: Rated 'False' by PolitiFact]"), 3)
+
+    def test_session_pooled_with_timeouts(self):
+        """Test one keep-alive session sized to the parallelism is reused with timeouts."""
+        validator = FactValidator(self.config)
+        session = validator._get_session()
+        self.assertIs(validator._get_session(), session)
+        self.assertEqual(session.get_adapter('https://factchecktools.googleapis.com')._pool_maxsize, 4)
+
+        with patch.object(session, 'get', side_effect=self.fake_session(0)[0].get.side_effect) as get:
+            validator._query_google_fact_check("vaccines were never tested on anyone before release")
+        self.assertEqual(get.call_args.kwargs['timeout'], (5, 10))
+        validator.close()
+
+    def test_stage_closes_session(self):
+        """Test the fact validation stage closes the pooled session, also when validation fails."""
+        controller = MultiPassController.__new__(MultiPassController)
+        controller.enhanced_logger = MagicMock()
+        controller.fact_validator = FactValidator(self.config)
+        script_path = os.path.join(self.test_dir, 'script.json')
+        with open(script_path, 'w', encoding='utf-8') as f:
+            json.dump(self.script(), f)
+
+        session, _ = self.fake_session(0)
+        controller.fact_validator._session = session
+        controller._execute_fact_validation(script_path)
+        session.close.assert_called_once()
+        self.assertIsNone(controller.fact_validator._session)
+
+        session, _ = self.fake_session(0)
+        controller.fact_validator._session = session
+        with patch.object(FactValidator, 'validate_script', side_effect=RuntimeError("quota")):
+            with self.assertRaises(RuntimeError):
+                controller._execute_fact_validation(script_path)
+        session.close.assert_called_once()
+
+
+class TestClaimCacheLimits(unittest.TestCase):
+    """LRU size limits and concurrent writers."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.test_dir, 'claim_cache.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_least_recently_read_evicted(self):
+        """Test entries beyond max_entries are evicted oldest-read first."""
+        cache = ClaimCache(self.cache_path, namespace='fact_check', ttl_hours=24, max_entries=3)
+        clock = [1000.0]
+        with patch('claim_cache.time.time', side_effect=lambda: clock[0]):
+            for key in ('a', 'b', 'c'):
+                clock[0] += 1
+                cache.put(key, key)
+            clock[0] += 1
+            cache.get('a')
+            clock[0] += 1
+            cache.put('d', 'd')
+
+            self.assertEqual(cache.count(), 3)
+            self.assertIsNone(cache.get('b'))
+            for key in ('a', 'c', 'd'):
+                self.assertEqual(cache.get(key), key)
+        self.assertEqual(cache.stats['evictions'], 1)
+
+    def test_miss_reads_without_write_lock(self):
+        """Test a miss never takes the write lock and an empty cache is still usable."""
+        cache = ClaimCache(self.cache_path, namespace='fact_check')
+        self.assertTrue(cache)
+
+        holder = sqlite3.connect(self.cache_path, isolation_level=None)
+        holder.execute('BEGIN IMMEDIATE')
+        try:
+            with patch('claim_cache.BUSY_TIMEOUT_SECONDS', 0.1), \
+                    patch('claim_cache.logger.warning') as warning:
+                self.assertIsNone(cache.get('missing'))
+            warning.assert_not_called()
+        finally:
+            holder.execute('ROLLBACK')
+            holder.close()
+        self.assertEqual(cache.stats['misses'], 1)
+
+    def test_limits_are_per_namespace(self):
+        """Test one verifier's entries never evict another's."""
+        facts = ClaimCache(self.cache_path, namespace='fact_check', max_entries=1)
+        events = ClaimCache(self.cache_path, namespace='recent_events', max_entries=1)
+        facts.put('k', 1)
+        events.put('k', 2)
+        self.assertEqual((facts.get('k'), events.get('k')), (1, 2))
+
+    def test_concurrent_writers(self):
+        """Test parallel writers with their own cache objects all succeed."""
+        def episode(n):
+            cache = ClaimCache(self.cache_path, namespace='fact_check')
+            for i in range(25):
+                cache.put(f'{n}-{i}', {'episode': n})
+                cache.get(f'{n}-{i}')
+
+        threads = [threading.Thread(target=episode, args=(n,)) for n in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(ClaimCache(self.cache_path, namespace='fact_check').count(), 150)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,121 @@
+"""
+Tests for the Compiled Keyword Engine
+
+Created: 2026-10-18
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import unittest
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+from keyword_engine import KeywordEngine
+from diversity_selector import DiversitySelector
+from false_negative_scanner import FalseNegativeScanner
+from binary_segment_filter import BinarySegmentFilter
+from recent_events_verifier import RecentEventsVerifier
+
+FILLER = ['the', 'they', 'said', 'that', 'it', 'was', 'about', 'and', 'a', 'whole', 'lot', 'of',
+          'people', 'knew', 'social', 'shot', 'passed', 'murdered', 'technology', 'votes', 'who.']
+
+
+def per_keyword_scores(categories, text):
+    """Topic scores the way _extract_topics computed them before the engine."""
+    scores = {}
+    for topic, keywords in categories.items():
+        score = sum(len(re.findall(r'\b' + re.escape(k) + r'\b', text)) for k in keywords)
+        if score > 0:
+            scores[topic] = score
+    return scores
+
+
+def random_texts(categories, count, seed=7):
+    rng = random.Random(seed)
+    vocabulary = FILLER + [k for words in categories.values() for k in words]
+    return [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(5, 80))) for _ in range(count)]
+
+
+class TestKeywordEngine(unittest.TestCase):
+    """Single-pass counts identical to per-keyword scanning."""
+
+    def test_overlapping_keywords_each_counted(self):
+        """Test a keyword inside a longer one and a shared prefix both count."""
+        engine = KeywordEngine({'tech': ['social media', 'media'], 'crime': ['murder', 'murdered']},
+                               whole_words=False)
+        self.assertEqual(engine.keyword_counts('social media murdered'),
+                         {'social media': 1, 'media': 1, 'murder': 1, 'murdered': 1})
+        self.assertEqual(engine.counts('social media murdered'), {'tech': 2, 'crime': 2})
+
+    def test_whole_words(self):
+        """Test whole-word mode ignores keywords inside other words."""
+        engine = KeywordEngine.from_keywords(['ai', 'who', 'cover-up'])
+        self.assertEqual(engine.keyword_counts('said who? the cover-up, not ai-driven paint'),
+                         {'who': 1, 'cover-up': 1, 'ai': 1})
+        self.assertIsNone(engine.search('the waiter'))
+
+    def test_topic_scores_match_per_keyword_regex(self):
+        """Test DiversitySelector topic scores equal the per-keyword findall totals."""
+        categories = DiversitySelector.TOPIC_KEYWORDS
+        for text in random_texts(categories, 300):
+            self.assertEqual(DiversitySelector.TOPIC_ENGINE.counts(text), per_keyword_scores(categories, text))
+
+    def test_call_sites_match_previous_scans(self):
+        """Test severity, ad and date-sensitive matches equal the previous per-keyword scans."""
+        severity = FalseNegativeScanner.HIGH_SEVERITY_KEYWORDS
+        dates = RecentEventsVerifier.DATE_SENSITIVE_KEYWORDS
+        ads = BinarySegmentFilter.AD_KEYWORDS
+        texts = random_texts({'all': severity + ads + [k for words in dates.values() for k in words]}, 300)
+
+        for text in texts:
+            self.assertEqual(
+                FalseNegativeScanner.SEVERITY_ENGINE.found(text).get('keywords', []),
+                [k for k in severity if re.search(r'\b' + re.escape(k) + r'\b', text)]
+            )
+            self.assertEqual(BinarySegmentFilter.AD_ENGINE.search(text) is not None,
+                             any(k in text for k in ads))
+            self.assertEqual(
+                {t: words[0] for t, words in RecentEventsVerifier.DATE_SENSITIVE_ENGINE.found(text).items()},
+                {t: next(k for k in words if k in text) for t, words in dates.items()
+                 if any(k in text for k in words)}
+            )
+
+    def test_extract_topics_unchanged(self):
+        """Test segment topics keep their order, ties broken by topic order."""
+        segment = {
+            'narrativeSegmentTitle': 'Vaccine election claims',
+            'clipContextDescription': 'The media covered the vote',
+            'suggestedClip': [{'quote': 'The vaccine news was social media propaganda'}],
+        }
+        self.assertEqual(DiversitySelector()._extract_topics(segment),
+                         ['media', 'health', 'politics', 'technology'])
+
+    def test_benchmark_against_per_keyword_scan(self):
+        """Micro-benchmark: one compiled pass matches a regex per keyword; timing is reported only."""
+        categories = DiversitySelector.TOPIC_KEYWORDS
+        texts = random_texts(categories, 400, seed=11)
+        engine = DiversitySelector.TOPIC_ENGINE
+
+        start = time.perf_counter()
+        expected = [per_keyword_scores(categories, text) for text in texts]
+        per_keyword = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = [engine.counts(text) for text in texts]
+        compiled = time.perf_counter() - start
+
+        print(f"\n  topic scoring, {len(texts)} segments: per-keyword {per_keyword * 1000:.1f}ms, "
+              f"compiled {compiled * 1000:.1f}ms ({per_keyword / compiled:.1f}x)")
+        self.assertEqual(actual, expected)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -26,12 +26,15 @@ sys.path.insert(0, content_analysis_dir)
 sys.path.insert(0, code_dir)
 
 # Import modules to test
+import multi_pass_controller
 from multi_pass_controller import MultiPassController, create_multi_pass_controller
 from binary_segment_filter import BinarySegmentFilter, FilterResult, GateResult
 from binary_rebuttal_verifier import BinaryRebuttalVerifier, VerificationResult
 from diversity_selector import DiversitySelector
 from false_negative_scanner import FalseNegativeScanner
 from output_quality_gate import OutputQualityGate
+from upload_registry import GeminiUploadRegistry
+from streaming_pass1 import IncrementalJSONArrayParser, StreamingSegmentProcessor
 
 # Import mock data
 from mock_data import (
@@ -357,7 +360,8 @@ class TestMultiPassControllerFactoryE2E(unittest.TestCase):
 
         self.config = {
             'api': {'gemini_api_key': 'test-key'},
-            'quality_control': {}
+            'quality_control': {},
+            'claim_cache': {'path': os.path.join(self.test_dir, 'claim_cache.sqlite')}
         }
 
     def tearDown(self):
@@ -505,5 +509,192 @@ class TestPipelineErrorHandlingE2E(unittest.TestCase):
         self.assertIsInstance(result.passed, bool)
 
 
+class TestUploadRegistryE2E(unittest.TestCase):
+    """Test content-hash reuse of Gemini uploads across passes and reruns."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.transcript_path = os.path.join(self.test_dir, "transcript.json")
+        with open(self.transcript_path, 'w') as f:
+            json.dump({'segments': [{'text': 'hello'}]}, f)
+        self.registry_path = os.path.join(self.test_dir, "Processing", "gemini_upload_registry.json")
+
+    def tearDown(self):
+        """Clean up."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_registry_reuses_identical_content_until_cleanup(self):
+        """Test identical content is reused across registry instances and deleted once."""
+        client = MagicMock()
+        client.files.get.side_effect = lambda name: MagicMock(name=name, state=MagicMock())
+        uploaded = MagicMock(expiration_time=None)
+        uploaded.name = 'files/abc123'
+        uploaded.uri = 'https://example.invalid/files/abc123'
+
+        registry = GeminiUploadRegistry(persist_path=self.registry_path)
+        self.assertIsNone(registry.find(self.transcript_path, client))
+        registry.register(self.transcript_path, uploaded)
+        self.assertTrue(registry.is_tracked(uploaded))
+
+        # A rerun loads the persisted entry and reuses the live handle
+        rerun_registry = GeminiUploadRegistry(persist_path=self.registry_path)
+        self.assertIsNotNone(rerun_registry.find(self.transcript_path, client))
+        self.assertEqual(rerun_registry.stats['reused'], 1)
+
+        # Changed content is a different key
+        with open(self.transcript_path, 'w') as f:
+            json.dump({'segments': [{'text': 'changed'}]}, f)
+        self.assertIsNone(rerun_registry.find(self.transcript_path, client))
+
+        self.assertEqual(rerun_registry.cleanup_all(client), 1)
+        client.files.delete.assert_called_once_with(name='files/abc123')
+        self.assertFalse(rerun_registry.is_tracked(uploaded))
+
+
+    def test_failed_run_deactivates_registry(self):
+        """Test a failed run keeps its uploads but clears the process-wide registry."""
+        # Same module instance the controller activates registries in
+        upload_registry = sys.modules[multi_pass_controller.set_active_registry.__module__]
+        registry = upload_registry.GeminiUploadRegistry(persist_path=self.registry_path)
+        upload_registry.set_active_registry(registry)
+
+        controller = MultiPassController.__new__(MultiPassController)
+        controller.config = {}
+        controller.episode_dir = self.test_dir
+        controller.enhanced_logger = MockEnhancedLogger()
+        controller.completed_stages = []
+        controller.reused_stages = []
+        controller.stage_outputs = {}
+        controller.stage_metadata = {}
+        controller.budget = None
+        controller.upload_registry = registry
+
+        with patch.object(MultiPassController, '_execute_pass_1_analysis', side_effect=RuntimeError("quota")):
+            with self.assertRaises(RuntimeError):
+                controller.run_full_pipeline(self.transcript_path)
+
+        self.assertIsNone(upload_registry.get_active_registry())
+        self.assertNotIn('upload_registry', controller.stage_metadata)
+
+    def test_failed_run_cleans_up_context_caches(self):
+        """Test a failed run deletes and deactivates its episode-scoped context caches."""
+        context_cache = sys.modules[multi_pass_controller.set_active_context_cache.__module__]
+        cache = MagicMock(stats={'created': 1, 'deleted': 1})
+        context_cache.set_active_context_cache(cache)
+
+        controller = MultiPassController.__new__(MultiPassController)
+        controller.config = {}
+        controller.episode_dir = self.test_dir
+        controller.enhanced_logger = MockEnhancedLogger()
+        controller.completed_stages = []
+        controller.reused_stages = []
+        controller.stage_outputs = {}
+        controller.stage_metadata = {}
+        controller.budget = None
+        controller.context_cache = cache
+
+        with patch.object(MultiPassController, '_execute_pass_1_analysis', side_effect=RuntimeError("quota")):
+            with self.assertRaises(RuntimeError):
+                controller.run_full_pipeline(self.transcript_path)
+
+        cache.cleanup_episode.assert_called_once_with()
+        self.assertIsNone(context_cache.get_active_context_cache())
+        self.assertEqual(controller.stage_metadata['context_cache'], {'created': 1, 'deleted': 1})
+
+
+class TestStreamingPass1E2E(unittest.TestCase):
+    """Test gate filtering overlapped with streamed Pass 1 generation."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.episode_dir = os.path.join(self.test_dir, "Test_Episode_Streaming")
+        os.makedirs(os.path.join(self.episode_dir, "Processing"))
+        self.pass1_path = os.path.join(
+            self.episode_dir, "Processing", "original_audio_analysis_results.json"
+        )
+        with open(self.pass1_path, 'w', encoding='utf-8') as f:
+            json.dump(get_mock_pass1_data(), f)
+
+    def tearDown(self):
+        """Clean up."""
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_parser_yields_objects_across_arbitrary_splits(self):
+        """Test objects are emitted once complete, regardless of chunk boundaries."""
+        text = '```json\n[{"a": "brace } and [bracket", "b": {"c": [1, 2]}}, {"q": "esc \\" }"}, {"broken": }]\n```'
+        parser = IncrementalJSONArrayParser()
+        emitted = []
+        for i in range(0, len(text), 3):
+            emitted.extend(parser.feed(text[i:i + 3]))
+
+        self.assertEqual(emitted, [{'a': 'brace } and [bracket', 'b': {'c': [1, 2]}}, {'q': 'esc " }'}])
+        self.assertEqual(parser.skipped_count, 1)
+        self.assertTrue(parser.finished)
+
+    def test_failed_run_cancels_streaming_workers(self):
+        """Test a stage failure stops the streaming pool without waiting on queued segments."""
+        processor = MagicMock()
+        processor.get_stats.return_value = {'evaluated': 2}
+
+        controller = MultiPassController.__new__(MultiPassController)
+        controller.config = {}
+        controller.episode_dir = self.episode_dir
+        controller.enhanced_logger = MockEnhancedLogger()
+        controller.completed_stages = []
+        controller.reused_stages = []
+        controller.stage_outputs = {}
+        controller.stage_metadata = {}
+        controller.budget = None
+        controller.streaming_processor = processor
+
+        with patch.object(MultiPassController, '_execute_binary_filtering', side_effect=RuntimeError("quota")):
+            with self.assertRaises(RuntimeError):
+                controller.run_full_pipeline(self.pass1_path)
+
+        processor.shutdown.assert_called_once_with(cancel=True)
+        self.assertIsNone(controller.streaming_processor)
+        self.assertEqual(controller.stage_metadata['pass1_streaming'], {'evaluated': 2})
+
+    def test_streamed_verdicts_reused_after_pass1(self):
+        """Test streamed segments are not re-filtered once Pass 1 completes."""
+        mock_filter = MockBinarySegmentFilter()
+        segment_filter = BinarySegmentFilter({'api_delay': 0}, skip_api_init=True)
+        segment_filter.filter_segment = MagicMock(side_effect=mock_filter.filter_segment)
+
+        controller = MultiPassController.__new__(MultiPassController)
+        controller.episode_dir = self.episode_dir
+        controller.enhanced_logger = MockEnhancedLogger()
+        controller.segment_filter = segment_filter
+        controller.stage_metadata = {}
+        controller.stage_outputs = {}
+        controller.streaming_processor = StreamingSegmentProcessor(segment_filter)
+
+        # Stream the first five segments in small pieces, as generation would
+        parser = IncrementalJSONArrayParser()
+        text = json.dumps(get_mock_pass1_data()[:5], indent=2)
+        for i in range(0, len(text), 50):
+            for segment in parser.feed(text[i:i + 50]):
+                controller.streaming_processor.submit(segment)
+        self.assertEqual(parser.parsed_count, 5)
+
+        passed, rejected = controller._execute_binary_filtering(self.pass1_path)
+        controller._finish_streaming()
+
+        self.assertEqual(
+            [s['segment_id'] for s in passed],
+            [s['segment_id'] for s in get_mock_pass1_data() if s['segment_id'] in mock_filter.passing_segments]
+        )
+        self.assertEqual(len(rejected), 4)
+        self.assertTrue(all(
+            s['binary_filter_results']['segment_id'] == s['segment_id'] for s in passed + rejected
+        ))
+        # 5 streamed + 3 evaluated after Pass 1, no segment filtered twice
+        self.assertEqual(segment_filter.filter_segment.call_count, 8)
+        self.assertEqual(controller.stage_metadata['binary_filtering']['streamed_verdicts_reused'], 5)
+        self.assertEqual(controller.stage_metadata['pass1_streaming']['evaluated'], 5)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,181 @@
+"""
+Tests for Pipeline Budget Degradation
+
+Created: 2026-10-18
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+from pipeline_budget import PipelineBudget
+from model_cascade import ModelCascade
+from usage_tracker import UsageTracker, CallRecord
+from stage_checkpoints import StageCheckpointStore
+from multi_pass_controller import MultiPassController
+
+
+def tracker_with_tokens(prompt, output):
+    tracker = UsageTracker({})
+    tracker.record(CallRecord(component='transcript_analyzer', stage='pass_1', model='gemini-2.5-pro',
+                              prompt_tokens=prompt, output_tokens=output))
+    return tracker
+
+
+class TestPipelineBudget(unittest.TestCase):
+    """Latency/token budgets and the stages they degrade."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.config = {'pipeline_budget': {'enabled': True, 'max_tokens': 100000, 'max_latency_seconds': 600}}
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def controller(self, tracker):
+        """A controller with a budget, usage tracker and cascade-backed verifiers."""
+        controller = MultiPassController.__new__(MultiPassController)
+        controller.config = self.config
+        controller.episode_dir = self.test_dir
+        controller.enhanced_logger = MagicMock()
+        controller.stage_metadata = {}
+        controller.stage_outputs = {}
+        controller.reused_stages = []
+        controller.usage_tracker = tracker
+        controller.budget = PipelineBudget.from_config(self.config)
+        controller.degraded_stages = set()
+        controller.segment_filter = MagicMock(cascade=ModelCascade({}, 'segment_filter'))
+        controller.rebuttal_verifier = MagicMock(cascade=ModelCascade({}, 'rebuttal_verifier'), max_iterations=3)
+        controller.false_negative_scanner = MagicMock()
+        controller.fact_validator = MagicMock()
+        return controller
+
+    def test_from_config(self):
+        """Test the budget is off unless enabled with at least one limit."""
+        self.assertIsNone(PipelineBudget.from_config({}))
+        self.assertIsNone(PipelineBudget.from_config({'pipeline_budget': {'enabled': True}}))
+        self.assertEqual(PipelineBudget.from_config(self.config).max_tokens, 100000)
+
+    def test_within_budget_runs_full_quality(self):
+        """Test no stage degrades while usage is under both limits."""
+        controller = self.controller(tracker_with_tokens(50000, 1000))
+        for stage in ('binary_filtering', 'false_negative_recovery', 'rebuttal_verification', 'fact_validation'):
+            with controller._stage(stage):
+                pass
+
+        self.assertEqual(controller.segment_filter.cascade.strong_model, 'gemini-2.5-pro')
+        self.assertEqual(controller.rebuttal_verifier.max_iterations, 3)
+        self.assertEqual(controller.degraded_stages, set())
+        self.assertNotIn('pipeline_budget', controller.stage_metadata)
+
+    def test_over_token_budget_degrades_remaining_stages(self):
+        """Test each stage's cheaper mode applies and every decision is recorded."""
+        controller = self.controller(tracker_with_tokens(95000, 10000))
+        selected = [{'segment_id': 'S1'}]
+
+        with controller._stage('pass_1'):
+            pass
+        with controller._stage('binary_filtering'):
+            pass
+        with controller._stage('false_negative_recovery'):
+            recovered = controller._execute_false_negative_recovery(selected, [{'segment_id': 'S2'}])
+        with controller._stage('rebuttal_verification'):
+            pass
+        with controller._stage('fact_validation'):
+            validated = controller._execute_fact_validation('script.json')
+
+        self.assertEqual(recovered, selected)
+        self.assertEqual(validated, 'script.json')
+        controller.false_negative_scanner.scan_rejected.assert_not_called()
+        controller.fact_validator.validate_script.assert_not_called()
+        for cascade in (controller.segment_filter.cascade, controller.rebuttal_verifier.cascade):
+            self.assertEqual(cascade.degraded_model, 'gemini-2.5-flash')
+        self.assertEqual(controller.rebuttal_verifier.max_iterations, 1)
+
+        report = controller.stage_metadata['pipeline_budget']
+        self.assertEqual(report['tokens'], 105000)
+        self.assertEqual(report['degraded_stages'],
+                         ['binary_filtering', 'false_negative_recovery', 'rebuttal_verification', 'fact_validation'])
+        self.assertEqual(
+            [(d['stage'], d['action']) for d in report['decisions']],
+            [('binary_filtering', 'cheaper_gate_model'), ('false_negative_recovery', 'skip_stage'),
+             ('rebuttal_verification', 'cheaper_gate_model'), ('rebuttal_verification', 'cap_rebuttal_iterations'),
+             ('fact_validation', 'skip_stage')]
+        )
+        self.assertTrue(all(d['exceeded'] == ['tokens'] and d['applied'] for d in report['decisions']))
+
+    def test_degraded_cascade_keeps_reporting_stats(self):
+        """Test a degraded cascade uses the cheaper model and still reports earlier statistics."""
+        cascade = ModelCascade({'quality_control': {'model_cascade': {'enabled': True}}}, 'rebuttal_verifier')
+        models = []
+
+        def call_model(prompt, model):
+            models.append(model)
+            return "GATE_1_ANSWER: YES\nCONFIDENCE: 95"
+
+        cascade.run("prompt", call_model, lambda text: ({}, None))
+        cascade.degrade('gemini-2.5-flash-lite')
+        cascade.run("prompt", call_model, lambda text: ({}, None))
+
+        self.assertEqual(models, ['gemini-2.5-flash', 'gemini-2.5-flash-lite'])
+        self.assertTrue(cascade.enabled and cascade.reporting)
+        stats = cascade.get_stats()
+        self.assertEqual((stats['calls'], stats['fast_only'], stats['degraded_calls']), (1, 1, 1))
+        self.assertEqual(stats['degraded_model'], 'gemini-2.5-flash-lite')
+
+    def test_missing_verifier_not_degraded(self):
+        """Test a stage whose verifier is unavailable records the decision as not applied."""
+        controller = self.controller(tracker_with_tokens(200000, 0))
+        controller.rebuttal_verifier = None
+
+        with controller._stage('rebuttal_verification'):
+            pass
+
+        report = controller.stage_metadata['pipeline_budget']
+        self.assertEqual([(d['action'], d['applied']) for d in report['decisions']],
+                         [('cheaper_gate_model', False), ('cap_rebuttal_iterations', False)])
+        self.assertEqual(report['degraded_stages'], [])
+        self.assertEqual(controller.degraded_stages, set())
+
+    def test_over_latency_budget(self):
+        """Test the wall-clock budget degrades stages without usage tracking."""
+        controller = self.controller(None)
+        controller.budget.started = time.monotonic() - 601
+
+        with controller._stage('fact_validation'):
+            self.assertEqual(controller._execute_fact_validation('script.json'), 'script.json')
+
+        decision = controller.stage_metadata['pipeline_budget']['decisions'][0]
+        self.assertEqual((decision['exceeded'], decision['tokens']), (['latency'], None))
+
+    def test_degraded_stage_not_checkpointed(self):
+        """Test a stage run in budget mode reruns at full quality next time."""
+        calls = []
+        controller = self.controller(tracker_with_tokens(200000, 0))
+        controller.checkpoints = StageCheckpointStore(os.path.join(self.test_dir, 'checkpoints'), self.test_dir)
+
+        with controller._stage('false_negative_recovery'):
+            controller._checkpointed('false_negative_recovery', [[], []], lambda: calls.append(1) or [])
+
+        controller = self.controller(tracker_with_tokens(10, 0))
+        controller.checkpoints = StageCheckpointStore(os.path.join(self.test_dir, 'checkpoints'), self.test_dir)
+        with controller._stage('false_negative_recovery'):
+            controller._checkpointed('false_negative_recovery', [[], []], lambda: calls.append(1) or [])
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(controller.reused_stages, [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,160 @@
+"""
+Tests for Concurrent, Deduplicated Recent Events Verification
+
+Created: 2026-10-18
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+from recent_events_verifier import RecentEventsVerifier
+from claim_cache import ClaimCache
+from rate_limiter import RateLimiter
+
+QUOTE = "He was assassinated last week and they are hiding it."
+
+
+def segment(segment_id, quote=QUOTE, why_harmful="False claim of an assassination"):
+    return {
+        'segment_identifier': segment_id,
+        'clipContextDescription': '',
+        'why_harmful': why_harmful,
+        'suggestedClip': [{'speaker': 'Guest', 'quote': quote}],
+    }
+
+
+def search_response(status='CONFIRMED_FALSE'):
+    return SimpleNamespace(text=json.dumps({
+        'verified_status': status, 'summary': 'No such event', 'sources': ['news'], 'confidence': 0.9
+    }))
+
+
+class TestRecentEventsVerification(unittest.TestCase):
+    """Deduping, concurrent searching and persisting date-sensitive claims."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.test_dir, 'claim_cache.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def verifier(self, ttl_hours=24, limiter=None):
+        verifier = RecentEventsVerifier.__new__(RecentEventsVerifier)
+        verifier.config = {}
+        verifier.max_concurrent = 4
+        verifier.limiter = limiter or RateLimiter(max_concurrent=4)
+        verifier.claim_cache = ClaimCache(self.cache_path, namespace='recent_events', ttl_hours=ttl_hours)
+        verifier.client = MagicMock()
+        verifier.client.models.generate_content.return_value = search_response()
+        return verifier
+
+    def test_shared_claim_searched_once_and_fanned_out(self):
+        """Test one search answers the same claim in several segments."""
+        verifier = self.verifier()
+        segments = [segment('seg_1'), segment('seg_2'), segment('seg_3')]
+
+        updated, metadata = verifier.verify_segments(segments)
+
+        self.assertEqual(verifier.client.models.generate_content.call_count, 1)
+        self.assertEqual(metadata['total_claims_checked'], 3)
+        self.assertEqual(metadata['unique_claims_verified'], 1)
+        for seg in updated:
+            self.assertEqual(seg['_verification']['results'][0]['status'], 'CONFIRMED_FALSE')
+
+    def test_confirmed_events_corrected_per_segment(self):
+        """Test a shared CONFIRMED_TRUE result only flags segments that called it false."""
+        verifier = self.verifier()
+        verifier.client.models.generate_content.return_value = search_response('CONFIRMED_TRUE')
+
+        updated, metadata = verifier.verify_segments(
+            [segment('seg_1'), segment('seg_2', why_harmful='Conspiracy framing')]
+        )
+
+        self.assertTrue(updated[0].get('_correction_needed'))
+        self.assertNotIn('_correction_needed', updated[1])
+        self.assertEqual(metadata['corrections_needed'], 1)
+
+    def test_unique_claims_searched_concurrently(self):
+        """Test distinct claims are in flight at the same time."""
+        verifier = self.verifier()
+        barrier = threading.Barrier(2)
+
+        def generate(**kwargs):
+            barrier.wait(timeout=5)
+            return search_response()
+
+        verifier.client.models.generate_content.side_effect = generate
+        verifier.verify_segments([
+            segment('seg_1'),
+            segment('seg_2', quote="The senator was elected by dead voters in the primary."),
+        ])
+        self.assertFalse(barrier.broken)
+
+    def test_grounded_results_persist_until_ttl(self):
+        """Test a later run reuses stored results, and expired ones are searched again."""
+        self.verifier().verify_segments([segment('seg_1')])
+
+        rerun = self.verifier()
+        _, metadata = rerun.verify_segments([segment('seg_9')])
+        rerun.client.models.generate_content.assert_not_called()
+        self.assertEqual(metadata['claim_cache_hits'], 1)
+
+        with patch('claim_cache.time.time', return_value=time.time() + 25 * 3600):
+            expired = self.verifier()
+            expired.verify_segments([segment('seg_9')])
+        self.assertEqual(expired.client.models.generate_content.call_count, 1)
+
+    def test_failed_search_not_persisted(self):
+        """Test search errors are retried on the next run instead of cached."""
+        verifier = self.verifier()
+        verifier.client.models.generate_content.side_effect = RuntimeError("503")
+        verifier.verify_segments([segment('seg_1')])
+
+        rerun = self.verifier()
+        rerun.verify_segments([segment('seg_1')])
+        self.assertEqual(rerun.client.models.generate_content.call_count, 1)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Shared concurrency and pacing limits."""
+
+    def test_limits_concurrency(self):
+        """Test no more than max_concurrent calls hold a slot at once."""
+        limiter = RateLimiter(max_concurrent=2)
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def call():
+            with limiter.slot():
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.02)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=call) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(peak[0], 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
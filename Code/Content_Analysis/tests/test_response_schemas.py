@@ -0,0 +1,108 @@
+"""
+Tests for Schema-Constrained Gemini Output
+
+Created: 2026-10-18
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+from google.genai import types
+
+import podcast_narrative_generator
+from podcast_narrative_generator import NarrativeCreatorGenerator
+
+# Same module instance the generator uses
+response_schemas = sys.modules[podcast_narrative_generator.json_output_options.__module__]
+
+
+class SchemaRejected(Exception):
+    """Stand-in for a 400 ClientError from the API."""
+    code = 400
+
+
+class TestSchemaConversion(unittest.TestCase):
+    """JSON Schema files convert to valid Gemini response schemas."""
+
+    def tearDown(self):
+        response_schemas.configure_response_schemas(enabled=True)
+
+    def test_all_schemas_are_valid_gemini_schemas(self):
+        """Test every pipeline schema loads and validates as a types.Schema."""
+        for name in response_schemas.SCHEMA_FILES:
+            schema = response_schemas.load_response_schema(name)
+            self.assertIsNotNone(schema, name)
+            types.Schema.model_validate(schema)
+
+    def test_conversion_drops_unsupported_keywords(self):
+        """Test refs are inlined, null unions become nullable and order is kept."""
+        converted = response_schemas.to_gemini_schema({
+            'definitions': {'id': {'type': 'string', 'pattern': '^x$'}},
+            'type': 'object',
+            'additionalProperties': False,
+            'required': ['b'],
+            'properties': {
+                'b': {'$ref': '#/definitions/id'},
+                'a': {'type': ['string', 'null'], 'const': 'x'},
+            },
+        })
+        self.assertEqual(converted, {
+            'type': 'OBJECT',
+            'required': ['b'],
+            'properties': {'b': {'type': 'STRING'}, 'a': {'type': 'STRING', 'nullable': True}},
+            'propertyOrdering': ['b', 'a'],
+        })
+
+    def test_prompt_fields_missing_from_schema_files_are_added(self):
+        """Test fields the prompts request are present in the response schemas."""
+        pass1 = response_schemas.load_response_schema('pass1_analysis')
+        self.assertIn('extended_clip', pass1['items']['properties'])
+
+        script = response_schemas.load_response_schema('creative_script')
+        section = script['properties']['podcast_sections']['items']['properties']
+        self.assertIn('hook_clip', section['section_type']['enum'])
+
+    def test_disabled_returns_no_options(self):
+        """Test structured output can be switched off."""
+        response_schemas.configure_response_schemas(enabled=False)
+        self.assertEqual(response_schemas.json_output_options('pass1_analysis'), {})
+
+
+class TestSchemaFallback(unittest.TestCase):
+    """A rejected schema falls back to plain JSON mode."""
+
+    def tearDown(self):
+        response_schemas.configure_response_schemas(enabled=True)
+
+    def test_rejected_schema_retries_without_it(self):
+        """Test the call is repeated without the schema and the schema stays off."""
+        generator = NarrativeCreatorGenerator.__new__(NarrativeCreatorGenerator)
+        generator.model_name = 'gemini-2.5-pro'
+        client = MagicMock()
+        response = MagicMock(candidates=[])
+        client.models.generate_content.side_effect = [
+            SchemaRejected("Invalid response_schema"), response, response
+        ]
+
+        with patch.object(generator, '_get_client', return_value=client):
+            self.assertIs(generator._generate_json(['prompt'], 'structure_plan', 0.3), response)
+            generator._generate_json(['prompt'], 'structure_plan', 0.3)
+
+        configs = [c.kwargs['config'] for c in client.models.generate_content.call_args_list]
+        self.assertIsNotNone(configs[0].response_schema)
+        self.assertIsNone(configs[1].response_schema)
+        self.assertEqual(configs[1].response_mime_type, 'application/json')
+        self.assertIsNone(configs[2].response_schema)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
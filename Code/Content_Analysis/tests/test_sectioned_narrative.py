@@ -0,0 +1,201 @@
+"""
+Tests for Sectioned (Parallel) Narrative Generation
+
+Created: 2026-10-18
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+from podcast_narrative_generator import NarrativeCreatorGenerator
+
+SEGMENTS = [
+    {
+        "segment_id": f"Harmful_Segment_0{n}",
+        "narrativeSegmentTitle": f"Claim {n}",
+        "clipContextDescription": f"Context {n}",
+        "severityRating": "HIGH",
+        "suggestedClip": [{"timestamp": f"{n}00.0", "speaker": "Guest", "quote": f"Quote {n}"}],
+        "fullerContextTimestamps": {"start": n * 100.0, "end": n * 100.0 + 45},
+    }
+    for n in range(1, 5)
+]
+
+STRUCTURE_PLAN = {
+    "episode_overview": {"primary_theme": "Health myths", "total_segments_provided": 4,
+                         "segments_to_include": 3, "segments_to_skip": 1},
+    "hook_selection": {"segment_id": "Harmful_Segment_02", "reason": "Most egregious"},
+    "clip_order": [
+        {"segment_id": "Harmful_Segment_03", "position": 2, "skip": False},
+        {"segment_id": "Harmful_Segment_04", "position": 3, "skip": True},
+        {"segment_id": "Harmful_Segment_01", "position": 1, "skip": False},
+    ],
+    "thematic_groups": [{"label": "Medicine", "segment_ids": ["Harmful_Segment_01"]}],
+}
+
+
+def section_response(section_types):
+    """JSON response for the given section types."""
+    return SimpleNamespace(text=json.dumps({
+        "sections": [
+            {"section_type": t, "script_content": f"{t} narration " * 20, "estimated_duration": "40s"}
+            for t in section_types
+        ],
+        "key_claims": ["a claim"],
+    }))
+
+
+class TestSectionedNarrative(unittest.TestCase):
+    """Fanning the structure plan out into parallel section calls."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.analysis_path = os.path.join(self.test_dir, 'final_filtered_for_script.json')
+        with open(self.analysis_path, 'w', encoding='utf-8') as f:
+            json.dump(SEGMENTS, f)
+
+        self.generator = NarrativeCreatorGenerator.__new__(NarrativeCreatorGenerator)
+        self.generator.model_name = 'gemini-2.5-pro'
+        self.generator.section_workers = 4
+        self.generator.max_section_retries = 2
+        self.generator.last_section_report = None
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def fake_generate_json(self, fail_once=(), barrier=None):
+        """Stand-in for _generate_json answering with the assigned section types."""
+        lock = threading.Lock()
+
+        def generate(contents, schema_name, temperature):
+            prompt = contents[0]
+            assignment = prompt.split('## 6. YOUR ASSIGNMENT')[1]
+            if 'intro_plus_hook_analysis' in assignment:
+                key, types_ = 'intro', ['intro_plus_hook_analysis']
+            elif '"intro"' in assignment:
+                key, types_ = 'intro', ['intro']
+            elif '"outro"' in assignment:
+                key, types_ = 'outro', ['outro']
+            else:
+                segment_id = assignment.split('(')[1].split(')')[0]
+                key, types_ = segment_id, ['pre_clip', 'post_clip']
+            with lock:
+                self.calls.append((key, prompt.split('## 6. YOUR ASSIGNMENT')[0]))
+                first_attempt = sum(1 for k, _ in self.calls if k == key) == 1
+            if barrier is not None and first_attempt:
+                barrier.wait(timeout=5)
+            if key in fail_once and first_attempt:
+                return SimpleNamespace(text='{"sections": []}')
+            return section_response(types_)
+
+        return generate
+
+    def test_sections_assembled_in_plan_order(self):
+        """Test hook, intro, clip pairs and outro are assembled in plan position order."""
+        self.generator._generate_json = self.fake_generate_json()
+        script = self.generator._generate_sectioned_script(
+            self.analysis_path, STRUCTURE_PLAN, 'Joe Rogan Experience #2000 - Guest Name', 'with_hook'
+        )
+
+        self.assertEqual(
+            [(s['section_type'], s.get('clip_id') or s.get('clip_reference')) for s in script['podcast_sections']],
+            [
+                ('hook_clip', 'Harmful_Segment_02'),
+                ('intro_plus_hook_analysis', None),
+                ('pre_clip', 'Harmful_Segment_01'),
+                ('video_clip', 'Harmful_Segment_01'),
+                ('post_clip', 'Harmful_Segment_01'),
+                ('pre_clip', 'Harmful_Segment_03'),
+                ('video_clip', 'Harmful_Segment_03'),
+                ('post_clip', 'Harmful_Segment_03'),
+                ('outro', None),
+            ]
+        )
+        video = script['podcast_sections'][3]
+        self.assertEqual((video['start_time'], video['end_time']), ('100.0', '145.0'))
+        self.assertEqual(script['script_metadata']['hook_clip_id'], 'Harmful_Segment_02')
+        self.assertTrue(self.generator._validate_output_structure(script))
+
+        # Every call shares the same persona/plan prefix
+        self.assertEqual(len({prefix for _, prefix in self.calls}), 1)
+
+    def test_sections_generated_concurrently(self):
+        """Test all section calls are in flight at the same time."""
+        # Intro, two clip pairs and outro must all reach the barrier together
+        barrier = threading.Barrier(4)
+        self.generator._generate_json = self.fake_generate_json(barrier=barrier)
+        self.generator._generate_sectioned_script(
+            self.analysis_path, STRUCTURE_PLAN, 'Episode', 'with_hook'
+        )
+        self.assertFalse(barrier.broken)
+
+    def test_only_failed_sections_regenerated(self):
+        """Test a section missing from its response is the only one regenerated."""
+        self.generator._generate_json = self.fake_generate_json(fail_once={'Harmful_Segment_03'})
+        script = self.generator._generate_sectioned_script(
+            self.analysis_path, STRUCTURE_PLAN, 'Episode', 'without_hook'
+        )
+
+        keys = [key for key, _ in self.calls]
+        self.assertEqual(keys.count('Harmful_Segment_03'), 2)
+        self.assertEqual(keys.count('Harmful_Segment_01'), 1)
+        self.assertEqual(self.generator.last_section_report['regenerated'], {'clip:Harmful_Segment_03': 1})
+        self.assertEqual(script['podcast_sections'][0]['section_type'], 'intro')
+
+    def test_persistent_failure_raises(self):
+        """Test a section that keeps failing stops generation after the retry limit."""
+        self.generator.max_section_retries = 1
+        self.generator._generate_json = lambda contents, schema_name, temperature: SimpleNamespace(text='{}')
+        with self.assertRaises(Exception) as error:
+            self.generator._generate_sectioned_script(
+                self.analysis_path, STRUCTURE_PLAN, 'Episode', 'without_hook'
+            )
+        self.assertIn('after 2 attempts', str(error.exception))
+
+    def test_custom_instructions_shared_by_every_section(self):
+        """Test custom instructions reach every section call's shared prefix."""
+        self.generator._generate_json = self.fake_generate_json()
+        self.generator._generate_sectioned_script(
+            self.analysis_path, STRUCTURE_PLAN, 'Episode', 'with_hook', 'Mention the sponsor once.'
+        )
+
+        prefixes = {prefix for _, prefix in self.calls}
+        self.assertEqual(len(prefixes), 1)
+        self.assertIn('## ADDITIONAL INSTRUCTIONS\nMention the sponsor once.', prefixes.pop())
+
+    def test_clip_timestamps_match_schema(self):
+        """Test integer timestamps are written as decimals and missing ones stop generation early."""
+        segment = {**SEGMENTS[0], 'fullerContextTimestamps': {'start': 120, 'end': 165}}
+        section = self.generator._build_clip_section(segment, 'video_clip', 'video_clip_001', '', [])
+        self.assertEqual((section['start_time'], section['end_time'], section['estimated_duration']),
+                         ('120.0', '165.0', '45s'))
+
+        segments = [dict(s) for s in SEGMENTS]
+        segments[2]['fullerContextTimestamps'] = {'end': 345}
+        with open(self.analysis_path, 'w', encoding='utf-8') as f:
+            json.dump(segments, f)
+        self.generator._generate_json = self.fake_generate_json()
+        with self.assertRaises(ValueError) as error:
+            self.generator._generate_sectioned_script(
+                self.analysis_path, STRUCTURE_PLAN, 'Episode', 'without_hook'
+            )
+        self.assertIn('Harmful_Segment_03', str(error.exception))
+        self.assertEqual(self.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,292 @@
+"""
+Tests for Chunked Analysis Windowing and Merge
+
+The reference implementations below are the original quadratic
+ChunkedTranscriptAnalyzer._merge_results / _chunk_transcript loops; the
+interval engine must reproduce their outputs exactly. Token-budget chunking
+is checked for turn boundaries, overlap and uniform chunk sizes.
+
+Created: 2026-10-18
+"""
+
+import os
+import sys
+import copy
+import math
+import random
+import unittest
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+from chunked_transcript_analyzer import ChunkedTranscriptAnalyzer
+from segment_intervals import IntervalIndex
+
+
+def legacy_merge_results(all_results, threshold=0.5):
+    """Original O(n^2) ChunkedTranscriptAnalyzer._merge_results."""
+    if not all_results:
+        return []
+
+    def get_start(seg):
+        ts = seg.get('fullerContextTimestamps', {})
+        try:
+            return float(ts.get('start', 0))
+        except (ValueError, TypeError):
+            return 0
+    all_results.sort(key=get_start)
+
+    severity_order = {'CRITICAL': 4, 'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
+
+    merged = []
+    for seg in all_results:
+        ts = seg.get('fullerContextTimestamps', {})
+        try:
+            seg_start = float(ts.get('start', 0))
+            seg_end = float(ts.get('end', 0))
+        except (ValueError, TypeError):
+            merged.append(seg)
+            continue
+
+        seg_duration = seg_end - seg_start
+        if seg_duration <= 0:
+            merged.append(seg)
+            continue
+
+        is_duplicate = False
+        for i, existing in enumerate(merged):
+            ex_ts = existing.get('fullerContextTimestamps', {})
+            try:
+                ex_start = float(ex_ts.get('start', 0))
+                ex_end = float(ex_ts.get('end', 0))
+            except (ValueError, TypeError):
+                continue
+
+            overlap = max(0, min(seg_end, ex_end) - max(seg_start, ex_start))
+            shorter_duration = min(seg_duration, ex_end - ex_start)
+            if shorter_duration > 0 and overlap / shorter_duration > threshold:
+                seg_severity = severity_order.get(seg.get('severityRating', ''), 0)
+                ex_severity = severity_order.get(existing.get('severityRating', ''), 0)
+                if seg_severity > ex_severity or (
+                    seg_severity == ex_severity and seg_duration > (ex_end - ex_start)
+                ):
+                    merged[i] = seg
+                is_duplicate = True
+                break
+
+        if not is_duplicate:
+            merged.append(seg)
+
+    return merged
+
+
+def legacy_window(segments, chunk_start, chunk_end):
+    """Original per-window rescan from _chunk_transcript."""
+    chunk_segments = []
+    for seg in segments:
+        seg_start = float(seg.get('start_time', seg.get('start', 0)))
+        seg_end = float(seg.get('end_time', seg.get('end', 0)))
+        if seg_start < chunk_end and seg_end > chunk_start:
+            chunk_segments.append(seg)
+    return chunk_segments
+
+
+def random_pass1_segments(rng, count):
+    """Chunk results with clustered, overlapping and malformed timestamps."""
+    segments = []
+    for i in range(count):
+        start = rng.choice([rng.uniform(0, 3600), rng.randint(0, 40) * 90.0])
+        end = start + rng.choice([rng.uniform(5, 240), 0, -10, 60.0])
+        timestamps = {'start': start, 'end': end}
+        roll = rng.random()
+        if roll < 0.03:
+            timestamps = {'start': 'n/a', 'end': end}
+        elif roll < 0.06:
+            timestamps = {'start': start, 'end': None}
+        elif roll < 0.08:
+            timestamps = {}
+        segments.append({
+            'segment_id': f'seg_{i}',
+            'severityRating': rng.choice(['CRITICAL', 'HIGH', 'MEDIUM', 'LOW', '']),
+            'fullerContextTimestamps': timestamps,
+        })
+    return segments
+
+
+class TestSweepMergeEquivalence(unittest.TestCase):
+    """Sweep-line merge matches the original quadratic merge."""
+
+    def setUp(self):
+        self.analyzer = ChunkedTranscriptAnalyzer({'chunked_analysis': {}})
+
+    def test_randomized_equivalence(self):
+        """Test identical output (same objects, same order) on random inputs."""
+        rng = random.Random(1234)
+        for trial in range(300):
+            segments = random_pass1_segments(rng, rng.randint(0, 80))
+            expected = legacy_merge_results(list(segments))
+            actual = self.analyzer._merge_results(list(segments))
+            self.assertEqual(
+                [s['segment_id'] for s in actual],
+                [s['segment_id'] for s in expected],
+                f"trial {trial}"
+            )
+
+    def test_equivalence_across_thresholds(self):
+        """Test equivalence for strict, loose and negative overlap thresholds."""
+        rng = random.Random(99)
+        for threshold in (0.0, 0.25, 0.9, -0.5):
+            self.analyzer.dedup_overlap_threshold = threshold
+            for _ in range(50):
+                segments = random_pass1_segments(rng, 40)
+                expected = legacy_merge_results(copy.copy(segments), threshold)
+                actual = self.analyzer._merge_results(copy.copy(segments))
+                self.assertEqual(
+                    [s['segment_id'] for s in actual],
+                    [s['segment_id'] for s in expected]
+                )
+
+    def test_duration_tie_break_policy(self):
+        """Test the duration policy keeps the longer duplicate over higher severity."""
+        segments = [
+            {'segment_id': 'short_critical', 'severityRating': 'CRITICAL',
+             'fullerContextTimestamps': {'start': 100, 'end': 160}},
+            {'segment_id': 'long_low', 'severityRating': 'LOW',
+             'fullerContextTimestamps': {'start': 110, 'end': 260}},
+        ]
+        self.assertEqual(
+            [s['segment_id'] for s in self.analyzer._merge_results(list(segments))],
+            ['short_critical']
+        )
+
+        self.analyzer.dedup_tie_break = 'duration'
+        self.assertEqual(
+            [s['segment_id'] for s in self.analyzer._merge_results(list(segments))],
+            ['long_low']
+        )
+
+
+class TestBisectWindowEquivalence(unittest.TestCase):
+    """Bisect window slicing matches the original per-window rescan."""
+
+    def test_interval_index_matches_rescan(self):
+        """Test random windows over ordered and unordered transcript segments."""
+        rng = random.Random(7)
+        for ordered in (True, False):
+            for _ in range(100):
+                segments = []
+                t = 0.0
+                for _ in range(rng.randint(0, 120)):
+                    start = t if ordered else rng.uniform(0, 600)
+                    end = start + rng.choice([rng.uniform(0, 30), 0.0, 200.0])
+                    segments.append({'start': start, 'end': end})
+                    t = start + rng.uniform(0, 10)
+                index = IntervalIndex([(s['start'], s['end']) for s in segments])
+                for _ in range(10):
+                    lo = rng.uniform(0, 700)
+                    hi = lo + rng.uniform(0, 300)
+                    self.assertEqual(
+                        [segments[i] for i in index.overlapping(lo, hi)],
+                        legacy_window(segments, lo, hi)
+                    )
+
+    def test_chunk_transcript_windows(self):
+        """Test _chunk_transcript produces the same windows as before."""
+        analyzer = ChunkedTranscriptAnalyzer({'chunked_analysis': {
+            'chunk_duration_minutes': 25, 'chunk_overlap_minutes': 3
+        }})
+        segments = []
+        t = 0.0
+        rng = random.Random(3)
+        while t < 3 * 3600:
+            duration = rng.uniform(2, 45)
+            segments.append({'start_time': t, 'end_time': t + duration, 'text': 'x'})
+            t += duration
+
+        chunks = analyzer._chunk_transcript({}, segments)
+        self.assertEqual(len(chunks), 9)
+        for chunk in chunks:
+            self.assertEqual(
+                chunk['segments'],
+                legacy_window(segments, chunk['start_sec'], chunk['end_sec'])
+            )
+
+
+class TestTokenBudgetChunking(unittest.TestCase):
+    """Token-budget chunking cuts on speaker turns with token overlap."""
+
+    def setUp(self):
+        self.analyzer = ChunkedTranscriptAnalyzer({'chunked_analysis': {
+            'target_chunk_tokens': 4000, 'chunk_overlap_tokens': 500
+        }})
+        # Dense fast-talking first half, sparse music-heavy second half
+        rng = random.Random(11)
+        self.segments = []
+        t = 0.0
+        speakers = ['Joe Rogan', 'Guest']
+        speaker = 0
+        for i in range(600):
+            dense = i < 300
+            words = rng.randint(25, 60) if dense else rng.randint(1, 6)
+            duration = rng.uniform(4, 10) if dense else rng.uniform(15, 40)
+            if rng.random() < 0.3:
+                speaker = 1 - speaker
+            self.segments.append({
+                'speaker': speakers[speaker],
+                'text': ' '.join(['word'] * words),
+                'start_time': t,
+                'end_time': t + duration,
+            })
+            t += duration
+        self.tokens = [self.analyzer._estimate_segment_tokens(s) for s in self.segments]
+
+    def test_chunks_cover_transcript_on_turn_boundaries(self):
+        """Test every segment is covered and cuts never split a short turn."""
+        chunks = self.analyzer._chunk_transcript_by_tokens(self.segments, self.tokens)
+        index_of = {id(seg): i for i, seg in enumerate(self.segments)}
+
+        covered = set()
+        for chunk in chunks:
+            indices = [index_of[id(seg)] for seg in chunk['segments']]
+            self.assertEqual(indices, list(range(indices[0], indices[-1] + 1)))
+            covered.update(indices)
+            first = indices[0]
+            if first > 0:
+                self.assertNotEqual(
+                    self.segments[first - 1]['speaker'], self.segments[first]['speaker']
+                )
+        self.assertEqual(covered, set(range(len(self.segments))))
+
+    def test_chunks_are_uniform_in_tokens_not_minutes(self):
+        """Test chunk sizes track the token budget rather than wall-clock time."""
+        chunks = self.analyzer._chunk_transcript_by_tokens(self.segments, self.tokens)
+        self.assertEqual(len(chunks), math.ceil(sum(self.tokens) / 4000))
+
+        sizes = [c['tokens'] for c in chunks]
+        self.assertLess(max(sizes), 4000 * 1.5)
+        self.assertGreater(min(sizes), 4000 * 0.5)
+
+        minutes = [c['end_min'] - c['start_min'] for c in chunks]
+        self.assertGreater(max(minutes), 3 * min(minutes))
+
+    def test_overlap_measured_in_tokens(self):
+        """Test consecutive chunks share at least the overlap budget."""
+        chunks = self.analyzer._chunk_transcript_by_tokens(self.segments, self.tokens)
+        for previous, current in zip(chunks, chunks[1:]):
+            shared = [s for s in current['segments'] if any(s is p for p in previous['segments'])]
+            self.assertGreaterEqual(sum(self.analyzer._estimate_segment_tokens(s) for s in shared), 500)
+
+    def test_max_chunks_caps_chunk_count(self):
+        """Test max_chunks caps the number of chunks and keeps the tail."""
+        self.analyzer.max_chunks = 3
+        chunks = self.analyzer._chunk_transcript_by_tokens(self.segments, self.tokens)
+        self.assertEqual(len(chunks), 3)
+        self.assertIs(chunks[-1]['segments'][-1], self.segments[-1])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
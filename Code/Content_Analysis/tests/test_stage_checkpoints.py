@@ -0,0 +1,173 @@
+"""
+Tests for Pipeline Stage Checkpoints
+
+Created: 2026-10-18
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+import multi_pass_controller
+from multi_pass_controller import MultiPassController
+from stage_checkpoints import StageCheckpointStore
+
+
+class TestStageCheckpoints(unittest.TestCase):
+    """Resuming controller sub-stages from fingerprinted checkpoints."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.episode_dir = os.path.join(self.test_dir, 'Test_Episode')
+        os.makedirs(os.path.join(self.episode_dir, 'Processing'))
+        self.script_path = os.path.join(self.episode_dir, 'Output', 'Scripts', 'unified_podcast_script.json')
+        self.config = {'quality_control': {'diversity': {'max_segments': 8}}}
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def controller(self):
+        """A controller with only stage tracking and a checkpoint store."""
+        controller = MultiPassController.__new__(MultiPassController)
+        controller.config = self.config
+        controller.episode_dir = self.episode_dir
+        controller.enhanced_logger = MagicMock()
+        controller.completed_stages = []
+        controller.stage_outputs = {}
+        controller.stage_metadata = {}
+        controller.reused_stages = []
+        controller.checkpoints = StageCheckpointStore(
+            os.path.join(self.episode_dir, 'Processing', 'checkpoints'), self.episode_dir
+        )
+        return controller
+
+    def write_script(self, content):
+        os.makedirs(os.path.dirname(self.script_path), exist_ok=True)
+        with open(self.script_path, 'w', encoding='utf-8') as f:
+            json.dump(content, f)
+        return self.script_path
+
+    def run_stages(self, controller, segments, generate, format_script):
+        """Diversity selection, script generation and in-place TTS formatting."""
+        selected = controller._checkpointed('diversity_selection', [segments, []], lambda: segments[:2])
+        script_path = controller._checkpointed('script_generation', [selected, 'with_hook'], generate)
+        controller._checkpointed(
+            'tts_formatting', [script_path], lambda: format_script(script_path), files=(script_path,)
+        )
+        return selected, script_path
+
+    def fake_stages(self):
+        def generate():
+            self.generated += 1
+            return self.write_script({'sections': ['draft']})
+
+        def format_script(path):
+            self.formatted += 1
+            self.write_script({'sections': ['formatted']})
+
+        return generate, format_script
+
+    def test_rerun_reuses_every_completed_stage(self):
+        """Test a rerun restores results and files without executing stages."""
+        self.generated = self.formatted = 0
+        segments = [{'segment_id': f'S{n}'} for n in range(3)]
+        generate, format_script = self.fake_stages()
+
+        first = self.controller()
+        selected, script_path = self.run_stages(first, segments, generate, format_script)
+
+        # A later stage crashed after overwriting the script
+        self.write_script({'sections': ['half-verified']})
+
+        second = self.controller()
+        resumed = self.run_stages(second, segments, generate, format_script)
+
+        self.assertEqual(resumed, (selected, script_path))
+        self.assertEqual((self.generated, self.formatted), (1, 1))
+        with open(self.script_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'sections': ['formatted']})
+        self.assertEqual(
+            second.get_pipeline_status()['reused_stages'],
+            ['diversity_selection', 'script_generation', 'tts_formatting']
+        )
+
+    def test_changed_input_invalidates_stage_and_downstream(self):
+        """Test only stages whose inputs changed run again."""
+        self.generated = self.formatted = 0
+        segments = [{'segment_id': f'S{n}'} for n in range(3)]
+        generate, format_script = self.fake_stages()
+        self.run_stages(self.controller(), segments, generate, format_script)
+
+        # Same selection, different script config
+        self.config['narrative_generation'] = {'mode': 'sectioned'}
+        second = self.controller()
+        self.run_stages(second, segments, generate, format_script)
+
+        self.assertEqual(second.reused_stages, ['diversity_selection', 'tts_formatting'])
+        self.assertEqual(self.generated, 2)
+
+    def test_stage_reporting_error_is_not_checkpointed(self):
+        """Test a stage that degraded after catching its own failure reruns next time."""
+        calls = []
+
+        def verify():
+            calls.append(1)
+            controller.stage_metadata['recent_events_verification'] = {'error': 'timeout'}
+            return []
+
+        controller = self.controller()
+        controller._checkpointed('recent_events_verification', [[]], verify)
+        controller = self.controller()
+        controller._checkpointed('recent_events_verification', [[]], verify)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(controller.reused_stages, [])
+
+    def test_prompt_files_fingerprinted(self):
+        """Test Pass 1 and script generation checkpoints cover the prompt files they read."""
+        inputs = {}
+        results = {'pass_1': 'pass1.json', 'binary_filtering': ([], []), 'script_generation': None}
+
+        def record(stage, stage_inputs, run, files=()):
+            inputs[stage] = stage_inputs
+            if stage == 'script_generation':
+                raise RuntimeError("stop")
+            return results.get(stage, [])
+
+        controller = self.controller()
+        controller.budget = None
+        controller._load_guest_profile = lambda: ""
+        with patch.object(MultiPassController, '_checkpointed', side_effect=record):
+            with self.assertRaises(RuntimeError):
+                controller.run_full_pipeline(os.path.join(self.episode_dir, 'transcript.json'))
+
+        self.assertIn(multi_pass_controller.ANALYSIS_RULES_PATH, inputs['pass_1'])
+        templates = multi_pass_controller.generation_template_paths()
+        self.assertIn(os.path.join(multi_pass_controller.GENERATION_TEMPLATES_DIR, 'persona_definition.txt'),
+                      templates)
+        self.assertEqual(inputs['script_generation'][2:], templates)
+
+    def test_edited_rules_rerun_pass_1(self):
+        """Test editing a prompt file changes the stage fingerprint."""
+        rules = os.path.join(self.test_dir, 'rules.txt')
+        calls = []
+        for text in ('Flag vaccine claims.', 'Flag vaccine claims.', 'Flag election claims.'):
+            with open(rules, 'w', encoding='utf-8') as f:
+                f.write(text)
+            self.controller()._checkpointed('pass_1', ['transcript.json', '', rules], lambda: calls.append(1))
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,138 @@
+"""
+Tests for the Compiled TTS Formatter
+
+Created: 2026-10-18
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import unittest
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+from tts_formatter import TTSFormatter
+from output_quality_gate import OutputQualityGate, QualityIssue
+
+NAMES = {'host': 'Joe Rogan', 'guest': 'Robert F. Kennedy Jr.'}
+
+TOKENS = (
+    list(TTSFormatter.ABBREVIATIONS) + TTSFormatter.HYPHEN_JOIN
+    + [word.title() for word in TTSFormatter.HYPHEN_JOIN]
+    + ['(pause)', '(SFX: record scratch)', '(NOTE: cut here)', '(according to the WHO)', '(Laughing',
+       ')', '(', 'C O V I D', 'V A E R S', '&', '&amp;', 'AT&T', '@', '50%', '2.5%', '$100', '$1,200',
+       '$3.5 million', '#2334', 'F.', 'J. ', 'F Kennedy Junior', 'Joe Robert and F Kennedy Junior',
+       'Mary-Jane', '...', '....', '.', '-', 'the', 'vaccine', 'said', 'they', 'knew', 'Dr', 'Mrs']
+)
+
+
+def reference_format(formatter, text):
+    """Every rule the way format_text applied it before compilation: one
+    re.sub or str.replace per stage direction, abbreviation and compound word."""
+    pattern = r'\([^)]*\b(?:' + '|'.join(formatter.STAGE_DIRECTION_KEYWORDS) + r')[^)]*\)'
+    text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    text = re.sub(r'\((SFX|NOTE|CUE|FX|MUSIC|SOUND)[^)]*\)', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'  +', ' ', text)
+    text = re.sub(r'\b[A-Z](?:\s[A-Z]){2,}\b', lambda m: m.group(0).replace(' ', ''), text)
+    for abbr, expansion in formatter.ABBREVIATIONS.items():
+        text = text.replace(abbr, expansion)
+    text = re.sub(r'(?<!\w)&(?!\w{2,};)', 'and', text)
+    text = text.replace('@', 'at')
+    text = re.sub(r'(\d+(?:\.\d+)?)%', r'\1 percent', text)
+    text = re.sub(r'\$(\d[\d,]*(?:\.\d+)?)\s*(million|billion|trillion|thousand)?',
+                  lambda m: f"{m.group(1)} {m.group(2)} dollars" if m.group(2) else f"{m.group(1)} dollars",
+                  text)
+    text = re.sub(r'#(\d+)', r'number \1', text)
+    text = re.sub(r'\b([A-Z])\.\s', r'\1 ', text)
+    for word in formatter.HYPHEN_JOIN:
+        text = re.sub(re.escape(word), word.replace('-', ''), text, flags=re.IGNORECASE)
+    text = re.sub(r'([A-Z][a-z]+)-([A-Z][a-z]+)', r'\1 \2', text)
+    text = re.sub(r'\.{3,}', ',', text)
+    for pattern, replacement in formatter._name_patterns:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def random_texts(count, seed=5):
+    rng = random.Random(seed)
+    return [rng.choice([' ', '']).join(rng.choice(TOKENS) for _ in range(rng.randint(1, 40)))
+            for _ in range(count)]
+
+
+class TestTTSFormatter(unittest.TestCase):
+    """Compiled single-pass formatting identical to the per-rule passes."""
+
+    def setUp(self):
+        self.formatter = TTSFormatter(verified_names=NAMES)
+
+    def test_rules(self):
+        """Test each rule family on a representative sentence."""
+        text = ("(pause) Dr. Smith vs. the govt. said C O V I D rates rose 50% & cost $3.5 million... "
+                "The so-called Co-Host Mary-Jane met F Kennedy Junior at #23.")
+        self.assertEqual(
+            self.formatter.format_text(text),
+            " Doctor Smith versus the government said COVID rates rose 50 percent and cost 3.5 million "
+            "dollars, The socalled cohost Mary Jane met Robert F Kennedy Junior at number 23."
+        )
+
+    def test_matches_per_rule_passes(self):
+        """Test compiled formatting equals the per-entry reference on generated text."""
+        for text in random_texts(3000):
+            self.assertEqual(self.formatter.format_text(text), reference_format(self.formatter, text))
+
+    def test_format_many(self):
+        """Test format_many keeps input order and formats repeated texts once."""
+        texts = ['Thanks for listening (music)', 'Dr. Who & co-host', 'Thanks for listening (music)']
+        self.assertEqual(self.formatter.format_many(texts),
+                         ['Thanks for listening ', 'Doctor Who and cohost', 'Thanks for listening '])
+        self.assertEqual(self.formatter.format_many(iter([])), [])
+
+        script = {'podcast_sections': [{'script_content': t} for t in texts] + [{'section_type': 'video_clip'}]}
+        self.formatter.format_script(script)
+        self.assertEqual([s.get('script_content') for s in script['podcast_sections']],
+                         ['Thanks for listening ', 'Doctor Who and cohost', 'Thanks for listening ', None])
+
+    def test_auto_correct_reuses_formatter(self):
+        """Test auto_correct builds one formatter and applies each script-wide fix once."""
+        gate = OutputQualityGate(verified_names=NAMES)
+        script = {'podcast_sections': [
+            {'section_id': 'intro_001', 'script_content': 'Hi (pause) with F Kennedy Junior'},
+            {'section_id': 'outro_001', 'script_content': '(SFX: music) Bye from F Kennedy Junior'},
+        ]}
+        issues = [QualityIssue(name, 'warning', 'fix', section['section_id'], auto_fixable=True)
+                  for section in script['podcast_sections'] for name in ('stage_directions', 'name_consistency')]
+
+        corrected = gate.auto_correct(script, issues)
+        formatter = gate._tts_formatter
+        gate.auto_correct(script, issues)
+
+        self.assertIs(gate._tts_formatter, formatter)
+        self.assertEqual([s['script_content'] for s in corrected['podcast_sections']],
+                         ['Hi with Robert F Kennedy Junior', ' Bye from Robert F Kennedy Junior'])
+
+    def test_benchmark_against_per_rule_passes(self):
+        """Micro-benchmark: compiled formatting of a whole script matches per-rule passes; timing is reported only."""
+        texts = random_texts(1500, seed=9)
+
+        start = time.perf_counter()
+        expected = [reference_format(self.formatter, text) for text in texts]
+        per_rule = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = self.formatter.format_many(texts)
+        compiled = time.perf_counter() - start
+
+        print(f"\n  TTS formatting, {len(texts)} texts: per-rule {per_rule * 1000:.1f}ms, "
+              f"compiled {compiled * 1000:.1f}ms ({per_rule / compiled:.1f}x)")
+        self.assertEqual(actual, expected)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,134 @@
+"""
+Tests for Gemini Usage Accounting
+
+Created: 2026-10-18
+"""
+
+import os
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+# Add parent directories to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+content_analysis_dir = os.path.dirname(current_dir)
+code_dir = os.path.dirname(content_analysis_dir)
+sys.path.insert(0, content_analysis_dir)
+sys.path.insert(0, code_dir)
+
+import binary_segment_filter
+from binary_segment_filter import BinarySegmentFilter
+from streaming_pass1 import StreamingSegmentProcessor
+
+# Same module instance the call sites use
+usage_tracker = sys.modules[binary_segment_filter.track_call.__module__]
+
+
+def fake_response(prompt=1000, cached=0, output=200, thoughts=None, text="GATE_1_ANSWER: YES"):
+    """Response object carrying usage_metadata like the google-genai SDK."""
+    return SimpleNamespace(
+        text=text,
+        usage_metadata=SimpleNamespace(
+            prompt_token_count=prompt,
+            cached_content_token_count=cached,
+            candidates_token_count=output,
+            thoughts_token_count=thoughts,
+        ),
+    )
+
+
+class TestUsageTracker(unittest.TestCase):
+    """Recording and rolling up call usage."""
+
+    def setUp(self):
+        self.tracker = usage_tracker.UsageTracker({})
+        usage_tracker.set_active_usage_tracker(self.tracker)
+
+    def tearDown(self):
+        usage_tracker.set_active_usage_tracker(None)
+
+    def test_rollup_per_stage_and_episode(self):
+        """Test tokens, retries and errors roll up by stage and in total."""
+        with self.tracker.stage('pass_1'):
+            with usage_tracker.track_call('transcript_analyzer', 'gemini-2.5-pro') as call:
+                call.response = fake_response(prompt=50000, cached=40000, output=3000, thoughts=1000)
+        with self.tracker.stage('binary_filtering'):
+            with self.assertRaises(RuntimeError):
+                with usage_tracker.track_call('binary_segment_filter', 'gemini-2.5-flash'):
+                    raise RuntimeError("503 unavailable")
+            with usage_tracker.track_call('binary_segment_filter', 'gemini-2.5-flash', attempt=1) as call:
+                call.response = fake_response()
+
+        summary = self.tracker.summarize()
+        self.assertEqual(list(summary['stages']), ['pass_1', 'binary_filtering'])
+
+        pass1 = summary['stages']['pass_1']
+        self.assertEqual((pass1['prompt_tokens'], pass1['cached_tokens']), (50000, 40000))
+        self.assertEqual((pass1['output_tokens'], pass1['thinking_tokens']), (3000, 1000))
+        # 10k uncached + 40k cached input, 4k output (thinking billed as output)
+        self.assertAlmostEqual(pass1['estimated_cost_usd'], (10000 * 1.25 + 40000 * 0.31 + 4000 * 10.0) / 1e6, places=4)
+
+        gates = summary['stages']['binary_filtering']
+        self.assertEqual((gates['calls'], gates['retries'], gates['errors']), (2, 1, 1))
+        self.assertEqual(summary['episode']['calls'], 3)
+        self.assertIn('TOTAL', self.tracker.format_table(summary))
+
+    def test_no_active_tracker_is_noop(self):
+        """Test call sites work unchanged without a tracker."""
+        usage_tracker.set_active_usage_tracker(None)
+        with usage_tracker.track_call('x', 'gemini-2.5-pro') as call:
+            call.response = fake_response()
+        self.assertEqual(self.tracker.records, [])
+
+    def test_streaming_workers_book_their_own_stages(self):
+        """Test streamed filter/verify calls are booked to their stages while the controller moves on."""
+        def filter_segment(segment):
+            with usage_tracker.track_call('binary_segment_filter', 'gemini-2.5-pro') as call:
+                call.response = fake_response(prompt=100)
+            return SimpleNamespace(passed=True, to_dict=dict)
+
+        def verify_segment(segment):
+            with usage_tracker.track_call('recent_events_verifier', 'gemini-2.5-flash') as call:
+                call.response = fake_response(prompt=10)
+
+        processor = StreamingSegmentProcessor(
+            MagicMock(filter_segment=filter_segment, api_delay=0), MagicMock(verify_segment=verify_segment)
+        )
+        with self.tracker.stage('pass_1'):
+            processor.submit({'quote': 'one'})
+            processor.wait()
+            # Pool threads spawned inside a stage still inherit it
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                pool.submit(verify_segment, {}).result()
+        processor.shutdown()
+
+        self.assertEqual(
+            [(r.component, r.stage) for r in self.tracker.records],
+            [('binary_segment_filter', 'binary_filtering'), ('recent_events_verifier', 'recent_events_verification'),
+             ('recent_events_verifier', 'pass_1')]
+        )
+
+    def test_gate_filter_call_site_records_attempts(self):
+        """Test the gate filter records each retry with its attempt number."""
+        segment_filter = BinarySegmentFilter.__new__(BinarySegmentFilter)
+        segment_filter.max_retries = 2
+        segment_filter._debug_api_calls = []
+        client = MagicMock()
+        client.models.generate_content.side_effect = [RuntimeError("timeout"), fake_response()]
+
+        with patch.object(segment_filter, '_get_client', return_value=client), \
+                patch.object(binary_segment_filter.time, 'sleep'), \
+                self.tracker.stage('binary_filtering'):
+            segment_filter._request_consolidated("prompt", 'gemini-2.5-flash')
+
+        self.assertEqual(
+            [(r.stage, r.attempt, r.success) for r in self.tracker.records],
+            [('binary_filtering', 0, False), ('binary_filtering', 1, True)]
+        )
+        self.assertEqual(self.tracker.records[1].prompt_tokens, 1000)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
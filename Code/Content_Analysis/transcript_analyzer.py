@@ -18,6 +18,7 @@ import logging
 import traceback
 import re
 import time
+import threading
 from functools import wraps
 
 # Add path for imports
@@ -32,6 +33,84 @@ except ImportError as e:
     FileOrganizer = None
     get_file_organizer_config = None
 
+try:
+    from .upload_registry import get_active_registry
+except ImportError:
+    try:
+        from Content_Analysis.upload_registry import get_active_registry
+    except ImportError:
+        try:
+            from upload_registry import get_active_registry
+        except ImportError:
+            get_active_registry = lambda: None
+
+try:
+    from .context_cache import build_request
+except ImportError:
+    try:
+        from Content_Analysis.context_cache import build_request
+    except ImportError:
+        try:
+            from context_cache import build_request
+        except ImportError:
+            def build_request(prefix, suffix, model, scope='episode'):
+                return prefix + suffix, None
+
+try:
+    from .streaming_pass1 import IncrementalJSONArrayParser
+except ImportError:
+    try:
+        from Content_Analysis.streaming_pass1 import IncrementalJSONArrayParser
+    except ImportError:
+        try:
+            from streaming_pass1 import IncrementalJSONArrayParser
+        except ImportError:
+            IncrementalJSONArrayParser = None
+
+try:
+    from .compact_transcript import build_compact_transcript, load_turn_time_map, COMPACT_PROMPT_NOTE
+except ImportError:
+    try:
+        from Content_Analysis.compact_transcript import build_compact_transcript, load_turn_time_map, COMPACT_PROMPT_NOTE
+    except ImportError:
+        try:
+            from compact_transcript import build_compact_transcript, load_turn_time_map, COMPACT_PROMPT_NOTE
+        except ImportError:
+            build_compact_transcript = None
+
+try:
+    from .response_schemas import json_output_options, is_schema_rejection, reject_schema
+except ImportError:
+    try:
+        from Content_Analysis.response_schemas import json_output_options, is_schema_rejection, reject_schema
+    except ImportError:
+        try:
+            from response_schemas import json_output_options, is_schema_rejection, reject_schema
+        except ImportError:
+            json_output_options = lambda name: {}
+            is_schema_rejection = lambda error: False
+            reject_schema = lambda name, error: None
+
+try:
+    from Utils.api_cassette import create_gemini_client
+except ImportError:
+    try:
+        from api_cassette import create_gemini_client
+    except ImportError:
+        def create_gemini_client(api_key=None):
+            # A requested record/replay run must not fall through to live calls
+            if os.getenv('YOUTUBER_CASSETTE', 'off') != 'off':
+                raise RuntimeError("YOUTUBER_CASSETTE is set but Utils/api_cassette.py could not be imported")
+            return genai.Client(api_key=api_key)
+
+try:
+    from .usage_tracker import track_call
+except ImportError:
+    try:
+        from Content_Analysis.usage_tracker import track_call
+    except ImportError:
+        from usage_tracker import track_call
+
 # Set up console logging
 logging.basicConfig(
     level=logging.INFO,
@@ -48,6 +127,16 @@ API_KEY = os.getenv('GEMINI_API_KEY')
 # Global client instance (set by configure_gemini)
 _gemini_client = None
 
+# Transcript upload format (set by configure_transcript_upload; full JSON by default)
+_compact_upload = False
+_max_turn_seconds = 30.0
+
+def configure_transcript_upload(compact=False, max_turn_seconds=30.0):
+    """Choose between the full transcript JSON and the compact turn format for uploads."""
+    global _compact_upload, _max_turn_seconds
+    _compact_upload = bool(compact) and build_compact_transcript is not None
+    _max_turn_seconds = max_turn_seconds
+
 def load_episode_metadata_from_path(transcript_path):
     """
     Load episode metadata from Input/episode_metadata.json based on transcript file path.
@@ -100,6 +189,22 @@ def load_episode_metadata_from_path(transcript_path):
         logger.error(f"Failed to load episode metadata: {e}")
         return None
 
+def find_processing_dir(file_path):
+    """
+    Locate the Processing folder of the episode containing file_path.
+
+    Falls back to the file's own directory when it is not inside an episode
+    folder (Input/ and Processing/ siblings).
+    """
+    file_dir = os.path.dirname(os.path.abspath(file_path))
+    current_path = file_dir
+    while current_path and current_path != os.path.dirname(current_path):
+        processing_folder = os.path.join(current_path, 'Processing')
+        if os.path.isdir(os.path.join(current_path, 'Input')) and os.path.isdir(processing_folder):
+            return processing_folder
+        current_path = os.path.dirname(current_path)
+    return file_dir
+
 def extract_host_and_guest_names(file_path):
     """
     Extract host and guest names from folder structure.
@@ -158,6 +263,9 @@ def extract_host_and_guest_names(file_path):
         logger.error(f"Error extracting names from path: {e}")
         return ("Unknown Host", "Unknown Guest")
 
+# Attempt number of the current retry_gemini_call invocation (for usage tracking)
+_retry_state = threading.local()
+
 def retry_gemini_call(max_retries=5, base_delay=1, backoff_factor=2):
     """
     Decorator to retry Gemini API calls with exponential backoff.
@@ -181,6 +289,7 @@ def retry_gemini_call(max_retries=5, base_delay=1, backoff_factor=2):
                     else:
                         logger.info(f"Attempting {func.__name__} (attempt {attempt + 1}/{max_retries + 1})")
                     
+                    _retry_state.attempt = attempt
                     result = func(*args, **kwargs)
                     
                     # Check if result indicates success
@@ -269,7 +378,7 @@ def configure_gemini():
         # Check module-level API_KEY first, then fallback to environment variable
         api_key = API_KEY or os.getenv('GEMINI_API_KEY')
         if api_key:
-            _gemini_client = genai.Client(api_key=api_key)
+            _gemini_client = create_gemini_client(api_key=api_key)
             logger.info("Gemini API client configured successfully")
             return True
         else:
@@ -758,14 +867,35 @@ def upload_transcript_to_gemini(transcript_path, display_name):
             except (json.JSONDecodeError, ValueError) as repair_error:
                 logger.error(f"Failed to repair JSON: {repair_error}")
                 raise ValueError(f"Invalid JSON format - original error: {e}, repair failed: {repair_error}")
+        upload_path = transcript_path
+        if _compact_upload:
+            # Merge same-speaker segments into short-coded turns; times are mapped back after analysis
+            compact_text, _ = build_compact_transcript(transcript_data, _max_turn_seconds)
+            compact_name = os.path.splitext(os.path.basename(transcript_path))[0] + '_compact.json'
+            upload_path = os.path.join(find_processing_dir(transcript_path), compact_name)
+            with open(upload_path, 'w', encoding='utf-8') as f:
+                f.write(compact_text)
+            logger.info(
+                f"Compact transcript: {os.path.getsize(upload_path)} bytes "
+                f"({os.path.getsize(upload_path) / file_size:.0%} of full JSON)"
+            )
+
           # Upload file to Gemini using the new genai client API
-        logger.info(f"Uploading to Gemini with display name: {display_name}")
         client = get_gemini_client()
 
+        # Reuse a live upload of identical content (reruns, repeated chunks)
+        registry = get_active_registry()
+        if registry:
+            existing = registry.find(upload_path, client)
+            if existing:
+                return existing
+
+        logger.info(f"Uploading to Gemini with display name: {display_name}")
+
           # Perform the upload using the new client API
         # Note: JSON files work perfectly when uploaded with text/plain MIME type
         file_object = client.files.upload(
-            file=transcript_path,
+            file=upload_path,
             config=types.UploadFileConfig(
                 mime_type="text/plain",
                 display_name=display_name
@@ -774,7 +904,10 @@ def upload_transcript_to_gemini(transcript_path, display_name):
 
         logger.info(f"File uploaded successfully: {file_object.name}")
         logger.info(f"File URI: {file_object.uri}")
-        
+
+        if registry:
+            registry.register(upload_path, file_object)
+
         return file_object
         
     except Exception as e:
@@ -783,8 +916,18 @@ def upload_transcript_to_gemini(transcript_path, display_name):
         logger.error(f"Traceback: {traceback.format_exc()}")
         return None
 
-def create_file_based_prompt(analysis_rules, file_path=None):
+def create_file_based_prompt(analysis_rules, file_path=None, chunk_context=""):
     """Create clean analysis prompt without embedded transcript content."""
+    prefix, suffix = create_file_based_prompt_parts(analysis_rules, file_path, chunk_context)
+    return prefix + suffix
+
+def create_file_based_prompt_parts(analysis_rules, file_path=None, chunk_context=""):
+    """
+    Build the analysis prompt as (static prefix, per-call suffix).
+
+    The prefix holds only the analysis rules so it can be served from a context
+    cache; participant names, chunk context and the output instruction follow.
+    """
     logger.info("Creating file-based analysis prompt")
     
     # Extract participant names if file_path is provided
@@ -815,26 +958,72 @@ def create_file_based_prompt(analysis_rules, file_path=None):
 
 """
     
-    prompt = f"""
-{participant_info}
+    prefix = f"""
 ANALYSIS RULES:
 {analysis_rules}
 
+"""
+    if _compact_upload:
+        suffix = f"""{participant_info}{chunk_context}{COMPACT_PROMPT_NOTE}
+Analyze the transcript content according to the rules above and return only valid JSON without any markdown formatting or explanations.
+"""
+    else:
+        suffix = f"""{participant_info}{chunk_context}
 The transcript file contains a JSON structure with segments. Analyze the transcript content according to the rules above and return only valid JSON without any markdown formatting or explanations.
 """
 
-    logger.info(f"File-based prompt created: {len(prompt)} characters")
-    return prompt
+    logger.info(f"File-based prompt created: {len(prefix) + len(suffix)} characters")
+    return prefix, suffix
+
+def _stream_generate_content(client, model, contents, config, on_segment):
+    """
+    Stream a generation, handing each completed top-level array object to on_segment.
+
+    Returns:
+        Tuple of (full response text, last streamed chunk for finish_reason inspection)
+    """
+    parser = IncrementalJSONArrayParser()
+    text_parts = []
+    last_chunk = None
+    for chunk in client.models.generate_content_stream(model=model, contents=contents, config=config):
+        last_chunk = chunk
+        try:
+            text = chunk.text or ""
+        except (ValueError, AttributeError):
+            text = ""
+        if not text:
+            continue
+        text_parts.append(text)
+        for segment in parser.feed(text):
+            try:
+                on_segment(segment)
+            except Exception as e:
+                logger.warning(f"Streamed segment handler failed: {e}")
+
+    logger.info(f"Streamed {parser.parsed_count} segment(s) during generation ({parser.skipped_count} skipped)")
+    return "".join(text_parts), last_chunk
 
 @retry_gemini_call()
-def analyze_with_gemini_file_upload(file_object, analysis_rules, output_dir=None, file_path=None):
-    """Analyze transcript using file upload method (REQUIRED to avoid safety blocks)."""
+def analyze_with_gemini_file_upload(file_object, analysis_rules, output_dir=None, file_path=None, chunk_context="", on_segment=None):
+    """Analyze transcript using file upload method (REQUIRED to avoid safety blocks).
+
+    When on_segment is given, the response is streamed and each harmful segment
+    is passed to on_segment as soon as it is complete. The return value is the
+    same full JSON string either way.
+    """
     logger.info("Starting Gemini analysis with file upload method (only supported method)")
     logger.info("This method avoids safety blocks by separating content from analysis instructions")
     try:
-        # Create file-based prompt
-        prompt_text = create_file_based_prompt(analysis_rules, file_path)
+        # Create file-based prompt (static rules prefix + per-call suffix)
+        prompt_prefix, prompt_suffix = create_file_based_prompt_parts(analysis_rules, file_path, chunk_context)
+        prompt_text = prompt_prefix + prompt_suffix
         logger.info(f"Prompt length: {len(prompt_text)} characters")
+
+        # Compact uploads report turn times; map them back to original segment times
+        time_map = load_turn_time_map(file_path, _max_turn_seconds) if _compact_upload and file_path else None
+        if time_map and on_segment:
+            stream_handler = on_segment
+            on_segment = lambda segment: stream_handler(time_map.remap_segment(segment))
         
         # Save the prompt to the episode's Processing folder if output_dir is provided
         if output_dir:
@@ -877,19 +1066,50 @@ FULL PROMPT SENT TO GEMINI:
             logger.info("Calling client.models.generate_content()...")
             sys.stdout.flush()
 
+            # Serve the rules prefix from the episode context cache when active
+            request_text, cached_content = build_request(
+                prompt_prefix, prompt_suffix, 'gemini-2.5-pro', scope='episode'
+            )
+
             # Generate response using the new client API
             # Using gemini-2.5-pro for deeper reasoning on subjective analysis
-            # Note: Not setting response_mime_type to avoid SDK validation issues
-            response = client.models.generate_content(
-                model='gemini-2.5-pro',
-                contents=[prompt_text, file_object],
-                config=types.GenerateContentConfig(
+            # JSON mode constrained to the Pass 1 schema; the cleanup/repair
+            # chain below still runs as a fallback
+            schema_options = json_output_options('pass1_analysis')
+
+            def generate(options):
+                generation_config = types.GenerateContentConfig(
                     temperature=0.1,
                     top_p=0.9,
                     candidate_count=1,
-                    max_output_tokens=65536
+                    max_output_tokens=65536,
+                    cached_content=cached_content,
+                    **options
                 )
-            )
+                attempt = getattr(_retry_state, 'attempt', 0)
+                with track_call('transcript_analyzer', 'gemini-2.5-pro', attempt) as call:
+                    if on_segment and IncrementalJSONArrayParser:
+                        # Stream so downstream filtering can start on completed segments
+                        # (usage_metadata arrives on the last chunk)
+                        text, call.response = _stream_generate_content(
+                            client, 'gemini-2.5-pro', [request_text, file_object],
+                            generation_config, on_segment
+                        )
+                        return text, call.response
+                    call.response = client.models.generate_content(
+                        model='gemini-2.5-pro',
+                        contents=[request_text, file_object],
+                        config=generation_config
+                    )
+                    return None, call.response
+
+            try:
+                streamed_text, response = generate(schema_options)
+            except Exception as schema_err:
+                if not schema_options or not is_schema_rejection(schema_err):
+                    raise
+                reject_schema('pass1_analysis', schema_err)
+                streamed_text, response = generate({})
             logger.info(f"Response received. Type: {type(response)}")
             sys.stdout.flush()
         except Exception as gen_err:
@@ -927,28 +1147,34 @@ FULL PROMPT SENT TO GEMINI:
                     # Don't immediately return - try to extract text first
 
         # Try to get response text
-        try:
-            response_text = response.text
+        if streamed_text is not None:
+            response_text = streamed_text.strip()
             if not response_text:
                 logger.error("Empty response text from Gemini")
                 return None
-            response_text = response_text.strip()
-        except (ValueError, AttributeError) as e:
-            logger.error(f"Could not access response text: {e}")
-            # Try alternative access method for new API
+        else:
             try:
-                if response.candidates and response.candidates[0].content:
-                    parts = response.candidates[0].content.parts
-                    if parts:
-                        response_text = parts[0].text.strip()
-                        logger.info("Retrieved text from candidates[0].content.parts[0].text")
+                response_text = response.text
+                if not response_text:
+                    logger.error("Empty response text from Gemini")
+                    return None
+                response_text = response_text.strip()
+            except (ValueError, AttributeError) as e:
+                logger.error(f"Could not access response text: {e}")
+                # Try alternative access method for new API
+                try:
+                    if response.candidates and response.candidates[0].content:
+                        parts = response.candidates[0].content.parts
+                        if parts:
+                            response_text = parts[0].text.strip()
+                            logger.info("Retrieved text from candidates[0].content.parts[0].text")
+                        else:
+                            return "ERROR: No parts in response content"
                     else:
-                        return "ERROR: No parts in response content"
-                else:
+                        return "ERROR: Could not access response text"
+                except Exception as alt_err:
+                    logger.error(f"Alternative text access also failed: {alt_err}")
                     return "ERROR: Could not access response text"
-            except Exception as alt_err:
-                logger.error(f"Alternative text access also failed: {alt_err}")
-                return "ERROR: Could not access response text"
         
         logger.info(f"Received response length: {len(response_text)} characters")
         logger.info(f"Response preview (first 500 chars): {response_text[:500]}")
@@ -959,7 +1185,7 @@ FULL PROMPT SENT TO GEMINI:
 
         if cleaned_json:
             logger.info("JSON validation successful")
-            return cleaned_json
+            return time_map.remap_json(cleaned_json) if time_map else cleaned_json
         else:
             logger.error("JSON validation failed - attempting recovery")
             # Try to at least strip markdown and fix truncated JSON
@@ -991,7 +1217,7 @@ FULL PROMPT SENT TO GEMINI:
                     # Validate the recovery
                     try:
                         json.loads(recovery_text)
-                        return recovery_text
+                        return time_map.remap_json(recovery_text) if time_map else recovery_text
                     except json.JSONDecodeError as e:
                         logger.warning(f"Recovery attempt failed validation: {e}")
                 else:
@@ -1013,6 +1239,9 @@ def cleanup_uploaded_file(file_object, max_retries=3):
     """
     Clean up uploaded file with retry mechanism.
 
+    Uploads owned by the active upload registry are kept for reuse and
+    deleted when the episode completes.
+
     Args:
         file_object: The file object returned from client.files.upload()
         max_retries: Maximum number of retry attempts for deletion
@@ -1020,6 +1249,11 @@ def cleanup_uploaded_file(file_object, max_retries=3):
     if not file_object:
         return
 
+    registry = get_active_registry()
+    if registry and registry.is_tracked(file_object):
+        logger.info(f"Keeping registered upload for reuse: {file_object.name}")
+        return
+
     for attempt in range(max_retries):
         try:
             client = get_gemini_client()
@@ -11,6 +11,11 @@ Rules:
 - Name period removal
 - Hyphen cleanup for compound words
 
+Every pattern is compiled once with the class. Abbreviations and hyphenated
+compound words are literal replacements, so they share one table-driven
+pass instead of a str.replace/re.sub per entry. Rules that can interact
+(symbols, numbers, initials, names) keep their original order.
+
 Author: Claude Code
 Created: 2025-02-27
 Pipeline: Multi-Pass Quality Control System
@@ -18,11 +23,16 @@ Pipeline: Multi-Pass Quality Control System
 
 import re
 import logging
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any
 
 logger = logging.getLogger(__name__)
 
 
+def _alternation(words: Iterable[str]) -> str:
+    """Escaped regex alternation, longest entries first."""
+    return '|'.join(re.escape(word) for word in sorted(words, key=lambda w: (-len(w), w)))
+
+
 class TTSFormatter:
     """Deterministic TTS formatting applied after script generation."""
 
@@ -63,6 +73,30 @@ class TTSFormatter:
         'well-known', 'so-called', 'self-correcting',
     ]
 
+    # Compiled once for every formatter instance
+    STAGE_DIRECTION_PATTERN = re.compile(
+        r'\([^)]*\b(?:' + '|'.join(STAGE_DIRECTION_KEYWORDS) + r')[^)]*\)'
+        r'|\((?:SFX|NOTE|CUE|FX|MUSIC|SOUND)[^)]*\)',
+        re.IGNORECASE
+    )
+    DOUBLE_SPACE_PATTERN = re.compile(r'  +')
+    SPACED_ACRONYM_PATTERN = re.compile(r'\b[A-Z](?:\s[A-Z]){2,}\b')
+    # Abbreviations match case-sensitively, compound words in any case
+    LITERAL_PATTERN = re.compile(
+        f"(?P<abbreviation>{_alternation(ABBREVIATIONS)})|(?i:(?P<compound>{_alternation(HYPHEN_JOIN)}))"
+    )
+    LITERAL_TABLE = {
+        'abbreviation': ABBREVIATIONS,
+        'compound': {word: word.replace('-', '') for word in HYPHEN_JOIN},
+    }
+    AMPERSAND_PATTERN = re.compile(r'(?<!\w)&(?!\w{2,};)')
+    PERCENT_PATTERN = re.compile(r'(\d+(?:\.\d+)?)%')
+    DOLLAR_PATTERN = re.compile(r'\$(\d[\d,]*(?:\.\d+)?)\s*(million|billion|trillion|thousand)?')
+    HASHTAG_PATTERN = re.compile(r'#(\d+)')
+    INITIAL_PATTERN = re.compile(r'\b([A-Z])\.\s')
+    HYPHENATED_NAME_PATTERN = re.compile(r'([A-Z][a-z]+)-([A-Z][a-z]+)')
+    ELLIPSIS_PATTERN = re.compile(r'\.{3,}')
+
     def __init__(self, verified_names: Dict = None):
         """
         Initialize TTSFormatter.
@@ -157,15 +191,14 @@ class TTSFormatter:
         Returns:
             Script data with TTS-formatted content
         """
-        sections = script_data.get('podcast_sections', [])
+        sections = [s for s in script_data.get('podcast_sections', []) if 'script_content' in s]
+        formatted = self.format_many(section['script_content'] for section in sections)
         formatted_count = 0
 
-        for section in sections:
-            if 'script_content' in section:
-                original = section['script_content']
-                section['script_content'] = self.format_text(original)
-                if section['script_content'] != original:
-                    formatted_count += 1
+        for section, text in zip(sections, formatted):
+            if text != section['script_content']:
+                section['script_content'] = text
+                formatted_count += 1
 
         if formatted_count > 0:
             logger.info(f"TTS formatting applied to {formatted_count} sections")
@@ -176,7 +209,7 @@ class TTSFormatter:
         """Apply all TTS formatting rules to a text string."""
         text = self._strip_stage_directions(text)
         text = self._collapse_spaced_acronyms(text)
-        text = self._expand_abbreviations(text)
+        text = self._replace_literals(text)
         text = self._replace_symbols(text)
         text = self._spell_numbers(text)
         text = self._remove_name_periods(text)
@@ -185,6 +218,27 @@ class TTSFormatter:
         text = self._fix_names(text)
         return text
 
+    def format_many(self, texts: Iterable[str]) -> List[str]:
+        """
+        Apply all TTS formatting rules to each text of a whole script.
+
+        Repeated texts (shared intros, sign-offs, re-checked sections) are
+        formatted once.
+
+        Args:
+            texts: Texts to format
+
+        Returns:
+            Formatted texts, in input order
+        """
+        formatted: Dict[str, str] = {}
+        results = []
+        for text in texts:
+            if text not in formatted:
+                formatted[text] = self.format_text(text)
+            results.append(formatted[text])
+        return results
+
     def _collapse_spaced_acronyms(self, text: str) -> str:
         """Collapse spaced-out acronyms like 'C O V I D' back to 'COVID'.
 
@@ -195,20 +249,26 @@ class TTSFormatter:
             return m.group(0).replace(' ', '')
         # Match 3+ single uppercase letters separated by single spaces
         # e.g. "C O V I D" -> "COVID", "V A E R S" -> "VAERS"
-        text = re.sub(r'\b[A-Z](?:\s[A-Z]){2,}\b', collapse_match, text)
+        text = self.SPACED_ACRONYM_PATTERN.sub(collapse_match, text)
         return text
 
-    def _expand_abbreviations(self, text: str) -> str:
-        """Expand abbreviations to full words."""
-        for abbr, expansion in self.ABBREVIATIONS.items():
-            # Use word boundary to avoid partial matches
-            text = text.replace(abbr, expansion)
-        return text
+    def _replace_literals(self, text: str) -> str:
+        """Expand abbreviations and join hyphenated compound words in one pass.
+
+        No entry contains another, so a single scan gives the same result as
+        replacing entry by entry.
+        """
+        table = self.LITERAL_TABLE
+
+        def replace_match(m):
+            group = m.lastgroup
+            return table[group][m.group(0) if group == 'abbreviation' else m.group(0).lower()]
+        return self.LITERAL_PATTERN.sub(replace_match, text)
 
     def _replace_symbols(self, text: str) -> str:
         """Replace symbols with spoken equivalents."""
         # Handle & (but not in HTML entities)
-        text = re.sub(r'(?<!\w)&(?!\w{2,};)', 'and', text)
+        text = self.AMPERSAND_PATTERN.sub('and', text)
         text = text.replace('@', 'at')
         return text
 
@@ -218,7 +278,7 @@ class TTSFormatter:
         def replace_percent(match):
             num = match.group(1)
             return f"{num} percent"
-        text = re.sub(r'(\d+(?:\.\d+)?)%', replace_percent, text)
+        text = self.PERCENT_PATTERN.sub(replace_percent, text)
 
         # Currency: "$100" -> "100 dollars", "$100 million" -> "100 million dollars"
         def replace_dollar(match):
@@ -227,33 +287,32 @@ class TTSFormatter:
             if magnitude:
                 return f"{num} {magnitude} dollars"
             return f"{num} dollars"
-        text = re.sub(r'\$(\d[\d,]*(?:\.\d+)?)\s*(million|billion|trillion|thousand)?', replace_dollar, text)
+        text = self.DOLLAR_PATTERN.sub(replace_dollar, text)
 
         # Hashtag numbers: "#2334" -> "number 2334"
-        text = re.sub(r'#(\d+)', r'number \1', text)
+        text = self.HASHTAG_PATTERN.sub(r'number \1', text)
 
         return text
 
     def _remove_name_periods(self, text: str) -> str:
         """Remove periods from names like 'Robert F. Kennedy' -> 'Robert F Kennedy'."""
         # Match single capital letter followed by period and space (middle initials)
-        text = re.sub(r'\b([A-Z])\.\s', r'\1 ', text)
+        text = self.INITIAL_PATTERN.sub(r'\1 ', text)
         return text
 
     def _fix_hyphens(self, text: str) -> str:
-        """Remove hyphens from compound words that cause TTS pauses."""
-        for word in self.HYPHEN_JOIN:
-            replacement = word.replace('-', '')
-            text = re.sub(re.escape(word), replacement, text, flags=re.IGNORECASE)
+        """Split hyphenated personal names that cause TTS pauses.
 
-        # Also handle hyphenated personal names: "Mary-Jane" -> "Mary Jane"
-        text = re.sub(r'([A-Z][a-z]+)-([A-Z][a-z]+)', r'\1 \2', text)
+        Compound words in HYPHEN_JOIN are joined by _replace_literals.
+        """
+        # "Mary-Jane" -> "Mary Jane"
+        text = self.HYPHENATED_NAME_PATTERN.sub(r'\1 \2', text)
 
         return text
 
     def _clean_ellipses(self, text: str) -> str:
         """Replace ellipses with commas for natural pauses."""
-        text = re.sub(r'\.{3,}', ',', text)
+        text = self.ELLIPSIS_PATTERN.sub(',', text)
         return text
 
     def _strip_stage_directions(self, text: str) -> str:
@@ -263,15 +322,12 @@ class TTSFormatter:
         or factual asides like (that's 40 percent of the population).
         Only strips parentheticals containing stage-direction keywords.
         """
-        # Match parenthetical containing a stage-direction keyword
-        pattern = r'\([^)]*\b(?:' + '|'.join(self.STAGE_DIRECTION_KEYWORDS) + r')[^)]*\)'
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-
-        # Also catch generic stage directions: (SFX: ...), (NOTE: ...), (CUE: ...)
-        text = re.sub(r'\((SFX|NOTE|CUE|FX|MUSIC|SOUND)[^)]*\)', '', text, flags=re.IGNORECASE)
+        # Parentheticals containing a stage-direction keyword, plus generic
+        # stage directions: (SFX: ...), (NOTE: ...), (CUE: ...)
+        text = self.STAGE_DIRECTION_PATTERN.sub('', text)
 
         # Clean up double spaces left behind
-        text = re.sub(r'  +', ' ', text)
+        text = self.DOUBLE_SPACE_PATTERN.sub(' ', text)
         return text
 
     def _fix_names(self, text: str) -> str:
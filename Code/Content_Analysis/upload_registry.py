@@ -0,0 +1,216 @@
+"""
+Upload Registry - Content-Addressed Reuse of Gemini File Uploads
+
+Pass 1, every chunk of a chunked analysis and narrative generation each upload
+a file to the Gemini Files API, and the transcript analyzer deletes each one
+right after use. Reruns of an episode therefore re-upload identical files and
+wait for processing again.
+
+The registry keys uploads by the SHA-256 of the file contents. While a
+registry is active:
+- upload_transcript_to_gemini / NarrativeCreatorGenerator._upload_analysis_file
+  return a live handle for identical content instead of re-uploading
+- cleanup_uploaded_file leaves tracked files alone
+- MultiPassController deletes every tracked file once the episode completes
+
+Entries are persisted to Processing/gemini_upload_registry.json so a rerun after
+a failure can reuse handles until they expire (Gemini keeps files for 48h).
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# Gemini Files API retains uploads for 48 hours; stay clear of the edge
+DEFAULT_TTL_HOURS = 47
+EXPIRY_SAFETY_MARGIN = timedelta(minutes=30)
+
+# Process-wide registry consulted by the upload helpers (None = no reuse)
+_active_registry = None
+
+
+def set_active_registry(registry: Optional['GeminiUploadRegistry']) -> None:
+    """Install (or clear with None) the registry used by upload helpers."""
+    global _active_registry
+    _active_registry = registry
+
+
+def get_active_registry() -> Optional['GeminiUploadRegistry']:
+    """Return the active upload registry, if any."""
+    return _active_registry
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class GeminiUploadRegistry:
+    """
+    Tracks Gemini file uploads by content hash for reuse within their expiry.
+    """
+
+    def __init__(self, persist_path: Optional[str] = None, ttl_hours: float = DEFAULT_TTL_HOURS):
+        """
+        Initialize the registry.
+
+        Args:
+            persist_path: Optional JSON file to persist entries across runs
+            ttl_hours: Maximum age of a reusable upload
+        """
+        self.persist_path = persist_path
+        self.ttl = timedelta(hours=ttl_hours)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self.stats = {'uploads': 0, 'reused': 0, 'expired': 0, 'deleted': 0}
+        self._load()
+
+    def find(self, path: str, client) -> Optional[object]:
+        """
+        Return a live file handle for content identical to path, or None.
+
+        Args:
+            path: Local file about to be uploaded
+            client: genai.Client used to confirm the remote file still exists
+        """
+        sha = file_sha256(path)
+        with self._lock:
+            entry = self._entries.get(sha)
+        if not entry:
+            return None
+
+        if self._is_expired(entry):
+            self._forget(sha, reason='expired')
+            return None
+
+        try:
+            handle = client.files.get(name=entry['name'])
+        except Exception as e:
+            logger.info(f"Registered upload {entry['name']} no longer available: {e}")
+            self._forget(sha, reason='expired')
+            return None
+
+        state = getattr(getattr(handle, 'state', None), 'name', None)
+        if state == 'FAILED':
+            self._forget(sha, reason='expired')
+            return None
+
+        with self._lock:
+            self.stats['reused'] += 1
+        logger.info(f"♻️  Reusing Gemini upload {entry['name']} for {os.path.basename(path)}")
+        return handle
+
+    def register(self, path: str, file_object) -> None:
+        """Record a fresh upload of path."""
+        if not file_object or not getattr(file_object, 'name', None):
+            return
+        now = datetime.now(timezone.utc)
+        expires_at = now + self.ttl
+        remote_expiry = getattr(file_object, 'expiration_time', None)
+        if isinstance(remote_expiry, datetime):
+            if remote_expiry.tzinfo is None:
+                remote_expiry = remote_expiry.replace(tzinfo=timezone.utc)
+            expires_at = min(expires_at, remote_expiry - EXPIRY_SAFETY_MARGIN)
+
+        with self._lock:
+            self._entries[file_sha256(path)] = {
+                'name': file_object.name,
+                'uri': getattr(file_object, 'uri', None),
+                'source_path': path,
+                'uploaded_at': now.isoformat(),
+                'expires_at': expires_at.isoformat(),
+            }
+            self.stats['uploads'] += 1
+            self._save_locked()
+
+    def is_tracked(self, file_object) -> bool:
+        """True if the registry owns this upload (deletion is deferred)."""
+        name = getattr(file_object, 'name', None)
+        with self._lock:
+            return any(e['name'] == name for e in self._entries.values())
+
+    def cleanup_all(self, client) -> int:
+        """
+        Delete every tracked upload. Called once at the end of an episode.
+
+        Returns:
+            Number of files deleted
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+
+        deleted = 0
+        for sha, entry in entries:
+            try:
+                client.files.delete(name=entry['name'])
+                deleted += 1
+            except Exception as e:
+                # Expired or already removed remotely - nothing left to clean
+                logger.debug(f"Could not delete {entry['name']}: {e}")
+            with self._lock:
+                self._entries.pop(sha, None)
+
+        with self._lock:
+            self.stats['deleted'] += deleted
+            self._save_locked()
+        logger.info(f"✅ Deleted {deleted} registered Gemini upload(s)")
+        return deleted
+
+    def _is_expired(self, entry: Dict) -> bool:
+        try:
+            expires_at = datetime.fromisoformat(entry['expires_at'])
+        except (KeyError, ValueError):
+            return True
+        return datetime.now(timezone.utc) >= expires_at
+
+    def _forget(self, sha: str, reason: str) -> None:
+        with self._lock:
+            if self._entries.pop(sha, None) is not None:
+                self.stats[reason] += 1
+                self._save_locked()
+
+    def _load(self) -> None:
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            self._entries = {
+                sha: entry for sha, entry in entries.items() if not self._is_expired(entry)
+            }
+            if self._entries:
+                logger.info(f"Loaded {len(self._entries)} live Gemini upload(s) from registry")
+        except Exception as e:
+            logger.warning(f"Failed to load upload registry: {e}")
+            self._entries = {}
+
+    def _save_locked(self) -> None:
+        if not self.persist_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.persist_path), exist_ok=True)
+            tmp_path = self.persist_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_path, self.persist_path)
+        except Exception as e:
+            logger.warning(f"Failed to save upload registry: {e}")
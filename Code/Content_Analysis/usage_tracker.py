@@ -0,0 +1,293 @@
+"""
+Usage Tracker - Token, Latency and Cost Accounting for Gemini Calls
+
+Every Gemini call site wraps its request in track_call(); the active tracker
+records the response's usage_metadata (prompt, cached, output and thinking
+tokens), wall-clock latency, the attempt number and whether the call failed.
+Calls are attributed to the controller stage that was running when they were
+made and to the component (module) that made them. Background workers that
+outlive the stage which started them (streaming Pass 1 filter and verify
+calls) attribute their calls explicitly with attributed_stage().
+
+The controller installs one tracker per episode, rolls the records up per
+stage and for the whole episode into pipeline_metadata['usage'], and prints a
+summary table at the end of the run. Without an active tracker track_call()
+is a no-op, so modules used standalone are unaffected.
+
+Costs are estimates from per-model prices (USD per 1M tokens) that can be
+overridden in config:
+
+    usage_tracking:
+      enabled: true
+      pricing:
+        gemini-2.5-pro: {input: 1.25, cached_input: 0.31, output: 10.0}
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens; thinking tokens are billed as output
+DEFAULT_PRICING = {
+    'gemini-2.5-pro': {'input': 1.25, 'cached_input': 0.31, 'output': 10.0},
+    'gemini-2.5-flash': {'input': 0.30, 'cached_input': 0.075, 'output': 2.50},
+    'gemini-2.5-flash-lite': {'input': 0.10, 'cached_input': 0.025, 'output': 0.40},
+}
+
+UNATTRIBUTED_STAGE = 'other'
+
+
+@dataclass
+class CallRecord:
+    """One Gemini request attempt."""
+    component: str
+    stage: str
+    model: str
+    attempt: int = 0
+    success: bool = True
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    thinking_tokens: int = 0
+    latency_seconds: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for serialization."""
+        return asdict(self)
+
+
+class CallHandle:
+    """Set .response inside a track_call() block to record its usage."""
+
+    def __init__(self):
+        self.response = None
+
+
+def _usage_counts(response) -> Dict[str, int]:
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is None:
+        return {}
+
+    def count(name):
+        value = getattr(usage, name, None)
+        return value if isinstance(value, int) else 0
+
+    return {
+        'prompt_tokens': count('prompt_token_count'),
+        'cached_tokens': count('cached_content_token_count'),
+        'output_tokens': count('candidates_token_count'),
+        'thinking_tokens': count('thoughts_token_count'),
+    }
+
+
+class UsageTracker:
+    """
+    Collects CallRecords for one episode and rolls them up per stage.
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialize the UsageTracker.
+
+        Args:
+            config: Full pipeline configuration dictionary
+        """
+        usage_config = (config or {}).get('usage_tracking', {})
+        self.pricing = dict(DEFAULT_PRICING)
+        self.pricing.update(usage_config.get('pricing', {}))
+        self.current_stage = UNATTRIBUTED_STAGE
+        self.records: List[CallRecord] = []
+        self._lock = threading.Lock()
+        # Per-thread stage overriding current_stage (see thread_stage)
+        self._local = threading.local()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Attribute calls made inside the block to a pipeline stage."""
+        previous = self.current_stage
+        self.current_stage = name
+        try:
+            yield
+        finally:
+            self.current_stage = previous
+
+    @contextmanager
+    def thread_stage(self, name: str):
+        """Attribute calls made by this thread inside the block to a stage,
+        whichever stage the pipeline has moved on to meanwhile."""
+        previous = getattr(self._local, 'stage', None)
+        self._local.stage = name
+        try:
+            yield
+        finally:
+            self._local.stage = previous
+
+    def stage_for_call(self) -> str:
+        """Stage a call made now by the calling thread belongs to."""
+        return getattr(self._local, 'stage', None) or self.current_stage
+
+    def record(self, record: CallRecord) -> None:
+        """Add a call record."""
+        with self._lock:
+            self.records.append(record)
+
+    def total_tokens(self) -> int:
+        """Prompt, output and thinking tokens recorded so far."""
+        with self._lock:
+            return sum(r.prompt_tokens + r.output_tokens + r.thinking_tokens for r in self.records)
+
+    def _price(self, model: str) -> Optional[Dict[str, float]]:
+        if model in self.pricing:
+            return self.pricing[model]
+        # Versioned names such as gemini-2.5-flash-preview-05-20
+        matches = [name for name in self.pricing if model.startswith(name)]
+        return self.pricing[max(matches, key=len)] if matches else None
+
+    def estimate_cost(self, record: CallRecord) -> float:
+        """Estimated USD cost of one call (0 for unknown models)."""
+        price = self._price(record.model)
+        if not price:
+            return 0.0
+        uncached = max(record.prompt_tokens - record.cached_tokens, 0)
+        return (
+            uncached * price.get('input', 0)
+            + record.cached_tokens * price.get('cached_input', price.get('input', 0))
+            + (record.output_tokens + record.thinking_tokens) * price.get('output', 0)
+        ) / 1_000_000
+
+    def _rollup(self, records: List[CallRecord]) -> Dict[str, Any]:
+        return {
+            'calls': len(records),
+            'retries': sum(1 for r in records if r.attempt > 0),
+            'errors': sum(1 for r in records if not r.success),
+            'prompt_tokens': sum(r.prompt_tokens for r in records),
+            'cached_tokens': sum(r.cached_tokens for r in records),
+            'output_tokens': sum(r.output_tokens for r in records),
+            'thinking_tokens': sum(r.thinking_tokens for r in records),
+            'latency_seconds': round(sum(r.latency_seconds for r in records), 2),
+            'estimated_cost_usd': round(sum(self.estimate_cost(r) for r in records), 4),
+        }
+
+    def summarize(self) -> Dict[str, Any]:
+        """
+        Roll up all records.
+
+        Returns:
+            Dict with 'episode' totals and per-'stages', per-'components' and
+            per-'models' breakdowns (stages in first-call order)
+        """
+        with self._lock:
+            records = list(self.records)
+
+        def group(key):
+            groups: Dict[str, List[CallRecord]] = {}
+            for record in records:
+                groups.setdefault(getattr(record, key), []).append(record)
+            return {name: self._rollup(items) for name, items in groups.items()}
+
+        return {
+            'episode': self._rollup(records),
+            'stages': group('stage'),
+            'components': group('component'),
+            'models': group('model'),
+        }
+
+    def format_table(self, summary: Optional[Dict] = None) -> str:
+        """Render the per-stage summary as a fixed-width table."""
+        summary = summary or self.summarize()
+        header = f"{'Stage':<28}{'Calls':>6}{'Retry':>6}{'Err':>5}{'Prompt':>10}{'Cached':>10}{'Output':>10}{'Secs':>9}{'USD':>9}"
+        lines = [header, '-' * len(header)]
+        rows = list(summary['stages'].items()) + [('TOTAL', summary['episode'])]
+        for name, totals in rows:
+            if name == 'TOTAL':
+                lines.append('-' * len(header))
+            lines.append(
+                f"{name[:27]:<28}{totals['calls']:>6}{totals['retries']:>6}{totals['errors']:>5}"
+                f"{totals['prompt_tokens']:>10,}{totals['cached_tokens']:>10,}"
+                f"{totals['output_tokens'] + totals['thinking_tokens']:>10,}"
+                f"{totals['latency_seconds']:>9.1f}{totals['estimated_cost_usd']:>9.3f}"
+            )
+        return '\n'.join(lines)
+
+
+# Process-wide tracker used by the Gemini call sites
+_active_tracker: Optional[UsageTracker] = None
+
+
+def set_active_usage_tracker(tracker: Optional[UsageTracker]) -> None:
+    """Install (or clear with None) the tracker used by all call sites."""
+    global _active_tracker
+    _active_tracker = tracker
+
+
+def get_active_usage_tracker() -> Optional[UsageTracker]:
+    """Return the active tracker, or None when tracking is off."""
+    return _active_tracker
+
+
+@contextmanager
+def attributed_stage(name: str):
+    """
+    Attribute the calling thread's Gemini calls inside the block to a stage.
+
+    For worker threads whose calls belong to a stage other than the one the
+    controller is currently running. No-op without an active tracker.
+    """
+    tracker = _active_tracker
+    if tracker is None:
+        yield
+        return
+    with tracker.thread_stage(name):
+        yield
+
+
+@contextmanager
+def track_call(component: str, model: str, attempt: int = 0):
+    """
+    Record one Gemini request with the active tracker.
+
+    Usage:
+        with track_call('binary_segment_filter', model, attempt) as call:
+            call.response = client.models.generate_content(...)
+
+    Exceptions are recorded as failed calls and re-raised.
+    """
+    handle = CallHandle()
+    tracker = _active_tracker
+    if tracker is None:
+        yield handle
+        return
+
+    record = CallRecord(
+        component=component,
+        stage=tracker.stage_for_call(),
+        model=model,
+        attempt=attempt,
+    )
+    started = time.monotonic()
+    try:
+        yield handle
+    except Exception as e:
+        record.success = False
+        record.error = f"{type(e).__name__}: {e}"[:200]
+        raise
+    finally:
+        record.latency_seconds = round(time.monotonic() - started, 3)
+        for key, value in _usage_counts(handle.response).items():
+            setattr(record, key, value)
+        tracker.record(record)
@@ -5,6 +5,10 @@ Generates a formatted document with claims, verdicts, and source URLs
 for use in YouTube video descriptions. Uses Gemini with Google Search
 grounding to find real URLs for sources mentioned in rebuttals.
 
+Verdicts and sources are recorded in the cross-episode claim library; claims
+already summarized in an earlier episode reuse them instead of being sent
+to the grounded search again.
+
 Author: Claude Code
 Created: 2024-12-31
 Pipeline: Stage 8 - Final Output Generation
@@ -21,6 +25,34 @@ from datetime import datetime
 from google import genai
 from google.genai import types
 
+try:
+    from Utils.api_cassette import create_gemini_client
+except ImportError:
+    try:
+        from api_cassette import create_gemini_client
+    except ImportError:
+        def create_gemini_client(api_key=None):
+            # A requested record/replay run must not fall through to live calls
+            if os.getenv('YOUTUBER_CASSETTE', 'off') != 'off':
+                raise RuntimeError("YOUTUBER_CASSETTE is set but Utils/api_cassette.py could not be imported")
+            return genai.Client(api_key=api_key)
+
+try:
+    from .usage_tracker import track_call
+except ImportError:
+    try:
+        from Content_Analysis.usage_tracker import track_call
+    except ImportError:
+        from usage_tracker import track_call
+
+try:
+    from .claim_library import ClaimLibrary
+except ImportError:
+    try:
+        from Content_Analysis.claim_library import ClaimLibrary
+    except ImportError:
+        from claim_library import ClaimLibrary
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -55,6 +87,7 @@ class YouTubeDescriptionGenerator:
         self.config = config or {}
         self.api_key = os.getenv('GEMINI_API_KEY')
         self.model_name = "gemini-2.5-pro"
+        self.claim_library = ClaimLibrary.from_config(self.config)
         self._configure_gemini()
 
     def _configure_gemini(self) -> bool:
@@ -62,7 +95,7 @@ class YouTubeDescriptionGenerator:
         global _gemini_client
         try:
             if self.api_key:
-                _gemini_client = genai.Client(api_key=self.api_key)
+                _gemini_client = create_gemini_client(api_key=self.api_key)
                 logger.info("Gemini API client configured for YouTube description generation")
                 return True
             else:
@@ -112,8 +145,8 @@ class YouTubeDescriptionGenerator:
 
             print(f"  Found {len(pairs)} claims to process", flush=True)
 
-            # Generate summaries with sources using Gemini
-            summaries = self._generate_summaries_with_sources(pairs)
+            # Generate summaries with sources, reusing the library's for known claims
+            summaries, reused = self._generate_summaries(pairs)
 
             # Format output document
             output_text = self._format_output_document(summaries, script_data)
@@ -132,7 +165,8 @@ class YouTubeDescriptionGenerator:
                 'success': True,
                 'output_path': str(output_path),
                 'claims_processed': len(pairs),
-                'summaries_generated': len(summaries)
+                'summaries_generated': len(summaries),
+                'summaries_from_library': reused
             }
 
         except Exception as e:
@@ -165,12 +199,54 @@ class YouTubeDescriptionGenerator:
                     'key_claims': section.get('key_claims', []),
                     'severity_level': section.get('severity_level', 'MEDIUM'),
                     'rebuttal': post_clips.get(clip_id, ''),
-                    'clip_id': clip_id
+                    'clip_id': clip_id,
+                    'suggestedClip': section.get('suggestedClip', [])
                 }
                 pairs.append(pair)
 
         return pairs
 
+    def _generate_summaries(self, pairs: List[Dict]) -> Tuple[List[Dict], int]:
+        """
+        Summaries for all pairs, in order: library entries for known claims,
+        Gemini with Google Search for the rest.
+
+        Returns:
+            Tuple of (summaries, number reused from the library)
+        """
+        library = getattr(self, 'claim_library', None)
+        known = {}
+        if library is not None:
+            for i, pair in enumerate(pairs):
+                entry = library.lookup(pair)
+                if entry and entry.get('summary') and entry.get('verdict'):
+                    known[i] = {
+                        'title': entry.get('summary_title', pair['title']),
+                        'verdict': entry['verdict'],
+                        'raw_text': entry['summary'],
+                        'sources_line': entry.get('sources_line', ''),
+                        'from_library': True,
+                    }
+            if known:
+                print(f"  Reusing {len(known)} verdicts from the claim library", flush=True)
+
+        pending = [pair for i, pair in enumerate(pairs) if i not in known]
+        generated = self._generate_summaries_with_sources(pending) if pending else []
+
+        # Record only grounded summaries that line up one-to-one with their claims
+        if library is not None and len(generated) == len(pending):
+            for pair, summary in zip(pending, generated):
+                if not summary.get('fallback') and summary.get('verdict'):
+                    library.record(
+                        pair, verdict=summary['verdict'], summary=summary['raw_text'],
+                        summary_title=summary.get('title'), sources_line=summary.get('sources_line')
+                    )
+
+        generated_iter = iter(generated)
+        summaries = [known[i] if i in known else next(generated_iter, None) for i in range(len(pairs))]
+        summaries = [summary for summary in summaries if summary is not None] + list(generated_iter)
+        return summaries, len(known)
+
     def _generate_summaries_with_sources(self, pairs: List[Dict]) -> List[Dict]:
         """Generate concise summaries with verdicts and source URLs using Gemini."""
 
@@ -225,11 +301,12 @@ Return ONLY the formatted claim summaries, one per claim, separated by blank lin
                 tools=[types.Tool(google_search=types.GoogleSearch())]
             )
 
-            response = client.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-                config=config
-            )
+            with track_call('youtube_description_generator', self.model_name) as call:
+                response = call.response = client.models.generate_content(
+                    model=self.model_name,
+                    contents=prompt,
+                    config=config
+                )
 
             if not response.text:
                 raise ValueError("Empty response from Gemini")
@@ -298,7 +375,8 @@ Return ONLY the formatted claim summaries, one per claim, separated by blank lin
                 'title': pair['title'][:50],
                 'verdict': verdict,
                 'raw_text': f'"{pair["title"][:50]}" - {verdict}\nSee video for detailed fact-check.',
-                'sources_line': 'Sources: See video description'
+                'sources_line': 'Sources: See video description',
+                'fallback': True
             }
             summaries.append(summary)
 
@@ -25,6 +25,16 @@ from Chatterbox.simple_audio_file_manager import SimpleAudioFileManager
 
 from .config_edge_tts import DEFAULT_VOICE, VOICE_RATE, VOICE_VOLUME, VOICE_PITCH, OUTPUT_FORMAT
 
+# Record/replay layer for offline profiling runs
+try:
+    from Utils.api_cassette import synthesize
+except ImportError:
+    def synthesize(engine, params, output_path, produce):
+        # A requested record/replay run must not fall through to live calls
+        if os.getenv('YOUTUBER_CASSETTE', 'off') != 'off':
+            raise RuntimeError("YOUTUBER_CASSETTE is set but Utils/api_cassette.py could not be imported")
+        return produce()
+
 logger = logging.getLogger(__name__)
 
 
@@ -205,7 +215,13 @@ class EdgeTTSEngine:
 
     def _generate_audio_sync(self, text: str, output_path: str) -> None:
         """Synchronous wrapper for async Edge TTS generation"""
-        asyncio.run(self._generate_audio_async(text, output_path))
+        synthesize(
+            'edge_tts',
+            {'text': text, 'voice': self.voice, 'rate': self.rate,
+             'volume': self.volume, 'pitch': self.pitch},
+            output_path,
+            lambda: asyncio.run(self._generate_audio_async(text, output_path))
+        )
 
     async def _generate_audio_async(self, text: str, output_path: str) -> None:
         """Generate audio using Edge TTS async API"""
@@ -23,6 +23,16 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from Chatterbox.json_parser import ChatterboxResponseParser, AudioSection
 from Chatterbox.simple_audio_file_manager import SimpleAudioFileManager
 
+# Record/replay layer for offline profiling runs
+try:
+    from Utils.api_cassette import synthesize
+except ImportError:
+    def synthesize(engine, params, output_path, produce):
+        # A requested record/replay run must not fall through to live calls
+        if os.getenv('YOUTUBER_CASSETTE', 'off') != 'off':
+            raise RuntimeError("YOUTUBER_CASSETTE is set but Utils/api_cassette.py could not be imported")
+        return produce()
+
 logger = logging.getLogger(__name__)
 
 
@@ -195,15 +205,23 @@ class ElevenLabsTTSEngine:
                 logger.info(f"Making ElevenLabs API call for: {section.script_content[:100]}...")
                 logger.info(f"Using voice ID: {self.voice_id}")
                 
-                audio_data = self.client.text_to_speech.convert(
-                    voice_id=self.voice_id,
-                    text=section.script_content,
-                    voice_settings=self.voice_settings
+                def produce():
+                    audio_data = self.client.text_to_speech.convert(
+                        voice_id=self.voice_id,
+                        text=section.script_content,
+                        voice_settings=self.voice_settings
+                    )
+                    # Save audio file
+                    save(audio_data, str(output_file))
+
+                synthesize(
+                    'elevenlabs',
+                    {'voice_id': self.voice_id, 'text': section.script_content,
+                     'voice_settings': self.voice_settings},
+                    str(output_file),
+                    produce
                 )
                 
-                # Save audio file
-                save(audio_data, str(output_file))
-                
                 logger.info(f"✅ Successfully generated: {output_file}")
                 results['successful'] += 1
                 results['generated_files'].append(str(output_file))
@@ -0,0 +1,500 @@
+"""
+API Cassette - Record/Replay Layer for Gemini and TTS Calls
+
+Lets the multi-pass pipeline and the TTS engines run without network access
+for local profiling. A cassette sits at the client boundary:
+
+- record: calls go to the live services; every request -> response pair
+  (and its wall-clock timing) is appended to <cassette_dir>/interactions.jsonl,
+  TTS audio is copied to <cassette_dir>/audio/.
+- replay: requests are matched by a content hash of (operation, model,
+  contents, config) and served from disk. Latency can be replayed as
+  recorded, scaled, fixed, or skipped, so concurrency and caching changes can
+  be measured against realistic service times.
+
+Gemini clients are created through create_gemini_client(), which wraps the
+real client (record) or replaces it (replay). Uploaded files and context
+caches get server-assigned names that differ between runs; the cassette maps
+them to content digests so requests that reference them still match.
+Recorded errors are replayed as CassetteReplayError with the original status
+code, so retry paths behave the same way. Identical requests are served in
+recorded order; once exhausted the last response is repeated.
+
+Activation (environment, for whole-process runs):
+    YOUTUBER_CASSETTE=record|replay
+    YOUTUBER_CASSETTE_DIR=/path/to/cassette
+    YOUTUBER_CASSETTE_LATENCY=recorded|none|<seconds>
+    YOUTUBER_CASSETTE_LATENCY_SCALE=1.0
+
+or config (MultiPassController):
+    cassette: {mode: replay, path: ..., latency: recorded, latency_scale: 1.0}
+
+Replay needs no credentials; placeholder API keys are set so the key checks
+in the client setup code pass.
+
+Created: 2026-10-18
+Pipeline: Multi-Pass Quality Control System
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from google import genai
+    from google.genai import types
+    GENAI_AVAILABLE = True
+except ImportError:
+    genai = None
+    types = None
+    GENAI_AVAILABLE = False
+
+MODES = ('off', 'record', 'replay')
+INTERACTIONS_FILE = 'interactions.jsonl'
+AUDIO_DIR = 'audio'
+PLACEHOLDER_KEYS = ('GEMINI_API_KEY', 'ELEVENLABS_API_KEY')
+
+
+class CassetteMissError(KeyError):
+    """A replayed request has no recorded response."""
+
+
+class CassetteReplayError(Exception):
+    """A recorded API error, raised again during replay."""
+
+    def __init__(self, message: str, code: Optional[int] = None):
+        self.code = code
+        super().__init__(message)
+
+
+def _digest(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _file_digest(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _dump(obj: Any) -> Any:
+    """Serialize an SDK response object."""
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump(mode='json', exclude_none=True)
+    return obj
+
+
+class Cassette:
+    """
+    On-disk store of recorded API interactions.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = 'replay',
+        latency: Any = 'recorded',
+        latency_scale: float = 1.0,
+    ):
+        """
+        Initialize the Cassette.
+
+        Args:
+            path: Cassette directory
+            mode: 'record' or 'replay'
+            latency: Replay delay: 'recorded', 'none' or fixed seconds per call
+            latency_scale: Multiplier applied to recorded latencies
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.latency_scale = float(latency_scale)
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict]] = defaultdict(list)
+        self._served: Dict[str, int] = defaultdict(int)
+        self._aliases: Dict[str, str] = {}
+        self.stats = {'recorded': 0, 'replayed': 0, 'repeats': 0, 'misses': 0}
+
+        os.makedirs(os.path.join(path, AUDIO_DIR), exist_ok=True)
+        self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def _load(self) -> None:
+        interactions_path = os.path.join(self.path, INTERACTIONS_FILE)
+        if not os.path.exists(interactions_path):
+            if self.replaying:
+                logger.warning(f"Cassette has no recorded interactions: {interactions_path}")
+            return
+        with open(interactions_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                if entry.get('kind') == 'alias':
+                    self._aliases[entry['name']] = entry['digest']
+                else:
+                    self._entries[entry['key']].append(entry)
+
+    def _append(self, entry: Dict) -> None:
+        with self._lock:
+            with open(os.path.join(self.path, INTERACTIONS_FILE), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            if entry.get('kind') == 'alias':
+                self._aliases[entry['name']] = entry['digest']
+            else:
+                self._entries[entry['key']].append(entry)
+                self.stats['recorded'] += 1
+
+    # ---- request matching -------------------------------------------------
+
+    def add_alias(self, name: str, digest: str) -> None:
+        """Map a server-assigned resource name to a content digest."""
+        if name and self._aliases.get(name) != digest:
+            if self.replaying:
+                with self._lock:
+                    self._aliases[name] = digest
+            else:
+                self._append({'kind': 'alias', 'name': name, 'digest': digest})
+
+    def normalize(self, value: Any) -> Any:
+        """Turn request arguments into stable, run-independent JSON."""
+        if isinstance(value, (str, int, float, bool)) or value is None:
+            return value
+        if isinstance(value, (list, tuple)):
+            return [self.normalize(v) for v in value]
+        if isinstance(value, dict):
+            normalized = {k: self.normalize(v) for k, v in value.items()}
+            cache_name = normalized.get('cached_content')
+            if isinstance(cache_name, str):
+                normalized['cached_content'] = self._aliases.get(cache_name, cache_name)
+            return normalized
+        if hasattr(value, 'uri') and hasattr(value, 'name'):
+            # Uploaded file reference
+            return {'file': self._aliases.get(value.name, value.name)}
+        if hasattr(value, 'model_dump'):
+            return self.normalize(value.model_dump(mode='json', exclude_none=True))
+        return repr(value)
+
+    def request_key(self, operation: str, **request: Any) -> str:
+        """Content hash identifying a request."""
+        return _digest({'operation': operation, **self.normalize(request)})
+
+    # ---- record / replay --------------------------------------------------
+
+    def record(self, key: str, kind: str, started: float, **fields: Any) -> None:
+        """Append one interaction (timing measured from started)."""
+        self._append({
+            'kind': kind,
+            'key': key,
+            'latency_seconds': round(time.monotonic() - started, 4),
+            **fields,
+        })
+
+    def lookup(self, key: str, description: str = '') -> Dict:
+        """Next recorded interaction for a request (raises CassetteMissError)."""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self.stats['misses'] += 1
+                raise CassetteMissError(f"No recorded response for {description or 'request'} ({key[:12]})")
+            index = self._served[key]
+            if index >= len(entries):
+                self.stats['repeats'] += 1
+                index = len(entries) - 1
+            else:
+                self._served[key] += 1
+            self.stats['replayed'] += 1
+            return entries[index]
+
+    def delay(self, recorded_seconds: float) -> float:
+        """Seconds to wait when replaying a call recorded at recorded_seconds."""
+        if self.latency == 'none':
+            return 0.0
+        if self.latency == 'recorded':
+            return max(recorded_seconds, 0.0) * self.latency_scale
+        return float(self.latency)
+
+    def sleep(self, recorded_seconds: float) -> None:
+        seconds = self.delay(recorded_seconds)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    @staticmethod
+    def raise_recorded_error(entry: Dict) -> None:
+        if 'error' in entry:
+            raise CassetteReplayError(entry['error'], code=entry.get('code'))
+
+    @staticmethod
+    def error_fields(error: Exception) -> Dict:
+        code = getattr(error, 'code', None) or getattr(error, 'status_code', None)
+        return {'error': f"{type(error).__name__}: {error}", 'code': code if isinstance(code, int) else None}
+
+    # ---- TTS boundary -----------------------------------------------------
+
+    def synthesize(self, engine: str, params: Dict, output_path: str, produce: Callable[[], Any]) -> Any:
+        """
+        Run (record) or replay a TTS request that writes audio to output_path.
+
+        Args:
+            engine: TTS engine name
+            params: Everything that determines the audio (text, voice, settings)
+            output_path: Audio file the engine writes
+            produce: Performs the live request and writes output_path
+
+        Returns:
+            produce()'s return value (recorded value when replaying)
+        """
+        key = self.request_key('tts', engine=engine, params=params)
+        suffix = os.path.splitext(output_path)[1]
+
+        if self.replaying:
+            entry = self.lookup(key, f"{engine} TTS")
+            self.sleep(entry.get('latency_seconds', 0))
+            self.raise_recorded_error(entry)
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+            shutil.copyfile(os.path.join(self.path, AUDIO_DIR, entry['audio']), output_path)
+            return entry.get('result')
+
+        started = time.monotonic()
+        try:
+            result = produce()
+        except Exception as e:
+            self.record(key, 'tts', started, engine=engine, **self.error_fields(e))
+            raise
+        audio_name = f"{key}{suffix}"
+        shutil.copyfile(output_path, os.path.join(self.path, AUDIO_DIR, audio_name))
+        recorded_result = result if isinstance(result, (bool, int, float, str)) or result is None else None
+        self.record(key, 'tts', started, engine=engine, audio=audio_name, result=recorded_result)
+        return result
+
+
+class _CassetteModels:
+    """client.models stand-in for generate_content / generate_content_stream."""
+
+    def __init__(self, owner: 'CassetteGeminiClient'):
+        self._owner = owner
+
+    def generate_content(self, *, model: str, contents: Any, config: Any = None, **kwargs):
+        cassette = self._owner.cassette
+        key = cassette.request_key('generate_content', model=model, contents=contents, config=config)
+
+        if cassette.replaying:
+            entry = cassette.lookup(key, f"{model} generate_content")
+            cassette.sleep(entry.get('latency_seconds', 0))
+            cassette.raise_recorded_error(entry)
+            return types.GenerateContentResponse.model_validate(entry['response'])
+
+        started = time.monotonic()
+        try:
+            response = self._owner.client.models.generate_content(
+                model=model, contents=contents, config=config, **kwargs
+            )
+        except Exception as e:
+            cassette.record(key, 'gemini', started, **cassette.error_fields(e))
+            raise
+        cassette.record(key, 'gemini', started, model=model, response=_dump(response))
+        return response
+
+    def generate_content_stream(self, *, model: str, contents: Any, config: Any = None, **kwargs):
+        cassette = self._owner.cassette
+        key = cassette.request_key('generate_content_stream', model=model, contents=contents, config=config)
+
+        if cassette.replaying:
+            entry = cassette.lookup(key, f"{model} generate_content_stream")
+            cassette.raise_recorded_error(entry)
+            previous = 0.0
+            for offset, chunk in zip(entry['offsets'], entry['chunks']):
+                cassette.sleep(offset - previous)
+                previous = offset
+                yield types.GenerateContentResponse.model_validate(chunk)
+            return
+
+        started = time.monotonic()
+        chunks, offsets = [], []
+        try:
+            for chunk in self._owner.client.models.generate_content_stream(
+                model=model, contents=contents, config=config, **kwargs
+            ):
+                chunks.append(_dump(chunk))
+                offsets.append(round(time.monotonic() - started, 4))
+                yield chunk
+        except Exception as e:
+            cassette.record(key, 'gemini', started, **cassette.error_fields(e))
+            raise
+        cassette.record(key, 'gemini', started, model=model, chunks=chunks, offsets=offsets)
+
+
+class _CassetteFiles:
+    """client.files stand-in; replay hands out local File handles."""
+
+    def __init__(self, owner: 'CassetteGeminiClient'):
+        self._owner = owner
+
+    def _fake_file(self, name: str, config: Any = None):
+        return types.File(
+            name=name,
+            uri=f"cassette://{name}",
+            display_name=getattr(config, 'display_name', None),
+            mime_type=getattr(config, 'mime_type', None),
+            state='ACTIVE',
+        )
+
+    def upload(self, *, file: Any, config: Any = None, **kwargs):
+        cassette = self._owner.cassette
+        digest = _file_digest(file) if isinstance(file, (str, os.PathLike)) else _digest(repr(file))
+        if cassette.replaying:
+            handle = self._fake_file(f"files/cassette-{digest[:16]}", config)
+        else:
+            handle = self._owner.client.files.upload(file=file, config=config, **kwargs)
+        cassette.add_alias(handle.name, f"file:{digest}")
+        return handle
+
+    def get(self, *, name: str, **kwargs):
+        if self._owner.cassette.replaying:
+            return self._fake_file(name)
+        return self._owner.client.files.get(name=name, **kwargs)
+
+    def delete(self, *, name: str, **kwargs):
+        if self._owner.cassette.replaying:
+            return None
+        return self._owner.client.files.delete(name=name, **kwargs)
+
+
+class _CassetteCaches:
+    """client.caches stand-in; replay hands out local cache names."""
+
+    def __init__(self, owner: 'CassetteGeminiClient'):
+        self._owner = owner
+
+    def create(self, *, model: str, config: Any = None, **kwargs):
+        cassette = self._owner.cassette
+        digest = _digest({'model': model, 'contents': cassette.normalize(getattr(config, 'contents', None))})
+        if cassette.replaying:
+            cache = types.CachedContent(name=f"cachedContents/cassette-{digest[:16]}", model=model)
+        else:
+            cache = self._owner.client.caches.create(model=model, config=config, **kwargs)
+        cassette.add_alias(cache.name, f"cache:{digest}")
+        return cache
+
+    def delete(self, *, name: str, **kwargs):
+        if self._owner.cassette.replaying:
+            return None
+        return self._owner.client.caches.delete(name=name, **kwargs)
+
+
+class CassetteGeminiClient:
+    """
+    genai.Client stand-in that records or replays models, files and caches
+    calls. Other attributes are forwarded to the live client (record only).
+    """
+
+    def __init__(self, cassette: Cassette, client: Any = None):
+        self.cassette = cassette
+        self.client = client
+        self.models = _CassetteModels(self)
+        self.files = _CassetteFiles(self)
+        self.caches = _CassetteCaches(self)
+
+    def __getattr__(self, name: str):
+        if self.client is None:
+            raise AttributeError(f"'{name}' is not available while replaying a cassette")
+        return getattr(self.client, name)
+
+
+# Process-wide cassette used by client factories and TTS engines. The module
+# is imported as Utils.api_cassette (Code/ on sys.path, TTS engines) and as
+# api_cassette (Code/Utils/ on sys.path); both names must resolve to this one
+# module so they share the active cassette.
+for _module_name in ('Utils.api_cassette', 'api_cassette'):
+    sys.modules.setdefault(_module_name, sys.modules[__name__])
+_active_cassette: Optional[Cassette] = None
+_env_checked = False
+
+
+def activate_cassette(cassette: Optional[Cassette]) -> None:
+    """Install (or clear with None) the process-wide cassette."""
+    global _active_cassette, _env_checked
+    _active_cassette = cassette
+    _env_checked = True
+    if cassette and cassette.replaying:
+        for name in PLACEHOLDER_KEYS:
+            os.environ.setdefault(name, 'cassette-replay')
+
+
+def configure_cassette(settings: Optional[Dict]) -> Optional[Cassette]:
+    """
+    Activate a cassette from a settings dict (mode, path, latency, latency_scale).
+
+    Returns the active cassette, or None when mode is off/missing.
+    """
+    settings = settings or {}
+    mode = settings.get('mode', 'off')
+    if mode not in MODES:
+        raise ValueError(f"Unknown cassette mode: {mode}")
+    if mode == 'off' or not settings.get('path'):
+        return get_active_cassette()
+
+    cassette = Cassette(
+        settings['path'],
+        mode=mode,
+        latency=settings.get('latency', 'recorded'),
+        latency_scale=settings.get('latency_scale', 1.0),
+    )
+    activate_cassette(cassette)
+    logger.info(f"API cassette active: {mode} from {settings['path']}")
+    return cassette
+
+
+def get_active_cassette() -> Optional[Cassette]:
+    """Return the active cassette, activating one from the environment on first use."""
+    global _env_checked
+    if not _env_checked:
+        _env_checked = True
+        mode = os.getenv('YOUTUBER_CASSETTE', 'off')
+        if mode != 'off':
+            latency = os.getenv('YOUTUBER_CASSETTE_LATENCY', 'recorded')
+            configure_cassette({
+                'mode': mode,
+                'path': os.getenv('YOUTUBER_CASSETTE_DIR'),
+                'latency': latency if latency in ('recorded', 'none') else float(latency),
+                'latency_scale': float(os.getenv('YOUTUBER_CASSETTE_LATENCY_SCALE', '1.0')),
+            })
+    return _active_cassette
+
+
+def create_gemini_client(api_key: Optional[str] = None):
+    """
+    Create a Gemini client, routed through the active cassette if there is one.
+    """
+    cassette = get_active_cassette()
+    if cassette and cassette.replaying:
+        return CassetteGeminiClient(cassette)
+    client = genai.Client(api_key=api_key)
+    return CassetteGeminiClient(cassette, client) if cassette else client
+
+
+def synthesize(engine: str, params: Dict, output_path: str, produce: Callable[[], Any]) -> Any:
+    """Run a TTS request through the active cassette (or directly without one)."""
+    cassette = get_active_cassette()
+    if cassette is None:
+        return produce()
+    return cassette.synthesize(engine, params, output_path, produce)
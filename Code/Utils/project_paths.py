@@ -91,6 +91,18 @@ def get_transcripts_dir() -> Path:
     return transcripts_dir
 
 
+def get_cache_dir() -> Path:
+    """
+    Get the Cache directory path for data shared across episodes, creating it if it doesn't exist.
+
+    Returns:
+        Path: Path to the Cache directory
+    """
+    cache_dir = get_project_root() / "Cache"
+    cache_dir.mkdir(exist_ok=True)
+    return cache_dir
+
+
 def get_config_file(filename: str) -> Path:
     """
     Get path to a specific config file.